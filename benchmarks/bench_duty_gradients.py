@@ -0,0 +1,38 @@
+"""Benchmarks the gradients of a day long hourly duty schedule: one adjoint pass against central finite
+differences, which need two simulations per duty.
+
+	python -m benchmarks.bench_duty_gradients
+"""
+import timeit
+import numpy as np
+from gym_hvac.models import HVAC, HvacBuilding
+
+def benchmark(function, number:int):
+	return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+def createSchedule():
+	building = HvacBuilding(HVAC(), 16500 * 100, 200, 18, 100)
+	outside = 5 + 5 * np.sin(np.arange(24) * np.pi / 12)
+	heating = np.full(24, 0.15)
+	cooling = np.zeros(24)
+	return building, outside, heating, cooling
+
+def benchmarkAdjoint(number:int = 200):
+	building, outside, heating, cooling = createSchedule()
+	return benchmark(lambda: building.SimulateDutySchedule(outside, heating, cooling), number)
+
+def benchmarkFiniteDifferences(number:int = 5):
+	building, outside, heating, cooling = createSchedule()
+	def gradients():
+		for hour in range(24):
+			for sign in [1, -1]:
+				perturbed = heating.copy()
+				perturbed[hour] = perturbed[hour] + sign * 1e-6
+				building.SimulateDutySchedule(outside, perturbed, cooling)
+	return benchmark(gradients, number)
+
+if __name__ == '__main__':
+	adjoint = benchmarkAdjoint()
+	finiteDifferences = benchmarkFiniteDifferences()
+	print("24 hourly duties, adjoint gradients: {:.1f} us".format(adjoint * 1e6))
+	print("24 hourly duties, finite differences: {:.1f} us ({:.0f}x)".format(finiteDifferences * 1e6, finiteDifferences / adjoint))
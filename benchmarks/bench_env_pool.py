@@ -0,0 +1,59 @@
+"""Benchmarks the latency of getting a fresh env: reset, a reset to a random scenario, building an HvacEnv (from keyword
+arguments and from a compiled spec), unpickling a compiled spec in a worker, gym.make and the env pool.
+
+	python -m benchmarks.bench_env_pool
+"""
+import pickle
+import timeit
+import warnings
+import gym
+from gym_hvac.envs import HvacEnv, HvacEnvPool, ScenarioSampler, CompileEnvSpec
+
+def benchmark(function, number:int):
+	return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+def benchmarkReset(number:int = 100000):
+	env = HvacEnv()
+	return benchmark(env.reset, number)
+
+def benchmarkScenarioReset(number:int = 100000):
+	env = HvacEnv(scenarioSampler=ScenarioSampler())
+	def nextScenario():
+		# a scenario is only drawn for an episode that had a step
+		env.step_count = 1
+		env.reset()
+	return benchmark(nextScenario, number)
+
+def benchmarkConstruct(number:int = 2000):
+	return benchmark(HvacEnv, number)
+
+def benchmarkConstructFromSpec(number:int = 2000):
+	compiled = CompileEnvSpec({'conditionedFloorArea': 150, 'outsideTemperatures': 'october'})
+	return benchmark(lambda: HvacEnv(spec=compiled), number)
+
+def benchmarkUnpickleSpec(number:int = 20000):
+	pickled = pickle.dumps(CompileEnvSpec({'conditionedFloorArea': 150, 'outsideTemperatures': 'october'}))
+	return benchmark(lambda: pickle.loads(pickled), number)
+
+def benchmarkMake(number:int = 2000):
+	def make():
+		# gym 0.26 warns about the env checker on every make
+		with warnings.catch_warnings():
+			warnings.simplefilter('ignore')
+			gym.make('Hvac-v0')
+	return benchmark(make, number)
+
+def benchmarkPool(number:int = 20000):
+	pool = HvacEnvPool()
+	def acquireAndRelease():
+		pool.Release(pool.Acquire(outsideTemperatures='cold', initialTemperature=19))
+	return benchmark(acquireAndRelease, number)
+
+if __name__ == '__main__':
+	print("HvacEnv.reset: {:.2f} us".format(benchmarkReset() * 1e6))
+	print("HvacEnv.reset to a random scenario: {:.2f} us".format(benchmarkScenarioReset() * 1e6))
+	print("HvacEnv(): {:.1f} us".format(benchmarkConstruct() * 1e6))
+	print("HvacEnv(spec=compiled): {:.1f} us".format(benchmarkConstructFromSpec() * 1e6))
+	print("unpickling a compiled spec: {:.2f} us".format(benchmarkUnpickleSpec() * 1e6))
+	print("gym.make('Hvac-v0'): {:.1f} us".format(benchmarkMake() * 1e6))
+	print("HvacEnvPool Acquire + Release: {:.2f} us".format(benchmarkPool() * 1e6))
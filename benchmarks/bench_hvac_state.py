@@ -0,0 +1,41 @@
+"""Benchmarks the per second simulation cost and the per instance memory of HVAC and HvacBuilding.
+
+	python -m benchmarks.bench_hvac_state
+"""
+import timeit
+import tracemalloc
+from gym_hvac.models import HVAC
+from gym_hvac.models import HvacBuilding
+
+def createHvacBuilding():
+	conditioned_floor_area = 100
+	return HvacBuilding(HVAC(), heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200, initial_building_temperature=20, conditioned_floor_area=conditioned_floor_area)
+
+def benchmarkStep(seconds:int = 200000, repeat:int = 5):
+	"""Gets the best time per simulated second over a heating day (start up, mid run and shutdowns)
+	"""
+	def run():
+		hvacBuilding = createHvacBuilding()
+		hvac = hvacBuilding.building_hvac
+		for i in range(seconds):
+			if i % 1800 == 0:
+				hvac.TurnHeatingOn()
+			elif i % 1800 == 900:
+				hvac.TurnHvacOff()
+			hvacBuilding.step(-5.0)
+	return min(timeit.repeat(run, number=1, repeat=repeat)) / seconds
+
+def benchmarkMemory(instances:int = 10000):
+	"""Gets the bytes allocated per HvacBuilding (including its HVAC)
+	"""
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	hvacBuildings = [createHvacBuilding() for i in range(instances)]
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return (after - before) / len(hvacBuildings)
+
+if __name__ == '__main__':
+	print("HvacBuilding.step: {:.3f} us per simulated second".format(benchmarkStep() * 1e6))
+	print("HvacBuilding + HVAC: {:.0f} bytes per instance".format(benchmarkMemory()))
@@ -0,0 +1,53 @@
+"""Benchmarks the startup cost of a fresh interpreter importing the gym_hvac modules, what every spawned worker pays.
+
+	python -m benchmarks.bench_import_time
+"""
+import subprocess
+import sys
+import time
+
+MODULES = ['gym_hvac', 'gym_hvac.models', 'gym_hvac.utils', 'gym_hvac.envs', 'gym_hvac.evaluation']
+# frameworks the simulator must not load, the training script and the report process import them when needed
+HEAVY_MODULES = ['gym', 'matplotlib', 'tensorforce', 'tensorflow']
+
+def importProbe(module:str):
+	return ("import sys, time\n"
+		"start = time.perf_counter()\n"
+		"import " + module + "\n"
+		"print(time.perf_counter() - start)\n"
+		"print(','.join(name for name in " + repr(HEAVY_MODULES) + " if name in sys.modules))\n")
+
+def benchmarkImport(module:str, repeat:int = 5):
+	"""Gets the best import time of the module in a fresh interpreter, the interpreter start up not included,
+	and the heavy modules it loaded
+
+	Returns:
+		tuple -- seconds, list of the loaded HEAVY_MODULES
+	"""
+	best = None
+	loaded = []
+	for i in range(repeat):
+		output = subprocess.run([sys.executable, '-c', importProbe(module)], check=True, capture_output=True, text=True).stdout.splitlines()
+		seconds = float(output[0])
+		loaded = [name for name in output[1].split(',') if name]
+		if best is None or seconds < best:
+			best = seconds
+	return best, loaded
+
+def benchmarkInterpreter(repeat:int = 5):
+	"""Gets the best wall time of starting an interpreter that imports nothing, the floor of a worker start up
+	"""
+	best = None
+	for i in range(repeat):
+		start = time.perf_counter()
+		subprocess.run([sys.executable, '-c', 'pass'], check=True)
+		seconds = time.perf_counter() - start
+		if best is None or seconds < best:
+			best = seconds
+	return best
+
+if __name__ == '__main__':
+	print("python -c pass: {:.1f} ms".format(benchmarkInterpreter() * 1e3))
+	for module in MODULES:
+		seconds, loaded = benchmarkImport(module)
+		print("import {}: {:.1f} ms (loads: {})".format(module, seconds * 1e3, ', '.join(loaded) or 'none'))
@@ -0,0 +1,38 @@
+"""Benchmarks what rendering costs the env: the step overhead of recording the render history and the time of an rgb_array frame.
+
+	python -m benchmarks.bench_render
+"""
+import timeit
+from gym_hvac.envs import HvacEnv
+
+def runEpisode(env:HvacEnv, steps:int = 200):
+	env.reset()
+	for i in range(steps):
+		env.step((i // 20) % 2)
+
+def benchmarkStepOverhead(steps:int = 200, repeat:int = 15):
+	"""Gets the best time per step without and with the render history recorded
+
+	Returns:
+		tuple -- seconds per step, seconds per step while rendering
+	"""
+	env = HvacEnv()
+	plain = min(timeit.repeat(lambda: runEpisode(env, steps), number=1, repeat=repeat)) / steps
+	env.render('rgb_array')
+	recorded = min(timeit.repeat(lambda: runEpisode(env, steps), number=1, repeat=repeat)) / steps
+	env.close()
+	return plain, recorded
+
+def benchmarkFrame(frames:int = 200):
+	"""Gets the time of a step followed by an rgb_array frame
+	"""
+	env = HvacEnv()
+	env.render('rgb_array')
+	seconds = timeit.timeit(lambda: (env.step(0), env.render('rgb_array')), number=frames) / frames
+	env.close()
+	return seconds
+
+if __name__ == '__main__':
+	plain, recorded = benchmarkStepOverhead()
+	print("HvacEnv.step: {:.2f} us, recording the render history: {:.2f} us ({:+.1f}%)".format(plain * 1e6, recorded * 1e6, (recorded / plain - 1) * 100))
+	print("HvacEnv.step + render('rgb_array'): {:.2f} ms per frame".format(benchmarkFrame() * 1e3))
@@ -0,0 +1,55 @@
+"""Benchmarks a day of thermostat control: deciding every second, solving the threshold crossings, and the
+setpoint env against the on/off env run by the baseline thermostat every 5 minutes.
+
+	python -m benchmarks.bench_setpoint_env
+"""
+import timeit
+import numpy as np
+from gym_hvac.envs import HvacEnv, HvacSetpointEnv
+from gym_hvac.evaluation import ThermostatPolicy
+from gym_hvac.models import HVAC, HvacBuilding, HysteresisThermostat
+
+def benchmark(function, number:int):
+	return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+def benchmarkPerSecond(outsideTemperature:float, number:int = 3):
+	def day():
+		building = HvacBuilding(HVAC(), 16500 * 100, 200, 18, 100)
+		thermostat = HysteresisThermostat()
+		for second in range(24 * 3600):
+			thermostat.Step(building, outsideTemperature)
+	return benchmark(day, number)
+
+def benchmarkEvents(outsideTemperature:float, number:int = 20):
+	def day():
+		building = HvacBuilding(HVAC(), 16500 * 100, 200, 18, 100)
+		thermostat = HysteresisThermostat()
+		for hour in range(24):
+			thermostat.Run(building, outsideTemperature, 3600)
+	return benchmark(day, number)
+
+def benchmarkOnOffEnv(number:int = 20):
+	env = HvacEnv(outsideTemperatures='normal')
+	policy = ThermostatPolicy()
+	def day():
+		policy.Reset(1)
+		observation = env.reset()
+		for step in range(288):
+			observation, reward, done, info = env.step(int(policy(observation.reshape(1, -1))[0]))
+	return benchmark(day, number)
+
+def benchmarkSetpointEnv(number:int = 20):
+	env = HvacSetpointEnv(outsideTemperatures='normal')
+	action = np.array([20.0, 20.0, 2.0], dtype=np.float32)
+	def day():
+		env.reset()
+		for step in range(24):
+			env.step(action)
+	return benchmark(day, number)
+
+if __name__ == '__main__':
+	for outsideTemperature in [-8, 34]:
+		print("thermostat day at {} C, every second: {:.1f} ms".format(outsideTemperature, benchmarkPerSecond(outsideTemperature) * 1e3))
+		print("thermostat day at {} C, event by event: {:.2f} ms".format(outsideTemperature, benchmarkEvents(outsideTemperature) * 1e3))
+	print("HvacEnv day, 288 on/off actions: {:.2f} ms".format(benchmarkOnOffEnv() * 1e3))
+	print("HvacSetpointEnv day, 24 setpoint actions: {:.2f} ms".format(benchmarkSetpointEnv() * 1e3))
@@ -1,6 +1,25 @@
-from gym.envs.registration import register
+"""The HVAC gym package.
 
-register(
-    id='Hvac-v0',
-    entry_point='gym_hvac.envs:HvacEnv',
-)
\ No newline at end of file
+Importing the package doesn't import gym, so the simulator (gym_hvac.models) loads without it. Hvac-v0 and
+HvacSetpoint-v0 are registered when gym is already imported, when gym_hvac.envs is imported, or by gym itself through the
+gym.envs entry point of the installed package.
+"""
+import sys
+
+def RegisterEnvironments():
+	"""Registers Hvac-v0 and HvacSetpoint-v0 with gym, registering them again is a no-op
+	"""
+	from gym.envs.registration import register, registry
+	if 'Hvac-v0' not in registry:
+		register(
+			id='Hvac-v0',
+			entry_point='gym_hvac.envs:HvacEnv',
+		)
+	if 'HvacSetpoint-v0' not in registry:
+		register(
+			id='HvacSetpoint-v0',
+			entry_point='gym_hvac.envs:HvacSetpointEnv',
+		)
+
+if 'gym' in sys.modules:
+	RegisterEnvironments()
@@ -1,3 +1,10 @@
 """The HVAC Gym Environment.
 """
-from gym_hvac.envs.hvac_env import HvacEnv
\ No newline at end of file
+from gym_hvac.envs.env_spec import CompileEnvSpec, CompiledEnvSpec, LoadEnvSpec, ENV_SPEC_DEFAULTS
+from gym_hvac.envs.hvac_env import HvacEnv, EPISODE_CHUNK_DTYPE, GetEpisodeChunkDtype, ENV_STATE_DTYPE
+from gym_hvac.envs.hvac_setpoint_env import HvacSetpointEnv
+from gym_hvac.envs.hvac_env_pool import HvacEnvPool, SHARED_ENV_POOL
+from gym_hvac.envs.domain_randomization import ScenarioSampler, SCENARIO_DTYPE, MaxEnergyCostForTime
+from gym_hvac import RegisterEnvironments
+
+RegisterEnvironments()
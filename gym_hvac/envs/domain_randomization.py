@@ -0,0 +1,171 @@
+"""Domain randomization: every episode gets another building, HVAC sizing, initial temperature and weather day.
+
+The scenarios are drawn in batches of structured records with the constants a reset needs already derived
+(the discretization factors and the max cost of a step), so applying one is a lookup. Batch b is drawn from
+the generator seeded with (seed, b), scenario i is the same in every process without any coordination.
+"""
+from collections import OrderedDict
+import numpy as np
+from gym_hvac.models import HVAC
+from gym_hvac.envs.hvac_env import _LOGAN_OUTSIDE_TEMPERATURES
+
+# the hours of a weather day, the env looks up hours 0 to 24
+WEATHER_HOURS = 25
+
+SCENARIO_DTYPE = np.dtype([
+	('index', '<i8'),
+	('weatherDay', '<i8'),
+	('conditionedFloorArea', '<f8'),
+	('heatMassCapacity', '<f8'),
+	('heatTransmission', '<f8'),
+	('gasRateEnergy', '<f8'),
+	('airConditioningEnergy', '<f8'),
+	('initialTemperature', '<f8'),
+	('weatherOffset', '<f8'),
+	('dtByCm', '<f8'),
+	('decay', '<f8'),
+	('maxEnergyCost', '<f8'),
+	('outsideTemperatures', '<f8', (WEATHER_HOURS,))])
+
+def MaxEnergyCostForTime(gasRateEnergy, airConditioningEnergy, seconds:float, hvacParameters = None,
+	dollarsPerDTH = 6.53535, dollarsPerKiloWattHour = 0.1149):
+	"""HvacBuilding.CalculateMaxEneregyCostForTime for arrays of furnace and A/C sizes, with the same
+	operations in the same order so the result is equal to the float
+
+		Arguments:
+			gasRateEnergy {np.ndarray} -- the heating energy of the burning gas [W]
+			airConditioningEnergy {np.ndarray} -- the energy of the A/C compressor [W]
+			seconds {float} -- the length of a step [s]
+
+		Keyword Arguments:
+			hvacParameters {tuple} -- the HVAC.GetParameters of the other energies (default: {None, a default HVAC})
+	"""
+	if hvacParameters is None:
+		hvacParameters = HVAC().GetParameters()
+	gasValveEnergy, gasVentBlowerEnergy, _, _, houseBlowerEnergy = hvacParameters[:5]
+	hours = seconds / 3600.0
+	gasDTH = np.asarray(gasRateEnergy, dtype=np.float64) * seconds / seconds * hours / 1000 / 293.001111
+	heatingKWH = (gasValveEnergy + gasVentBlowerEnergy) * seconds / seconds * (seconds / 3600) / 1000
+	heatingCost = heatingKWH * dollarsPerKiloWattHour + gasDTH * dollarsPerDTH
+	coolingKWH = (np.asarray(airConditioningEnergy, dtype=np.float64) + houseBlowerEnergy) * seconds / seconds * (seconds / 3600) / 1000
+	coolingCost = coolingKWH * dollarsPerKiloWattHour
+	return np.where(coolingCost > heatingCost, coolingCost, heatingCost)
+
+class ScenarioSampler():
+	"""Draws seeded random scenarios in batches, every range is a (low, high) uniform draw
+
+		Keyword Arguments:
+			seed {int} -- The seed of every batch (default: {0})
+			batchSize {int} -- The scenarios drawn at once (default: {4096})
+			cachedBatches {int} -- The batches kept, the least recently used one is dropped (default: {4})
+			stepSeconds {float} -- The step length of the env, for the max cost of a step [s] (default: {300})
+			conditionedFloorAreaRange {tuple} -- [m**2] (default: {(60, 200)})
+			heatMassCapacityPerAreaRange {tuple} -- The heat mass capacity per conditioned floor area [J/(K*m**2)] (default: {(12000, 21000)})
+			heatTransmissionRange {tuple} -- [W/K] (default: {(120, 320)})
+			gasRateEnergyRange {tuple} -- The furnace size [W] (default: {(17585, 35170)}, 60k to 120k BTU/h)
+			airConditioningEnergyRange {tuple} -- The A/C compressor size [W] (default: {(2500, 5300)})
+			initialTemperatureRange {tuple} -- [C] (default: {(14, 24)})
+			weatherDays {list} -- The Logan profiles a day is picked from (default: {['cold', 'october', 'normal', 'hot']})
+			weatherOffsetRange {tuple} -- Added to every hour of the picked day [C] (default: {(-3, 3)})
+			cache {ForcingCache} -- Draw every batch once per cache directory, the records are memory mapped from it (default: {None})
+	"""
+
+	def __init__(self, seed:int = 0, batchSize:int = 4096, cachedBatches:int = 4, stepSeconds:float = 300,
+		conditionedFloorAreaRange = (60.0, 200.0), heatMassCapacityPerAreaRange = (12000.0, 21000.0),
+		heatTransmissionRange = (120.0, 320.0), gasRateEnergyRange = (17585.0, 35170.0), airConditioningEnergyRange = (2500.0, 5300.0),
+		initialTemperatureRange = (14.0, 24.0), weatherDays = None, weatherOffsetRange = (-3.0, 3.0), cache = None):
+		self.seed = seed
+		self.cache = cache
+		self.batchSize = batchSize
+		self.cachedBatches = cachedBatches
+		self.stepSeconds = stepSeconds
+		self.conditionedFloorAreaRange = conditionedFloorAreaRange
+		self.heatMassCapacityPerAreaRange = heatMassCapacityPerAreaRange
+		self.heatTransmissionRange = heatTransmissionRange
+		self.gasRateEnergyRange = gasRateEnergyRange
+		self.airConditioningEnergyRange = airConditioningEnergyRange
+		self.initialTemperatureRange = initialTemperatureRange
+		self.weatherDays = list(weatherDays or ['cold', 'october', 'normal', 'hot'])
+		self.weatherOffsetRange = weatherOffsetRange
+		self.hvacParameters = HVAC().GetParameters()
+		# the weather days padded to WEATHER_HOURS with their last hour
+		self.__weather = np.array([self.__PadDay(_LOGAN_OUTSIDE_TEMPERATURES[day]) for day in self.weatherDays])
+		self.__batches = OrderedDict()
+
+	def __getstate__(self):
+		# workers draw the batches they need themselves
+		state = self.__dict__.copy()
+		state['_ScenarioSampler__batches'] = OrderedDict()
+		return state
+
+	@staticmethod
+	def __PadDay(hours):
+		hours = list(hours[:WEATHER_HOURS])
+		return hours + [hours[-1]] * (WEATHER_HOURS - len(hours))
+
+	def GetMaxCoolingPower(self):
+		"""Gets the largest HVAC.GetMaxCoolingPower of any scenario, the bound of the observation
+		"""
+		return self.airConditioningEnergyRange[1] + self.hvacParameters[4]
+
+	def DrawBatch(self, batch:int):
+		"""Draws a batch of scenarios, the same batch number gives the same scenarios
+
+		Returns:
+			np.ndarray -- batchSize SCENARIO_DTYPE records, scenarios batch * batchSize on
+		"""
+		generator = np.random.default_rng([self.seed, batch])
+		size = self.batchSize
+		records = np.zeros(size, dtype=SCENARIO_DTYPE)
+		records['index'] = np.arange(batch * size, (batch + 1) * size)
+		records['conditionedFloorArea'] = generator.uniform(*self.conditionedFloorAreaRange, size)
+		records['heatMassCapacity'] = records['conditionedFloorArea'] * generator.uniform(*self.heatMassCapacityPerAreaRange, size)
+		records['heatTransmission'] = generator.uniform(*self.heatTransmissionRange, size)
+		records['gasRateEnergy'] = generator.uniform(*self.gasRateEnergyRange, size)
+		records['airConditioningEnergy'] = generator.uniform(*self.airConditioningEnergyRange, size)
+		records['initialTemperature'] = generator.uniform(*self.initialTemperatureRange, size)
+		records['weatherDay'] = generator.integers(0, len(self.weatherDays), size)
+		records['weatherOffset'] = generator.uniform(*self.weatherOffsetRange, size)
+		# the constants HvacBuilding derives at construction, for the one second time step
+		records['dtByCm'] = 1.0 / records['heatMassCapacity']
+		records['decay'] = 1 - records['dtByCm'] * records['heatTransmission']
+		records['maxEnergyCost'] = MaxEnergyCostForTime(records['gasRateEnergy'], records['airConditioningEnergy'], self.stepSeconds, self.hvacParameters)
+		records['outsideTemperatures'] = self.__weather[records['weatherDay']] + records['weatherOffset'][:, None]
+		return records
+
+	def __GetBatch(self, batch:int):
+		cached = self.__batches.get(batch)
+		if cached is not None:
+			self.__batches.move_to_end(batch)
+			return cached
+		if self.cache is None:
+			records = self.DrawBatch(batch)
+		else:
+			records = self.cache.GetOrCreate(self.GetCacheKey(batch), lambda: self.DrawBatch(batch))
+		# the rows as python tuples, so a reset hands python floats to the per second simulation
+		scalarNames = [name for name in SCENARIO_DTYPE.names if name != 'outsideTemperatures']
+		rows = [row + (tuple(hours),) for row, hours in zip(records[scalarNames].tolist(), records['outsideTemperatures'].tolist())]
+		cached = (records, rows)
+		self.__batches[batch] = cached
+		if len(self.__batches) > self.cachedBatches:
+			self.__batches.popitem(last=False)
+		return cached
+
+	def GetCacheKey(self, batch:int):
+		"""Gets the ForcingCache key of a batch, it changes with the seed and any range
+		"""
+		return self.cache.MakeKey('ScenarioSampler', batch, self.seed, self.batchSize, self.stepSeconds,
+			self.conditionedFloorAreaRange, self.heatMassCapacityPerAreaRange, self.heatTransmissionRange, self.gasRateEnergyRange,
+			self.airConditioningEnergyRange, self.initialTemperatureRange, self.weatherDays, self.weatherOffsetRange,
+			self.hvacParameters, self.__weather)
+
+	def GetBatch(self, batch:int):
+		return self.__GetBatch(batch)[0]
+
+	def GetRecord(self, index:int):
+		"""Gets scenario index, a new batch is only drawn every batchSize scenarios
+
+		Returns:
+			tuple -- the scenario in SCENARIO_DTYPE field order, outsideTemperatures as a tuple
+		"""
+		return self.__GetBatch(index // self.batchSize)[1][index % self.batchSize]
@@ -0,0 +1,222 @@
+"""The declarative description of an HvacEnv: the building, the HVAC, the weather, the temperature bounds and the step.
+
+A spec is a dict (or the JSON of one, or the path of a .json file like examples/configs) with any of the keys of
+ENV_SPEC_DEFAULTS. CompileEnvSpec checks it once and derives every constant an env needs (the discretization
+factors, the max energy cost of a step, the observation bounds) into an immutable CompiledEnvSpec. Equal specs
+compile to the same object, and a compiled spec is pickled with its constants, so the envs of every worker are
+built from it without deriving anything again.
+
+	env = gym.make('Hvac-v0', spec={'conditionedFloorArea': 150, 'outsideTemperatures': 'october'})
+"""
+import json
+import os
+from gym_hvac.models import HVAC, HvacBuilding, RewardFunction
+from gym_hvac.utils import GetStorageDtype
+
+# the hourly outside temperatures of the Logan profiles, shared by every env
+_LOGAN_OUTSIDE_TEMPERATURES = {
+	'cold': (-7, -8, -8, -8, -8, -9, -10, -9, -8, -7, -4, -2, -3, -2, -2, -1, -2, -3, -3, -4, -4, -4, -4, -4, -4),
+	'october': (1.11, 2.22, 1.67, 1.67, 2.22, 1.11, 1.11, 2.78, 4.44, 4.44, 5.56, 6.67, 6.67, 7.22, 6.67, 2.22, 2.22, 1.67, 1.11, 1.11, 0.56, 1.11, 0.0, 0.0, 0.0),
+	'normal': (-0.56, 1.31, 3.17, 5.04, 6.9, 8.77, 10.63, 12.5, 14.37, 16.23, 18.1, 19.96, 21.83, 23.69, 25.56, 23.21, 20.86, 18.52, 16.17, 13.83, 11.48, 9.14, 6.79, 4.44),
+	'hot': (37, 38, 38, 38, 38, 39, 40, 39, 38, 37, 34, 32, 33, 32, 32, 31, 32, 33, 33, 34, 34, 34, 34, 34, 34),
+}
+
+# the keys of a spec and the values of the keys it leaves out
+ENV_SPEC_DEFAULTS = {
+	'outsideTemperatures': 'cold', # a Logan profile name or the hourly outside temperatures [C]
+	'conditionedFloorArea': 100, # [m**2]
+	'heatMassCapacity': None, # [J/K], 16500 * conditionedFloorArea when None
+	'heatTransmission': 200, # [W/K]
+	'initialTemperature': 18, # [C]
+	'temperatureBounds': (10.0, 30.0), # an episode ends outside of them [C]
+	'targetTemperature': 20.0, # [C]
+	'comfortBand': 2.0, # [C]
+	'stepSeconds': 300,
+	'maxSteps': 3600,
+	'envelope': None, # '2r2c' to split the building with TwoNodeEnvelope.FromSingleNode
+	'dtype': 'float64',
+	'hvac': {}, # HVAC energy keyword arguments, e.g. {'gasRateEnergy': 23446}
+	'forecastHorizon': 0, # the forecast outside temperatures appended to the observation
+	'forecastStride': 1, # the hours between two forecast temperatures
+	'forecastNoise': 0.0, # the standard deviation of the forecast error an hour ahead, it grows with the square root of the lead [C]
+	'forecastSeed': 0, # the seed of the forecast errors, an episode's errors are drawn from (forecastSeed, episode)
+	'reward': None, # a REWARD_FUNCTIONS name or the weights of the reward terms, 'occupiedComfort' with a forcing and 'maxCost' without when None
+}
+_HVAC_KEYS = ('gasValveEnergy', 'gasVentBlowerEnergy', 'gasRateEnergy', 'flameIgnitorEnergy', 'houseBlowerEnergy', 'airConditioningEnergy')
+
+# the compiled specs by their frozen spec
+_COMPILED = {}
+
+def _Freeze(value):
+	# a hashable equivalent of a JSON value, lists and tuples freeze alike
+	if isinstance(value, dict):
+		return tuple(sorted((key, _Freeze(item)) for key, item in value.items()))
+	if isinstance(value, (list, tuple)):
+		return tuple(_Freeze(item) for item in value)
+	return value
+
+def _Number(spec, key):
+	value = spec[key]
+	if isinstance(value, bool) or not isinstance(value, (int, float)):
+		raise ValueError("The env spec value of " + key + " has to be a number.")
+	return float(value)
+
+class CompiledEnvSpec():
+	"""A checked env spec with its derived constants, immutable and hashable. Made by CompileEnvSpec.
+
+		Attributes:
+			spec {dict} -- a copy of the complete spec, with the defaults filled in
+			outsideTemperatures {tuple} -- the hourly outside temperatures, at least 25 hours, shorter weather is padded with its last hour [C]
+			dtByCm {float} -- the one second step divided by the heat mass capacity [s*K/J]
+			decay {float} -- the share of the temperature kept over one second
+			maxEnergyCost {float} -- the max energy cost of a step, the reward normalizer [US$]
+			observationLow {tuple} -- the lower observation bounds, without the occupancy of a forcing
+			observationHigh {tuple} -- the upper observation bounds, without the occupancy of a forcing
+			and the spec values: conditionedFloorArea, heatMassCapacity, heatTransmission, initialTemperature, buildingMin,
+			buildingMax, buildingTarget, comfortBand, stepSeconds, maxSteps, envelope, dtype, hvacParameters (the HVAC keywords),
+			forecastHorizon, forecastStride, forecastNoise and forecastSeed
+			reward {RewardFunction} -- None for the default of the env
+	"""
+	__slots__ = ('key', 'outsideTemperatures', 'conditionedFloorArea', 'heatMassCapacity', 'heatTransmission', 'initialTemperature',
+		'buildingMin', 'buildingMax', 'buildingTarget', 'comfortBand', 'stepSeconds', 'maxSteps', 'envelope', 'dtype', 'hvacParameters',
+		'forecastHorizon', 'forecastStride', 'forecastNoise', 'forecastSeed', 'reward', 'dtByCm', 'decay', 'maxEnergyCost', 'observationLow', 'observationHigh')
+
+	def __setattr__(self, name, value):
+		raise AttributeError("A compiled env spec can't be changed, compile another spec.")
+
+	def __delattr__(self, name):
+		raise AttributeError("A compiled env spec can't be changed, compile another spec.")
+
+	def __hash__(self):
+		return hash(self.key)
+
+	def __eq__(self, other):
+		return isinstance(other, CompiledEnvSpec) and self.key == other.key
+
+	def __reduce__(self):
+		# pickled with the derived constants, unpickling doesn't compile again
+		return (_Restore, (tuple(getattr(self, name) for name in CompiledEnvSpec.__slots__),))
+
+	def __repr__(self):
+		return 'CompiledEnvSpec(' + self.key + ')'
+
+	@property
+	def spec(self):
+		return json.loads(self.key)
+
+	def CreateHvac(self):
+		"""Gets a new HVAC with the spec's energies
+		"""
+		return HVAC(**dict(self.hvacParameters))
+
+def _Restore(values):
+	compiled = object.__new__(CompiledEnvSpec)
+	for name, value in zip(CompiledEnvSpec.__slots__, values):
+		object.__setattr__(compiled, name, value)
+	# an equal spec compiled in this process is reused, so envs built from either share it
+	return _COMPILED.setdefault(('key', compiled.key), compiled)
+
+def LoadEnvSpec(spec):
+	"""Gets the spec dict of a dict, a JSON string or the path of a JSON file
+	"""
+	if isinstance(spec, dict):
+		return spec
+	if isinstance(spec, str):
+		if spec.lstrip().startswith('{'):
+			return json.loads(spec)
+		if os.path.isfile(spec):
+			with open(spec) as fp:
+				return json.load(fp)
+	raise ValueError("An env spec is a dict, its JSON or the path of a JSON file: " + repr(spec))
+
+def CompileEnvSpec(spec = None):
+	"""Compiles an env spec once, compiling an equal spec again returns the same CompiledEnvSpec
+
+		Arguments:
+			spec {dict or str or CompiledEnvSpec} -- a dict with keys of ENV_SPEC_DEFAULTS, its JSON or the path of a JSON file,
+				a compiled spec is returned as it is (default: {None}, every default)
+
+		Returns:
+			CompiledEnvSpec
+	"""
+	if isinstance(spec, CompiledEnvSpec):
+		return spec
+	spec = LoadEnvSpec({} if spec is None else spec)
+	frozen = _Freeze(spec)
+	compiled = _COMPILED.get(frozen)
+	if compiled is not None:
+		return compiled
+
+	unknown = sorted(set(spec) - set(ENV_SPEC_DEFAULTS))
+	if unknown:
+		raise ValueError("Unknown env spec keys: " + ', '.join(unknown))
+	full = dict(ENV_SPEC_DEFAULTS)
+	full.update(spec)
+	unknownHvac = sorted(set(full['hvac']) - set(_HVAC_KEYS))
+	if unknownHvac:
+		raise ValueError("Unknown env spec hvac keys: " + ', '.join(unknownHvac))
+
+	outsideTemperatures = full['outsideTemperatures']
+	if isinstance(outsideTemperatures, str):
+		if outsideTemperatures not in _LOGAN_OUTSIDE_TEMPERATURES:
+			raise ValueError("Unknown outside temperature profile: " + outsideTemperatures)
+		outsideTemperatures = _LOGAN_OUTSIDE_TEMPERATURES[outsideTemperatures]
+	outsideTemperatures = tuple(float(temperature) for temperature in outsideTemperatures)
+	if len(outsideTemperatures) == 0:
+		raise ValueError("The env spec needs at least one hourly outside temperature.")
+	# a day and the next midnight, shorter weather keeps its last hour
+	outsideTemperatures = outsideTemperatures + outsideTemperatures[-1:] * (25 - len(outsideTemperatures))
+	conditionedFloorArea = _Number(full, 'conditionedFloorArea')
+	if full['heatMassCapacity'] is None:
+		full['heatMassCapacity'] = 16500 * full['conditionedFloorArea']
+	heatMassCapacity = _Number(full, 'heatMassCapacity')
+	heatTransmission = _Number(full, 'heatTransmission')
+	if conditionedFloorArea <= 0 or heatMassCapacity <= 0 or heatTransmission < 0:
+		raise ValueError("The env spec needs a positive floor area and heat mass capacity and a heat transmission of at least 0.")
+	buildingMin, buildingMax = (float(bound) for bound in full['temperatureBounds'])
+	buildingTarget = _Number(full, 'targetTemperature')
+	if not buildingMin <= buildingTarget <= buildingMax:
+		raise ValueError("The env spec target temperature has to be within the temperature bounds.")
+	stepSeconds = full['stepSeconds']
+	maxSteps = full['maxSteps']
+	if not isinstance(stepSeconds, int) or not isinstance(maxSteps, int) or stepSeconds < 1 or maxSteps < 1:
+		raise ValueError("The env spec step seconds and max steps have to be positive integers.")
+	if full['envelope'] not in (None, '2r2c'):
+		raise ValueError("The env spec envelope is None or '2r2c'.")
+	forecastHorizon = full['forecastHorizon']
+	forecastStride = full['forecastStride']
+	forecastSeed = full['forecastSeed']
+	forecastNoise = _Number(full, 'forecastNoise')
+	if not all(isinstance(value, int) and not isinstance(value, bool) for value in (forecastHorizon, forecastStride, forecastSeed)) \
+		or forecastHorizon < 0 or forecastStride < 1 or forecastNoise < 0:
+		raise ValueError("The env spec forecast horizon, stride and seed are integers, the stride positive and the noise at least 0.")
+	dtype = GetStorageDtype(full['dtype']).name
+	full['dtype'] = dtype
+	reward = full['reward']
+	if reward is not None:
+		reward = RewardFunction(reward)
+		full['reward'] = reward.GetTerms()
+	hvacParameters = tuple(sorted((name, float(value)) for name, value in full['hvac'].items()))
+
+	hvac = HVAC(**dict(hvacParameters))
+	# the building works out its constants like every env built without a spec did
+	building = HvacBuilding(hvac, heat_mass_capacity=heatMassCapacity, heat_transmission=heatTransmission,
+		initial_building_temperature=20, conditioned_floor_area=conditionedFloorArea)
+	maxEnergyCost = building.CalculateMaxEneregyCostForTime(stepSeconds)
+	dtByCm = 1.0 / heatMassCapacity
+	decay = 1 - dtByCm * heatTransmission
+	observationLow = (0.0, buildingMin, -10.0, -5.0, buildingTarget)
+	observationHigh = (hvac.GetMaxCoolingPower() + 0.0, buildingMax, 50.0, 5.0, buildingTarget)
+
+	full['outsideTemperatures'] = outsideTemperatures
+	full['temperatureBounds'] = (buildingMin, buildingMax)
+	full['hvac'] = dict(hvacParameters)
+	key = json.dumps(full, sort_keys=True)
+	compiled = _COMPILED.get(('key', key))
+	if compiled is None:
+		compiled = _Restore((key, outsideTemperatures, conditionedFloorArea, heatMassCapacity, heatTransmission,
+			_Number(full, 'initialTemperature'), buildingMin, buildingMax, buildingTarget, _Number(full, 'comfortBand'), stepSeconds,
+			maxSteps, full['envelope'], dtype, hvacParameters, forecastHorizon, forecastStride, forecastNoise, forecastSeed, reward, dtByCm, decay,
+			maxEnergyCost, observationLow, observationHigh))
+	_COMPILED[frozen] = compiled
+	return compiled
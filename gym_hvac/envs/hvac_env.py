@@ -14,100 +14,146 @@ import numpy as np
 from gym_hvac.models import Building
 from gym_hvac.models import HVAC
 from gym_hvac.models import HvacBuilding
+from gym_hvac.models import TwoNodeEnvelope
+from gym_hvac.models import RewardFunction, REWARD_STEP_DTYPE, HVAC_STATE_DTYPE, BUILDING_STATE_DTYPE
 from gym_hvac.utils import HvacBuildingTracker
+from gym_hvac.utils import GetStorageDtype
+from gym_hvac.envs.hvac_renderer import RenderHistory, HvacRenderer
+from gym_hvac.envs.env_spec import CompileEnvSpec, _LOGAN_OUTSIDE_TEMPERATURES
+
+def GetEpisodeChunkDtype(dtype = 'float64', actionSpace = None):
+	"""Gets the record of a step in the chunks of HvacEnv.iter_run, the temperatures and the average watts are
+	stored in the storage dtype, the rest in 64 bits. The action is an integer unless a Box actionSpace is given.
+
+	Fields: the step, the seconds since the reset it starts at, the action, the indoor and outside temperature after it [C],
+	the average watts of the observation, the reward, the cost since the reset [US$] and the HVAC phase after it (see hvac_event_log)
+	"""
+	dtype = GetStorageDtype(dtype)
+	action = ('action', '<i8')
+	if isinstance(actionSpace, spaces.Box):
+		action = ('action', actionSpace.dtype, actionSpace.shape)
+	return np.dtype([
+		('step', '<i8'),
+		('time', '<i8'),
+		action,
+		('indoorTemperature', dtype),
+		('outsideTemperature', dtype),
+		('averageWatts', dtype),
+		('reward', '<f8'),
+		('cost', '<f8'),
+		('mode', '<i1')])
+
+EPISODE_CHUNK_DTYPE = GetEpisodeChunkDtype()
+
+# the episode progress of an env, see HvacEnv.GetSessionState
+ENV_STATE_DTYPE = np.dtype([
+	('episode', '<i8'),
+	('episodeReward', '<f8'),
+	('stepCount', '<i8'),
+	('stepAfterDone', '<i8'),
+	('stepMax', '<i8'),
+	('outsideTemperature', '<f8'),
+	('initialTemperature', '<f8')])
+
+# gym spaces are costly to build (their repr formats the bounds), envs with the same bounds share them
+_SPACES = {}
+
+def _GetSpaces(low, high, dtype = np.float32):
+	key = (tuple(low), tuple(high), np.dtype(dtype).name)
+	spaces_ = _SPACES.get(key)
+	if spaces_ is None:
+		spaces_ = (spaces.Discrete(3), spaces.Box(low=np.array(low, dtype=dtype), high=np.array(high, dtype=dtype), dtype=dtype))
+		_SPACES[key] = spaces_
+	return spaces_
+
+# the default reward functions, shared by the envs
+_DEFAULT_REWARDS = {}
+
+def _GetDefaultReward(name:str):
+	reward = _DEFAULT_REWARDS.get(name)
+	if reward is None:
+		reward = RewardFunction(name)
+		_DEFAULT_REWARDS[name] = reward
+	return reward
 
 class HvacEnv(gym.Env):
-	def __init__(self, outsideTemperature:float = 0.0):
+	"""The HVAC building gym environment.
+
+		Keyword Arguments:
+			outsideTemperatures {str or list} -- The hourly outside temperatures of the day, or the name of a Logan profile: 'cold', 'october', 'normal' or 'hot' (default: {'cold'})
+			conditionedFloorArea {float} -- The conditioned floor area of the building [m**2] (default: {100})
+			heatMassCapacity {float} -- The heat mass capacity of the building [J/K] (default: {16500 * conditionedFloorArea})
+			heatTransmission {float} -- The heat transmission to the outside [W/K] (default: {200})
+			initialTemperature {float} -- The building temperature after a reset [C] (default: {18})
+			equipment {TableEquipment} -- Performance table equipment replacing the HVAC's fixed heating and cooling power (default: {None})
+			forcing {ExogenousForcing} -- Occupancy, internal and solar gains. When set the observation ends with the occupancy
+				and the reward only asks for comfort while the building is occupied (default: {None})
+			comfortBand {float} -- How far from the target the temperature may be while occupied [C] (default: {2})
+			envelope {TwoNodeEnvelope or str} -- A 2R2C envelope, or '2r2c' to split the single node building with TwoNodeEnvelope.FromSingleNode (default: {None})
+			forecastHorizon {int} -- The forecast outside temperatures appended to the observation, one per forecastStride hours
+				after the hour of the step, the last hour of the weather is kept after the day (default: {0})
+			forecastStride {int} -- The hours between two forecast temperatures (default: {1})
+			forecastNoise {float} -- The standard deviation of the forecast error an hour ahead, the error is a random walk
+				over the lead hours so it grows with their square root [C] (default: {0})
+			forecastSeed {int} -- The seed of the forecast errors, those of an episode are drawn from (forecastSeed, episode) (default: {0})
+			reward {str or dict or RewardFunction} -- The reward, a REWARD_FUNCTIONS name or the weights of the reward terms
+				(default: {None}, 'occupiedComfort' with a forcing and 'maxCost' without)
+			spec {dict or str or CompiledEnvSpec} -- A declarative env spec (see env_spec) replacing outsideTemperatures,
+				conditionedFloorArea, heatMassCapacity, heatTransmission, initialTemperature, comfortBand, dtype, a '2r2c'
+				envelope, the forecast and the reward, which then have to be left out. It also sets the bounds, target, step and HVAC energies (default: {None})
+	"""
+	metadata = {'render_modes': ['human', 'rgb_array'], 'render.modes': ['human', 'rgb_array'], 'render_fps': 10}
+
+	def __init__(self, outsideTemperature:float = 0.0, outsideTemperatures = None, conditionedFloorArea:float = 100,
+		heatMassCapacity:float = None, heatTransmission:float = 200, initialTemperature:float = 18, equipment = None,
+		forcing = None, comfortBand:float = 2.0, envelope = None, scenarioSampler = None, scenarioStart:int = 0, scenarioStride:int = 1,
+		dtype = 'float64', forecastHorizon:int = 0, forecastStride:int = 1, forecastNoise:float = 0.0, forecastSeed:int = 0, reward = None, spec = None):
 
 		self.__version__ = "0.1.0"
-		
-		hvac = HVAC()
-		conditioned_floor_area = 100
-		hvacBuilding = HvacBuilding(hvac, heat_mass_capacity=16500 * conditioned_floor_area, 
-		heat_transmission=200, initial_building_temperature=20, 
-		conditioned_floor_area=conditioned_floor_area)
-		self.__loganOutsideTemperatures_October = [1.11, 2.22, 1.67, 1.67, 2.22, 1.11, 1.11, 2.78, 4.44, 4.44, 5.56, 6.67, 6.67, 7.22, 6.67, 2.22, 2.22, 1.67, 1.11, 1.11, 0.56, 1.11, 0.00, 0.00, 0.00]
-		self.__loganOutsideTemperatures =[
--7
-,-8
-,-8
-,-8
-,-8
-,-9
-,-10
-,-9
-,-8
-,-7
-,-4
-,-2
-,-3
-,-2
-,-2
-,-1
-,-2
-,-3
-,-3
-,-4
-,-4
-,-4
-,-4
-,-4
-,-4
-]
-
-		self.__loganOutsideTemperaturesNormal =[
--0.56,
-1.31,
-3.17,
-5.04,
-6.90,
-8.77,
-10.63,
-12.50,
-14.37,
-16.23,
-18.10,
-19.96,
-21.83,
-23.69,
-25.56,
-23.21,
-20.86,
-18.52,
-16.17,
-13.83,
-11.48,
-9.14,
-6.79,
-4.44,
-		]
-		self.__loganOutsideTemperaturesHot =[
-37
-,38
-,38
-,38
-,38
-,39
-,40
-,39
-,38
-,37
-,34
-,32
-,33
-,32
-,32
-,31
-,32
-,33
-,33
-,34
-,34
-,34
-,34
-,34
-,34
-]
+
+		if spec is None:
+			# the keyword arguments are a spec too, envs built alike share its compiled constants
+			spec = {'outsideTemperatures': 'cold' if outsideTemperatures is None else outsideTemperatures,
+				'conditionedFloorArea': conditionedFloorArea, 'heatMassCapacity': heatMassCapacity, 'heatTransmission': heatTransmission,
+				'initialTemperature': initialTemperature, 'comfortBand': comfortBand, 'dtype': GetStorageDtype(dtype).name,
+				'envelope': envelope if isinstance(envelope, str) else None, 'forecastHorizon': forecastHorizon,
+				'forecastStride': forecastStride, 'forecastNoise': forecastNoise, 'forecastSeed': forecastSeed,
+				'reward': reward}
+			if isinstance(envelope, str):
+				envelope = None
+		elif outsideTemperatures is not None or heatMassCapacity is not None or isinstance(envelope, str) \
+			or (conditionedFloorArea, heatTransmission, initialTemperature, comfortBand, GetStorageDtype(dtype).name) != (100, 200, 18, 2.0, 'float64') \
+			or (forecastHorizon, forecastStride, forecastNoise, forecastSeed, reward) != (0, 1, 0.0, 0, None):
+			raise ValueError("The values of a spec can't be given as keyword arguments too.")
+		envSpec = CompileEnvSpec(spec)
+		if scenarioSampler is not None and (envelope is not None or envSpec.envelope is not None):
+			raise ValueError("A scenario sampler can't be combined with a two node envelope.")
+		if envSpec.envelope == '2r2c':
+			if envelope is not None:
+				raise ValueError("The spec's envelope can't be combined with an envelope keyword argument.")
+			envelope = TwoNodeEnvelope.FromSingleNode(envSpec.heatMassCapacity, envSpec.heatTransmission)
+		hvacBuilding = HvacBuilding(envSpec.CreateHvac(), heat_mass_capacity=envSpec.heatMassCapacity,
+		heat_transmission=envSpec.heatTransmission, initial_building_temperature=20,
+		conditioned_floor_area=envSpec.conditionedFloorArea, equipment=equipment, envelope=envelope)
+		self.envSpec = envSpec
+		self.initialTemperature = envSpec.initialTemperature
+		self.forcing = forcing
+		self.comfortBand = envSpec.comfortBand
+		self.rewardFunction = envSpec.reward
+		if self.rewardFunction is None:
+			self.rewardFunction = _GetDefaultReward('maxCost' if forcing is None else 'occupiedComfort')
+		self.rewardStep = None
+		self.dtype = GetStorageDtype(envSpec.dtype)
+		self.reporter = None
+		self.episode = 0
+		self.episode_reward = 0.0
+		self.render_history = None
+		self.renderer = None
+		self.scenarioSampler = scenarioSampler
+		self.scenarioStart = scenarioStart
+		self.scenarioStride = scenarioStride
+		self.scenario = None
+		self.__loganOutsideTemperatures = envSpec.outsideTemperatures
 
 		self.OutsideTemperature = self.__loganOutsideTemperatures[0]
 		self.hvacBuilding = hvacBuilding
@@ -117,21 +163,35 @@ class HvacEnv(gym.Env):
 		# 1 Cooling On
 		# 2 Heating On
 		# if you want more than one action then you need to provide a spaces.Tuple
-		self.action_space = spaces.Discrete(3)
 		self.state = 0.0
 		self.step_count = 0
 		self.step_after_done = 0
-		self.env_step_interval = 300
-		self.step_max = 288
-		self.building_min = 10.0
-		self.building_max = 30.0
-		self.building_target = 20.0
-		self.hvacBuilding.CalculateMaxEneregyCostForTime(self.env_step_interval)
+		self.env_step_interval = envSpec.stepSeconds
+		self.step_max = envSpec.maxSteps
+		self.building_min = envSpec.buildingMin
+		self.building_max = envSpec.buildingMax
+		self.building_target = envSpec.buildingTarget
+		self.hvacBuilding.SetMaxEnergyCost(envSpec.maxEnergyCost)
 		
 		# the observation currnently the average cost per second, current building temp, current outside temp, and temperature delta
-		low = np.array([0.0, self.building_min, -10.0, -5.0, self.building_target])
-		high = np.array([(self.hvacBuilding.building_hvac.GetMaxCoolingPower() + 0.0), self.building_max, 50.0, 5.0, self.building_target])
-		self.observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
+		low = np.array(envSpec.observationLow)
+		high = np.array(envSpec.observationHigh)
+		if scenarioSampler is not None:
+			high[0] = scenarioSampler.GetMaxCoolingPower()
+		if self.forcing is not None:
+			low = np.append(low, 0.0)
+			high = np.append(high, 1.0)
+		if envSpec.forecastHorizon > 0:
+			# the outside temperature bounds, widened by five standard deviations of the error at the longest lead
+			margin = 5 * envSpec.forecastNoise * np.sqrt(envSpec.forecastHorizon * envSpec.forecastStride)
+			low = np.append(low, np.full(envSpec.forecastHorizon, envSpec.observationLow[2] - margin))
+			high = np.append(high, np.full(envSpec.forecastHorizon, envSpec.observationHigh[2] + margin))
+		self.action_space, self.observation_space = _GetSpaces(low, high, self.dtype)
+		self.__initial_state = None
+		self.__forecast = None
+		self.__forecastWeather = None
+		# the cycles HVAC counted for a command that kept the A/C on, see _take_action
+		self.__repeatedCycles = 0
 		self.reset()
 
 	def step(self, action): 
@@ -166,27 +226,28 @@ class HvacEnv(gym.Env):
 		assert self.action_space.contains(action)
 		# get the current temperature to calculate the delta
 		previousTemp = self.hvacBuilding.current_temperature 
-		previousMoneyTotal = self.hvacBuilding.CalculateGasEneregyCost() + self.hvacBuilding.CalculateElectricEneregyCost()
+		previousGas, previousElectric, previousCycles = self.hvacBuilding.GetEnergyUsed()
+		self.__repeatedCycles = 0
 		self._take_action(action)
 		
 		afterTemp = self.hvacBuilding.current_temperature 
-		afterMoneyTotal = self.hvacBuilding.CalculateGasEneregyCost() + self.hvacBuilding.CalculateElectricEneregyCost()
+		gas, electric, cycles = self.hvacBuilding.GetEnergyUsed()
 		
 		deltaTemp = previousTemp - afterTemp
-		actionCost = afterMoneyTotal - previousMoneyTotal 
+		# the step's cost from the energy it used, the running totals aren't priced twice
+		actionCost = self.hvacBuilding.CalculateEnergyCost(gas - previousGas, electric - previousElectric)
 		# todo consider adding the time of day to the state
 		self.state = (self.hvacBuilding.building_hvac.GetAverageWattsPerSecond(), self.hvacBuilding.current_temperature, self.OutsideTemperature, deltaTemp, self.building_target)
+		if self.forcing is not None:
+			self.state = self.state + (self.hvacBuilding.GetOccupancy(),)
 
-		reward = self._get_reward(previousTemp, actionCost)
-
-		done = False
-		# if 1 when it is hotter outside than inside, then we terminate
-		if action == 1 and self.OutsideTemperature > previousTemp:
-			done = True
+		reward = self._get_reward(previousTemp, actionCost, cycles - previousCycles - self.__repeatedCycles,
+			(electric - previousElectric) / self.env_step_interval)
+		self.episode_reward = self.episode_reward + reward
+		if self.render_history is not None:
+			self.render_history.Append(afterTemp, self.OutsideTemperature, self.state[0])
 
-		# if 2 when it is cooler outside than inside, then we terminate
-		if action == 2 and self.OutsideTemperature < previousTemp:
-			done = True
+		done = self._action_terminates(action, previousTemp)
 
 		# if 2 when it is cooler outside then we terminate
 		if self.step_count >= self.step_max:
@@ -195,19 +256,261 @@ class HvacEnv(gym.Env):
 		# if the temperature goes way to far like 10 C or 30 C
 		if afterTemp < self.building_min or afterTemp > self.building_max:
 			done = True
-		return np.array(self.state), reward, done, {self.hvacBuilding.current_temperature, self.hvacBuilding.building_hvac.CoolingIsOn }
+		return self.GetObservation(), reward, done, {self.hvacBuilding.current_temperature, self.hvacBuilding.building_hvac.CoolingIsOn }
+
+	def iter_run(self, policy, chunk_steps:int = 288, steps:int = None):
+		"""Resets and runs an episode, yielding it in chunks of steps instead of growing a list per quantity
+
+			Arguments:
+				policy {callable} -- Gets the observation and returns the action
+
+			Keyword Arguments:
+				chunk_steps {int} -- The steps in a chunk, the last chunk may be shorter (default: {288})
+				steps {int} -- The steps to run whether or not the episode is done, like the baseline scripts (default: {None}, until done)
+
+			Yields:
+				np.ndarray -- EPISODE_CHUNK_DTYPE records in the dtype of the env, a new array for every chunk
+		"""
+		if chunk_steps < 1:
+			raise ValueError("The chunk steps have to be positive.")
+		chunkDtype = GetEpisodeChunkDtype(self.dtype, self.action_space)
+		hvac = self.hvacBuilding.building_hvac
+		observation = self.reset()
+		start = hvac.TotalTimeInSeconds
+		startCost = self.hvacBuilding.CalculateGasEneregyCost() + self.hvacBuilding.CalculateElectricEneregyCost()
+		step = 0
+		done = False
+		def running():
+			return not done if steps is None else step < steps
+		while running():
+			rows = []
+			while len(rows) < chunk_steps and running():
+				time = hvac.TotalTimeInSeconds - start
+				action = policy(observation)
+				observation, reward, done, info = self.step(action)
+				cost = self.hvacBuilding.CalculateGasEneregyCost() + self.hvacBuilding.CalculateElectricEneregyCost() - startCost
+				rows.append((step, time, action, self.hvacBuilding.current_temperature, self.OutsideTemperature, observation[0],
+					reward, cost, hvac.GetPhase()[0]))
+				step = step + 1
+			yield np.array(rows, dtype=chunkDtype)
+
+	def GetOutsideTemperatureProfile(self, profile):
+		"""Gets the hourly outside temperatures for a Logan profile name, lists are returned as they are
+		"""
+		if not isinstance(profile, str):
+			return list(profile)
+		if profile not in _LOGAN_OUTSIDE_TEMPERATURES:
+			raise ValueError("Unknown outside temperature profile: " + profile)
+		return _LOGAN_OUTSIDE_TEMPERATURES[profile]
+
+	def GetOutsideTemperatureForTime(self, seconds:int):
+		"""Gets the outside temperature of the hour a time of the episode falls in, the last hour is kept after the day
+		"""
+		hourOfDay = 0
+		if seconds != 0:
+			hourOfDay = int(seconds / 3600)
+		# the weather has 24 hours, 25 with the next midnight, or more days of a scenario
+		lastHour = len(self.__loganOutsideTemperatures) - 1
+		if(hourOfDay > lastHour):
+			hourOfDay = lastHour
+		return self.__loganOutsideTemperatures[hourOfDay]
+
+	def SetReporter(self, reporter):
+		"""Sets the TrainingReporter that gets the summary of every finished episode, None to stop reporting
+		"""
+		self.reporter = reporter
+
+	def GetEpisodeSummary(self):
+		"""Gets the summary of the current episode in EPISODE_SUMMARY_DTYPE field order
+
+		Returns:
+			tuple -- episode, timesteps, reward, totalCost, temperature, heatingCycles, coolingCycles, heatingSeconds, coolingSeconds
+		"""
+		hvac = self.hvacBuilding.building_hvac
+		totalCost = self.hvacBuilding.CalculateGasEneregyCost() + self.hvacBuilding.CalculateElectricEneregyCost()
+		return (self.episode, self.step_count, self.episode_reward, totalCost, self.hvacBuilding.current_temperature,
+			hvac.NumberOfTimesHeatingTurnedOn, hvac.NumberOfTimesCoolingTurnedOn, hvac.TotalDurationHeatingOn, hvac.TotalDurationCoolingOn)
+
+	def ReportEpisode(self):
+		"""Hands the summary of the current episode to the reporter, episodes without a step are not reported
+		"""
+		if self.reporter is not None and self.step_count > 0:
+			self.reporter.AddEpisode(self.GetEpisodeSummary())
 
 	def reset(self):
-		self.hvacBuilding.reset()
+		self.ReportEpisode()
+		if self.step_count > 0:
+			self.episode = self.episode + 1
+		self.episode_reward = 0.0
+		self.rewardStep = None
+		if self.scenarioSampler is not None:
+			self.ApplyScenario(self.scenarioSampler.GetRecord(self.scenarioStart + self.episode * self.scenarioStride))
+		self.hvacBuilding.reset(self.initialTemperature)
+		if self.render_history is not None:
+			self.render_history.Clear()
 		self.step_count = 0
-		self.step_max = 3600
+		self.step_max = self.envSpec.maxSteps
 		self.step_after_done = 0
 		self.OutsideTemperature = self.__loganOutsideTemperatures[0]
-		self.state = (0.0, self.hvacBuilding.current_temperature, self.OutsideTemperature, 0.0, self.building_target)
-		return np.array(self.state)
+		if self.forcing is not None:
+			# the gains are compiled once for the hours the weather covers
+			self.hvacBuilding.SetForcing(self.forcing.Compile(len(self.__loganOutsideTemperatures) * 3600))
+		# the first observation only changes with the initial and outside temperature, it is kept and handed out as a copy
+		initialState = self.__initial_state
+		key = (self.initialTemperature, self.OutsideTemperature)
+		if initialState is None or initialState[0] != key:
+			state = (0.0, self.hvacBuilding.current_temperature, self.OutsideTemperature, 0.0, self.building_target)
+			if self.forcing is not None:
+				state = state + (self.hvacBuilding.GetOccupancy(),)
+			initialState = (key, state, np.array(state, dtype=self.dtype))
+			self.__initial_state = initialState
+		self.state = initialState[1]
+		if self.envSpec.forecastHorizon > 0:
+			self.__SetForecast()
+			return self.GetObservation()
+		return initialState[2].copy()
+
+	def GetForecast(self):
+		"""Gets the forecast outside temperatures of the observation, a read only view into the episode's forecasts
+
+			Returns:
+				np.ndarray -- forecastHorizon temperatures, forecastStride hours apart from the hour after the current one [C]
+		"""
+		if self.__forecast is None:
+			raise ValueError("The env has no forecast, set a forecastHorizon.")
+		hour = min(self.hvacBuilding.building_hvac.TotalTimeInSeconds // 3600, len(self.__forecast) - 1)
+		return self.__forecast[int(hour)]
+
+	def __SetForecast(self):
+		# the forecasts of every hour of the episode's weather are one strided view into the weather padded with its last
+		# hour, so a step slices a row instead of building the window, the errors of the episode are drawn in one block
+		spec = self.envSpec
+		weather = self.__loganOutsideTemperatures
+		if spec.forecastNoise == 0 and weather is self.__forecastWeather:
+			return
+		horizon = spec.forecastHorizon
+		stride = spec.forecastStride
+		hours = len(weather)
+		padded = np.empty(hours + horizon * stride, dtype=self.dtype)
+		padded[:hours] = weather
+		padded[hours:] = weather[-1]
+		itemSize = padded.itemsize
+		forecast = np.lib.stride_tricks.as_strided(padded[stride:], shape=(hours, horizon), strides=(itemSize, stride * itemSize),
+			writeable=False)
+		if spec.forecastNoise > 0:
+			rng = np.random.default_rng([spec.forecastSeed, self.episode])
+			errors = np.cumsum(rng.normal(0.0, spec.forecastNoise * np.sqrt(stride), (hours, horizon)), axis=1)
+			forecast = (forecast + errors).astype(self.dtype)
+			forecast.flags.writeable = False
+		self.__forecast = forecast
+		self.__forecastWeather = weather
+
+	def GetObservation(self):
+		"""Gets the current observation without stepping, the state followed by the forecast when there is one
+		"""
+		if self.__forecast is None:
+			return np.array(self.state, dtype=self.dtype)
+		stateSize = len(self.state)
+		observation = np.empty(stateSize + self.envSpec.forecastHorizon, dtype=self.dtype)
+		observation[:stateSize] = self.state
+		observation[stateSize:] = self.GetForecast()
+		return observation
+
+	def GetSessionState(self):
+		"""Gets everything an env built alike needs to continue the session exactly, e.g. for a training checkpoint.
+		The weather, scenario, gains and forecast of the episode are derived again from the episode counter.
+
+		Returns:
+			dict -- fixed size records and arrays: env (ENV_STATE_DTYPE), observation (the state), rewardStep
+				(REWARD_STEP_DTYPE, empty before the first step), building (BUILDING_STATE_DTYPE) and hvac (HVAC_STATE_DTYPE)
+		"""
+		rewardSteps = [] if self.rewardStep is None else [self.GetRewardStep()]
+		return {
+			'env': np.array((self.episode, self.episode_reward, self.step_count, self.step_after_done, self.step_max,
+				self.OutsideTemperature, self.initialTemperature), dtype=ENV_STATE_DTYPE),
+			'observation': np.array(self.state, dtype=np.float64),
+			'rewardStep': np.array(rewardSteps, dtype=REWARD_STEP_DTYPE),
+			'building': np.array(self.hvacBuilding.GetState(), dtype=BUILDING_STATE_DTYPE),
+			'hvac': np.array(self.hvacBuilding.building_hvac.GetState(), dtype=HVAC_STATE_DTYPE),
+		}
+
+	def SetSessionState(self, state):
+		"""Continues the session of a GetSessionState, the env has to be built with the same arguments
+
+		Arguments:
+			state {dict} -- from GetSessionState
+		"""
+		(self.episode, self.episode_reward, self.step_count, self.step_after_done, self.step_max,
+			outsideTemperature, initialTemperature) = np.asarray(state['env'], dtype=ENV_STATE_DTYPE).item()
+		if self.scenarioSampler is not None:
+			self.ApplyScenario(self.scenarioSampler.GetRecord(self.scenarioStart + self.episode * self.scenarioStride))
+		self.OutsideTemperature = outsideTemperature
+		self.initialTemperature = initialTemperature
+		if self.forcing is not None:
+			self.hvacBuilding.SetForcing(self.forcing.Compile(len(self.__loganOutsideTemperatures) * 3600))
+		self.hvacBuilding.building_hvac.SetState(np.asarray(state['hvac'], dtype=HVAC_STATE_DTYPE))
+		self.hvacBuilding.SetState(np.asarray(state['building'], dtype=BUILDING_STATE_DTYPE))
+		self.state = tuple(np.asarray(state['observation'], dtype=np.float64).tolist())
+		rewardSteps = np.asarray(state['rewardStep'], dtype=REWARD_STEP_DTYPE)
+		self.rewardStep = dict(zip(REWARD_STEP_DTYPE.names, rewardSteps[0].item())) if len(rewardSteps) else None
+		if self.envSpec.forecastHorizon > 0:
+			self.__forecastWeather = None
+			self.__SetForecast()
+
+	def ApplyScenario(self, scenario):
+		"""Sets up the building, HVAC, initial temperature and weather of a scenario, it takes effect with the next reset
+
+		Arguments:
+			scenario {tuple} -- a ScenarioSampler record in SCENARIO_DTYPE field order
+		"""
+		(_, _, conditionedFloorArea, heatMassCapacity, heatTransmission, gasRateEnergy, airConditioningEnergy,
+			initialTemperature, _, dtByCm, decay, maxEnergyCost, outsideTemperatures) = scenario
+		self.hvacBuilding.building_hvac.SetCapacity(gasRateEnergy, airConditioningEnergy)
+		self.hvacBuilding.SetParameters(heatMassCapacity, heatTransmission, conditionedFloorArea, dtByCm, decay, maxEnergyCost)
+		self.initialTemperature = initialTemperature
+		self.__loganOutsideTemperatures = outsideTemperatures
+		self.scenario = scenario
 
 	def render(self, mode='human', close=False):
-		pass
+		"""Renders the last day of steps, the steps are recorded from the first call on
+
+		Keyword Arguments:
+			mode {str} -- 'human' keeps a live dashboard open in its own process, 'rgb_array' returns a frame (default: {'human'})
+			close {bool} -- close the renderer instead (default: {False})
+
+		Returns:
+			np.ndarray -- for 'rgb_array' the (height, width, 3) frame, overwritten by the next call
+		"""
+		if close:
+			self.close()
+			return None
+		if mode not in self.metadata['render_modes']:
+			raise ValueError("Unknown render mode: " + str(mode))
+		shared = mode == 'human'
+		if self.render_history is None or (shared and self.render_history.GetName() is None):
+			history = RenderHistory(int(24 * 3600 / self.env_step_interval), shared=shared)
+			if self.render_history is None:
+				history.Append(self.hvacBuilding.current_temperature, self.OutsideTemperature, 0.0)
+			else:
+				# the dashboard process reads the history from shared memory
+				self.render_history.CopyTo(history)
+				self.close()
+			self.render_history = history
+		if self.renderer is None:
+			self.renderer = HvacRenderer(self.render_history, self.env_step_interval / 60.0, self.building_min, self.building_max,
+				self.building_target, self.hvacBuilding.building_hvac.GetMaxCoolingPower(), fps=self.metadata['render_fps'])
+		if mode == 'rgb_array':
+			return self.renderer.GetFrame()
+		self.renderer.Show()
+		return None
+
+	def close(self):
+		if self.renderer is not None:
+			self.renderer.Close()
+			self.renderer = None
+		if self.render_history is not None:
+			self.render_history.Close()
+			self.render_history = None
 		
 	def _take_action(self, action):
 		# convert
@@ -216,24 +519,45 @@ class HvacEnv(gym.Env):
 		if action == 1:
 			self.hvacBuilding.building_hvac.TurnHeatingOn()
 		if action == 2:
+			# HVAC counts every TurnCoolingOn, keeping the A/C on isn't a new cycle to the reward
+			self.__repeatedCycles = int(self.hvacBuilding.building_hvac.CoolingIsOn)
 			self.hvacBuilding.building_hvac.TurnCoolingOn()
 		
 		# this will run through the simulation for 10 seconds
 		# get the time of day
-		hourOfDay = 0
-		if self.hvacBuilding.building_hvac.TotalTimeInSeconds != 0:
-			hourOfDay = int(self.hvacBuilding.building_hvac.TotalTimeInSeconds / 3600) 
-		if(hourOfDay > 24):
-			hourOfDay = 24
-		currentOutsideTemperature = self.__loganOutsideTemperatures[hourOfDay]
+		currentOutsideTemperature = self.GetOutsideTemperatureForTime(self.hvacBuilding.building_hvac.TotalTimeInSeconds)
 		self.OutsideTemperature = currentOutsideTemperature
 
-		for	i in range(self.env_step_interval):
-			self.hvacBuilding.step(currentOutsideTemperature)
+		# the steady phases of the interval are integrated in one batch
+		self.hvacBuilding.StepSeconds(currentOutsideTemperature, self.env_step_interval)
 
 		self.step_count = self.step_count + 1
 	
-	def _get_reward(self, previousTemp:float, actionCost: float):
-		reward = self.hvacBuilding.DetermineReward(previousTemp, actionCost)
-		
-		return reward
+	def _action_terminates(self, action, previousTemp:float):
+		# if 1 when it is hotter outside than inside, then we terminate
+		if action == 1 and self.OutsideTemperature > previousTemp:
+			return True
+
+		# if 2 when it is cooler outside than inside, then we terminate
+		if action == 2 and self.OutsideTemperature < previousTemp:
+			return True
+		return False
+
+	def GetRewardStep(self):
+		"""Gets the record the reward of the last step was computed from, to re-score an episode with another RewardFunction
+
+		Returns:
+			tuple -- the step in REWARD_STEP_DTYPE field order, None before the first step
+		"""
+		if self.rewardStep is None:
+			return None
+		return tuple(self.rewardStep.values())
+
+	def _get_reward(self, previousTemp:float, actionCost: float, cycles:int = 0, power:float = 0.0):
+		occupancy = 1.0
+		if self.forcing is not None:
+			occupancy = self.hvacBuilding.GetOccupancy()
+		self.rewardStep = {'temperature': self.hvacBuilding.current_temperature, 'previousTemperature': previousTemp, 'cost': actionCost,
+			'maxCost': self.hvacBuilding.GetMaxEnergyCost(), 'cycles': cycles, 'power': power, 'occupancy': occupancy,
+			'comfortLow': self.building_target - self.comfortBand, 'comfortHigh': self.building_target + self.comfortBand}
+		return self.rewardFunction(self.rewardStep)
@@ -0,0 +1,81 @@
+"""A pool of constructed HvacEnvs, so loops that need a fresh env per run reuse the ones they are done with.
+"""
+from contextlib import contextmanager
+from gym_hvac.envs.hvac_env import HvacEnv
+from gym_hvac.envs.env_spec import CompileEnvSpec, CompiledEnvSpec
+
+def _PoolKey(value):
+	# lists (weather) and compiled specs compare by value, other objects (forcing, equipment) by identity
+	if isinstance(value, (list, tuple)):
+		return tuple(_PoolKey(item) for item in value)
+	if value is None or isinstance(value, (str, int, float, bool, CompiledEnvSpec)):
+		return value
+	return ('id', id(value))
+
+class HvacEnvPool():
+	"""Hands out reset envs built with the same keyword arguments as one released before, or builds a new one.
+
+	initialTemperature isn't part of the key, it is only used by reset so a pooled env takes any value.
+
+		Keyword Arguments:
+			envClass {type} -- the env class (default: {HvacEnv})
+			maxIdle {int} -- The most released envs kept per keyword arguments (default: {64})
+	"""
+
+	def __init__(self, envClass = HvacEnv, maxIdle:int = 64):
+		self.envClass = envClass
+		self.maxIdle = maxIdle
+		self.__idle = {}
+		self.__keys = {}
+		self.Created = 0
+		self.Reused = 0
+
+	def Acquire(self, **kwargs):
+		"""Gets a reset env, see HvacEnv for the keyword arguments
+		"""
+		defaultTemperature = 18
+		if kwargs.get('spec') is not None:
+			kwargs['spec'] = CompileEnvSpec(kwargs['spec'])
+			defaultTemperature = kwargs['spec'].initialTemperature
+		initialTemperature = kwargs.pop('initialTemperature', defaultTemperature)
+		key = tuple(sorted((name, _PoolKey(value)) for name, value in kwargs.items()))
+		idle = self.__idle.get(key)
+		if idle:
+			env = idle.pop()
+			self.Reused = self.Reused + 1
+		else:
+			if kwargs.get('spec') is None:
+				kwargs['initialTemperature'] = initialTemperature
+			env = self.envClass(**kwargs)
+			self.Created = self.Created + 1
+		self.__keys[id(env)] = key
+		env.initialTemperature = initialTemperature
+		env.episode = 0
+		env.step_count = 0
+		env.reset()
+		return env
+
+	def Release(self, env):
+		"""Returns an env to the pool, it must not be used after
+		"""
+		key = self.__keys.pop(id(env), None)
+		if key is None:
+			raise ValueError("The env wasn't acquired from this pool.")
+		env.SetReporter(None)
+		env.close()
+		idle = self.__idle.setdefault(key, [])
+		if len(idle) < self.maxIdle:
+			idle.append(env)
+
+	@contextmanager
+	def Borrow(self, **kwargs):
+		"""Acquires an env for a with block and releases it after
+		"""
+		env = self.Acquire(**kwargs)
+		try:
+			yield env
+		finally:
+			self.Release(env)
+
+# the pool of the evaluation loops and the baseline runs of this process
+SHARED_ENV_POOL = HvacEnvPool()
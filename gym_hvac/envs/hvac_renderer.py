@@ -0,0 +1,240 @@
+"""Rendering of the HVAC environment: a fixed size history the env appends to on every step, an rgb_array
+frame drawn into a preallocated canvas, and a live dashboard in its own process.
+
+Both draw with blitting: the axes are drawn once and every frame only restores that background and draws
+the lines. matplotlib is imported on the first frame, not with the env.
+"""
+import time
+import numpy as np
+
+# the history columns
+HISTORY_FIELDS = ('indoorTemperature', 'outsideTemperature', 'averageWatts')
+
+class RenderHistory():
+	"""A ring of the last capacity steps, kept in one float64 buffer: the number of steps ever appended,
+	the number of steps when it was last cleared, then the rows.
+
+	Append writes through a memoryview, which costs a fraction of a microsecond. With shared=True the buffer
+	is shared memory the dashboard process reads, a frame may then show a row being written.
+
+		Keyword Arguments:
+			capacity {int} -- The number of steps kept (default: {288}, a day of 5 minute steps)
+			shared {bool} -- Keep the buffer in shared memory (default: {False})
+			name {str} -- Attach to the shared memory of an existing history (default: {None})
+	"""
+	__slots__ = ('capacity', '__memory', '__owner', '__array', '__values', '__count', '__index', '__end')
+
+	def __init__(self, capacity:int = 288, shared:bool = False, name:str = None):
+		self.capacity = capacity
+		size = 2 + capacity * len(HISTORY_FIELDS)
+		self.__memory = None
+		self.__owner = False
+		if shared or name is not None:
+			from multiprocessing import shared_memory
+			if name is None:
+				self.__memory = shared_memory.SharedMemory(create=True, size=size * 8)
+				self.__owner = True
+			else:
+				self.__memory = shared_memory.SharedMemory(name=name)
+			self.__array = np.ndarray((size,), dtype=np.float64, buffer=self.__memory.buf)
+			if self.__owner:
+				self.__array[:] = 0.0
+		else:
+			self.__array = np.zeros(size)
+		self.__values = memoryview(self.__array).cast('B').cast('d')
+		# the writer keeps its own count and next row index, the buffer count is for the readers
+		self.__count = int(self.__values[0])
+		self.__end = size
+		self.__index = 2 + (self.__count % capacity) * 3
+
+	def GetName(self):
+		return None if self.__memory is None else self.__memory.name
+
+	def GetCount(self):
+		"""Gets the number of steps appended since the last Clear
+		"""
+		return int(self.__values[0] - self.__values[1])
+
+	def GetVersion(self):
+		"""Gets a value that changes with every Append and Clear, to tell whether a drawn frame is current
+		"""
+		return (self.__values[0], self.__values[1])
+
+	def Append(self, indoorTemperature:float, outsideTemperature:float, averageWatts:float):
+		values = self.__values
+		index = self.__index
+		values[index] = indoorTemperature
+		values[index + 1] = outsideTemperature
+		values[index + 2] = averageWatts
+		self.__count = self.__count + 1
+		values[0] = self.__count
+		index = index + 3
+		self.__index = 2 if index == self.__end else index
+
+	def Clear(self):
+		self.__values[1] = self.__count
+
+	def GetRows(self):
+		"""Gets the kept steps, oldest first
+
+		Returns:
+			np.ndarray -- (steps, len(HISTORY_FIELDS)) copy of the rows
+		"""
+		total = int(self.__values[0])
+		count = min(total - int(self.__values[1]), self.capacity)
+		rows = self.__array[2:].reshape(self.capacity, len(HISTORY_FIELDS))
+		# the oldest kept row is count rows behind the next one to be written
+		return rows[(np.arange(total - count, total) % self.capacity)]
+
+	def CopyTo(self, history):
+		"""Appends the kept steps to another history
+		"""
+		for row in self.GetRows():
+			history.Append(*row)
+
+	def Close(self):
+		self.__values.release()
+		self.__values = None
+		self.__array = None
+		if self.__memory is not None:
+			self.__memory.close()
+			if self.__owner:
+				self.__memory.unlink()
+
+class _DashboardFigure():
+	"""The dashboard axes of a figure and the blitting of its lines
+	"""
+
+	def __init__(self, figure, capacity:int, stepMinutes:float, buildingMin:float, buildingMax:float, target:float, maxWatts:float):
+		self.figure = figure
+		self.stepMinutes = stepMinutes
+		temperatureAxis, outsideAxis, wattsAxis = figure.subplots(3, 1, sharex=True)
+		temperatureAxis.set_ylim(buildingMin, buildingMax)
+		temperatureAxis.set_ylabel('Indoor (C)')
+		temperatureAxis.axhline(target, color='Yellow', lw=2, linestyle=':')
+		outsideAxis.set_ylim(-10.0, 50.0)
+		outsideAxis.set_ylabel('Outdoor (C)')
+		wattsAxis.set_ylim(0.0, maxWatts * 1.05)
+		wattsAxis.set_ylabel('HVAC (W)')
+		wattsAxis.set_xlim(-(capacity - 1) * stepMinutes, 0.0)
+		wattsAxis.set_xlabel('Minutes ago')
+		# animated lines are left out of the background and only drawn by Update
+		self.axes = [temperatureAxis, outsideAxis, wattsAxis]
+		self.lines = [axis.plot([], [], color, animated=True)[0] for axis, color in zip(self.axes, ['C1', 'C2', 'C3'])]
+		self.background = None
+
+	def CaptureBackground(self, event = None):
+		self.background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+
+	def Update(self, rows):
+		canvas = self.figure.canvas
+		if self.background is None:
+			canvas.draw()
+			self.CaptureBackground()
+		canvas.restore_region(self.background)
+		x = (np.arange(len(rows)) - (len(rows) - 1)) * self.stepMinutes
+		for column, (axis, line) in enumerate(zip(self.axes, self.lines)):
+			line.set_data(x, rows[:, column])
+			axis.draw_artist(line)
+
+class HvacRenderer():
+	"""Draws the RenderHistory of an env
+
+		Arguments:
+			history {RenderHistory} -- The history the env appends to
+			stepMinutes {float} -- The minutes between two steps
+			buildingMin {float} -- The lowest indoor temperature drawn [C]
+			buildingMax {float} -- The highest indoor temperature drawn [C]
+			target {float} -- The target temperature [C]
+			maxWatts {float} -- The highest average watts drawn [W]
+
+		Keyword Arguments:
+			fps {float} -- The most frames per second the live dashboard draws (default: {10})
+			width {int} -- The frame width [pixels] (default: {640})
+			height {int} -- The frame height [pixels] (default: {480})
+	"""
+
+	def __init__(self, history:RenderHistory, stepMinutes:float, buildingMin:float, buildingMax:float, target:float, maxWatts:float,
+		fps:float = 10.0, width:int = 640, height:int = 480):
+		self.history = history
+		self.fps = fps
+		self.width = width
+		self.height = height
+		self.__limits = (stepMinutes, buildingMin, buildingMax, target, maxWatts)
+		self.__dashboard = None
+		self.__frame = None
+		self.__frameVersion = None
+		self.__dashboardProcess = None
+		self.__stop = None
+
+	def GetFrame(self):
+		"""Draws the history into the preallocated canvas
+
+		Returns:
+			np.ndarray -- (height, width, 3) uint8 frame, the same array is overwritten by the next call
+		"""
+		if self.__dashboard is None:
+			from matplotlib.figure import Figure
+			from matplotlib.backends.backend_agg import FigureCanvasAgg
+			figure = Figure(figsize=(self.width / 100.0, self.height / 100.0), dpi=100)
+			FigureCanvasAgg(figure)
+			self.__dashboard = _DashboardFigure(figure, self.history.capacity, *self.__limits)
+			self.__frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+		version = self.history.GetVersion()
+		# nothing was appended since the last frame, the canvas already shows it
+		if version != self.__frameVersion:
+			self.__dashboard.Update(self.history.GetRows())
+			np.copyto(self.__frame, np.asarray(self.__dashboard.figure.canvas.buffer_rgba())[:, :, :3])
+			self.__frameVersion = version
+		return self.__frame
+
+	def Show(self):
+		"""Starts the live dashboard process if it isn't running, the history has to be shared
+
+		Returns:
+			bool -- True when the dashboard is running
+		"""
+		if self.__dashboardProcess is not None and self.__dashboardProcess.is_alive():
+			return True
+		if self.history.GetName() is None:
+			raise ValueError("The live dashboard needs a shared RenderHistory.")
+		import multiprocessing
+		context = multiprocessing.get_context('spawn')
+		self.__stop = context.Event()
+		self.__dashboardProcess = context.Process(target=_RunDashboard, daemon=True,
+			args=(self.history.GetName(), self.history.capacity, self.__limits, self.fps, self.__stop))
+		self.__dashboardProcess.start()
+		return True
+
+	def Close(self):
+		if self.__dashboardProcess is not None:
+			self.__stop.set()
+			self.__dashboardProcess.join(5.0)
+			if self.__dashboardProcess.is_alive():
+				self.__dashboardProcess.terminate()
+			self.__dashboardProcess = None
+		self.__dashboard = None
+
+def _RunDashboard(historyName:str, capacity:int, limits, fps:float, stop):
+	import matplotlib.pyplot as plt
+	history = RenderHistory(capacity, name=historyName)
+	figure = plt.figure('HVAC')
+	dashboard = _DashboardFigure(figure, capacity, *limits)
+	# a resized or exposed window is redrawn in full, the background has to be captured again
+	figure.canvas.mpl_connect('draw_event', dashboard.CaptureBackground)
+	plt.show(block=False)
+	interval = 1.0 / fps
+	drawnVersion = None
+	while not stop.is_set() and plt.fignum_exists(figure.number):
+		start = time.monotonic()
+		version = history.GetVersion()
+		if version != drawnVersion:
+			dashboard.Update(history.GetRows())
+			figure.canvas.blit(figure.bbox)
+			drawnVersion = version
+		figure.canvas.flush_events()
+		elapsed = time.monotonic() - start
+		if elapsed < interval:
+			time.sleep(interval - elapsed)
+	plt.close(figure)
+	history.Close()
@@ -0,0 +1,85 @@
+"""The HVAC environment with setpoint actions: the agent picks the heating and cooling setpoints and the
+deadband once per block (an hour by default) and a hysteresis thermostat runs the HVAC in between.
+"""
+import numpy as np
+from gym import spaces
+from gym_hvac.models import HysteresisThermostat, THERMOSTAT_STATE_DTYPE
+from gym_hvac.envs.hvac_env import HvacEnv
+
+# the action spaces by bounds, shared like the spaces of HvacEnv
+_ACTION_SPACES = {}
+
+def _GetActionSpace(low, high):
+	key = (tuple(low), tuple(high))
+	actionSpace = _ACTION_SPACES.get(key)
+	if actionSpace is None:
+		actionSpace = spaces.Box(low=np.array(low, dtype=np.float32), high=np.array(high, dtype=np.float32), dtype=np.float32)
+		_ACTION_SPACES[key] = actionSpace
+	return actionSpace
+
+class HvacSetpointEnv(HvacEnv):
+	"""The HVAC building gym environment with an action of [heating setpoint, cooling setpoint, deadband] per block.
+
+	The thermostat decides every second (see HysteresisThermostat), solved event by event, so a block costs
+	a few closed form steps per HVAC cycle. The observation and reward are those of HvacEnv for the block.
+	Actions outside the bounds are clipped.
+
+		Keyword Arguments:
+			blockSeconds {int} -- The seconds between two actions (default: {3600})
+			episodeSeconds {int} -- The length of an episode (default: {86400})
+			setpointRange {tuple} -- The lowest and highest setpoint [C] (default: {(15, 28)})
+			deadbandRange {tuple} -- The smallest and largest deadband [C] (default: {(0.5, 4)})
+			See HvacEnv for the others, a scenarioSampler has to be made with stepSeconds=blockSeconds
+	"""
+
+	def __init__(self, blockSeconds:int = 3600, episodeSeconds:int = 86400, setpointRange = (15.0, 28.0), deadbandRange = (0.5, 4.0), **kwargs):
+		scenarioSampler = kwargs.get('scenarioSampler')
+		if scenarioSampler is not None and scenarioSampler.stepSeconds != blockSeconds:
+			raise ValueError("The scenario sampler has to precompute the max cost for steps of blockSeconds.")
+		self.blockSeconds = blockSeconds
+		self.episodeSeconds = episodeSeconds
+		self.thermostat = HysteresisThermostat()
+		super().__init__(**kwargs)
+		self.env_step_interval = blockSeconds
+		self.hvacBuilding.CalculateMaxEneregyCostForTime(self.env_step_interval)
+		self.action_space = _GetActionSpace([setpointRange[0], setpointRange[0], deadbandRange[0]],
+			[setpointRange[1], setpointRange[1], deadbandRange[1]])
+
+	def step(self, action):
+		action = np.clip(np.asarray(action, dtype=np.float32), self.action_space.low, self.action_space.high)
+		return super().step(action)
+
+	def reset(self):
+		observation = super().reset()
+		self.thermostat.reset()
+		self.step_max = int(self.episodeSeconds / self.blockSeconds)
+		return observation
+
+	def GetSessionState(self):
+		"""Gets the session state of HvacEnv with the thermostat's (THERMOSTAT_STATE_DTYPE)
+		"""
+		state = super().GetSessionState()
+		state['thermostat'] = np.array(self.thermostat.GetState(), dtype=THERMOSTAT_STATE_DTYPE)
+		return state
+
+	def SetSessionState(self, state):
+		super().SetSessionState(state)
+		self.thermostat.SetState(np.asarray(state['thermostat'], dtype=THERMOSTAT_STATE_DTYPE))
+
+	def _take_action(self, action):
+		heatingSetpoint, coolingSetpoint, deadband = action.tolist()
+		self.thermostat.SetSetpoints(heatingSetpoint, coolingSetpoint, deadband)
+		hvac = self.hvacBuilding.building_hvac
+		seconds = self.blockSeconds
+		# the outside temperature changes on the hour, a block is run in pieces that don't span one
+		while seconds > 0:
+			now = hvac.TotalTimeInSeconds
+			segment = min(seconds, 3600 - now % 3600)
+			self.OutsideTemperature = self.GetOutsideTemperatureForTime(now)
+			self.thermostat.Run(self.hvacBuilding, self.OutsideTemperature, segment)
+			seconds = seconds - segment
+		self.step_count = self.step_count + 1
+
+	def _action_terminates(self, action, previousTemp:float):
+		# ending the episode for heating or cooling against the outside temperature is for the on/off actions
+		return False
@@ -0,0 +1,3 @@
+"""Batch evaluation of policies over scenario suites.
+"""
+from gym_hvac.evaluation.policy_evaluation import CreateScenario, CreateScenarioSuite, ThermostatPolicy, EvaluateScenarios, EvaluatePolicy, SummarizeResults, FormatSummaryTable
@@ -0,0 +1,212 @@
+"""Evaluates a policy over a suite of scenarios (weather days, building variants and seeds).
+
+A policy is any callable taking a (number of envs, observation size) array of observations and
+returning one action per env. Policies that keep state per env can define Reset(numberOfEnvs),
+it is called before every batch.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from gym_hvac.envs import SHARED_ENV_POOL
+
+# two sided 95% Student t values by degrees of freedom, the normal value is used above 30
+_T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+	2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+	2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+SUMMARY_METRICS = ['totalCost', 'comfortViolationMinutes', 'heatingCycles', 'coolingCycles', 'totalReward', 'finalTemperature']
+
+def CreateScenario(name:str, outsideTemperatures = 'cold', seed:int = 0, steps:int = 288,
+	conditionedFloorArea:float = 100, heatMassCapacity:float = None, heatTransmission:float = 200,
+	initialTemperature:float = 18, initialTemperatureJitter:float = 0.0):
+	"""Creates a scenario record, the keyword arguments match HvacEnv
+
+	Arguments:
+		name {str} -- The scenario group the result is summarized under (seeds of a group are aggregated together)
+		seed {int} -- Seeds the generator the initial temperature jitter is drawn from
+		steps {int} -- The number of env steps to run (default: {288}, one day of 5 minute steps)
+		initialTemperatureJitter {float} -- The initial temperature is drawn uniformly within +- this value [C]
+	"""
+	return {
+		'name': name,
+		'outsideTemperatures': outsideTemperatures,
+		'seed': seed,
+		'steps': steps,
+		'conditionedFloorArea': conditionedFloorArea,
+		'heatMassCapacity': heatMassCapacity,
+		'heatTransmission': heatTransmission,
+		'initialTemperature': initialTemperature,
+		'initialTemperatureJitter': initialTemperatureJitter,
+	}
+
+def CreateScenarioSuite(profiles = ('cold', 'october', 'normal', 'hot'), buildingVariants = None, seeds = range(10),
+	steps:int = 288, initialTemperatureJitter:float = 2.0):
+	"""Creates the cross product of weather profiles, building variants and seeds
+
+	Arguments:
+		buildingVariants {dict} -- building variant name to HvacEnv building keyword arguments (default: {a single 'standard' building})
+	"""
+	if buildingVariants is None:
+		buildingVariants = {'standard': {}}
+	scenarios = []
+	for profile in profiles:
+		for variantName, variant in buildingVariants.items():
+			for seed in seeds:
+				scenarios.append(CreateScenario(profile + '/' + variantName, outsideTemperatures=profile, seed=seed,
+					steps=steps, initialTemperatureJitter=initialTemperatureJitter, **variant))
+	return scenarios
+
+class ThermostatPolicy():
+	"""The standard hysteresis thermostat of hvac_baseline.py written as a batched policy
+
+		Keyword Arguments:
+			desiredTemperature {float} -- (default: {20})
+			temperatureDelta {float} -- how far the temperature may drift before the HVAC turns on (default: {2})
+	"""
+	def __init__(self, desiredTemperature:float = 20, temperatureDelta:float = 2):
+		self.desiredTemperature = desiredTemperature
+		self.temperatureDelta = temperatureDelta
+		self.__actions = np.zeros(0, dtype=np.int64)
+
+	def Reset(self, numberOfEnvs:int):
+		self.__actions = np.zeros(numberOfEnvs, dtype=np.int64)
+
+	def __call__(self, observations):
+		temperature = observations[:, 1]
+		previous = self.__actions.copy()
+		# switching between heating and cooling always passes through off, the furnace has to shut down first
+		self.__actions[(previous == 1) & (temperature > self.desiredTemperature)] = 0
+		self.__actions[(previous == 2) & (temperature < self.desiredTemperature)] = 0
+		self.__actions[(previous == 0) & (temperature < self.desiredTemperature - self.temperatureDelta)] = 1
+		self.__actions[(previous == 0) & (temperature > self.desiredTemperature + self.temperatureDelta)] = 2
+		return self.__actions.copy()
+
+def EvaluateScenarios(policy, scenarios, comfortBand:float = 2.0, dtype = 'float64'):
+	"""Runs a batch of scenarios in lock step in this process, calling the policy once per step for all envs.
+	An env that is done stops stepping, its results are those of the steps it ran, the policy still gets its last
+	observation with the others.
+
+	Keyword Arguments:
+		dtype {str} -- The dtype of the envs and of the batched observations the policy gets, the totals are float64 (default: {'float64'})
+
+	Returns:
+		list -- one result dict per scenario, 'steps' is the number of steps run before the env was done or the scenario ended
+	"""
+	envs = []
+	observations = []
+	for scenario in scenarios:
+		# a generator per scenario, the global numpy.random state of the caller is left alone
+		rng = np.random.default_rng(scenario['seed'])
+		# the envs are reused across the batches a worker evaluates
+		env = SHARED_ENV_POOL.Acquire(outsideTemperatures=scenario['outsideTemperatures'],
+			conditionedFloorArea=scenario['conditionedFloorArea'],
+			heatMassCapacity=scenario['heatMassCapacity'],
+			heatTransmission=scenario['heatTransmission'],
+			initialTemperature=scenario['initialTemperature'] + rng.uniform(-1.0, 1.0) * scenario['initialTemperatureJitter'],
+			dtype=dtype)
+		envs.append(env)
+		observations.append(env.reset())
+
+	if hasattr(policy, 'Reset'):
+		policy.Reset(len(envs))
+
+	count = len(envs)
+	observations = np.array(observations, dtype=dtype).reshape(count, -1)
+	totalReward = np.zeros(count)
+	violationSteps = np.zeros(count, dtype=np.int64)
+	# HVAC counts every cooling on command, a command that keeps the A/C on isn't a cycle
+	repeatedCooling = np.zeros(count, dtype=np.int64)
+	stepsLeft = np.array([scenario['steps'] for scenario in scenarios])
+	stepsRun = np.zeros(count, dtype=np.int64)
+	for step in range(int(stepsLeft.max()) if count else 0):
+		actions = np.asarray(policy(observations)).reshape(count)
+		for i, env in enumerate(envs):
+			if step >= stepsLeft[i]:
+				continue
+			action = int(actions[i])
+			if action == 2 and env.hvacBuilding.building_hvac.CoolingIsOn:
+				repeatedCooling[i] = repeatedCooling[i] + 1
+			observation, reward, done, _ = env.step(action)
+			stepsRun[i] = step + 1
+			if done:
+				# the episode ended, the env isn't stepped past it
+				stepsLeft[i] = step + 1
+			observations[i] = observation
+			totalReward[i] = totalReward[i] + reward
+			if abs(env.hvacBuilding.current_temperature - env.building_target) > comfortBand:
+				violationSteps[i] = violationSteps[i] + 1
+
+	results = []
+	for i, env in enumerate(envs):
+		hvacBuilding = env.hvacBuilding
+		results.append({
+			'name': scenarios[i]['name'],
+			'seed': scenarios[i]['seed'],
+			'totalCost': hvacBuilding.CalculateGasEneregyCost() + hvacBuilding.CalculateElectricEneregyCost(),
+			'comfortViolationMinutes': float(violationSteps[i] * env.env_step_interval / 60.0),
+			'heatingCycles': hvacBuilding.building_hvac.NumberOfTimesHeatingTurnedOn,
+			'coolingCycles': hvacBuilding.building_hvac.NumberOfTimesCoolingTurnedOn - int(repeatedCooling[i]),
+			'totalReward': float(totalReward[i]),
+			'finalTemperature': hvacBuilding.current_temperature,
+			'steps': int(stepsRun[i]),
+		})
+	for env in envs:
+		SHARED_ENV_POOL.Release(env)
+	return results
+
+def EvaluatePolicy(policy, scenarios, workers:int = None, batchSize:int = 32, comfortBand:float = 2.0, dtype = 'float64'):
+	"""Fans the scenarios out over a process pool in batches, see EvaluateScenarios
+
+	Arguments:
+		policy {callable} -- must be picklable when workers is not 0
+		workers {int} -- The number of worker processes, 0 evaluates in this process (default: {os.cpu_count()})
+		batchSize {int} -- The number of envs stepped together in one worker call (default: {32})
+		dtype {str} -- The dtype of the observations, 'float32' or 'float64' (default: {'float64'})
+
+	Returns:
+		list -- one result dict per scenario, in the order of the scenarios
+	"""
+	batches = [scenarios[i:i + batchSize] for i in range(0, len(scenarios), batchSize)]
+	if workers == 0:
+		return [result for batch in batches for result in EvaluateScenarios(policy, batch, comfortBand, dtype)]
+
+	workers = workers or os.cpu_count()
+	with ProcessPoolExecutor(max_workers=min(workers, max(len(batches), 1))) as executor:
+		futures = [executor.submit(EvaluateScenarios, policy, batch, comfortBand, dtype) for batch in batches]
+		return [result for future in futures for result in future.result()]
+
+def SummarizeResults(results, metrics = SUMMARY_METRICS):
+	"""Aggregates the results by scenario name into mean, standard deviation and a 95% confidence interval
+
+	Returns:
+		list -- one row per scenario name: {'name', 'count', metric + '_mean', metric + '_std', metric + '_ci95'}
+	"""
+	groups = {}
+	for result in results:
+		groups.setdefault(result['name'], []).append(result)
+
+	rows = []
+	for name, group in groups.items():
+		row = {'name': name, 'count': len(group)}
+		for metric in metrics:
+			values = np.array([result[metric] for result in group], dtype=np.float64)
+			std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+			degreesOfFreedom = len(values) - 1
+			tValue = _T_95[degreesOfFreedom - 1] if 0 < degreesOfFreedom <= len(_T_95) else 1.96
+			row[metric + '_mean'] = float(values.mean())
+			row[metric + '_std'] = std
+			row[metric + '_ci95'] = tValue * std / math.sqrt(len(values))
+		rows.append(row)
+	return rows
+
+def FormatSummaryTable(rows, metrics = SUMMARY_METRICS):
+	"""Formats the summary rows as a plain text table of mean +- 95% confidence interval
+	"""
+	header = ['name', 'n'] + metrics
+	lines = [header]
+	for row in rows:
+		lines.append([row['name'], str(row['count'])] +
+			["{:.3f} +- {:.3f}".format(row[metric + '_mean'], row[metric + '_ci95']) for metric in metrics])
+	widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+	return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, widths)) for line in lines)
@@ -1,5 +1,13 @@
 from gym_hvac.models.building import Building
-from gym_hvac.models.hvac import HVAC
-from gym_hvac.models.hvac_building import HvacBuilding
+from gym_hvac.models.hvac import HVAC, HVAC_STATE_DTYPE
+from gym_hvac.models.hvac_event_log import HvacEventLog, EVENT_DTYPE, CYCLE_DTYPE, PHASE_NAMES
+from gym_hvac.models.equipment import PerformanceTable, TableEquipment
+from gym_hvac.models.forcing import HourlySchedule, ExogenousForcing, CompiledForcing, CreateResidentialForcing
+from gym_hvac.models.forcing_cache import ForcingCache
+from gym_hvac.models.envelope import TwoNodeEnvelope
+from gym_hvac.models.duty_gradients import DutyTrajectory, SimulateDutySchedule
+from gym_hvac.models.rewards import RewardFunction, RegisterRewardTerm, REWARD_TERMS, REWARD_FUNCTIONS, REWARD_STEP_DTYPE
+from gym_hvac.models.hvac_building import HvacBuilding, RUN_CHUNK_DTYPE, GetRunChunkDtype, BUILDING_STATE_DTYPE
+from gym_hvac.models.thermostat import HysteresisThermostat, THERMOSTAT_STATE_DTYPE
 
 __version__ = '0.1.0.dev'
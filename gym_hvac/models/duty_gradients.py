@@ -0,0 +1,149 @@
+"""Exact gradients of a duty cycle schedule through the single node building.
+
+A duty schedule sets the share of every interval the furnace and the A/C run. In the averaged model a duty of
+0.5 puts half the steady power into the house every second of the interval, the start up and shutdown transients
+of the HVAC are left out. The one second recurrence of HvacBuilding._next_temperature is then linear in the
+duties, every interval is integrated in closed form and the cost is linear in the energy, so the gradients of
+the final temperature, the cost and the comfort penalty with respect to every duty and the building parameters
+come from one forward and one backward (adjoint) pass instead of a simulation per perturbed input.
+"""
+import numpy as np
+
+# the rows of the jacobians
+OUTPUTS = ('finalTemperature', 'cost', 'comfortPenalty')
+# the columns of DutyTrajectory.parameterJacobian
+PARAMETERS = ('heatMassCapacity', 'heatTransmission', 'initialTemperature')
+
+class DutyTrajectory():
+	"""The temperatures, costs and gradients of a duty schedule, see SimulateDutySchedule
+
+		Attributes:
+			temperatures {np.ndarray} -- the temperature at the start of every interval and at the end [C]
+			costs {np.ndarray} -- the energy cost of every interval [US$]
+			finalTemperature {float} -- [C]
+			cost {float} -- the total energy cost [US$]
+			comfortPenalty {float} -- the weighted squared distance of the interval end temperatures to the comfort band [C**2]
+			heatingJacobian {np.ndarray} -- (3, intervals) the gradients of the OUTPUTS with respect to the heating duties
+			coolingJacobian {np.ndarray} -- (3, intervals) the gradients of the OUTPUTS with respect to the cooling duties
+			parameterJacobian {np.ndarray} -- (3, 3) the gradients of the OUTPUTS with respect to the PARAMETERS
+	"""
+	__slots__ = ('temperatures', 'costs', 'finalTemperature', 'cost', 'comfortPenalty',
+		'heatingJacobian', 'coolingJacobian', 'parameterJacobian')
+
+	def __init__(self, temperatures, costs, comfortPenalty, heatingJacobian, coolingJacobian, parameterJacobian):
+		self.temperatures = temperatures
+		self.costs = costs
+		self.finalTemperature = float(temperatures[-1])
+		self.cost = float(costs.sum())
+		self.comfortPenalty = float(comfortPenalty)
+		self.heatingJacobian = heatingJacobian
+		self.coolingJacobian = coolingJacobian
+		self.parameterJacobian = parameterJacobian
+
+	def GetGradient(self, output:str):
+		"""Gets the gradients of one of the OUTPUTS
+
+		Returns:
+			tuple -- the heating duty, cooling duty and parameter gradients
+		"""
+		row = OUTPUTS.index(output)
+		return (self.heatingJacobian[row], self.coolingJacobian[row], self.parameterJacobian[row])
+
+def SimulateDutySchedule(heatMassCapacity:float, heatTransmission:float, initialTemperature:float, outsideTemperatures,
+	heatingDuty, coolingDuty, heatingPower:float, coolingPower:float, heatingCostPerSecond:float, coolingCostPerSecond:float,
+	intervalSeconds:int = 3600, comfortLow:float = 19.0, comfortHigh:float = 23.0, comfortWeights = None, gains = None):
+	"""Simulates a duty schedule with the averaged HVAC and gets the gradients of its outcome
+
+		Arguments:
+			heatMassCapacity {float} -- [J/K]
+			heatTransmission {float} -- [W/K]
+			initialTemperature {float} -- [C]
+			outsideTemperatures {np.ndarray} -- the outside temperature of every interval [C]
+			heatingDuty {np.ndarray} -- the share of every interval the furnace runs, usually 0 to 1
+			coolingDuty {np.ndarray} -- the share of every interval the A/C runs, usually 0 to 1
+			heatingPower {float} -- the heat the furnace puts into the house while running [W]
+			coolingPower {float} -- the heat the A/C takes out of the house while running [W]
+			heatingCostPerSecond {float} -- the gas and electricity cost of a second of steady heating [US$]
+			coolingCostPerSecond {float} -- the electricity cost of a second of cooling [US$]
+
+		Keyword Arguments:
+			intervalSeconds {int} -- The length of an interval [s] (default: {3600})
+			comfortLow {float} -- [C] (default: {19.0})
+			comfortHigh {float} -- [C] (default: {23.0})
+			comfortWeights {np.ndarray} -- The weight of every interval's comfort, e.g. its occupancy (default: {None}, all 1)
+			gains {np.ndarray} -- The heat gains of every second of the schedule [W] (default: {None})
+
+		Returns:
+			DutyTrajectory
+	"""
+	outside = np.asarray(outsideTemperatures, dtype=np.float64)
+	heating = np.asarray(heatingDuty, dtype=np.float64)
+	cooling = np.asarray(coolingDuty, dtype=np.float64)
+	intervals = len(outside)
+	if heating.shape != (intervals,) or cooling.shape != (intervals,):
+		raise ValueError("A duty schedule needs a heating and a cooling duty for every outside temperature.")
+	weights = np.ones(intervals) if comfortWeights is None else np.asarray(comfortWeights, dtype=np.float64)
+	length = intervalSeconds
+
+	# the one second factors of HvacBuilding and their interval powers
+	dtByCm = 1.0 / heatMassCapacity
+	decay = 1.0 - dtByCm * heatTransmission
+	decayN = decay ** length
+	exponents = np.arange(length)
+	# sum of decay**j for j below length, and its derivative
+	if decay == 1:
+		decaySum = float(length)
+	else:
+		decaySum = (1 - decayN) / (1 - decay)
+	decaySumByDecay = float(np.dot(exponents[1:], decay ** (exponents[1:] - 1)))
+	decayNByDecay = length * decay ** (length - 1)
+
+	power = heating * heatingPower - cooling * coolingPower
+	drive = power + heatTransmission * outside
+	# the gains of every second decay with the building over the rest of its interval
+	gainTerms = np.zeros(intervals)
+	gainTermsByDecay = np.zeros(intervals)
+	if gains is not None:
+		perInterval = np.asarray(gains, dtype=np.float64).reshape(intervals, length)
+		remaining = exponents[::-1]
+		gainTerms = dtByCm * perInterval.dot(decay ** remaining)
+		gainTermsByDecay = dtByCm * perInterval.dot(remaining * decay ** np.maximum(remaining - 1, 0))
+
+	temperatures = np.empty(intervals + 1)
+	temperatures[0] = initialTemperature
+	for k in range(intervals):
+		temperatures[k + 1] = temperatures[k] * decayN + decaySum * dtByCm * drive[k] + gainTerms[k]
+	costs = length * (heating * heatingCostPerSecond + cooling * coolingCostPerSecond)
+
+	ends = temperatures[1:]
+	below = np.maximum(comfortLow - ends, 0.0)
+	above = np.maximum(ends - comfortHigh, 0.0)
+	comfortPenalty = np.dot(weights, below * below + above * above)
+
+	# the adjoints of the final temperature and the comfort penalty, adjoints[:, k] = d output / d temperatures[k]
+	sensitivity = np.zeros((2, intervals + 1))
+	sensitivity[0, intervals] = 1.0
+	sensitivity[1, 1:] = 2.0 * weights * (above - below)
+	adjoints = np.empty((2, intervals + 1))
+	adjoints[:, intervals] = sensitivity[:, intervals]
+	for k in range(intervals - 1, -1, -1):
+		adjoints[:, k] = sensitivity[:, k] + decayN * adjoints[:, k + 1]
+	following = adjoints[:, 1:]
+
+	heatingJacobian = np.empty((3, intervals))
+	coolingJacobian = np.empty((3, intervals))
+	heatingJacobian[[0, 2]] = following * (decaySum * dtByCm * heatingPower)
+	coolingJacobian[[0, 2]] = following * (-decaySum * dtByCm * coolingPower)
+	heatingJacobian[1] = length * heatingCostPerSecond
+	coolingJacobian[1] = length * coolingCostPerSecond
+
+	# the gradients with respect to the one second factors, then chained to the building parameters
+	byDecay = following.dot(decayNByDecay * temperatures[:-1] + decaySumByDecay * dtByCm * drive + gainTermsByDecay)
+	byDtByCm = following.dot(decaySum * drive + gainTerms / dtByCm)
+	byTransmission = following.dot(decaySum * dtByCm * outside)
+	parameterJacobian = np.zeros((3, 3))
+	capacitySquared = heatMassCapacity * heatMassCapacity
+	parameterJacobian[[0, 2], 0] = byDecay * heatTransmission / capacitySquared - byDtByCm / capacitySquared
+	parameterJacobian[[0, 2], 1] = byTransmission - byDecay * dtByCm
+	parameterJacobian[[0, 2], 2] = adjoints[:, 0]
+	return DutyTrajectory(temperatures, costs, comfortPenalty, heatingJacobian, coolingJacobian, parameterJacobian)
@@ -0,0 +1,100 @@
+import numpy as np
+
+# exact discretizations shared by every envelope with the same parameters, keyed by (parameters, dt)
+_TRANSITION_CACHE = {}
+
+def _Expm(matrix):
+	"""Matrix exponential by scaling and squaring of a Taylor series, enough for the small matrices of an envelope
+	"""
+	norm = np.abs(matrix).sum(axis=1).max()
+	squarings = max(0, int(np.ceil(np.log2(norm))) + 1) if norm > 0.5 else 0
+	scaled = matrix / (2.0 ** squarings)
+	result = np.eye(len(matrix))
+	term = np.eye(len(matrix))
+	for order in range(1, 20):
+		term = term @ scaled / order
+		result = result + term
+	for i in range(squarings):
+		result = result @ result
+	return result
+
+class TwoNodeEnvelope():
+	"""A second order (2R2C) building envelope: a fast air node and a slow mass node (walls, furniture).
+
+		C_air  dT_air/dt  = (T_mass - T_air) * air_mass_conductance + (T_out - T_air) * air_outside_conductance + power
+		C_mass dT_mass/dt = (T_air - T_mass) * air_mass_conductance + (T_out - T_mass) * mass_outside_conductance
+
+	The HVAC power and the heat gains go into the air node. The model is discretized exactly with the
+	matrix exponential, so a step of any length with constant inputs is two small mat-vecs.
+
+		Arguments:
+			air_heat_capacity:          capacity of the air node [J/K]
+			mass_heat_capacity:         capacity of the mass node [J/K]
+			air_mass_conductance:       heat transfer between the air and the mass [W/K]
+			air_outside_conductance:    heat transfer from the air to the outside [W/K]
+
+		Keyword Arguments:
+			mass_outside_conductance:   heat transfer from the mass to the outside [W/K] (default: {0})
+	"""
+	__slots__ = ('air_heat_capacity', 'mass_heat_capacity', 'air_mass_conductance', 'air_outside_conductance', 'mass_outside_conductance')
+
+	def __init__(self, air_heat_capacity, mass_heat_capacity, air_mass_conductance, air_outside_conductance, mass_outside_conductance = 0.0):
+		if air_heat_capacity <= 0 or mass_heat_capacity <= 0:
+			raise ValueError("The heat capacities must be positive.")
+		if air_mass_conductance < 0 or air_outside_conductance < 0 or mass_outside_conductance < 0:
+			raise ValueError("The conductances must not be negative.")
+		self.air_heat_capacity = air_heat_capacity
+		self.mass_heat_capacity = mass_heat_capacity
+		self.air_mass_conductance = air_mass_conductance
+		self.air_outside_conductance = air_outside_conductance
+		self.mass_outside_conductance = mass_outside_conductance
+
+	@staticmethod
+	def FromSingleNode(heat_mass_capacity, heat_transmission, air_fraction:float = 0.1, coupling_factor:float = 10.0):
+		"""Splits a single node building (HvacBuilding's heat_mass_capacity and heat_transmission) into air and mass
+
+		Keyword Arguments:
+			air_fraction {float} -- the share of the capacity in the air node (default: {0.1})
+			coupling_factor {float} -- the air to mass conductance as a multiple of heat_transmission (default: {10})
+		"""
+		return TwoNodeEnvelope(heat_mass_capacity * air_fraction, heat_mass_capacity * (1 - air_fraction),
+			heat_transmission * coupling_factor, heat_transmission)
+
+	def GetParameters(self):
+		return (self.air_heat_capacity, self.mass_heat_capacity, self.air_mass_conductance, self.air_outside_conductance, self.mass_outside_conductance)
+
+	def GetContinuousMatrices(self):
+		"""Gets the continuous state matrix A (2x2) and input matrix B (2x2, inputs outside temperature and air power)
+		"""
+		air, mass, coupling, airOutside, massOutside = self.GetParameters()
+		a = np.array([
+			[-(coupling + airOutside) / air, coupling / air],
+			[coupling / mass, -(coupling + massOutside) / mass]])
+		b = np.array([
+			[airOutside / air, 1.0 / air],
+			[massOutside / mass, 0.0]])
+		return a, b
+
+	def GetTransition(self, dt:float):
+		"""Gets the exact discrete transition over dt seconds with constant inputs, cached per (parameters, dt)
+
+			[T_air, T_mass]' = Ad @ [T_air, T_mass] + Bd @ [T_out, power]
+
+		Returns:
+			tuple -- the flat floats (a00, a01, a10, a11, bOut0, bOut1, bPower0, bPower1)
+		"""
+		key = (self.GetParameters(), dt)
+		transition = _TRANSITION_CACHE.get(key)
+		if transition is None:
+			a, b = self.GetContinuousMatrices()
+			# Van Loan: exp([[A, B], [0, 0]] dt) = [[Ad, Bd], [0, I]]
+			augmented = np.zeros((4, 4))
+			augmented[:2, :2] = a
+			augmented[:2, 2:] = b
+			exponential = _Expm(augmented * dt)
+			ad = exponential[:2, :2]
+			bd = exponential[:2, 2:]
+			transition = (float(ad[0, 0]), float(ad[0, 1]), float(ad[1, 0]), float(ad[1, 1]),
+				float(bd[0, 0]), float(bd[1, 0]), float(bd[0, 1]), float(bd[1, 1]))
+			_TRANSITION_CACHE[key] = transition
+		return transition
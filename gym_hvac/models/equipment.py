@@ -0,0 +1,159 @@
+import numpy as np
+
+class PerformanceTable():
+	"""A manufacturer performance table of delivered capacity and input power by outside and indoor temperature.
+
+	The table is compiled at construction into dense grids by bilinear interpolation, so a lookup is
+	one index computation into flat lists instead of an interpolation. Temperatures outside the table
+	are clamped to its edges.
+
+		Arguments:
+			outsideTemperatures {list} -- The outside temperatures of the table rows, increasing [C]
+			indoorTemperatures {list} -- The indoor temperatures of the table columns, increasing [C]
+			capacity {2d list} -- Heat delivered to (or removed from) the house [W], outside x indoor (all >= 0)
+			power {2d list} -- Power drawn by the equipment [W], outside x indoor
+
+		Keyword Arguments:
+			resolution {float} -- The spacing of the compiled grid [C] (default: {0.1})
+	"""
+	__slots__ = ('resolution', 'outsideGrid', 'indoorGrid', 'capacityGrid', 'powerGrid',
+		'__outside_min', '__indoor_min', '__outside_last', '__indoor_last', '__indoor_count', '__inverse_resolution',
+		'__capacity', '__power')
+
+	def __init__(self, outsideTemperatures, indoorTemperatures, capacity, power, resolution:float = 0.1):
+		outsideTemperatures = np.asarray(outsideTemperatures, dtype=np.float64)
+		indoorTemperatures = np.asarray(indoorTemperatures, dtype=np.float64)
+		capacity = np.asarray(capacity, dtype=np.float64).reshape(len(outsideTemperatures), len(indoorTemperatures))
+		power = np.asarray(power, dtype=np.float64).reshape(len(outsideTemperatures), len(indoorTemperatures))
+		if resolution <= 0:
+			raise ValueError("The resolution must be positive.")
+		if np.any(np.diff(outsideTemperatures) <= 0) or np.any(np.diff(indoorTemperatures) <= 0):
+			raise ValueError("The table temperatures must be increasing.")
+		if np.any(capacity < 0) or np.any(power < 0):
+			raise ValueError("The table capacity and power must not be negative.")
+
+		self.resolution = resolution
+		self.outsideGrid = self.__grid(outsideTemperatures, resolution)
+		self.indoorGrid = self.__grid(indoorTemperatures, resolution)
+		self.capacityGrid = self.__compile(outsideTemperatures, indoorTemperatures, capacity)
+		self.powerGrid = self.__compile(outsideTemperatures, indoorTemperatures, power)
+
+		self.__outside_min = float(self.outsideGrid[0])
+		self.__indoor_min = float(self.indoorGrid[0])
+		self.__outside_last = len(self.outsideGrid) - 1
+		self.__indoor_last = len(self.indoorGrid) - 1
+		self.__indoor_count = len(self.indoorGrid)
+		self.__inverse_resolution = 1.0 / resolution
+		# flat python lists are the fastest thing to index with a scalar
+		self.__capacity = self.capacityGrid.ravel().tolist()
+		self.__power = self.powerGrid.ravel().tolist()
+
+	def Lookup(self, outsideTemperature:float, indoorTemperature:float):
+		"""Gets the (capacity, power) at the nearest grid point
+
+		Returns:
+			tuple -- capacity [W], power [W]
+		"""
+		outsideIndex = int((outsideTemperature - self.__outside_min) * self.__inverse_resolution + 0.5)
+		if outsideIndex < 0:
+			outsideIndex = 0
+		elif outsideIndex > self.__outside_last:
+			outsideIndex = self.__outside_last
+		indoorIndex = int((indoorTemperature - self.__indoor_min) * self.__inverse_resolution + 0.5)
+		if indoorIndex < 0:
+			indoorIndex = 0
+		elif indoorIndex > self.__indoor_last:
+			indoorIndex = self.__indoor_last
+		index = outsideIndex * self.__indoor_count + indoorIndex
+		return self.__capacity[index], self.__power[index]
+
+	def LookupArray(self, outsideTemperatures, indoorTemperatures):
+		"""Vectorized Lookup for arrays of temperatures
+
+		Returns:
+			tuple -- capacity array [W], power array [W]
+		"""
+		outsideIndex = np.clip(np.floor((np.asarray(outsideTemperatures) - self.__outside_min) * self.__inverse_resolution + 0.5), 0, self.__outside_last).astype(np.intp)
+		indoorIndex = np.clip(np.floor((np.asarray(indoorTemperatures) - self.__indoor_min) * self.__inverse_resolution + 0.5), 0, self.__indoor_last).astype(np.intp)
+		return self.capacityGrid[outsideIndex, indoorIndex], self.powerGrid[outsideIndex, indoorIndex]
+
+	@staticmethod
+	def __grid(temperatures, resolution:float):
+		count = int(round((temperatures[-1] - temperatures[0]) / resolution)) + 1
+		return temperatures[0] + np.arange(count) * resolution
+
+	def __compile(self, outsideTemperatures, indoorTemperatures, values):
+		# interpolate along the indoor axis for every table row, then along the outside axis
+		rows = np.array([np.interp(self.indoorGrid, indoorTemperatures, row) for row in values])
+		return np.array([np.interp(self.outsideGrid, outsideTemperatures, rows[:, column]) for column in range(rows.shape[1])]).T.copy()
+
+class TableEquipment():
+	"""Heating and cooling equipment described by performance tables, replacing the fixed gasRateEnergy
+	and airConditioningEnergy of the HVAC.
+
+	The HVAC still runs its furnace and A/C sequences (ignition, blower delays, shutdown, overhead
+	blower power); the equipment scales the heat that sequence delivers by the table capacity and
+	replaces the gas or compressor energy with the table power.
+
+		Keyword Arguments:
+			heatingTables {list} -- PerformanceTable per heating stage, None when the equipment can't heat (default: {None})
+			coolingTable {PerformanceTable} -- None when the equipment can't cool (default: {None})
+			heatingIsElectric {bool} -- the heating power is electricity (heat pump) rather than gas (furnace) (default: {False})
+			stageUpSeconds {float} -- a running heating call moves up one stage after this many seconds (default: {600})
+	"""
+	__slots__ = ('heatingTables', 'coolingTable', 'heatingIsElectric', 'stageUpSeconds',
+		'GasEnergyUsed', 'ElectricEnergyUsed', 'ReplacedElectricEnergy')
+
+	def __init__(self, heatingTables = None, coolingTable:PerformanceTable = None, heatingIsElectric:bool = False, stageUpSeconds:float = 600):
+		if isinstance(heatingTables, PerformanceTable):
+			heatingTables = [heatingTables]
+		self.heatingTables = list(heatingTables) if heatingTables else []
+		self.coolingTable = coolingTable
+		self.heatingIsElectric = heatingIsElectric
+		self.stageUpSeconds = stageUpSeconds
+		self.reset()
+
+	def reset(self):
+		self.GasEnergyUsed = 0.0 # gas energy drawn by the equipment [W*s]
+		self.ElectricEnergyUsed = 0.0 # electric energy drawn by the equipment [W*s]
+		self.ReplacedElectricEnergy = 0.0 # compressor energy the HVAC counted that the equipment replaced [W*s]
+
+	def GetHeatInput(self, hvac, gasBurned:bool, outsideTemperature:float, indoorTemperature:float):
+		"""Gets the heat delivered to the house for the last simulated second of the HVAC and accounts the energy drawn
+
+		Arguments:
+			hvac {HVAC} -- The HVAC after SimulateOneSecond
+			gasBurned {bool} -- Whether the HVAC burned gas in the last second (the furnace is past ignition and not shutting down)
+
+		Returns:
+			float -- heat input [W], negative when cooling
+		"""
+		if hvac.HeatingIsOn:
+			if not self.heatingTables:
+				return 0.0
+			# the HVAC's heat profile (0 during ignition, ramping down during shutdown) scales the capacity
+			fraction = hvac.GetLastIntervalHeatingPower() / hvac.GetMaxHeatingPower()
+			if fraction == 0.0:
+				return 0.0
+			stage = int(hvac.LastHeatingDuration // self.stageUpSeconds)
+			if stage >= len(self.heatingTables):
+				stage = len(self.heatingTables) - 1
+			capacity, power = self.heatingTables[stage].Lookup(outsideTemperature, indoorTemperature)
+			if gasBurned:
+				if self.heatingIsElectric:
+					self.ElectricEnergyUsed = self.ElectricEnergyUsed + power
+				else:
+					self.GasEnergyUsed = self.GasEnergyUsed + power
+			return fraction * capacity
+
+		if hvac.CoolingIsOn:
+			compressorPower = hvac.GetLastIntervalCoolingPower()
+			if compressorPower == 0.0:
+				return 0.0
+			self.ReplacedElectricEnergy = self.ReplacedElectricEnergy + compressorPower
+			if self.coolingTable is None:
+				return 0.0
+			capacity, power = self.coolingTable.Lookup(outsideTemperature, indoorTemperature)
+			self.ElectricEnergyUsed = self.ElectricEnergyUsed + power
+			return -1.0 * capacity
+		return 0.0
@@ -0,0 +1,127 @@
+import numpy as np
+from gym_hvac.utils.dtype_policy import GetStorageDtype
+
+class HourlySchedule():
+	"""Values spread evenly over the day, expanded to a per second array
+
+		Arguments:
+			hourlyValues {list} -- The values of the day from midnight on, 24 are hourly, 48 half hourly, any count is spread
+				over the 24 hours
+
+		Keyword Arguments:
+			interpolate {bool} -- linearly interpolate between the hours instead of holding each hour's value (default: {False})
+	"""
+	__slots__ = ('hourlyValues', 'interpolate')
+
+	def __init__(self, hourlyValues, interpolate:bool = False):
+		self.hourlyValues = np.asarray(hourlyValues, dtype=np.float64)
+		if self.hourlyValues.ndim != 1 or len(self.hourlyValues) == 0:
+			raise ValueError("An hourly schedule needs at least one value.")
+		self.interpolate = interpolate
+
+	def ToSeconds(self, seconds:int):
+		"""Gets the schedule at every second from 0 to seconds, the schedule repeats every day
+		"""
+		hours = np.arange(seconds) / 3600.0
+		count = len(self.hourlyValues)
+		if not self.interpolate:
+			# each value holds for 24 / count hours, like the points the interpolation goes through
+			return self.hourlyValues[np.arange(seconds, dtype=np.int64) % 86400 * count // 86400]
+		# interpolate across midnight by appending the first hour again
+		values = np.append(self.hourlyValues, self.hourlyValues[0])
+		return np.interp(hours % 24, np.arange(len(values)) * 24.0 / count, values)
+
+class CompiledForcing():
+	"""The exogenous forcing of one episode aligned to the one second simulation grid
+
+		Attributes:
+			netGain {np.ndarray} -- internal, occupant and solar heat gains per second [W]
+			occupancy {np.ndarray} -- occupancy fraction per second (0 empty to 1 fully occupied)
+	"""
+	__slots__ = ('netGain', 'occupancy')
+
+	def __init__(self, netGain, occupancy):
+		self.netGain = netGain
+		self.occupancy = occupancy
+
+	def GetOccupancy(self, second:int):
+		"""Gets the occupancy at a second of the episode, the last value holds after the end
+		"""
+		if second >= len(self.occupancy):
+			second = len(self.occupancy) - 1
+		return float(self.occupancy[second])
+
+class ExogenousForcing():
+	"""Occupancy, internal and solar heat gain schedules of a building.
+
+	Compile expands them once into a single net gain array per second, the building then only
+	adds a precomputed term per simulated second.
+
+		Keyword Arguments:
+			occupancy {HourlySchedule} -- occupancy fraction, 0 empty to 1 fully occupied (default: {always empty})
+			occupantGains {float} -- heat given off by the occupants when fully occupied [W] (default: {400})
+			internalGains {HourlySchedule} -- appliances and lighting [W] (default: {None})
+			solarGains {HourlySchedule} -- solar heat through the windows [W] (default: {None})
+			dtype {str} -- The storage dtype of the compiled arrays, 'float32' or 'float64' (default: {'float64'})
+			cache {ForcingCache} -- Compile once per cache directory instead of once per process, the arrays are memory mapped from it (default: {None})
+	"""
+
+	def __init__(self, occupancy:HourlySchedule = None, occupantGains:float = 400, internalGains:HourlySchedule = None, solarGains:HourlySchedule = None,
+		dtype = 'float64', cache = None):
+		self.dtype = GetStorageDtype(dtype)
+		self.cache = cache
+		self.occupancy = occupancy
+		self.occupantGains = occupantGains
+		self.internalGains = internalGains
+		self.solarGains = solarGains
+		self.__compiled = {}
+
+	def __getstate__(self):
+		# with a cache the workers map the compiled arrays from it instead of getting a copy
+		state = self.__dict__.copy()
+		if self.cache is not None:
+			state['_ExogenousForcing__compiled'] = {}
+		return state
+
+	def GetCacheKey(self, seconds:int):
+		"""Gets the ForcingCache key of the compiled arrays, it changes with any schedule value
+		"""
+		schedules = [None if schedule is None else (schedule.hourlyValues, schedule.interpolate)
+			for schedule in [self.occupancy, self.internalGains, self.solarGains]]
+		return self.cache.MakeKey('ExogenousForcing', seconds, self.dtype.name, self.occupantGains, schedules)
+
+	def Compile(self, seconds:int):
+		"""Gets the CompiledForcing for an episode of the given length, schedules are deterministic so it is cached
+		"""
+		compiled = self.__compiled.get(seconds)
+		if compiled is not None:
+			return compiled
+
+		if self.cache is None:
+			netGain, occupancy = self.__CompileArrays(seconds)
+		else:
+			# one (2, seconds) array: the net gain, then the occupancy
+			netGain, occupancy = self.cache.GetOrCreate(self.GetCacheKey(seconds), lambda: np.stack(self.__CompileArrays(seconds)))
+		compiled = CompiledForcing(netGain, occupancy)
+		self.__compiled[seconds] = compiled
+		return compiled
+
+	def __CompileArrays(self, seconds:int):
+		occupancy = np.zeros(seconds)
+		if self.occupancy is not None:
+			occupancy = np.clip(self.occupancy.ToSeconds(seconds), 0.0, 1.0)
+		netGain = occupancy * self.occupantGains
+		for schedule in [self.internalGains, self.solarGains]:
+			if schedule is not None:
+				netGain = netGain + schedule.ToSeconds(seconds)
+		# the schedules are summed in float64 and only stored in the storage dtype
+		return netGain.astype(self.dtype, copy=False), occupancy.astype(self.dtype, copy=False)
+
+def CreateResidentialForcing():
+	"""Gets a typical weekday home: occupied overnight and in the evening, appliance peaks at meal times
+	and solar gains around midday
+	"""
+	occupancy = [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0.5, 1, 1, 1, 1, 1, 1]
+	internalGains = [150, 150, 150, 150, 150, 150, 400, 600, 300, 150, 150, 150, 200, 150, 150, 150, 150, 400, 800, 700, 500, 400, 300, 200]
+	solarGains = [0, 0, 0, 0, 0, 0, 0, 100, 300, 600, 900, 1100, 1200, 1100, 900, 600, 300, 100, 0, 0, 0, 0, 0, 0]
+	return ExogenousForcing(HourlySchedule(occupancy), 400, HourlySchedule(internalGains), HourlySchedule(solarGains, interpolate=True))
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+# bumped when the layout or the meaning of a cached array changes, old entries then stop matching
+# 2: held hourly schedules spread their values over the day like interpolated ones
+CACHE_FORMAT_VERSION = 2
+
+def _HashValue(hasher, value):
+	# arrays hash by dtype, shape and bytes, containers by their items, anything else by its repr
+	if isinstance(value, np.ndarray):
+		hasher.update(b'array' + str(value.dtype.descr).encode() + str(value.shape).encode())
+		hasher.update(np.ascontiguousarray(value).tobytes())
+	elif isinstance(value, (list, tuple)):
+		hasher.update(b'(' + str(len(value)).encode())
+		for item in value:
+			_HashValue(hasher, item)
+		hasher.update(b')')
+	elif isinstance(value, dict):
+		_HashValue(hasher, sorted(value.items()))
+	else:
+		hasher.update(type(value).__name__.encode() + b':' + repr(value).encode() + b';')
+
+class ForcingCache():
+	"""A content addressed directory of compiled episode data (forcing arrays, scenario batches) in .npy files.
+
+	An entry is written once, atomically (a temporary file renamed into place), and memory mapped read only by
+	every process that needs it, so the processes of a sweep share one copy in the page cache instead of each
+	compiling its own. Reading an entry marks it as used, when the directory grows past maxBytes the least
+	recently used entries are deleted. A process still mapping a deleted entry keeps its mapping.
+
+		Arguments:
+			directory {str} -- The cache directory, created when missing
+
+		Keyword Arguments:
+			maxBytes {int} -- The size the entries are evicted down to (default: {1 GiB})
+	"""
+
+	def __init__(self, directory:str, maxBytes:int = 1 << 30):
+		self.directory = directory
+		self.maxBytes = maxBytes
+		os.makedirs(directory, exist_ok=True)
+		self.Hits = 0
+		self.Misses = 0
+		self.Evictions = 0
+		self.BytesWritten = 0
+
+	def __getstate__(self):
+		# the counters are per process
+		state = self.__dict__.copy()
+		state.update(Hits=0, Misses=0, Evictions=0, BytesWritten=0)
+		return state
+
+	@staticmethod
+	def MakeKey(*parts):
+		"""Gets the content address of the parts an entry is compiled from
+
+		Returns:
+			str -- a hex digest
+		"""
+		hasher = hashlib.sha256()
+		_HashValue(hasher, (CACHE_FORMAT_VERSION,) + parts)
+		return hasher.hexdigest()
+
+	def GetPath(self, key:str):
+		return os.path.join(self.directory, key + '.npy')
+
+	def Load(self, key:str):
+		"""Gets a cached array memory mapped read only, None when it isn't cached
+		"""
+		path = self.GetPath(key)
+		try:
+			array = np.load(path, mmap_mode='r')
+		except (FileNotFoundError, ValueError):
+			# missing, or evicted between listing and opening
+			return None
+		try:
+			# the modification time orders the entries for eviction
+			os.utime(path)
+		except FileNotFoundError:
+			pass
+		return array
+
+	def Store(self, key:str, array):
+		"""Writes an array atomically, then evicts the least recently used entries over maxBytes
+
+		Returns:
+			np.ndarray -- the stored array memory mapped read only
+		"""
+		path = self.GetPath(key)
+		descriptor, temporaryPath = tempfile.mkstemp(dir=self.directory, prefix='.' + key, suffix='.tmp')
+		try:
+			with os.fdopen(descriptor, 'wb') as temporaryFile:
+				np.save(temporaryFile, np.ascontiguousarray(array))
+				temporaryFile.flush()
+				os.fsync(temporaryFile.fileno())
+			self.BytesWritten = self.BytesWritten + os.path.getsize(temporaryPath)
+			# another process writing the same key writes the same content, the last rename wins
+			os.replace(temporaryPath, path)
+		except BaseException:
+			if os.path.exists(temporaryPath):
+				os.remove(temporaryPath)
+			raise
+		self.Evict(keep=path)
+		return np.load(path, mmap_mode='r')
+
+	def GetOrCreate(self, key:str, create):
+		"""Gets a cached array, or creates it with create() and stores it
+
+		Returns:
+			np.ndarray -- memory mapped read only
+		"""
+		array = self.Load(key)
+		if array is not None:
+			self.Hits = self.Hits + 1
+			return array
+		self.Misses = self.Misses + 1
+		return self.Store(key, create())
+
+	def GetEntries(self):
+		"""Gets the cached entries, least recently used first
+
+		Returns:
+			list -- (modification time, bytes, path) per entry
+		"""
+		entries = []
+		with os.scandir(self.directory) as scan:
+			for entry in scan:
+				if entry.name.endswith('.npy') and not entry.name.startswith('.'):
+					try:
+						status = entry.stat()
+					except FileNotFoundError:
+						continue
+					entries.append((status.st_mtime, status.st_size, entry.path))
+		entries.sort()
+		return entries
+
+	def GetSize(self):
+		return sum(size for _, size, _ in self.GetEntries())
+
+	def Evict(self, keep:str = None):
+		"""Deletes the least recently used entries until the cache is within maxBytes
+
+		Keyword Arguments:
+			keep {str} -- A path that is never evicted, the entry just written (default: {None})
+		"""
+		entries = self.GetEntries()
+		size = sum(entrySize for _, entrySize, _ in entries)
+		for _, entrySize, path in entries:
+			if size <= self.maxBytes:
+				break
+			if path == keep:
+				continue
+			try:
+				os.remove(path)
+				self.Evictions = self.Evictions + 1
+			except FileNotFoundError:
+				pass
+			size = size - entrySize
+
+	def GetStats(self):
+		"""Gets the counters of this process
+
+		Returns:
+			dict -- hits, misses, evictions, bytesWritten and hitRate
+		"""
+		lookups = self.Hits + self.Misses
+		return {'hits': self.Hits, 'misses': self.Misses, 'evictions': self.Evictions, 'bytesWritten': self.BytesWritten,
+			'hitRate': self.Hits / lookups if lookups else 0.0}
@@ -1,4 +1,37 @@
 from datetime import timedelta
+import numpy as np
+from .hvac_event_log import HvacEventLog, PHASE_OFF, PHASE_IGNITION, PHASE_GAS_ON, PHASE_RUNNING, PHASE_SHUTDOWN, PHASE_SHUTDOWN_BLOWER, PHASE_COOLING
+
+# the state of an HVAC between two seconds, see HVAC.GetState
+HVAC_STATE_DTYPE = np.dtype([
+	('gasRateEnergy', '<f8'),
+	('airConditioningEnergy', '<f8'),
+	('TotalPowerUsed', '<f8'),
+	('TotalTimeInSeconds', '<i8'),
+	('TotalPowerHeatingUsed', '<f8'),
+	('TotalPowerCoolingUsed', '<f8'),
+	('TotalDurationHeatingOn', '<f8'),
+	('TotalDurationCoolingOn', '<f8'),
+	('CoolingIsOn', '?'),
+	('HeatingIsShuttingDown', '?'),
+	('HeatingIsOn', '?'),
+	('LastCoolingDuration', '<i8'),
+	('LastHeatingDuration', '<i8'),
+	('TotalGasEnergyUsed', '<f8'),
+	('NumberOfTimesHeatingTurnedOn', '<i8'),
+	('NumberOfTimesCoolingTurnedOn', '<i8'),
+	('HeatingShutoffDuration', '<i8'),
+	('lastCoolingEnergyInputed', '<f8'),
+	('lastHeatingEnergyInputed', '<f8')])
+
+def _ToSeconds(duration:timedelta):
+	"""Converts a timedelta to seconds, whole seconds stay ints so the common values are shared small ints
+	"""
+	seconds = duration.total_seconds()
+	if seconds.is_integer():
+		return int(seconds)
+	return seconds
+
 class HVAC():
 	"""Simulates an HVAC system with the startup times 
 	and all of the of the cycles that a normal furnace has		
@@ -14,7 +47,21 @@ class HVAC():
 			flameIgnitorDuration {timedelta} -- the time from the beginning of the heater being on that power is applied to the flame starter (default: {30 seconds})
 			gasValveOpenDelay {timedelta} -- the time from the beginning of the heater being on before the gas is turned on (default: {30 seconds})
 			houseBlowerOnDelay {timedelta} -- the time from the beginning of the heater being on before the blower turns on (default: {70 seconds})
+
+		The timing parameters are converted to seconds once at construction, the state lives in __slots__
+		so the per second simulation doesn't go through an attribute dictionary.
 		"""
+	__slots__ = (
+		'__gas_valve_energy', '__gas_vent_blower_energy', '__gas_rate_energy', '__flame_ignitor_energy',
+		'__house_blower_energy', '__air_conditioning_energy',
+		'__gas_vent_shut_off_seconds', '__gas_valve_shut_off_seconds', '__flame_ignitor_seconds',
+		'__gas_valve_open_seconds', '__house_blower_on_seconds',
+		'TotalPowerUsed', 'TotalTimeInSeconds', 'TotalPowerHeatingUsed', 'TotalPowerCoolingUsed',
+		'TotalDurationHeatingOn', 'TotalDurationCoolingOn', 'CoolingIsOn', 'HeatingIsShuttingDown', 'HeatingIsOn',
+		'LastCoolingDuration', 'LastHeatingDuration', 'TotalGasEnergyUsed',
+		'NumberOfTimesHeatingTurnedOn', 'NumberOfTimesCoolingTurnedOn',
+		'__HeatingShutoffDuration', '__lastCoolingEnergyInputed', '__lastHeatingEnergyInputed', '__event_log')
+
 	def __init__(self, 
 	gasValveEnergy=12, 
 	gasVentBlowerEnergy=184, 
@@ -34,11 +81,12 @@ class HVAC():
 		self.__flame_ignitor_energy = flameIgnitorEnergy
 		self.__house_blower_energy = houseBlowerEnergy
 		self.__air_conditioning_energy = airConditioningEnergy
-		self.__gas_vent_shut_off_delta = gasVentShutOffDelta
-		self.__gas_valve_shut_off_delta = gasValveShutOffDelta
-		self.__flame_ignitor_duration = flameIgnitorDuration
-		self.__gas_valve_open_delay = gasValveOpenDelay
-		self.__house_blower_on_delay = houseBlowerOnDelay
+		# timing parameters in seconds, the shut off deltas are negative so they are flipped to durations
+		self.__gas_vent_shut_off_seconds = _ToSeconds(-1 * gasVentShutOffDelta)
+		self.__gas_valve_shut_off_seconds = _ToSeconds(-1 * gasValveShutOffDelta)
+		self.__flame_ignitor_seconds = _ToSeconds(flameIgnitorDuration)
+		self.__gas_valve_open_seconds = _ToSeconds(gasValveOpenDelay)
+		self.__house_blower_on_seconds = _ToSeconds(houseBlowerOnDelay)
 
 		# Initialize Public Variables
 		self.TotalPowerUsed = 0.0 # The total number of watts used
@@ -60,6 +108,7 @@ class HVAC():
 		self.__HeatingShutoffDuration = 0 # Used to keep track of how long we have been shutting down the heater
 		self.__lastCoolingEnergyInputed = 0 # Used to keep track of the last amount of just cooling energy that was inputed into the house
 		self.__lastHeatingEnergyInputed = 0 # Used to keep track of the last amount of just heating energy that was inputed into the house (this is 0 during heating start up)
+		self.__event_log = None # the phase transitions, only recorded once EnableEventLog was called
 
 		
 	def reset(self):
@@ -83,6 +132,8 @@ class HVAC():
 		self.__HeatingShutoffDuration = 0 # Used to keep track of how long we have been shutting down the heater
 		self.__lastCoolingEnergyInputed = 0 # Used to keep track of the last amount of just cooling energy that was inputed into the house
 		self.__lastHeatingEnergyInputed = 0 # Used to keep track of the last amount of just heating energy that was inputed into the house (this is 0 during heating start up)
+		if self.__event_log is not None:
+			self.__event_log.Clear()
 
 
 	def TurnCoolingOn(self):
@@ -173,6 +224,8 @@ class HVAC():
 		"""Runs the model for 1 second to determine the total energy used
 		"""
 		energyConsumedSum = 0.0
+		if self.__event_log is not None:
+			self.__RecordPhase()
 		self.TotalTimeInSeconds = self.TotalTimeInSeconds + 1
 		self.__lastCoolingEnergyInputed = 0.0
 		self.__lastHeatingEnergyInputed = 0.0
@@ -201,6 +254,125 @@ class HVAC():
 		self.TotalPowerUsed = self.TotalPowerUsed + energyConsumedSum
 		return energyConsumedSum
 
+	def IsInSteadyPhase(self):
+		"""Whether the HVAC is in a phase where every second uses the same power (off, cooling, or heating mid run)
+		"""
+		if self.HeatingIsOn:
+			return not self.HeatingIsShuttingDown and self.LastHeatingDuration >= self.__house_blower_on_seconds
+		return True
+
+	def GetSteadyPower(self):
+		"""Gets the heat put into the house every second of the current steady phase, negative while cooling
+		"""
+		if self.HeatingIsOn:
+			return self.__gas_rate_energy
+		if self.CoolingIsOn:
+			return -1.0 * self.__air_conditioning_energy
+		return 0.0
+
+	def GetRunningHeatPower(self, heating:bool):
+		"""Gets the heat put into the house every second mid run, negative while cooling
+		"""
+		if heating:
+			return self.__gas_rate_energy
+		return -1.0 * self.__air_conditioning_energy
+
+	def GetRunningElectricPower(self, heating:bool):
+		"""Gets the electric power of every second mid run, the gas valve and blowers while heating, the compressor and blower while cooling
+		"""
+		if heating:
+			return self.__gas_valve_energy + self.__house_blower_energy + self.__gas_vent_blower_energy
+		return self.__air_conditioning_energy + self.__house_blower_energy
+
+	def SimulateSeconds(self, seconds:int):
+		"""Runs the model for a number of seconds, advancing the steady phases in one batch.
+
+		Transient phases (furnace start up and shutdown) are still simulated second by second,
+		so the counters end up exactly where repeated calls to SimulateOneSecond would leave them.
+
+		Arguments:
+			seconds {int} -- The number of seconds to simulate
+
+		Returns:
+			float -- The total energy consumed over the seconds
+		"""
+		energyConsumedSum = 0.0
+		while seconds > 0 and not self.IsInSteadyPhase():
+			energyConsumedSum = energyConsumedSum + (self.SimulateOneSecond() or 0.0)
+			seconds = seconds - 1
+		if seconds <= 0:
+			return energyConsumedSum
+
+		if self.__event_log is not None:
+			self.__RecordPhase()
+		self.TotalTimeInSeconds = self.TotalTimeInSeconds + seconds
+		self.__lastCoolingEnergyInputed = 0.0
+		self.__lastHeatingEnergyInputed = 0.0
+		if self.HeatingIsOn:
+			# gas vent, gas energy, gas valve and house blower are all running
+			self.__lastHeatingEnergyInputed = self.__gas_rate_energy
+			heatingSum = (self.__gas_valve_energy + self.__house_blower_energy + self.__gas_rate_energy + self.__gas_vent_blower_energy) * seconds
+			self.TotalGasEnergyUsed = self.TotalGasEnergyUsed + self.__gas_rate_energy * seconds
+			self.TotalPowerHeatingUsed = self.TotalPowerHeatingUsed + heatingSum
+			self.LastHeatingDuration = self.LastHeatingDuration + seconds
+			self.TotalDurationHeatingOn = self.TotalDurationHeatingOn + seconds
+			self.TotalPowerUsed = self.TotalPowerUsed + heatingSum
+			return energyConsumedSum + heatingSum
+
+		if self.CoolingIsOn:
+			self.__lastCoolingEnergyInputed = self.__air_conditioning_energy
+			acSum = (self.__air_conditioning_energy + self.__house_blower_energy) * seconds
+			self.TotalPowerCoolingUsed = self.TotalPowerCoolingUsed + acSum
+			self.TotalDurationCoolingOn = self.TotalDurationCoolingOn + seconds
+			self.LastCoolingDuration = self.LastCoolingDuration + seconds
+			self.TotalPowerUsed = self.TotalPowerUsed + acSum
+			return energyConsumedSum + acSum
+
+		return energyConsumedSum
+
+	def EnableEventLog(self, capacity:int = 256):
+		"""Starts recording the phase transitions, the log is cleared by reset
+
+		Keyword Arguments:
+			capacity {int} -- The events preallocated (default: {256})
+
+		Returns:
+			HvacEventLog -- the log
+		"""
+		if self.__event_log is None:
+			self.__event_log = HvacEventLog(capacity)
+		return self.__event_log
+
+	def GetEventLog(self):
+		return self.__event_log
+
+	def GetPhase(self):
+		"""Gets the phase the next simulated second is in, see hvac_event_log
+
+		Returns:
+			tuple -- the phase and the power it uses every second [W]
+		"""
+		if self.HeatingIsOn:
+			if self.HeatingIsShuttingDown:
+				if self.__HeatingShutoffDuration < self.__gas_vent_shut_off_seconds:
+					return (PHASE_SHUTDOWN, self.__gas_vent_blower_energy + self.__house_blower_energy)
+				if self.__HeatingShutoffDuration < self.__gas_valve_shut_off_seconds:
+					return (PHASE_SHUTDOWN_BLOWER, self.__house_blower_energy)
+				# the second the furnace finishes shutting down doesn't use any power
+				return (PHASE_OFF, 0.0)
+			if self.LastHeatingDuration < self.__flame_ignitor_seconds:
+				return (PHASE_IGNITION, self.__gas_vent_blower_energy + self.__flame_ignitor_energy)
+			if self.LastHeatingDuration < self.__house_blower_on_seconds:
+				return (PHASE_GAS_ON, self.__gas_valve_energy + self.__gas_rate_energy + self.__gas_vent_blower_energy)
+			return (PHASE_RUNNING, self.__gas_valve_energy + self.__house_blower_energy + self.__gas_rate_energy + self.__gas_vent_blower_energy)
+		if self.CoolingIsOn:
+			return (PHASE_COOLING, self.__air_conditioning_energy + self.__house_blower_energy)
+		return (PHASE_OFF, 0.0)
+
+	def __RecordPhase(self):
+		phase, power = self.GetPhase()
+		self.__event_log.Record(self.TotalTimeInSeconds, phase, power)
+
 	def __SumHeating__(self):
 		"""Sums the heating portions of the HVAC for one second, and keeps track of the stage of the heating (starting, running, and cooling)
 		"""
@@ -210,9 +382,9 @@ class HVAC():
 		# check whether it is shutting down, this is a first check in case they decide to shutdown in the middle of the startup
 		if self.HeatingIsShuttingDown:
 			self.__lastHeatingEnergyInputed = self.__determine_shutdown_heat_energy()
-			if self.__HeatingShutoffDuration < (-1 * self.__gas_vent_shut_off_delta.total_seconds()) :
+			if self.__HeatingShutoffDuration < self.__gas_vent_shut_off_seconds:
 				heatingSum = heatingSum + self.__gas_vent_blower_energy
-			if self.__HeatingShutoffDuration < (-1 * self.__gas_valve_shut_off_delta.total_seconds()) :
+			if self.__HeatingShutoffDuration < self.__gas_valve_shut_off_seconds:
 				heatingSum = heatingSum + self.__house_blower_energy
 			else:
 				# we have finished the shut off cycle
@@ -220,9 +392,9 @@ class HVAC():
 				self.HeatingIsShuttingDown = False
 
 		# heater is starting up
-		elif self.LastHeatingDuration < self.__house_blower_on_delay.total_seconds():
+		elif self.LastHeatingDuration < self.__house_blower_on_seconds:
 			# Pre gas turns on
-			if self.LastHeatingDuration < self.__flame_ignitor_duration.total_seconds():
+			if self.LastHeatingDuration < self.__flame_ignitor_seconds:
 				heatingSum = heatingSum + self.__gas_vent_blower_energy + self.__flame_ignitor_energy
 			else:
 				# after the gas turns on, but the blower hasn't turned on yet
@@ -253,7 +425,7 @@ class HVAC():
 	def __determine_shutdown_heat_energy(self):
 		"""Used to calculate the amount of energy that is still left in the heat register that could be added to the house
 		"""
-		totalShutdownTime = -1 * self.__gas_valve_shut_off_delta.total_seconds()
+		totalShutdownTime = self.__gas_valve_shut_off_seconds
 		timeRemaining = totalShutdownTime - self.__HeatingShutoffDuration
 		if timeRemaining <= 0:
 			return 0.0
@@ -303,6 +475,51 @@ class HVAC():
 		dthUsed = self.ConvertWattsToDTH(totalGasEnergyUsed, self.TotalDurationHeatingOn)
 		return dthUsed
 
+	def GetParameters(self):
+		"""Gets the energy and timing parameters, HVACs with equal parameters behave the same
+		"""
+		return (self.__gas_valve_energy, self.__gas_vent_blower_energy, self.__gas_rate_energy, self.__flame_ignitor_energy,
+			self.__house_blower_energy, self.__air_conditioning_energy, self.__gas_vent_shut_off_seconds, self.__gas_valve_shut_off_seconds,
+			self.__flame_ignitor_seconds, self.__gas_valve_open_seconds, self.__house_blower_on_seconds)
+
+	def SetCapacity(self, gasRateEnergy:float, airConditioningEnergy:float):
+		"""Resizes the furnace and the A/C, e.g. for a new random scenario before a reset
+
+		Arguments:
+			gasRateEnergy {float} -- the heating energy of the burning gas [W]
+			airConditioningEnergy {float} -- the energy of the A/C compressor [W]
+		"""
+		self.__gas_rate_energy = gasRateEnergy
+		self.__air_conditioning_energy = airConditioningEnergy
+
+	def GetState(self):
+		"""Gets the capacity, counters and phase of the HVAC, SetState on an HVAC with the same parameters continues from them.
+		The event log isn't part of the state.
+
+		Returns:
+			tuple -- the state in HVAC_STATE_DTYPE field order
+		"""
+		return (self.__gas_rate_energy, self.__air_conditioning_energy, self.TotalPowerUsed, self.TotalTimeInSeconds,
+			self.TotalPowerHeatingUsed, self.TotalPowerCoolingUsed, self.TotalDurationHeatingOn, self.TotalDurationCoolingOn,
+			self.CoolingIsOn, self.HeatingIsShuttingDown, self.HeatingIsOn, self.LastCoolingDuration, self.LastHeatingDuration,
+			self.TotalGasEnergyUsed, self.NumberOfTimesHeatingTurnedOn, self.NumberOfTimesCoolingTurnedOn,
+			self.__HeatingShutoffDuration, self.__lastCoolingEnergyInputed, self.__lastHeatingEnergyInputed)
+
+	def SetState(self, state):
+		"""Continues from a state of GetState
+
+		Arguments:
+			state {tuple} -- in HVAC_STATE_DTYPE field order, or an HVAC_STATE_DTYPE record
+		"""
+		if isinstance(state, (np.void, np.ndarray)):
+			state = state.item()
+		(gasRateEnergy, airConditioningEnergy, self.TotalPowerUsed, self.TotalTimeInSeconds,
+			self.TotalPowerHeatingUsed, self.TotalPowerCoolingUsed, self.TotalDurationHeatingOn, self.TotalDurationCoolingOn,
+			self.CoolingIsOn, self.HeatingIsShuttingDown, self.HeatingIsOn, self.LastCoolingDuration, self.LastHeatingDuration,
+			self.TotalGasEnergyUsed, self.NumberOfTimesHeatingTurnedOn, self.NumberOfTimesCoolingTurnedOn,
+			self.__HeatingShutoffDuration, self.__lastCoolingEnergyInputed, self.__lastHeatingEnergyInputed) = state
+		self.SetCapacity(gasRateEnergy, airConditioningEnergy)
+
 	def GetMaxGasEnergyForTime(self, seconds:int):
 		return self.GetMaxHeatingPower() * seconds
 
@@ -1,7 +1,50 @@
 from datetime import timedelta
+import numpy as np
 from .hvac import HVAC
+from .equipment import TableEquipment
+from .forcing import CompiledForcing
+from .envelope import TwoNodeEnvelope
+from .duty_gradients import SimulateDutySchedule
 from gym_hvac.utils import HvacBuildingTracker
+from gym_hvac.utils.dtype_policy import GetStorageDtype
 #import building
+
+# CalculateMaxEneregyCostForTime by (HVAC parameters, seconds, dollarsPerDTH)
+_MAX_ENERGY_COST = {}
+
+def GetRunChunkDtype(dtype = 'float64'):
+	"""Gets the record of a second in the chunks of HvacBuilding.iter_run, the temperatures and the power are
+	stored in the storage dtype, the time and the cost (a running total) in 64 bits
+
+	Fields: the second of the HVAC's clock it starts at, the indoor temperature at its end and the outside temperature [C],
+	the power the HVAC used [W], the cost since the run started [US$] and the HVAC phase (see hvac_event_log)
+	"""
+	dtype = GetStorageDtype(dtype)
+	return np.dtype([
+		('time', '<i8'),
+		('indoorTemperature', dtype),
+		('outsideTemperature', dtype),
+		('power', dtype),
+		('cost', '<f8'),
+		('mode', '<i1')])
+
+RUN_CHUNK_DTYPE = GetRunChunkDtype()
+
+# the state of a building between two seconds without its HVAC's, see HvacBuilding.GetState
+BUILDING_STATE_DTYPE = np.dtype([
+	('temperature', '<f8'),
+	('massTemperature', '<f8'),
+	('lastOutsideTemperature', '<f8'),
+	('maxEnergyCost', '<f8'),
+	('heatMassCapacity', '<f8'),
+	('heatTransmission', '<f8'),
+	('conditionedFloorArea', '<f8'),
+	('dtByCm', '<f8'),
+	('decay', '<f8'),
+	('equipmentGasEnergyUsed', '<f8'),
+	('equipmentElectricEnergyUsed', '<f8'),
+	('equipmentReplacedElectricEnergy', '<f8')])
+
 class HvacBuilding():
 	"""A simple Hvac Building Energy Model.
 
@@ -17,7 +60,16 @@ class HvacBuilding():
 		* initial_building_temperature: building temperature at start time [℃]
 		* conditioned_floor_area:       [m**2]
 		* hvacTracker {HvacTracker} : The tracker to keep track of metrics with the HVAC (default: {None})
+		* equipment {TableEquipment} : Performance table equipment replacing the HVAC's fixed heating and cooling power (default: {None})
+		* envelope {TwoNodeEnvelope} : A 2R2C air and mass envelope used instead of heat_mass_capacity and heat_transmission (default: {None})
+
+	The discretization factors of the one second time step are computed once at construction.
 	"""
+	__slots__ = ('building_hvac', 'current_temperature', 'mass_temperature',
+		'__heat_mass_capacity', '__heat_transmission', '__maximum_cooling_power', '__maximum_heating_power',
+		'__time_step_size', '__conditioned_floor_area', '__hvac_building_tracker',
+		'__last_outside_temperature', '__MaxEnergyReward', '__dt_by_cm', '__decay', '__equipment',
+		'__forcing', '__forcing_array', '__compiled_forcing', '__envelope', '__transition')
 
 	def __init__(self, 
 	hvac: HVAC, 
@@ -25,7 +77,9 @@ class HvacBuilding():
 	heat_transmission,
 	initial_building_temperature: float,
 	conditioned_floor_area,
-	hvacBuildingTracker:HvacBuildingTracker = None):
+	hvacBuildingTracker:HvacBuildingTracker = None,
+	equipment:TableEquipment = None,
+	envelope:TwoNodeEnvelope = None):
 
 		self.building_hvac = hvac
 		self.__heat_mass_capacity = heat_mass_capacity
@@ -38,6 +92,18 @@ class HvacBuilding():
 		self.__hvac_building_tracker = hvacBuildingTracker
 		self.__last_outside_temperature = 0.0
 		self.__MaxEnergyReward = 0.0
+		self.__dt_by_cm = self.__time_step_size.total_seconds() / self.__heat_mass_capacity
+		self.__decay = 1 - self.__dt_by_cm * self.__heat_transmission
+		self.__equipment = equipment
+		self.__forcing = None
+		self.__forcing_array = None
+		self.__compiled_forcing = None
+		# the mass node of a two node envelope, it follows the air temperature in the single node model
+		self.mass_temperature = initial_building_temperature
+		self.__envelope = envelope
+		self.__transition = None
+		if envelope is not None:
+			self.__transition = envelope.GetTransition(self.__time_step_size.total_seconds())
 
 
 	def step(self, outside_temperature:float):
@@ -49,42 +115,192 @@ class HvacBuilding():
 		Returns:
 			* tuple of the State
 		"""
-
-		def next_temperature(heating_cooling_power):
-			"""Gets the next temperature of the building
-			
-			Arguments:
-				heating_cooling_power {watts} -- Amount of power used to heat or cool
-			
-			Returns:
-				float -- Temperature in C
-			"""
-
-			return self._next_temperature(
-				outside_temperature=outside_temperature,
-				heating_cooling_power=heating_cooling_power
-			)
-
 		# Simulate the one second with the hvac to get the values that will be used
 		self.__last_outside_temperature = outside_temperature
-		self.building_hvac.SimulateOneSecond()
+		if self.__equipment != None:
+			gasBefore = self.building_hvac.TotalGasEnergyUsed
+			self.building_hvac.SimulateOneSecond()
+			btu_power = self.__equipment.GetHeatInput(self.building_hvac, self.building_hvac.TotalGasEnergyUsed != gasBefore, outside_temperature, self.current_temperature)
+		else:
+			self.building_hvac.SimulateOneSecond()
 
-		# check whether the heater of Cooling is on
-		btu_power = 0.0
-		if self.building_hvac.HeatingIsOn:
-			btu_power = self.building_hvac.GetLastIntervalHeatingPower()
+			# check whether the heater of Cooling is on
+			btu_power = 0.0
+			if self.building_hvac.HeatingIsOn:
+				btu_power = self.building_hvac.GetLastIntervalHeatingPower()
 
-		elif self.building_hvac.CoolingIsOn:
-			btu_power = -1.0 *self.building_hvac.GetLastIntervalCoolingPower()
+			elif self.building_hvac.CoolingIsOn:
+				btu_power = -1.0 *self.building_hvac.GetLastIntervalCoolingPower()
 		
-		next_temperature_heating_cooling = next_temperature(btu_power)
+		if self.__envelope is None:
+			next_temperature_heating_cooling = self._next_temperature(outside_temperature, btu_power)
+			if self.__forcing is not None:
+				# precomputed temperature change of the heat gains in this second
+				second = self.building_hvac.TotalTimeInSeconds - 1
+				if second >= len(self.__forcing):
+					second = len(self.__forcing) - 1
+				next_temperature_heating_cooling = next_temperature_heating_cooling + self.__forcing[second]
+		else:
+			if self.__forcing is not None:
+				# the gains heat the air node like the HVAC does
+				second = self.building_hvac.TotalTimeInSeconds - 1
+				if second >= len(self.__forcing):
+					second = len(self.__forcing) - 1
+				btu_power = btu_power + self.__forcing[second]
+			next_temperature_heating_cooling = self._next_envelope_temperature(self.__transition, outside_temperature, btu_power)
 		self.current_temperature = next_temperature_heating_cooling
 		
 		# if the hvac_building_tracker exists, then we will add a sample to it.
 		if self.__hvac_building_tracker != None:
 			self.__hvac_building_tracker.AddSample(next_temperature_heating_cooling, outside_temperature, self.building_hvac.GetAverageWattsPerSecond())
 		return (outside_temperature, self.current_temperature, self.building_hvac.GetAverageWattsPerSecond())
-	
+
+	def StepSeconds(self, outside_temperature:float, seconds:int):
+		"""Performs the building simulation for a number of seconds with a constant outside temperature.
+
+		While the HVAC is in a steady phase the temperature is integrated in closed form
+		instead of one second at a time. Start up and shutdown are still stepped per second.
+		When a tracker or equipment is attached every second is stepped, the tracker keeps its samples
+		and the equipment capacity follows the indoor temperature. So is a two node envelope with heat gains.
+
+		Parameters:
+			* outside_temperature: [℃]
+			* seconds: number of seconds to simulate
+
+		Returns:
+			* tuple of the State
+		"""
+		if self.__hvac_building_tracker != None or self.__equipment != None or (self.__envelope is not None and self.__forcing is not None):
+			for i in range(seconds):
+				self.step(outside_temperature)
+			return self.get_state(outside_temperature)
+
+		while seconds > 0 and not self.building_hvac.IsInSteadyPhase():
+			self.step(outside_temperature)
+			seconds = seconds - 1
+		if seconds <= 0:
+			return self.get_state(outside_temperature)
+
+		self.__last_outside_temperature = outside_temperature
+		self.building_hvac.SimulateSeconds(seconds)
+		btu_power = 0.0
+		if self.building_hvac.HeatingIsOn:
+			btu_power = self.building_hvac.GetLastIntervalHeatingPower()
+		elif self.building_hvac.CoolingIsOn:
+			btu_power = -1.0 * self.building_hvac.GetLastIntervalCoolingPower()
+
+		if self.__envelope is not None:
+			self.current_temperature = self._next_envelope_temperature(self.__envelope.GetTransition(seconds), outside_temperature, btu_power)
+			return self.get_state(outside_temperature)
+
+		temperature = self._next_temperature_after(outside_temperature, btu_power, seconds)
+		if self.__forcing is not None:
+			# every second's gain decays with the building over the rest of the batch
+			first = self.building_hvac.TotalTimeInSeconds - seconds
+			gains = self.__forcing_array[np.minimum(np.arange(first, first + seconds), len(self.__forcing_array) - 1)]
+			temperature = temperature + float(np.dot(self.__decay ** np.arange(seconds - 1, -1, -1), gains))
+		self.current_temperature = temperature
+		return self.get_state(outside_temperature)
+
+	def iter_run(self, controller, weather, chunk_seconds:int = 3600, seconds:int = None, control_seconds:int = 1, dtype = 'float64',
+		dollarsPerKiloWattHour = 0.1149, dollarsPerDTH = 6.53535):
+		"""Simulates second by second and yields the run in chunks instead of growing a list per quantity, so a run of
+		any length is processed with the memory of one chunk.
+
+		Parameters:
+			* controller:      called as controller(hvacBuilding, outside_temperature) every control_seconds before the second
+			                   is simulated, it switches the HVAC (e.g. a HysteresisThermostat), None leaves the HVAC as it is
+			* weather:         the outside temperature of every hour of the HVAC's clock, the last hour is kept after them [℃],
+			                   or a function of an array of seconds that returns their outside temperatures
+			* chunk_seconds:   the seconds in a chunk, the last chunk may be shorter
+			* seconds:         the seconds to run, every hour of the weather by default
+			* control_seconds: the seconds between calls of the controller
+			* dtype:           the storage dtype of the temperatures and the power, see GetRunChunkDtype
+
+		Yields:
+			* np.ndarray of chunk_seconds records, a new array for every chunk
+		"""
+		if seconds is None:
+			if callable(weather):
+				raise ValueError("The seconds to run are needed when the weather is a function.")
+			seconds = len(weather) * 3600
+		if chunk_seconds < 1 or control_seconds < 1:
+			raise ValueError("The chunk and control seconds have to be positive.")
+		chunkDtype = GetRunChunkDtype(dtype)
+		hvac = self.building_hvac
+		hourly = None if callable(weather) else np.asarray(weather, dtype=np.float64)
+		startPower = hvac.TotalPowerUsed
+		startGas = hvac.TotalGasEnergyUsed
+		startCost = self.CalculateGasEneregyCost(dollarsPerDTH) + self.CalculateElectricEneregyCost(dollarsPerKiloWattHour)
+		previousPower = startPower
+		done = 0
+		while done < seconds:
+			length = min(chunk_seconds, seconds - done)
+			times = np.arange(hvac.TotalTimeInSeconds, hvac.TotalTimeInSeconds + length)
+			if hourly is None:
+				outside = np.asarray(weather(times), dtype=np.float64)
+			else:
+				outside = hourly[np.minimum(times // 3600, len(hourly) - 1)]
+			indoor = []
+			modes = []
+			totalPower = []
+			totalGas = []
+			costs = []
+			for offset, outsideTemperature in enumerate(outside.tolist()):
+				if controller is not None and (done + offset) % control_seconds == 0:
+					controller(self, outsideTemperature)
+				modes.append(hvac.GetPhase()[0])
+				self.step(outsideTemperature)
+				indoor.append(self.current_temperature)
+				totalPower.append(hvac.TotalPowerUsed)
+				totalGas.append(hvac.TotalGasEnergyUsed)
+				if self.__equipment != None:
+					# the equipment replaces part of the HVAC's energy, its cost can't be derived from the HVAC's totals
+					costs.append(self.CalculateGasEneregyCost(dollarsPerDTH) + self.CalculateElectricEneregyCost(dollarsPerKiloWattHour) - startCost)
+
+			chunk = np.empty(length, dtype=chunkDtype)
+			chunk['time'] = times
+			chunk['indoorTemperature'] = indoor
+			chunk['outsideTemperature'] = outside
+			totalPower = np.array(totalPower)
+			chunk['power'] = np.diff(totalPower, prepend=previousPower)
+			if costs:
+				chunk['cost'] = costs
+			else:
+				# the energy since the run started converted like CalculateGasEneregyCost and CalculateElectricEneregyCost
+				gas = np.array(totalGas) - startGas
+				electric = totalPower - startPower - gas
+				chunk['cost'] = (self.CalculateTimeFrameGasEneregyCost(hvac.ConvertWattsToDTH(gas, 1), dollarsPerDTH)
+					+ self.CalculateTimeFrameElectricEneregyCost(hvac.ConvertWattsToKWH(electric, 1), dollarsPerKiloWattHour))
+			chunk['mode'] = modes
+			previousPower = totalPower[-1]
+			done = done + length
+			yield chunk
+
+	def SetForcing(self, compiledForcing:CompiledForcing):
+		"""Sets the exogenous heat gains of the episode, aligned with the HVAC's TotalTimeInSeconds
+
+		Arguments:
+			compiledForcing {CompiledForcing} -- from ExogenousForcing.Compile, None removes the gains
+		"""
+		self.__compiled_forcing = compiledForcing
+		if compiledForcing is None or len(compiledForcing.netGain) == 0:
+			self.__forcing = None
+			self.__forcing_array = None
+			return
+		if self.__envelope is not None:
+			self.__forcing_array = np.array(compiledForcing.netGain, dtype=np.float64)
+		else:
+			self.__forcing_array = self.__dt_by_cm * compiledForcing.netGain
+		self.__forcing = self.__forcing_array.tolist()
+
+	def GetOccupancy(self):
+		"""Gets the occupancy fraction of the current second, 0 when no forcing is set
+		"""
+		if self.__compiled_forcing is None:
+			return 0.0
+		return self.__compiled_forcing.GetOccupancy(self.building_hvac.TotalTimeInSeconds)
+
 	def get_state(self, outsideTemperature:float):
 		"""Gets the current state of the building
 		"""
@@ -126,6 +342,14 @@ class HvacBuilding():
 
 		return maxCost * -1.0
 		
+	def DetermineRewardOccupiedComfort(self, previousTemp: float, actionCost: float, occupied: bool, comfortLow: float, comfortHigh: float):
+		"""Rewards saving money, but only pays when the temperature is comfortable while the building is occupied
+		"""
+		maxCost = self.__MaxEnergyReward
+		if occupied and (self.current_temperature < comfortLow or self.current_temperature > comfortHigh):
+			return maxCost * -1.0
+		return maxCost - actionCost
+
 	def DetermineRewardCost(self, previousTemp: float, actionCost: float):
 		
 		reward = (self.CalculateElectricEneregyCost() + self.CalculateGasEneregyCost())
@@ -160,16 +384,205 @@ class HvacBuilding():
 		#reward = reward + temperatureReward
 		return temperatureReward
 
-	def reset(self):
-		self.current_temperature = 18
+	def reset(self, temperature:float = 18):
+		self.current_temperature = temperature
+		self.mass_temperature = temperature
 		self.building_hvac.reset()
+		if self.__equipment != None:
+			self.__equipment.reset()
+
+	def SetParameters(self, heat_mass_capacity, heat_transmission, conditioned_floor_area, dt_by_cm:float = None, decay:float = None,
+		max_energy_cost:float = None, step_seconds:float = 300):
+		"""Replaces the building parameters without building a new model, the HVAC capacity has to be set before.
+
+		The discretization factors and the max energy cost of a step are computed when they aren't given,
+		a ScenarioSampler hands them in precomputed.
+
+		Parameters:
+			* heat_mass_capacity:     capacity of the building's heat mass [J/K]
+			* heat_transmission:      heat transmission to the outside [W/K]
+			* conditioned_floor_area: [m**2]
+			* dt_by_cm:               the time step divided by the heat mass capacity [s*K/J]
+			* decay:                  the share of the temperature kept over a time step, 1 - dt_by_cm * heat_transmission
+			* max_energy_cost:        the CalculateMaxEneregyCostForTime of a step [US$]
+			* step_seconds:           the step the max energy cost is computed for when it isn't given, 300 is the HvacEnv step [s]
+		"""
+		if self.__envelope is not None:
+			raise ValueError("The parameters of a two node envelope can't be replaced.")
+		self.__heat_mass_capacity = heat_mass_capacity
+		self.__heat_transmission = heat_transmission
+		self.__conditioned_floor_area = conditioned_floor_area
+		self.__maximum_cooling_power = self.building_hvac.GetMaxCoolingPower()
+		self.__maximum_heating_power = self.building_hvac.GetMaxHeatingPower()
+		if dt_by_cm is None:
+			dt_by_cm = self.__time_step_size.total_seconds() / heat_mass_capacity
+		if decay is None:
+			decay = 1 - dt_by_cm * heat_transmission
+		self.__dt_by_cm = dt_by_cm
+		self.__decay = decay
+		if max_energy_cost is None:
+			# the HVAC capacity may have changed, the max cost of the old one would be stale
+			max_energy_cost = self.CalculateMaxEneregyCostForTime(step_seconds)
+		self.__MaxEnergyReward = max_energy_cost
+		if self.__compiled_forcing is not None:
+			# the gains are precomputed as temperature changes, they scale with the heat mass capacity
+			self.SetForcing(self.__compiled_forcing)
+
+	def GetParameters(self):
+		"""Gets the heat mass capacity, heat transmission and conditioned floor area
+		"""
+		return (self.__heat_mass_capacity, self.__heat_transmission, self.__conditioned_floor_area)
+
+	def GetMaxEnergyCost(self):
+		return self.__MaxEnergyReward
+
+	def GetState(self):
+		"""Gets the temperatures, parameters and equipment counters, the HVAC's state comes from HVAC.GetState
+
+		Returns:
+			tuple -- the state in BUILDING_STATE_DTYPE field order, the equipment counters are 0 without equipment
+		"""
+		equipment = (0.0, 0.0, 0.0)
+		if self.__equipment != None:
+			equipment = (self.__equipment.GasEnergyUsed, self.__equipment.ElectricEnergyUsed, self.__equipment.ReplacedElectricEnergy)
+		return (self.current_temperature, self.mass_temperature, self.__last_outside_temperature, self.__MaxEnergyReward,
+			self.__heat_mass_capacity, self.__heat_transmission, self.__conditioned_floor_area, self.__dt_by_cm, self.__decay) + equipment
+
+	def SetState(self, state):
+		"""Continues from a state of GetState, set the HVAC's state first since the parameters depend on its capacity
+
+		Arguments:
+			state {tuple} -- in BUILDING_STATE_DTYPE field order, or a BUILDING_STATE_DTYPE record
+		"""
+		if isinstance(state, (np.void, np.ndarray)):
+			state = state.item()
+		(temperature, massTemperature, lastOutsideTemperature, maxEnergyCost, heatMassCapacity, heatTransmission,
+			conditionedFloorArea, dtByCm, decay, gasEnergyUsed, electricEnergyUsed, replacedElectricEnergy) = state
+		if self.__envelope is None:
+			self.SetParameters(heatMassCapacity, heatTransmission, conditionedFloorArea, dtByCm, decay, maxEnergyCost)
+		self.__MaxEnergyReward = maxEnergyCost
+		self.current_temperature = temperature
+		self.mass_temperature = massTemperature
+		self.__last_outside_temperature = lastOutsideTemperature
+		if self.__equipment != None:
+			self.__equipment.GasEnergyUsed = gasEnergyUsed
+			self.__equipment.ElectricEnergyUsed = electricEnergyUsed
+			self.__equipment.ReplacedElectricEnergy = replacedElectricEnergy
+
+	def SetMaxEnergyCost(self, max_energy_cost:float):
+		"""Sets the max energy cost of a step precomputed with CalculateMaxEneregyCostForTime, e.g. by a compiled env spec
+		"""
+		self.__MaxEnergyReward = max_energy_cost
 
 	def GetHvacBuildingTracker(self):
 		return self.__hvac_building_tracker
+
+	def GetEquipment(self):
+		return self.__equipment
 		
 	def _next_temperature(self, outside_temperature, heating_cooling_power):
-		dt_by_cm = self.__time_step_size.total_seconds() / self.__heat_mass_capacity
-		return (self.current_temperature * (1 - dt_by_cm * self.__heat_transmission) + dt_by_cm * (heating_cooling_power + self.__heat_transmission * outside_temperature))
+		return (self.current_temperature * self.__decay + self.__dt_by_cm * (heating_cooling_power + self.__heat_transmission * outside_temperature))
+
+	def _next_temperature_after(self, outside_temperature, heating_cooling_power, seconds:int):
+		"""Gets the temperature after applying _next_temperature for a number of seconds with constant inputs
+		"""
+		decay = self.__decay
+		drive = self.__dt_by_cm * (heating_cooling_power + self.__heat_transmission * outside_temperature)
+		if decay == 1:
+			return self.current_temperature + seconds * drive
+		decayN = decay ** seconds
+		return self.current_temperature * decayN + drive * (1 - decayN) / (1 - decay)
+
+	def SimulateDutySchedule(self, outsideTemperatures, heatingDuty, coolingDuty, intervalSeconds:int = 3600, comfortLow:float = 19.0,
+		comfortHigh:float = 23.0, comfortWeights = None, dollarsPerKiloWattHour = 0.1149, dollarsPerDTH = 6.53535):
+		"""Simulates a duty schedule from the current temperature with the averaged HVAC and gets the exact gradients
+		of the final temperature, the cost and the comfort penalty, see duty_gradients. The building isn't changed.
+
+		Parameters:
+			* outsideTemperatures:  the outside temperature of every interval [℃]
+			* heatingDuty:          the share of every interval the furnace runs
+			* coolingDuty:          the share of every interval the A/C runs
+			* intervalSeconds:      the length of an interval [s]
+			* comfortLow, comfortHigh: the comfort band of the penalty [℃]
+			* comfortWeights:       the weight of every interval's comfort (default all 1)
+
+		Returns:
+			* DutyTrajectory
+		"""
+		if self.__envelope is not None or self.__equipment != None:
+			raise ValueError("Duty schedule gradients need the single node building and the HVAC's fixed power.")
+		hvac = self.building_hvac
+		heatingCostPerSecond = (self.CalculateTimeFrameGasEneregyCost(hvac.ConvertWattsToDTH(hvac.GetRunningHeatPower(True), 1), dollarsPerDTH)
+			+ self.CalculateTimeFrameElectricEneregyCost(hvac.ConvertWattsToKWH(hvac.GetRunningElectricPower(True), 1), dollarsPerKiloWattHour))
+		coolingCostPerSecond = self.CalculateTimeFrameElectricEneregyCost(hvac.ConvertWattsToKWH(hvac.GetRunningElectricPower(False), 1), dollarsPerKiloWattHour)
+		gains = None
+		if self.__compiled_forcing is not None and len(self.__compiled_forcing.netGain) > 0:
+			# the gains from the current second on, the last second repeats like in step
+			netGain = self.__compiled_forcing.netGain
+			seconds = np.arange(hvac.TotalTimeInSeconds, hvac.TotalTimeInSeconds + len(outsideTemperatures) * intervalSeconds)
+			gains = netGain[np.minimum(seconds, len(netGain) - 1)]
+		return SimulateDutySchedule(self.__heat_mass_capacity, self.__heat_transmission, self.current_temperature, outsideTemperatures,
+			heatingDuty, coolingDuty, hvac.GetRunningHeatPower(True), -1.0 * hvac.GetRunningHeatPower(False),
+			heatingCostPerSecond, coolingCostPerSecond, intervalSeconds, comfortLow, comfortHigh, comfortWeights, gains)
+
+	def GetSecondsInBand(self, outside_temperature:float, heating_cooling_power:float, low:float, high:float, limit:int):
+		"""Gets the number of seconds with constant inputs until the temperature first leaves [low, high].
+
+		The single node temperature moves monotonically towards its steady state, so only one threshold can be
+		crossed and the crossing second is solved from the closed form, then checked against the closed form
+		on both sides so rounding doesn't move it. With heat gains, equipment, a tracker or an envelope the
+		temperature isn't solved and 1 is returned, those seconds are stepped.
+
+		Parameters:
+			* outside_temperature: [℃]
+			* heating_cooling_power: the power of the steady phase, see HVAC.GetSteadyPower [W]
+			* low, high: the band [℃], may be infinite
+			* limit: the most seconds returned
+
+		Returns:
+			* int -- the first second whose temperature is outside the band, at least 1 and at most limit
+		"""
+		if self.__forcing is not None or self.__equipment != None or self.__hvac_building_tracker != None or self.__envelope is not None:
+			return 1
+		decay = self.__decay
+		drive = self.__dt_by_cm * (heating_cooling_power + self.__heat_transmission * outside_temperature)
+		temperature = self.current_temperature
+		if decay == 1:
+			steady = float('inf') if drive > 0 else float('-inf')
+		else:
+			steady = drive / (1 - decay)
+		threshold = high if steady > temperature else low
+		if drive == 0 and decay == 1 or not (steady > high or steady < low) or threshold in (float('inf'), float('-inf')):
+			# the temperature settles inside the band
+			return limit
+		if decay == 1:
+			seconds = int(np.floor((threshold - temperature) / drive)) + 1
+		else:
+			# temperature after n seconds is steady + (temperature - steady) * decay ** n
+			ratio = (threshold - steady) / (temperature - steady)
+			seconds = int(np.floor(np.log(ratio) / np.log(decay))) + 1 if ratio > 0 else 1
+		seconds = max(1, min(seconds, limit))
+		outside = lambda n: not (low <= self._next_temperature_after(outside_temperature, heating_cooling_power, n) <= high)
+		while seconds > 1 and outside(seconds - 1):
+			seconds = seconds - 1
+		while seconds < limit and not outside(seconds):
+			seconds = seconds + 1
+		return seconds
+
+	def _next_envelope_temperature(self, transition, outside_temperature, heating_cooling_power):
+		"""Advances the air and mass nodes of the two node envelope, see TwoNodeEnvelope.GetTransition
+
+		Returns:
+			float -- the next air temperature in C
+		"""
+		a00, a01, a10, a11, bOut0, bOut1, bPower0, bPower1 = transition
+		air = self.current_temperature
+		mass = self.mass_temperature
+		self.mass_temperature = a10 * air + a11 * mass + bOut1 * outside_temperature + bPower1 * heating_cooling_power
+		return a00 * air + a01 * mass + bOut0 * outside_temperature + bPower0 * heating_cooling_power
+
+	def GetEnvelope(self):
+		return self.__envelope
 
 	def PrintSummary(self, dollarsPerKiloWattHour = 0.1149, dollarsPerDTH = 6.53535):
 		"""Prints the summary of the Hvac building in the current state
@@ -194,6 +607,13 @@ class HvacBuilding():
 		Keyword Arguments:
 			dollarsPerDTH {float} -- calculates the cost per DTH (default: {6.53535})
 		"""
+		# the max cost only depends on the HVAC parameters, envs built alike share it
+		key = (self.building_hvac.GetParameters(), seconds, dollarsPerDTH)
+		maxCost = _MAX_ENERGY_COST.get(key)
+		if maxCost is not None:
+			self.__MaxEnergyReward = maxCost
+			return maxCost
+
 		# calculate the max cost for the given timeframe
 		# calculate the cost for heating 
 		timeframeGasEnergy = self.building_hvac.GetMaxGasEnergyForTime(seconds)
@@ -213,9 +633,11 @@ class HvacBuilding():
 
 		if(maxCoolingCostforTime > maxHeatingCostforTime):
 			self.__MaxEnergyReward = maxCoolingCostforTime
+			_MAX_ENERGY_COST[key] = maxCoolingCostforTime
 			return maxCoolingCostforTime
 			
 		self.__MaxEnergyReward = maxHeatingCostforTime
+		_MAX_ENERGY_COST[key] = maxHeatingCostforTime
 		return maxHeatingCostforTime
 
 	def CalculateTimeFrameGasEneregyCost(self, dth:float, dollarsPerDTH = 6.53535):
@@ -242,6 +664,11 @@ class HvacBuilding():
 		Keyword Arguments:
 			dollarsPerDTH {float} -- calculates the cost per DTH (default: {6.53535})
 		"""
+		if self.__equipment != None:
+			gasEnergyUsed = self.__equipment.GasEnergyUsed
+			if gasEnergyUsed == 0.0:
+				return 0.0
+			return self.building_hvac.ConvertWattsToDTH(gasEnergyUsed, self.building_hvac.TotalTimeInSeconds) * dollarsPerDTH
 		dthUsed = self.building_hvac.GetGasDTH()
 		return dthUsed * dollarsPerDTH
 
@@ -251,6 +678,35 @@ class HvacBuilding():
 		Keyword Arguments:
 			dollarsPerKiloWattHour {float} -- calculates the cost per KWH(default: {0.1149})
 		"""
+		if self.__equipment != None:
+			# the HVAC's overhead (blowers, vent, ignitor) plus the equipment's power instead of the fixed compressor power
+			hvac = self.building_hvac
+			electricEnergyUsed = hvac.TotalPowerUsed - hvac.TotalGasEnergyUsed - self.__equipment.ReplacedElectricEnergy + self.__equipment.ElectricEnergyUsed
+			if hvac.TotalTimeInSeconds == 0:
+				return 0.0
+			return hvac.ConvertWattsToKWH(electricEnergyUsed, hvac.TotalTimeInSeconds) * dollarsPerKiloWattHour
 		electricKWHs = self.building_hvac.GetElectricKilowattHours()
 		# get the cost per kwh
 		return electricKWHs * dollarsPerKiloWattHour
+
+	def GetEnergyUsed(self):
+		"""Gets the running totals the costs are linear in, the difference of two is what a step used
+
+		Returns:
+			tuple -- the gas energy [W*s], the electric energy [W*s] and the times the heating or the cooling turned on
+		"""
+		hvac = self.building_hvac
+		cycles = hvac.NumberOfTimesHeatingTurnedOn + hvac.NumberOfTimesCoolingTurnedOn
+		if self.__equipment != None:
+			electricEnergyUsed = hvac.TotalPowerUsed - hvac.TotalGasEnergyUsed - self.__equipment.ReplacedElectricEnergy + self.__equipment.ElectricEnergyUsed
+			return (self.__equipment.GasEnergyUsed, electricEnergyUsed, cycles)
+		return (hvac.TotalGasEnergyUsed, hvac.TotalPowerUsed - hvac.TotalGasEnergyUsed, cycles)
+
+	def CalculateEnergyCost(self, gasEnergy:float, electricEnergy:float, dollarsPerKiloWattHour = 0.1149, dollarsPerDTH = 6.53535):
+		"""Calculates the cost of energy, e.g. of the difference of two GetEnergyUsed, without the running totals
+
+		Arguments:
+			gasEnergy {float} -- [W*s]
+			electricEnergy {float} -- [W*s]
+		"""
+		return gasEnergy / 3600000 / 293.001111 * dollarsPerDTH + electricEnergy / 3600000 * dollarsPerKiloWattHour
@@ -0,0 +1,144 @@
+import numpy as np
+
+# the phases of the HVAC, every second of a phase uses the same power
+PHASE_OFF = 0
+PHASE_IGNITION = 1 # the vent blower and the flame ignitor run before the gas opens
+PHASE_GAS_ON = 2 # the gas burns, the house blower hasn't started yet
+PHASE_RUNNING = 3 # the furnace mid run
+PHASE_SHUTDOWN = 4 # the gas is off, the vent and house blowers still run
+PHASE_SHUTDOWN_BLOWER = 5 # only the house blower still runs
+PHASE_COOLING = 6
+PHASE_NAMES = ('off', 'ignition', 'gasOn', 'running', 'shutdown', 'shutdownBlower', 'cooling')
+HEATING_PHASES = (PHASE_IGNITION, PHASE_GAS_ON, PHASE_RUNNING, PHASE_SHUTDOWN, PHASE_SHUTDOWN_BLOWER)
+
+# a phase transition: the second the phase starts (the HVAC's TotalTimeInSeconds), the phase and the power used every second of it [W]
+EVENT_DTYPE = np.dtype([
+	('time', '<i8'),
+	('phase', '<i1'),
+	('power', '<f8')])
+
+# a heating or cooling cycle, from the start of the HVAC until it is off again
+CYCLE_DTYPE = np.dtype([
+	('heating', '?'),
+	('start', '<i8'),
+	('duration', '<i8'),
+	('energy', '<f8'),
+	('shortCycle', '?')])
+
+class HvacEventLog():
+	"""The phase transitions of an HVAC in a preallocated array of EVENT_DTYPE records, see HVAC.EnableEventLog.
+
+	A day has a few dozen transitions instead of 86400 seconds of state, the power of any second and the
+	energy of any interval are reconstructed from them when needed.
+
+		Keyword Arguments:
+			capacity {int} -- The events preallocated, doubled when they are used up (default: {256})
+	"""
+	__slots__ = ('__events', '__count', '__lastPhase')
+
+	def __init__(self, capacity:int = 256):
+		self.__events = np.zeros(max(capacity, 1), dtype=EVENT_DTYPE)
+		self.__count = 0
+		self.__lastPhase = -1
+
+	def Clear(self):
+		self.__count = 0
+		self.__lastPhase = -1
+
+	def Record(self, time:int, phase:int, power:float):
+		"""Adds an event when the phase changed
+		"""
+		if phase == self.__lastPhase:
+			return
+		if self.__count == len(self.__events):
+			self.__events = np.concatenate([self.__events, np.zeros_like(self.__events)])
+		self.__events[self.__count] = (time, phase, power)
+		self.__count = self.__count + 1
+		self.__lastPhase = phase
+
+	def GetEvents(self):
+		"""Gets the recorded events, a view that the next Record may replace
+		"""
+		return self.__events[:self.__count]
+
+	def __len__(self):
+		return self.__count
+
+	def GetPowerPerSecond(self, end:int, start:int = 0):
+		"""Gets the power used in every second from start to end
+
+		Arguments:
+			end {int} -- The second after the last one, usually the HVAC's TotalTimeInSeconds
+
+		Returns:
+			np.ndarray -- end - start powers [W], 0 before the first event
+		"""
+		events = self.GetEvents()
+		seconds = np.arange(start, end)
+		# the event in effect in a second is the last one starting at or before it
+		index = np.searchsorted(events['time'], seconds, side='right') - 1
+		return np.where(index >= 0, events['power'][np.maximum(index, 0)], 0.0)
+
+	def GetCumulativeEnergy(self, times):
+		"""Gets the energy used from the first event up to each time
+
+		Arguments:
+			times {np.ndarray} -- seconds, the energy is up to the start of each
+
+		Returns:
+			np.ndarray -- [J]
+		"""
+		events = self.GetEvents()
+		times = np.asarray(times, dtype=np.int64)
+		if len(events) == 0:
+			return np.zeros(times.shape)
+		starts = events['time']
+		# the energy up to every event, the power is constant from one event to the next
+		energyAtEvents = np.concatenate([[0.0], np.cumsum(np.diff(starts) * events['power'][:-1])])
+		index = np.searchsorted(starts, times, side='right') - 1
+		clipped = np.maximum(index, 0)
+		energy = energyAtEvents[clipped] + (times - starts[clipped]) * events['power'][clipped]
+		return np.where(index >= 0, energy, 0.0)
+
+	def GetEnergy(self, boundaries):
+		"""Gets the energy used in every interval between consecutive boundaries
+
+		Arguments:
+			boundaries {np.ndarray} -- ascending seconds, e.g. np.arange(0, 86401, 3600) for hourly energy
+
+		Returns:
+			np.ndarray -- len(boundaries) - 1 energies [J]
+		"""
+		return np.diff(self.GetCumulativeEnergy(boundaries))
+
+	def GetCycles(self, end:int, shortCycleSeconds:int = 300):
+		"""Gets the heating and cooling cycles, a cycle still running is cut off at end
+
+		Arguments:
+			end {int} -- The current second, usually the HVAC's TotalTimeInSeconds
+
+		Keyword Arguments:
+			shortCycleSeconds {int} -- Cycles shorter than this are flagged as short cycles (default: {300})
+
+		Returns:
+			np.ndarray -- CYCLE_DTYPE records in order
+		"""
+		events = self.GetEvents()
+		phases = events['phase']
+		heating = np.isin(phases, HEATING_PHASES)
+		cooling = phases == PHASE_COOLING
+		previousHeating = np.concatenate([[False], heating[:-1]])
+		previousCooling = np.concatenate([[False], cooling[:-1]])
+		# a cycle starts where its kind starts and ends at the next event of another kind
+		starts = np.flatnonzero((heating & ~previousHeating) | (cooling & ~previousCooling))
+		nextHeating = np.concatenate([heating[1:], [False]])
+		nextCooling = np.concatenate([cooling[1:], [False]])
+		ends = np.flatnonzero((heating & ~nextHeating) | (cooling & ~nextCooling)) + 1
+		endTimes = np.append(events['time'], end)[ends]
+		cycles = np.zeros(len(starts), dtype=CYCLE_DTYPE)
+		cycles['heating'] = heating[starts]
+		cycles['start'] = events['time'][starts]
+		cycles['duration'] = endTimes - cycles['start']
+		cycles['energy'] = self.GetCumulativeEnergy(endTimes) - self.GetCumulativeEnergy(cycles['start'])
+		cycles['shortCycle'] = cycles['duration'] < shortCycleSeconds
+		return cycles
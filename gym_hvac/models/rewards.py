@@ -0,0 +1,171 @@
+"""Rewards composed of weighted terms, computed from the deltas of a step instead of the running totals.
+
+A term gets the steps as a mapping of the REWARD_STEP_DTYPE fields, a dict of numbers for one step or a structured
+array of many, and returns the reward of every step. A term written with numpy works for both, so the definition an
+env steps with also rewards a batch of envs and re-scores recorded episodes:
+
+	reward = RewardFunction({'savings': 1.0, 'comfort': (0.5, {'occupiedOnly': True}), 'cycling': 0.01})
+	rewards = reward(np.array(steps, dtype=REWARD_STEP_DTYPE))
+"""
+import numpy as np
+
+# the record of a step a reward is computed from
+REWARD_STEP_DTYPE = np.dtype([
+	('temperature', '<f8'), # the indoor temperature after the step [C]
+	('previousTemperature', '<f8'), # the indoor temperature before the step [C]
+	('cost', '<f8'), # the energy cost of the step [US$]
+	('maxCost', '<f8'), # the max energy cost of a step [US$]
+	('cycles', '<i8'), # the times the heating or the cooling turned on during the step
+	('power', '<f8'), # the average electric power of the step [W]
+	('occupancy', '<f8'), # the occupancy after the step, 1 without a forcing
+	('comfortLow', '<f8'), # the comfort band [C]
+	('comfortHigh', '<f8')])
+
+def _Discomfort(steps):
+	# how far the temperature is outside of the comfort band [C]
+	return np.maximum(steps['comfortLow'] - steps['temperature'], 0.0) + np.maximum(steps['temperature'] - steps['comfortHigh'], 0.0)
+
+def SavingsTerm(steps):
+	"""The max cost of a step less its cost, the reward of HvacBuilding.DetermineRewardMaxCost [US$]
+	"""
+	return steps['maxCost'] - steps['cost']
+
+def CostTerm(steps):
+	"""The cost of a step as a share of the max cost, negated
+	"""
+	return -steps['cost'] / steps['maxCost']
+
+def ComfortTerm(steps, occupiedOnly:bool = False):
+	"""How far the temperature is outside of the comfort band, negated [C]
+
+		Keyword Arguments:
+			occupiedOnly {bool} -- Only while the building is occupied (default: {False})
+	"""
+	discomfort = _Discomfort(steps)
+	if occupiedOnly:
+		discomfort = discomfort * (steps['occupancy'] > 0)
+	return -discomfort
+
+def CyclingTerm(steps):
+	"""The times the heating or the cooling turned on, negated
+	"""
+	return -1.0 * steps['cycles']
+
+def PeakTerm(steps, limit:float = 0.0):
+	"""The average electric power above a limit, negated [kW]
+
+		Keyword Arguments:
+			limit {float} -- The power that isn't penalized [W] (default: {0})
+	"""
+	return -np.maximum(steps['power'] - limit, 0.0) / 1000
+
+def OccupiedComfortTerm(steps):
+	"""The savings while comfortable or unoccupied, the max cost negated otherwise, the reward of
+	HvacBuilding.DetermineRewardOccupiedComfort [US$]
+	"""
+	uncomfortable = (steps['occupancy'] > 0) & (_Discomfort(steps) > 0)
+	return np.where(uncomfortable, -steps['maxCost'], steps['maxCost'] - steps['cost'])
+
+# the terms by name, RegisterRewardTerm adds more
+REWARD_TERMS = {
+	'savings': SavingsTerm,
+	'cost': CostTerm,
+	'comfort': ComfortTerm,
+	'cycling': CyclingTerm,
+	'peak': PeakTerm,
+	'occupiedComfort': OccupiedComfortTerm,
+}
+
+# the terms of the named reward functions
+REWARD_FUNCTIONS = {
+	'maxCost': {'savings': 1.0},
+	'occupiedComfort': {'occupiedComfort': 1.0},
+}
+
+def RegisterRewardTerm(name:str, term):
+	"""Registers a term under a name, reward functions refer to their terms by name so a process unpickling one
+	has to register its terms too
+
+		Arguments:
+			name {str} -- The name of the term
+			term {callable} -- Gets the steps and the term's keyword parameters and returns the reward of every step
+	"""
+	if name in REWARD_TERMS and REWARD_TERMS[name] is not term:
+		raise ValueError("Another reward term is registered as " + name)
+	REWARD_TERMS[name] = term
+
+class RewardFunction():
+	"""The weighted sum of reward terms
+
+		Arguments:
+			terms {str or dict or RewardFunction} -- The name of a REWARD_FUNCTIONS entry, or the weight of every term by its
+				name, a (weight, parameters) pair for a term with keyword parameters
+	"""
+	__slots__ = ('__terms', '__functions', '__calls')
+
+	def __init__(self, terms):
+		if isinstance(terms, RewardFunction):
+			terms = terms.GetTerms()
+		if isinstance(terms, str):
+			if terms not in REWARD_FUNCTIONS:
+				raise ValueError("Unknown reward function: " + terms)
+			terms = REWARD_FUNCTIONS[terms]
+		if not isinstance(terms, dict) or len(terms) == 0:
+			raise ValueError("A reward function needs the weights of its terms by name.")
+		normalized = []
+		for name in sorted(terms):
+			if name not in REWARD_TERMS:
+				raise ValueError("Unknown reward term: " + name)
+			weight = terms[name]
+			parameters = {}
+			if isinstance(weight, (list, tuple)):
+				weight, parameters = weight
+			if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not isinstance(parameters, dict):
+				raise ValueError("The weight of the reward term " + name + " has to be a number, its parameters a dict.")
+			normalized.append((name, float(weight), tuple(sorted(parameters.items()))))
+		self.__terms = tuple(normalized)
+		self.__functions = tuple(REWARD_TERMS[name] for name, weight, parameters in self.__terms)
+		# the weight, function and keyword parameters of every term, ready for a call per step
+		self.__calls = tuple((weight, REWARD_TERMS[name], dict(parameters)) for name, weight, parameters in self.__terms)
+
+	def __call__(self, steps):
+		"""Gets the reward of the steps
+
+			Arguments:
+				steps {dict or np.ndarray} -- One step as a dict of the REWARD_STEP_DTYPE fields or REWARD_STEP_DTYPE records
+
+			Returns:
+				float or np.ndarray -- a float for a dict, the reward of every record for an array
+		"""
+		reward = 0.0
+		for weight, function, parameters in self.__calls:
+			reward = reward + weight * function(steps, **parameters)
+		if isinstance(reward, np.ndarray) and reward.ndim > 0:
+			return reward
+		return float(reward)
+
+	def __eq__(self, other):
+		return isinstance(other, RewardFunction) and self.__terms == other.__terms
+
+	def __hash__(self):
+		return hash(self.__terms)
+
+	def __reduce__(self):
+		return (RewardFunction, (self.GetTerms(),))
+
+	def __repr__(self):
+		return 'RewardFunction(' + repr(self.GetTerms()) + ')'
+
+	def GetTerms(self):
+		"""Gets the terms as they are given to a RewardFunction, a weight or a (weight, parameters) pair by name
+		"""
+		return {name: (weight, dict(parameters)) if parameters else weight for name, weight, parameters in self.__terms}
+
+	def GetTermRewards(self, steps):
+		"""Gets the weighted reward of every term, they sum up to the reward
+
+			Returns:
+				dict -- the rewards of the steps by term name
+		"""
+		return {name: weight * function(steps, **dict(parameters))
+			for (name, weight, parameters), function in zip(self.__terms, self.__functions)}
@@ -0,0 +1,135 @@
+import numpy as np
+from .hvac_building import HvacBuilding
+
+# the thermostat modes
+OFF = 0
+HEATING = 1
+COOLING = 2
+
+# the state of a thermostat, see HysteresisThermostat.GetState
+THERMOSTAT_STATE_DTYPE = np.dtype([
+	('heatingSetpoint', '<f8'),
+	('coolingSetpoint', '<f8'),
+	('deadband', '<f8'),
+	('mode', '<i8'),
+	('Decisions', '<i8')])
+
+class HysteresisThermostat():
+	"""The hysteresis thermostat of hvac_baseline.py with separate heating and cooling setpoints, deciding every second.
+
+	Heating turns on below heatingSetpoint - deadband and off above heatingSetpoint, cooling turns on above
+	coolingSetpoint + deadband and off below coolingSetpoint. Switching between heating and cooling passes
+	through off. With both setpoints at 20 and a deadband of 2 it is the baseline thermostat.
+
+	Run doesn't decide every second: while the HVAC is in a steady phase the thermostat can only act when the
+	temperature crosses a threshold, the second it does is solved from the closed form of the building
+	(HvacBuilding.GetSecondsInBand) and the seconds before it are integrated in one batch.
+
+		Keyword Arguments:
+			heatingSetpoint {float} -- [C] (default: {20})
+			coolingSetpoint {float} -- [C], raised to the heating setpoint when it is below (default: {20})
+			deadband {float} -- how far the temperature may drift past a setpoint before the HVAC turns on [C] (default: {2})
+	"""
+	__slots__ = ('heatingSetpoint', 'coolingSetpoint', 'deadband', 'mode', 'Decisions')
+
+	def __init__(self, heatingSetpoint:float = 20, coolingSetpoint:float = 20, deadband:float = 2):
+		self.mode = OFF
+		self.Decisions = 0
+		self.SetSetpoints(heatingSetpoint, coolingSetpoint, deadband)
+
+	def SetSetpoints(self, heatingSetpoint:float, coolingSetpoint:float, deadband:float):
+		self.heatingSetpoint = heatingSetpoint
+		self.coolingSetpoint = max(coolingSetpoint, heatingSetpoint)
+		self.deadband = max(deadband, 0.0)
+
+	def reset(self):
+		self.mode = OFF
+		self.Decisions = 0
+
+	def GetState(self):
+		"""Gets the setpoints, the mode and the decision counter in THERMOSTAT_STATE_DTYPE field order
+		"""
+		return (self.heatingSetpoint, self.coolingSetpoint, self.deadband, self.mode, self.Decisions)
+
+	def SetState(self, state):
+		"""Continues from a state of GetState, a tuple or a THERMOSTAT_STATE_DTYPE record
+		"""
+		if isinstance(state, (np.void, np.ndarray)):
+			state = state.item()
+		self.heatingSetpoint, self.coolingSetpoint, self.deadband, self.mode, self.Decisions = state
+
+	def Decide(self, temperature:float):
+		"""Updates the mode for the temperature at the start of a second
+
+		Returns:
+			int -- OFF, HEATING or COOLING
+		"""
+		mode = self.mode
+		if mode == HEATING and temperature > self.heatingSetpoint:
+			mode = OFF
+		elif mode == COOLING and temperature < self.coolingSetpoint:
+			mode = OFF
+		if mode == OFF:
+			if temperature < self.heatingSetpoint - self.deadband:
+				mode = HEATING
+			elif temperature > self.coolingSetpoint + self.deadband:
+				mode = COOLING
+		self.mode = mode
+		return mode
+
+	def GetBand(self):
+		"""Gets the temperatures [low, high] the current mode is kept in
+		"""
+		if self.mode == HEATING:
+			return (float('-inf'), self.heatingSetpoint)
+		if self.mode == COOLING:
+			return (self.coolingSetpoint, float('inf'))
+		return (self.heatingSetpoint - self.deadband, self.coolingSetpoint + self.deadband)
+
+	def Apply(self, hvac):
+		"""Commands the HVAC for the current mode, the commands the HVAC can't follow yet (the furnace shutting down) are repeated every second
+		"""
+		if self.mode == HEATING:
+			hvac.TurnCoolingOff()
+			hvac.TurnHeatingOn()
+		elif self.mode == COOLING:
+			if hvac.HeatingIsOn:
+				hvac.TurnHeatingOff()
+			elif not hvac.CoolingIsOn:
+				hvac.TurnCoolingOn()
+		else:
+			hvac.TurnHvacOff()
+
+	def __call__(self, hvacBuilding:HvacBuilding, outsideTemperature:float):
+		"""Decides and commands the HVAC without simulating, the controller of HvacBuilding.iter_run
+		"""
+		self.Decide(hvacBuilding.current_temperature)
+		self.Apply(hvacBuilding.building_hvac)
+
+	def Step(self, hvacBuilding:HvacBuilding, outsideTemperature:float):
+		"""Decides and simulates one second
+		"""
+		self(hvacBuilding, outsideTemperature)
+		return hvacBuilding.step(outsideTemperature)
+
+	def Run(self, hvacBuilding:HvacBuilding, outsideTemperature:float, seconds:int):
+		"""Runs the thermostat for a number of seconds with a constant outside temperature, event by event
+
+		Returns:
+			tuple -- the state of the building, see HvacBuilding.get_state
+		"""
+		hvac = hvacBuilding.building_hvac
+		while seconds > 0:
+			self.Decide(hvacBuilding.current_temperature)
+			self.Apply(hvac)
+			self.Decisions = self.Decisions + 1
+			if not hvac.IsInSteadyPhase():
+				# start up and shutdown change the power every second
+				hvacBuilding.step(outsideTemperature)
+				seconds = seconds - 1
+				continue
+			low, high = self.GetBand()
+			steadySeconds = hvacBuilding.GetSecondsInBand(outsideTemperature, hvac.GetSteadyPower(), low, high, seconds)
+			hvacBuilding.StepSeconds(outsideTemperature, steadySeconds)
+			seconds = seconds - steadySeconds
+		return hvacBuilding.get_state(outsideTemperature)
@@ -0,0 +1,3 @@
+"""Append-only store of training runs and their metrics.
+"""
+from gym_hvac.results.results_store import ResultsStore, FlattenConfig, LoadConfigFile, EPISODE_COLUMNS
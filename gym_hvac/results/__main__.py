@@ -0,0 +1,82 @@
+"""Lists, compares and imports runs of a results store.
+
+	python -m gym_hvac.results results.sqlite list --filter agent.type=ppo_agent
+	python -m gym_hvac.results results.sqlite compare 1 2 3 --metric totalCost --last 100
+	python -m gym_hvac.results results.sqlite import my-run --agent examples/configs/hvac_ppo.json --metrics training_metrics.csv
+"""
+import argparse
+import datetime
+import json
+import sys
+from gym_hvac.results.results_store import ResultsStore, LoadConfigFile, EPISODE_COLUMNS
+
+def parseFilter(text:str):
+	"""Parses key=value, key=low..high for a numeric range, numbers are compared as numbers
+	"""
+	if '=' not in text:
+		raise argparse.ArgumentTypeError("A filter is key=value or key=low..high: " + text)
+	key, value = text.split('=', 1)
+	if '..' in value:
+		low, high = value.split('..', 1)
+		return key, (float(low), float(high))
+	try:
+		return key, json.loads(value)
+	except ValueError:
+		return key, value
+
+def formatTable(header, rows):
+	lines = [header] + [['' if cell is None else ('{:.3f}'.format(cell) if isinstance(cell, float) else str(cell)) for cell in row] for row in rows]
+	widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+	return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, widths)) for line in lines)
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog='python -m gym_hvac.results')
+	parser.add_argument('store', help="The results SQLite file")
+	commands = parser.add_subparsers(dest='command', required=True)
+
+	listParser = commands.add_parser('list', help="List the runs matching the filters")
+	listParser.add_argument('-f', '--filter', type=parseFilter, action='append', default=[], help="key=value or key=low..high on the flattened configuration")
+	listParser.add_argument('-n', '--name', default=None, help="SQL LIKE pattern of the run name")
+
+	compareParser = commands.add_parser('compare', help="Compare an episode metric and the evaluations of runs")
+	compareParser.add_argument('runs', type=int, nargs='*', help="Run ids, all runs when none are given")
+	compareParser.add_argument('-m', '--metric', default='reward', choices=EPISODE_COLUMNS[1:], help="The episode metric")
+	compareParser.add_argument('-l', '--last', type=int, default=None, help="Only the last x episodes of every run")
+
+	importParser = commands.add_parser('import', help="Add a run from its configuration files and training_metrics.csv")
+	importParser.add_argument('name', help="The run name")
+	importParser.add_argument('-a', '--agent', default=None, help="Agent configuration file")
+	importParser.add_argument('-n', '--network', default=None, help="Network specification file")
+	importParser.add_argument('-e', '--env', default=None, help="Env parameters as JSON")
+	importParser.add_argument('-m', '--metrics', default=None, help="training_metrics.csv of the run")
+
+	args = parser.parse_args(argv)
+	with ResultsStore(args.store) as store:
+		if args.command == 'list':
+			runs = store.FindRuns(dict(args.filter), args.name)
+			print(formatTable(['run', 'name', 'created'],
+				[[run['run_id'], run['name'], datetime.datetime.fromtimestamp(run['created']).strftime('%Y-%m-%d %H:%M')] for run in runs]))
+		elif args.command == 'compare':
+			runIds = args.runs or None
+			rows = store.SummarizeRuns(runIds, args.metric, args.last)
+			print(formatTable(['run', 'name', 'episodes', 'mean', 'min', 'max', 'last'], [list(row) for row in rows]))
+			evaluations = store.GetEvaluations(runIds)
+			if evaluations:
+				print()
+				print(formatTable(['run', 'policy', 'scenario', 'metric', 'n', 'mean', 'ci95'],
+					[[row['run_id'], row['policy'], row['scenario'], row['metric'], row['count'], row['mean'], row['ci95']] for row in evaluations]))
+		elif args.command == 'import':
+			config = {}
+			if args.agent is not None:
+				config['agent'] = LoadConfigFile(args.agent)
+			if args.network is not None:
+				config['network'] = LoadConfigFile(args.network)
+			if args.env is not None:
+				config['env'] = json.loads(args.env)
+			runId = store.CreateRun(args.name, config)
+			count = store.ImportEpisodes(runId, args.metrics) if args.metrics is not None else 0
+			print("Added run {} with {} episodes".format(runId, count))
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
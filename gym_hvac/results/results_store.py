@@ -0,0 +1,268 @@
+"""An append-only SQLite store of training runs: their configuration, per episode metrics and evaluation summaries.
+
+Every configuration value is also kept flattened to a dotted key ('agent.update_mode.batch_size') in an
+indexed table, so runs are found by any parameter without parsing the JSON, and the metrics are aggregated
+by SQL on the file instead of being loaded.
+"""
+import csv
+import json
+import sqlite3
+import time
+
+# the per episode columns, in the order of EPISODE_SUMMARY_DTYPE
+EPISODE_COLUMNS = ['episode', 'timesteps', 'reward', 'totalCost', 'temperature', 'heatingCycles', 'coolingCycles', 'heatingSeconds', 'coolingSeconds']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+	run_id INTEGER PRIMARY KEY,
+	name TEXT NOT NULL,
+	created REAL NOT NULL,
+	config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_parameters (
+	run_id INTEGER NOT NULL REFERENCES runs(run_id),
+	key TEXT NOT NULL,
+	text_value TEXT,
+	number_value REAL,
+	PRIMARY KEY (run_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_parameters_by_number ON run_parameters(key, number_value);
+CREATE INDEX IF NOT EXISTS run_parameters_by_text ON run_parameters(key, text_value);
+CREATE TABLE IF NOT EXISTS episodes (
+	run_id INTEGER NOT NULL REFERENCES runs(run_id),
+	episode INTEGER NOT NULL,
+	timesteps INTEGER,
+	reward REAL,
+	totalCost REAL,
+	temperature REAL,
+	heatingCycles INTEGER,
+	coolingCycles INTEGER,
+	heatingSeconds REAL,
+	coolingSeconds REAL,
+	PRIMARY KEY (run_id, episode)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS evaluations (
+	run_id INTEGER NOT NULL REFERENCES runs(run_id),
+	policy TEXT NOT NULL,
+	scenario TEXT NOT NULL,
+	metric TEXT NOT NULL,
+	count INTEGER,
+	mean REAL,
+	std REAL,
+	ci95 REAL,
+	PRIMARY KEY (run_id, policy, scenario, metric)
+) WITHOUT ROWID;
+"""
+
+def FlattenConfig(config, prefix:str = ''):
+	"""Flattens nested dicts and lists into dotted keys: {'a': {'b': [1]}} gives {'a.b.0': 1}
+	"""
+	flat = {}
+	if isinstance(config, dict):
+		items = config.items()
+	elif isinstance(config, (list, tuple)):
+		items = enumerate(config)
+	else:
+		return {prefix: config}
+	for key, value in items:
+		flat.update(FlattenConfig(value, prefix + str(key) if not prefix else prefix + '.' + str(key)))
+	return flat
+
+def LoadConfigFile(path:str):
+	with open(path, 'r') as fp:
+		return json.load(fp=fp)
+
+class ResultsStore():
+	"""The results store in a SQLite file, runs are only ever added
+
+		Arguments:
+			path {str} -- The SQLite file, created when missing
+
+		Keyword Arguments:
+			timeout {float} -- How long a write waits for another process writing the same file [s] (default: {30})
+	"""
+
+	def __init__(self, path:str, timeout:float = 30.0):
+		self.path = path
+		self.connection = sqlite3.connect(path, timeout=timeout)
+		self.connection.row_factory = sqlite3.Row
+		# write ahead logging lets readers query while a sweep keeps adding runs
+		self.connection.execute('PRAGMA journal_mode=WAL')
+		self.connection.executescript(_SCHEMA)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exception):
+		self.Close()
+
+	def Close(self):
+		self.connection.close()
+
+	def CreateRun(self, name:str, config = None):
+		"""Adds a run and its configuration
+
+		Arguments:
+			name {str} -- A name to recognize the run by, it doesn't have to be unique
+
+		Keyword Arguments:
+			config {dict} -- JSON serializable configuration, e.g. {'agent': ..., 'network': ..., 'env': ...} (default: {None})
+
+		Returns:
+			int -- the run id
+		"""
+		config = config or {}
+		with self.connection:
+			runId = self.connection.execute('INSERT INTO runs (name, created, config) VALUES (?, ?, ?)',
+				(name, time.time(), json.dumps(config, sort_keys=True))).lastrowid
+			parameters = []
+			for key, value in FlattenConfig(config).items():
+				# booleans and numbers are compared as numbers, everything else as text
+				if isinstance(value, (bool, int, float)):
+					parameters.append((runId, key, None, float(value)))
+				else:
+					parameters.append((runId, key, None if value is None else str(value), None))
+			self.connection.executemany('INSERT INTO run_parameters VALUES (?, ?, ?, ?)', parameters)
+		return runId
+
+	def AddEpisodes(self, runId:int, summaries):
+		"""Adds per episode metrics
+
+		Arguments:
+			summaries {iterable} -- rows in EPISODE_COLUMNS order, e.g. an EPISODE_SUMMARY_DTYPE array or HvacEnv.GetEpisodeSummary tuples
+		"""
+		if hasattr(summaries, 'tolist'):
+			summaries = summaries.tolist()
+		with self.connection:
+			self.connection.executemany('INSERT INTO episodes VALUES (?' + ', ?' * len(EPISODE_COLUMNS) + ')',
+				((runId,) + tuple(summary) for summary in summaries))
+
+	def ImportEpisodes(self, runId:int, csvPath:str):
+		"""Adds the per episode metrics of a training_metrics.csv written by the TrainingReporter. The reporter appends
+		to the file, so when an episode is in it more than once (a resumed run) the last row is kept.
+
+		Returns:
+			int -- the number of episodes added
+		"""
+		episodes = {}
+		with open(csvPath, newline='') as csvFile:
+			for row in csv.DictReader(csvFile):
+				values = tuple(float(row[column]) for column in EPISODE_COLUMNS)
+				episodes[int(values[0])] = (int(values[0]),) + values[1:]
+		self.AddEpisodes(runId, [episodes[episode] for episode in sorted(episodes)])
+		return len(episodes)
+
+	def AddEvaluation(self, runId:int, policy:str, summaryRows):
+		"""Adds the evaluation summary of a policy
+
+		Arguments:
+			policy {str} -- e.g. 'agent' or 'thermostat'
+			summaryRows {list} -- the rows of SummarizeResults
+		"""
+		values = []
+		for row in summaryRows:
+			for key in row:
+				if key.endswith('_mean'):
+					metric = key[:-len('_mean')]
+					values.append((runId, policy, row['name'], metric, row['count'], row[key], row[metric + '_std'], row[metric + '_ci95']))
+		with self.connection:
+			self.connection.executemany('INSERT INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?)', values)
+
+	def FindRuns(self, filters = None, name:str = None):
+		"""Gets the runs whose configuration matches every filter
+
+		Keyword Arguments:
+			filters {dict} -- dotted key to a value, or to a (low, high) tuple for an inclusive numeric range (default: {None})
+			name {str} -- SQL LIKE pattern of the run name (default: {None})
+
+		Returns:
+			list -- sqlite3.Row with run_id, name, created and config per run
+		"""
+		query = 'SELECT run_id, name, created, config FROM runs'
+		conditions = []
+		arguments = []
+		for key, value in (filters or {}).items():
+			if isinstance(value, tuple):
+				conditions.append('run_id IN (SELECT run_id FROM run_parameters WHERE key = ? AND number_value BETWEEN ? AND ?)')
+				arguments.extend([key, value[0], value[1]])
+			elif isinstance(value, (bool, int, float)):
+				conditions.append('run_id IN (SELECT run_id FROM run_parameters WHERE key = ? AND number_value = ?)')
+				arguments.extend([key, float(value)])
+			else:
+				conditions.append('run_id IN (SELECT run_id FROM run_parameters WHERE key = ? AND text_value = ?)')
+				arguments.extend([key, str(value)])
+		if name is not None:
+			conditions.append('name LIKE ?')
+			arguments.append(name)
+		if conditions:
+			query = query + ' WHERE ' + ' AND '.join(conditions)
+		return self.connection.execute(query + ' ORDER BY run_id', arguments).fetchall()
+
+	def GetConfig(self, runId:int):
+		row = self.connection.execute('SELECT config FROM runs WHERE run_id = ?', (runId,)).fetchone()
+		if row is None:
+			raise KeyError("Unknown run: " + str(runId))
+		return json.loads(row['config'])
+
+	def IterEpisodes(self, runId:int, columns = EPISODE_COLUMNS):
+		"""Streams the episodes of a run in order without loading them all
+
+		Returns:
+			generator -- a tuple of the columns per episode
+		"""
+		for column in columns:
+			if column not in EPISODE_COLUMNS:
+				raise ValueError("Unknown episode column: " + column)
+		cursor = self.connection.execute('SELECT ' + ', '.join(columns) + ' FROM episodes WHERE run_id = ? ORDER BY episode', (runId,))
+		for row in cursor:
+			yield tuple(row)
+
+	def SummarizeRuns(self, runIds = None, metric:str = 'reward', lastEpisodes:int = None):
+		"""Aggregates a metric per run in SQL
+
+		Keyword Arguments:
+			runIds {list} -- the runs, all runs when None (default: {None})
+			metric {str} -- an EPISODE_COLUMNS metric (default: {'reward'})
+			lastEpisodes {int} -- only the last episodes of every run (default: {None, all episodes})
+
+		Returns:
+			list -- sqlite3.Row with run_id, name, episodes, mean, minimum, maximum and last per run
+		"""
+		if metric not in EPISODE_COLUMNS:
+			raise ValueError("Unknown episode metric: " + metric)
+		arguments = []
+		runFilter = ''
+		if runIds is not None:
+			runIds = list(runIds)
+			runFilter = 'WHERE run_id IN (' + ', '.join('?' * len(runIds)) + ')'
+			arguments.extend(runIds)
+		lastFilter = ''
+		if lastEpisodes is not None:
+			lastFilter = 'WHERE fromLast <= ?'
+			arguments.append(lastEpisodes)
+		query = ("SELECT ranked.run_id, runs.name, COUNT(*) AS episodes, AVG(value) AS mean, MIN(value) AS minimum, MAX(value) AS maximum, "
+			"MAX(CASE WHEN fromLast = 1 THEN value END) AS last "
+			"FROM (SELECT run_id, " + metric + " AS value, ROW_NUMBER() OVER (PARTITION BY run_id ORDER BY episode DESC) AS fromLast "
+			"FROM episodes " + runFilter + ") AS ranked "
+			"JOIN runs ON runs.run_id = ranked.run_id " + lastFilter + " GROUP BY ranked.run_id ORDER BY ranked.run_id")
+		return self.connection.execute(query, arguments).fetchall()
+
+	def GetEvaluations(self, runIds = None, metric:str = None):
+		"""Gets the evaluation summaries
+
+		Returns:
+			list -- sqlite3.Row with run_id, policy, scenario, metric, count, mean, std and ci95
+		"""
+		conditions = []
+		arguments = []
+		if runIds is not None:
+			runIds = list(runIds)
+			conditions.append('run_id IN (' + ', '.join('?' * len(runIds)) + ')')
+			arguments.extend(runIds)
+		if metric is not None:
+			conditions.append('metric = ?')
+			arguments.append(metric)
+		query = 'SELECT * FROM evaluations'
+		if conditions:
+			query = query + ' WHERE ' + ' AND '.join(conditions)
+		return self.connection.execute(query + ' ORDER BY run_id, policy, scenario, metric', arguments).fetchall()
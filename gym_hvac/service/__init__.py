@@ -0,0 +1,3 @@
+"""Serves the HVAC simulator to local controllers.
+"""
+from gym_hvac.service.hvac_service import HvacServiceServer, HvacServiceClient, HvacServiceError
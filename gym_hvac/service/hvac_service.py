@@ -0,0 +1,282 @@
+"""Serves HvacEnv sessions to local controllers over TCP or Unix sockets.
+
+Every message is little endian:
+	request  -- REQUEST (op, session id, argument)
+	response -- RESPONSE_HEADER (status, op, session id, observation length), the observation as that many
+	            doubles, then STEP_TRAILER (reward, done) or SNAPSHOT_TRAILER for OP_SNAPSHOT
+
+The observation length depends on the env (a forcing appends the occupancy, a forecast window its temperatures),
+error responses carry no observation.
+"""
+import asyncio
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from gym_hvac.envs import HvacEnv
+
+OP_OPEN = 1
+OP_RESET = 2
+OP_STEP = 3
+OP_SNAPSHOT = 4
+OP_CLOSE = 5
+
+STATUS_OK = 0
+STATUS_UNKNOWN_SESSION = 1
+STATUS_BAD_REQUEST = 2
+
+REQUEST = struct.Struct('<BIi')
+RESPONSE_HEADER = struct.Struct('<BBIH')
+STEP_TRAILER = struct.Struct('<dB')
+# current temperature, total cost, total simulated seconds, heating is on, cooling is on
+SNAPSHOT_TRAILER = struct.Struct('<ddQBB')
+
+def _PackResponse(status:int, op:int, sessionId:int, observation = (), *values):
+	trailer = SNAPSHOT_TRAILER if op == OP_SNAPSHOT else STEP_TRAILER
+	if not values:
+		values = trailer.unpack(bytes(trailer.size))
+	return (RESPONSE_HEADER.pack(status, op, sessionId, len(observation))
+		+ struct.pack('<' + str(len(observation)) + 'd', *observation) + trailer.pack(*values))
+
+class HvacServiceError(Exception):
+	"""Raised by the client when the service rejects a request
+	"""
+	def __init__(self, status:int, op:int):
+		super().__init__("HVAC service request " + str(op) + " failed with status " + str(status))
+		self.status = status
+		self.op = op
+
+class _HvacSession():
+	def __init__(self, env:HvacEnv):
+		self.env = env
+		self.nextStepTime = 0.0
+
+class HvacServiceServer():
+	"""Multiplexes many HvacEnv sessions behind one asyncio server.
+
+	Requests from all connections are queued and the queue is drained in batches: every request
+	that arrived while the previous batch was running is executed in one call on a worker thread,
+	so the event loop only pays one hand off per batch instead of one per step. All environment
+	work happens on that single worker thread, sessions never need locks.
+
+		Keyword Arguments:
+			realTimeFactor {float} -- When set, a session can only step once every env_step_interval / realTimeFactor wall seconds (default: {None})
+			maxBatchSize {int} -- The most requests executed in one batch (default: {4096})
+			envFactory {callable} -- Creates the env of a new session (default: {HvacEnv})
+	"""
+
+	def __init__(self, realTimeFactor:float = None, maxBatchSize:int = 4096, envFactory = HvacEnv):
+		if realTimeFactor is not None and realTimeFactor <= 0:
+			raise ValueError("realTimeFactor must be positive.")
+		self.realTimeFactor = realTimeFactor
+		self.maxBatchSize = maxBatchSize
+		self.BatchCount = 0
+		self.RequestCount = 0
+		self.__env_factory = envFactory
+		self.__sessions = {}
+		self.__next_session_id = 1
+		self.__pending = []
+		self.__pending_event = None
+		self.__batch_task = None
+		self.__server = None
+		self.__executor = ThreadPoolExecutor(max_workers=1)
+
+	def GetSessionCount(self):
+		return len(self.__sessions)
+
+	async def Start(self, host:str = '127.0.0.1', port:int = 0, path:str = None):
+		"""Starts listening on a local TCP port, or on a Unix socket when a path is given
+
+		Returns:
+			the bound (host, port) tuple or the socket path
+		"""
+		self.__pending_event = asyncio.Event()
+		self.__batch_task = asyncio.ensure_future(self.__run_batches())
+		if path is not None:
+			self.__server = await asyncio.start_unix_server(self.__handle_connection, path=path)
+			return path
+		self.__server = await asyncio.start_server(self.__handle_connection, host=host, port=port)
+		return self.__server.sockets[0].getsockname()[:2]
+
+	async def Close(self):
+		if self.__server is not None:
+			self.__server.close()
+			await self.__server.wait_closed()
+		if self.__batch_task is not None:
+			self.__batch_task.cancel()
+			try:
+				await self.__batch_task
+			except asyncio.CancelledError:
+				pass
+		self.__executor.shutdown(wait=True)
+
+	async def __handle_connection(self, reader, writer):
+		# the sessions this connection opened, they are closed with it when the client goes away without closing them
+		sessionIds = set()
+		try:
+			while True:
+				try:
+					request = await reader.readexactly(REQUEST.size)
+				except asyncio.IncompleteReadError:
+					break
+				op, sessionId, argument = REQUEST.unpack(request)
+				if op == OP_STEP and self.realTimeFactor is not None:
+					await self.__pace(sessionId)
+				response = await self.__submit(op, sessionId, argument)
+				status, _, responseSessionId, _ = RESPONSE_HEADER.unpack_from(response)
+				if status == STATUS_OK and op == OP_OPEN:
+					sessionIds.add(responseSessionId)
+				elif status == STATUS_OK and op == OP_CLOSE:
+					sessionIds.discard(responseSessionId)
+				writer.write(response)
+				await writer.drain()
+		except ConnectionError:
+			pass
+		finally:
+			# closed on the worker thread like any request, only that thread touches the sessions
+			for sessionId in sessionIds:
+				self.__submit(OP_CLOSE, sessionId, 0)
+			writer.close()
+
+	def __submit(self, op:int, sessionId:int, argument:int):
+		future = asyncio.get_running_loop().create_future()
+		self.__pending.append((op, sessionId, argument, future))
+		self.__pending_event.set()
+		return future
+
+	async def __pace(self, sessionId:int):
+		session = self.__sessions.get(sessionId)
+		if session is None:
+			return
+		delay = session.nextStepTime - time.monotonic()
+		if delay > 0:
+			await asyncio.sleep(delay)
+		session.nextStepTime = time.monotonic() + session.env.env_step_interval / self.realTimeFactor
+
+	async def __run_batches(self):
+		loop = asyncio.get_running_loop()
+		while True:
+			await self.__pending_event.wait()
+			self.__pending_event.clear()
+			while self.__pending:
+				batch = self.__pending[:self.maxBatchSize]
+				del self.__pending[:self.maxBatchSize]
+				responses = await loop.run_in_executor(self.__executor, self.__execute_batch, batch)
+				self.BatchCount = self.BatchCount + 1
+				self.RequestCount = self.RequestCount + len(batch)
+				for (op, sessionId, argument, future), response in zip(batch, responses):
+					if not future.done():
+						future.set_result(response)
+
+	def __execute_batch(self, batch):
+		responses = []
+		for op, sessionId, argument, future in batch:
+			try:
+				responses.append(self.__execute(op, sessionId, argument))
+			except Exception:
+				# a failing session only fails its own request, the batch and the other sessions go on
+				responses.append(_PackResponse(STATUS_BAD_REQUEST, op, sessionId))
+		return responses
+
+	def __execute(self, op:int, sessionId:int, argument:int):
+		if op == OP_OPEN:
+			sessionId = self.__next_session_id
+			self.__next_session_id = self.__next_session_id + 1
+			env = self.__env_factory()
+			self.__sessions[sessionId] = _HvacSession(env)
+			return _PackResponse(STATUS_OK, op, sessionId, env.GetObservation(), 0.0, 0)
+
+		session = self.__sessions.get(sessionId)
+		if session is None:
+			return _PackResponse(STATUS_UNKNOWN_SESSION, op, sessionId)
+		env = session.env
+
+		if op == OP_RESET:
+			return _PackResponse(STATUS_OK, op, sessionId, env.reset(), 0.0, 0)
+		if op == OP_STEP:
+			if not env.action_space.contains(argument):
+				return _PackResponse(STATUS_BAD_REQUEST, op, sessionId)
+			observation, reward, done, _ = env.step(argument)
+			return _PackResponse(STATUS_OK, op, sessionId, observation, reward, done)
+		if op == OP_SNAPSHOT:
+			hvacBuilding = env.hvacBuilding
+			hvac = hvacBuilding.building_hvac
+			totalCost = hvacBuilding.CalculateGasEneregyCost() + hvacBuilding.CalculateElectricEneregyCost()
+			return _PackResponse(STATUS_OK, op, sessionId, env.GetObservation(), hvacBuilding.current_temperature,
+				totalCost, hvac.TotalTimeInSeconds, hvac.HeatingIsOn, hvac.CoolingIsOn)
+		if op == OP_CLOSE:
+			del self.__sessions[sessionId]
+			return _PackResponse(STATUS_OK, op, sessionId)
+		return _PackResponse(STATUS_BAD_REQUEST, op, sessionId)
+
+class HvacServiceClient():
+	"""A minimal asyncio client for HvacServiceServer, one connection that can own several sessions.
+
+	Requests on one connection are answered in order, use one client per concurrent controller.
+	"""
+
+	def __init__(self):
+		self.__reader = None
+		self.__writer = None
+		self.__lock = None
+
+	async def Connect(self, host:str = '127.0.0.1', port:int = 0, path:str = None):
+		if path is not None:
+			self.__reader, self.__writer = await asyncio.open_unix_connection(path=path)
+		else:
+			self.__reader, self.__writer = await asyncio.open_connection(host=host, port=port)
+		self.__lock = asyncio.Lock()
+
+	async def Close(self):
+		self.__writer.close()
+		await self.__writer.wait_closed()
+
+	async def Open(self):
+		"""Opens a new session
+
+		Returns:
+			tuple -- the session id and the initial observation
+		"""
+		status, op, sessionId, observation, values = await self.__request(OP_OPEN, 0, 0)
+		return sessionId, observation
+
+	async def Reset(self, sessionId:int):
+		status, op, sessionId, observation, values = await self.__request(OP_RESET, sessionId, 0)
+		return observation
+
+	async def Step(self, sessionId:int, action:int):
+		"""Steps the session's env
+
+		Returns:
+			tuple -- observation, reward, done like HvacEnv.step without the info
+		"""
+		status, op, sessionId, observation, (reward, done) = await self.__request(OP_STEP, sessionId, action)
+		return observation, reward, bool(done)
+
+	async def Snapshot(self, sessionId:int):
+		"""Gets the session's state without stepping
+
+		Returns:
+			dict -- observation, temperature, totalCost, totalTimeInSeconds, heatingIsOn and coolingIsOn
+		"""
+		status, op, sessionId, observation, values = await self.__request(OP_SNAPSHOT, sessionId, 0)
+		return {
+			'observation': observation,
+			'temperature': values[0],
+			'totalCost': values[1],
+			'totalTimeInSeconds': values[2],
+			'heatingIsOn': bool(values[3]),
+			'coolingIsOn': bool(values[4])}
+
+	async def CloseSession(self, sessionId:int):
+		await self.__request(OP_CLOSE, sessionId, 0)
+
+	async def __request(self, op:int, sessionId:int, argument:int):
+		trailer = SNAPSHOT_TRAILER if op == OP_SNAPSHOT else STEP_TRAILER
+		async with self.__lock:
+			self.__writer.write(REQUEST.pack(op, sessionId, argument))
+			status, op, sessionId, length = RESPONSE_HEADER.unpack(await self.__reader.readexactly(RESPONSE_HEADER.size))
+			payload = await self.__reader.readexactly(length * 8 + trailer.size)
+		if status != STATUS_OK:
+			raise HvacServiceError(status, op)
+		observation = struct.unpack_from('<' + str(length) + 'd', payload)
+		return status, op, sessionId, observation, trailer.unpack_from(payload, length * 8)
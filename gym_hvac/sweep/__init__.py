@@ -0,0 +1,3 @@
+"""Hyperparameter sweeps of the agent configurations with successive halving.
+"""
+from gym_hvac.sweep.hyperparameter_sweep import HyperparameterSweep, ExpandGrid, SetConfigValue, RunTrainingTrial, ReadScore, RecordSweep, FormatSweepTable
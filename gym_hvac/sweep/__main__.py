@@ -0,0 +1,58 @@
+"""Runs or resumes a successive halving sweep of an agent configuration.
+
+	python -m gym_hvac.sweep sweeps/ppo -a examples/configs/hvac_ppo.json -n examples/configs/hvac_simple_network.json \
+		-g agent.step_optimizer.learning_rate=0.001,0.01,0.1 -g agent.update_mode.batch_size=16,32 --min-episodes 50
+"""
+import argparse
+import json
+import sys
+from gym_hvac.results import ResultsStore, LoadConfigFile
+from gym_hvac.sweep.hyperparameter_sweep import HyperparameterSweep, RecordSweep, FormatSweepTable
+
+def parseGridAxis(text:str):
+	"""Parses key=value,value,... the values are JSON when they parse as JSON
+	"""
+	if '=' not in text:
+		raise argparse.ArgumentTypeError("A grid axis is key=value,value,...: " + text)
+	key, values = text.split('=', 1)
+	parsed = []
+	for value in values.split(','):
+		try:
+			parsed.append(json.loads(value))
+		except ValueError:
+			parsed.append(value)
+	return key, parsed
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog='python -m gym_hvac.sweep')
+	parser.add_argument('directory', help="The sweep directory, an existing sweep in it is resumed")
+	parser.add_argument('-a', '--agent', required=True, help="Agent configuration file")
+	parser.add_argument('-n', '--network', default=None, help="Network specification file")
+	parser.add_argument('-g', '--grid', type=parseGridAxis, action='append', required=True, help="key=value,value,... over the dotted agent./network. fields")
+	parser.add_argument('--min-episodes', type=int, default=50, help="Episodes of the first rung")
+	parser.add_argument('--eta', type=int, default=3, help="Keep the best 1/eta trials of every rung")
+	parser.add_argument('--rungs', type=int, default=None, help="Number of rungs (default: until one trial is left)")
+	parser.add_argument('--minimize', action='store_true', default=False, help="Lower scores are better")
+	parser.add_argument('--metric', default='reward', help="The training_metrics.csv column scoring a trial")
+	parser.add_argument('--score-episodes', type=int, default=10, help="Score a trial by its last x episodes")
+	parser.add_argument('-m', '--max-episode-timesteps', type=int, default=288, help="Maximum number of timesteps per episode")
+	parser.add_argument('-w', '--workers', type=int, default=None, help="Trials run at once (default: the available CPUs)")
+	parser.add_argument('--memory-limit-mb', type=int, default=None, help="Memory limit of every trial")
+	parser.add_argument('--no-pin', action='store_true', default=False, help="Don't pin the workers to CPUs")
+	parser.add_argument('--results-store', default=None, help="Record the trials in this results SQLite file")
+	args = parser.parse_args(argv)
+
+	baseConfig = {'agent': LoadConfigFile(args.agent), 'network': LoadConfigFile(args.network) if args.network else None}
+	sweep = HyperparameterSweep(args.directory, baseConfig, dict(args.grid),
+		trialArguments={'maxEpisodeTimesteps': args.max_episode_timesteps, 'metric': args.metric, 'scoreEpisodes': args.score_episodes},
+		minEpisodes=args.min_episodes, eta=args.eta, rungs=args.rungs, maximize=not args.minimize, workers=args.workers,
+		memoryLimitBytes=args.memory_limit_mb * 1024 * 1024 if args.memory_limit_mb else None, pinCpus=not args.no_pin)
+	results = sweep.Run()
+	print(FormatSweepTable(results))
+	if args.results_store is not None:
+		with ResultsStore(args.results_store) as store:
+			RecordSweep(store, args.directory, results)
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
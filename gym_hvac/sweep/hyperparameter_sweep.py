@@ -0,0 +1,279 @@
+"""Hyperparameter sweeps of the tensorforce agent configurations with successive halving.
+
+The grid is expanded over dotted fields of the agent and network JSON ('agent.step_optimizer.learning_rate',
+'network.0.size'). Every trial of a rung trains for that rung's episodes in a process pool worker pinned to
+its own CPU and limited in memory, only the best 1/eta trials go on to the next rung and resume from their
+checkpoint. The sweep state is saved after every trial, so an interrupted sweep resumes where it stopped.
+A trial that fails, e.g. a training subprocess that ran out of the memory limit, gets the worst score and its error,
+it drops out at the next halving instead of stopping the sweep.
+"""
+import copy
+import csv
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SWEEP_STATE = 'sweep_state.json'
+# the training script beside the package
+TRAINING_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'tensor_force_gym_hvac.py')
+
+def SetConfigValue(config, dottedKey:str, value):
+	"""Sets a value in nested dicts and lists by its dotted key, e.g. 'agent.update_mode.batch_size' or 'network.0.size'
+	"""
+	keys = dottedKey.split('.')
+	node = config
+	for key in keys[:-1]:
+		node = node[int(key)] if isinstance(node, list) else node.setdefault(key, {})
+	if isinstance(node, list):
+		node[int(keys[-1])] = value
+	else:
+		node[keys[-1]] = value
+
+def ExpandGrid(baseConfig, grid):
+	"""Gets a config per combination of the grid values
+
+	Arguments:
+		baseConfig {dict} -- e.g. {'agent': agent JSON, 'network': network JSON}
+		grid {dict} -- dotted key to the list of its values
+
+	Returns:
+		list -- (parameters, config) per combination, parameters maps the dotted keys to the trial's values
+	"""
+	keys = sorted(grid)
+	trials = []
+	for values in itertools.product(*[grid[key] for key in keys]):
+		config = copy.deepcopy(baseConfig)
+		for key, value in zip(keys, values):
+			SetConfigValue(config, key, value)
+		trials.append((dict(zip(keys, values)), config))
+	return trials
+
+def ReadScore(csvPath:str, metric:str = 'reward', lastEpisodes:int = 10):
+	"""Gets the mean of a metric over the last episodes of a training_metrics.csv
+	"""
+	with open(csvPath, newline='') as csvFile:
+		values = [float(row[metric]) for row in csv.DictReader(csvFile)]
+	if not values:
+		raise ValueError("No episodes in " + csvPath)
+	values = values[-lastEpisodes:]
+	return sum(values) / len(values)
+
+def RunTrainingTrial(directory:str, config, episodes:int, resume:bool, script:str = TRAINING_SCRIPT, gymId:str = 'Hvac-v0',
+	maxEpisodeTimesteps:int = 288, metric:str = 'reward', scoreEpisodes:int = 10, extraArguments = ()):
+	"""Trains a trial with tensor_force_gym_hvac.py in a subprocess and scores it from its training_metrics.csv
+
+	Arguments:
+		directory {str} -- The trial directory, holds its configuration, checkpoint and metrics
+		config {dict} -- {'agent': agent JSON, 'network': network JSON or None}
+		episodes {int} -- The episodes to train in this rung
+		resume {bool} -- Continue from the checkpoint of the previous rung
+
+	Returns:
+		float -- the mean metric of the last scoreEpisodes episodes
+	"""
+	agentPath = os.path.join(directory, 'agent.json')
+	with open(agentPath, 'w') as fp:
+		json.dump(config['agent'], fp, indent=4)
+	checkpoint = os.path.join(directory, 'checkpoint', 'agent')
+	os.makedirs(os.path.dirname(checkpoint), exist_ok=True)
+	command = [sys.executable, script, gymId, '-a', agentPath, '-e', str(episodes), '-m', str(maxEpisodeTimesteps),
+		'-rd', directory, '-s', checkpoint]
+	if config.get('network') is not None:
+		networkPath = os.path.join(directory, 'network.json')
+		with open(networkPath, 'w') as fp:
+			json.dump(config['network'], fp, indent=4)
+		command.extend(['-n', networkPath])
+	if resume:
+		command.extend(['-l', checkpoint])
+	with open(os.path.join(directory, 'training.log'), 'a') as log:
+		subprocess.run(command + list(extraArguments), check=True, stdout=log, stderr=subprocess.STDOUT, cwd=directory)
+	return ReadScore(os.path.join(directory, 'training_metrics.csv'), metric, scoreEpisodes)
+
+def _InitializeWorker(cpus, memoryLimitBytes):
+	# every worker takes a CPU of its own, the training subprocesses inherit the affinity and the limit
+	try:
+		cpu = cpus.get_nowait()
+		if hasattr(os, 'sched_setaffinity'):
+			os.sched_setaffinity(0, {cpu})
+	except queue.Empty:
+		pass
+	if memoryLimitBytes is not None:
+		import resource
+		resource.setrlimit(resource.RLIMIT_AS, (memoryLimitBytes, memoryLimitBytes))
+
+def _RunTrial(trialFunction, directory:str, config, episodes:int, resume:bool, trialArguments):
+	# the score and None, or None and the error of a failed trial, interrupts still stop the sweep
+	os.makedirs(directory, exist_ok=True)
+	try:
+		return float(trialFunction(directory, config, episodes, resume, **trialArguments)), None
+	except Exception as error:
+		return None, type(error).__name__ + ': ' + str(error)
+
+class HyperparameterSweep():
+	"""A successive halving sweep over a parameter grid
+
+		Arguments:
+			directory {str} -- The sweep directory: the state file and a directory per trial
+			baseConfig {dict} -- {'agent': agent JSON, 'network': network JSON}
+			grid {dict} -- dotted key to the list of its values, see ExpandGrid
+
+		Keyword Arguments:
+			trialFunction {callable} -- trialFunction(directory, config, episodes, resume, **trialArguments) returns the score,
+				module level so it can be pickled (default: {RunTrainingTrial})
+			trialArguments {dict} -- extra keyword arguments of the trial function (default: {None})
+			minEpisodes {int} -- The episodes of the first rung, every later rung trains eta times longer in total (default: {50})
+			eta {int} -- Only the best 1/eta trials of a rung go on to the next one (default: {3})
+			rungs {int} -- The number of rungs (default: {until one trial is left})
+			maximize {bool} -- Higher scores are better (default: {True})
+			workers {int} -- The number of trials run at once, 0 runs them in this process (default: {the available CPUs})
+			memoryLimitBytes {int} -- The address space limit of every worker and its training subprocess (default: {None})
+			pinCpus {bool} -- Pin every worker to a CPU of its own (default: {True})
+	"""
+
+	def __init__(self, directory:str, baseConfig, grid, trialFunction = RunTrainingTrial, trialArguments = None, minEpisodes:int = 50,
+		eta:int = 3, rungs:int = None, maximize:bool = True, workers:int = None, memoryLimitBytes:int = None, pinCpus:bool = True):
+		if eta < 2:
+			raise ValueError("eta must be at least 2.")
+		self.directory = directory
+		self.trialFunction = trialFunction
+		self.trialArguments = trialArguments or {}
+		self.minEpisodes = minEpisodes
+		self.eta = eta
+		self.maximize = maximize
+		self.memoryLimitBytes = memoryLimitBytes
+		self.pinCpus = pinCpus
+		self.cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count()))
+		self.workers = len(self.cpus) if workers is None else workers
+
+		self.state = self.__LoadState()
+		if self.state is None:
+			trials = [{'trial': index, 'parameters': parameters, 'config': config, 'scores': []}
+				for index, (parameters, config) in enumerate(ExpandGrid(baseConfig, grid))]
+			self.state = {'grid': grid, 'trials': trials}
+			self.__SaveState()
+		elif self.state['grid'] != json.loads(json.dumps(grid)):
+			raise ValueError("The sweep directory holds a sweep of another grid: " + directory)
+		trialCount = len(self.state['trials'])
+		self.rungs = rungs if rungs is not None else int(math.floor(math.log(max(trialCount, 1), eta) + 1e-9)) + 1
+
+	def GetRungEpisodes(self, rung:int):
+		"""Gets the total episodes a trial has trained after the rung
+		"""
+		return self.minEpisodes * self.eta ** rung
+
+	def GetRungTrials(self, rung:int):
+		"""Gets the trials that run in a rung: every trial in the first, the best 1/eta of the previous rung after that,
+		without the trials that failed. None when the previous rung isn't finished.
+		"""
+		trials = self.state['trials']
+		for previous in range(rung):
+			if any(len(trial['scores']) <= previous for trial in trials):
+				return None
+			trials = sorted(trials, key=lambda trial: trial['scores'][previous], reverse=self.maximize)
+			trials = sorted(trials[:max(1, len(trials) // self.eta)], key=lambda trial: trial['trial'])
+			trials = [trial for trial in trials if 'error' not in trial]
+		return trials
+
+	def Run(self):
+		"""Runs the rungs that aren't finished
+
+		Returns:
+			list -- the trials, the best first: trial, parameters, config, scores (one per rung it ran), directory, and the
+				error of a failed trial, its last score is then the worst
+		"""
+		if self.workers == 0:
+			self.__RunRungs(None)
+		else:
+			context = multiprocessing.get_context('spawn')
+			cpus = context.Queue()
+			for cpu in self.cpus[:self.workers]:
+				cpus.put(cpu)
+			with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_InitializeWorker,
+				initargs=(cpus if self.pinCpus else context.Queue(), self.memoryLimitBytes)) as executor:
+				self.__RunRungs(executor)
+		return self.GetResults()
+
+	def GetResults(self):
+		"""Gets the trials ordered by the last rung they reached, then by their score in it
+		"""
+		def sortKey(trial):
+			score = trial['scores'][-1] if trial['scores'] else -math.inf if self.maximize else math.inf
+			return (-len(trial['scores']), -score if self.maximize else score)
+		return [dict(trial, directory=self.GetTrialDirectory(trial)) for trial in sorted(self.state['trials'], key=sortKey)]
+
+	def GetTrialDirectory(self, trial):
+		return os.path.join(self.directory, 'trial_{:04d}'.format(trial['trial']))
+
+	def __RunRungs(self, executor):
+		for rung in range(self.rungs):
+			pending = [trial for trial in self.GetRungTrials(rung) if len(trial['scores']) == rung]
+			episodes = self.GetRungEpisodes(rung) - (self.GetRungEpisodes(rung - 1) if rung > 0 else 0)
+			arguments = [(self.trialFunction, self.GetTrialDirectory(trial), trial['config'], episodes, rung > 0, self.trialArguments) for trial in pending]
+			if executor is None:
+				for trial, trialArguments in zip(pending, arguments):
+					self.__AddScore(trial, *_RunTrial(*trialArguments))
+				continue
+			# the trials catch their own errors, a broken pool still stops the sweep so it can be resumed
+			futures = {executor.submit(_RunTrial, *trialArguments): trial for trial, trialArguments in zip(pending, arguments)}
+			for future in as_completed(futures):
+				self.__AddScore(futures[future], *future.result())
+
+	def __AddScore(self, trial, score:float, error:str = None):
+		if error is not None:
+			score = -math.inf if self.maximize else math.inf
+			trial['error'] = error
+		trial['scores'].append(score)
+		self.__SaveState()
+
+	def __LoadState(self):
+		path = os.path.join(self.directory, SWEEP_STATE)
+		if not os.path.exists(path):
+			return None
+		with open(path, 'r') as fp:
+			return json.load(fp)
+
+	def __SaveState(self):
+		# written beside the state and renamed, an interrupted write leaves the last state
+		os.makedirs(self.directory, exist_ok=True)
+		path = os.path.join(self.directory, SWEEP_STATE)
+		with open(path + '.tmp', 'w') as fp:
+			json.dump(self.state, fp, indent=1)
+		os.replace(path + '.tmp', path)
+
+def RecordSweep(store, name:str, results):
+	"""Adds every trial of a sweep as a run of a ResultsStore, with its parameters and rung scores under 'sweep'
+
+	Returns:
+		list -- the run ids
+	"""
+	runIds = []
+	for trial in results:
+		config = dict(trial['config'], sweep={'name': name, 'trial': trial['trial'], 'parameters': trial['parameters'],
+			'scores': trial['scores'], 'rungs': len(trial['scores']), 'error': trial.get('error')})
+		runId = store.CreateRun(name + '/trial_{:04d}'.format(trial['trial']), config)
+		metricsPath = os.path.join(trial['directory'], 'training_metrics.csv')
+		if os.path.exists(metricsPath):
+			store.ImportEpisodes(runId, metricsPath)
+		runIds.append(runId)
+	return runIds
+
+def FormatSweepTable(results):
+	"""Formats the sweep results as a plain text table, one row per trial with its parameters and rung scores
+	"""
+	if not results:
+		return ''
+	keys = sorted(results[0]['parameters'])
+	rungs = max(len(trial['scores']) for trial in results)
+	header = ['trial'] + keys + ['rung ' + str(rung) for rung in range(rungs)]
+	lines = [header]
+	for trial in results:
+		lines.append([str(trial['trial'])] + [str(trial['parameters'][key]) for key in keys] +
+			['{:.3f}'.format(score) for score in trial['scores']] + [''] * (rungs - len(trial['scores'])))
+	widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+	return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, widths)) for line in lines)
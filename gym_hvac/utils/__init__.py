@@ -1,3 +1,28 @@
+from gym_hvac.utils.dtype_policy import GetStorageDtype, STORAGE_DTYPES, ACCUMULATION_DTYPE
 from gym_hvac.utils.hvac_building_tracker import HvacBuildingTracker
+from gym_hvac.utils.hvac_replay import HvacReplay, ReplayResiduals, ReadReplayLog, REPLAY_LOG_DTYPE, REPLAY_LOG_FLOAT32_DTYPE
 
 __version__ = '0.1.0.dev'
+
+# the training report pulls in multiprocessing and shared memory and the session checkpoint a writer thread, which
+# the simulator and its workers never use, so they are only imported when one of their names is asked for
+_LAZY_ATTRIBUTES = {
+	'TrainingReporter': 'gym_hvac.utils.training_report',
+	'EpisodeSummaryRing': 'gym_hvac.utils.training_report',
+	'EPISODE_SUMMARY_DTYPE': 'gym_hvac.utils.training_report',
+	'SessionCheckpoint': 'gym_hvac.utils.session_checkpoint',
+	'GetRandomState': 'gym_hvac.utils.session_checkpoint',
+	'SetRandomState': 'gym_hvac.utils.session_checkpoint',
+}
+
+def __getattr__(name:str):
+	moduleName = _LAZY_ATTRIBUTES.get(name)
+	if moduleName is None:
+		raise AttributeError("module 'gym_hvac.utils' has no attribute " + repr(name))
+	import importlib
+	value = getattr(importlib.import_module(moduleName), name)
+	globals()[name] = value
+	return value
+
+def __dir__():
+	return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,32 @@
+"""The float dtype of stored and observed data: observations, tracker samples, compiled forcing and recorded logs.
+
+float32 halves the memory and the bandwidth of large batches and datasets. Only what is stored or handed out
+is float32, the simulation keeps its state in float64 Python floats and every total (energy, cost, reward,
+time) is accumulated in float64, so a float32 run follows the same trajectory as a float64 run and only its
+stored values are rounded: about 1e-6 C for temperatures and 5e-4 W for the average watts, relative 6e-8.
+The derived constants of a building (the decay of a second is 1 - 1e-4) stay float64 in every mode, they
+would lose most of their digits in float32.
+"""
+import numpy as np
+
+STORAGE_DTYPES = ('float32', 'float64')
+
+# totals are accumulated in this dtype whatever the storage dtype
+ACCUMULATION_DTYPE = np.dtype(np.float64)
+
+def GetStorageDtype(dtype = 'float64'):
+	"""Gets the numpy dtype of a storage dtype policy
+
+	Arguments:
+		dtype {str or np.dtype} -- 'float32' or 'float64'
+
+	Returns:
+		np.dtype
+	"""
+	try:
+		resolved = np.dtype(dtype)
+	except TypeError:
+		resolved = None
+	if resolved is None or resolved.name not in STORAGE_DTYPES:
+		raise ValueError("Unsupported storage dtype: " + str(dtype) + ", use one of " + ', '.join(STORAGE_DTYPES))
+	return resolved
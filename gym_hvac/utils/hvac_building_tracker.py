@@ -1,49 +1,82 @@
 
+import numpy as np
+from gym_hvac.utils.dtype_policy import GetStorageDtype
 #from models import HVAC
 
 class HvacBuildingTracker():
 	""" Creates a tracker that will manage the data that the hvac building generates
+
+		Keyword Arguments:
+			dtype {str} -- Keep the samples in a growing numpy array of this storage dtype ('float32' or 'float64')
+				instead of lists, the Get methods then return arrays (default: {None})
 	"""
 
-	def __init__(self):
+	def __init__(self, dtype = None):
 		"""Creates an instance of the hvac building tracker
 		"""
+		self.dtype = None if dtype is None else GetStorageDtype(dtype)
 		self.__HouseTempArr = []
 		self.__OutsideTempArr = []
 		self.__AvgPowerPerSecArr = []
-	
+		self.__samples = None
+		self.__count = 0
+		if self.dtype is not None:
+			# house temperature, outside temperature and average watts per sample, doubled when full
+			self.__samples = np.empty((1024, 3), dtype=self.dtype)
+
 	def AddSample(self, houseTemp: float, outsideTemp: float, avgPwrPerSecond: float):
 		"""Adds a sample of the data for the house
-		
+
 		Arguments:
 			houseTemp {float} -- The current house temperature in C
 			outsideTemp {float} -- The current outside temperature in C
 			avgPwrPerSecond {float} -- The average watts per second
 		"""
+		if self.__samples is not None:
+			if self.__count == len(self.__samples):
+				self.__samples = np.concatenate([self.__samples, np.empty_like(self.__samples)])
+			self.__samples[self.__count] = (houseTemp, outsideTemp, avgPwrPerSecond)
+			self.__count = self.__count + 1
+			return
 
 		self.__HouseTempArr.append(houseTemp)
 		self.__OutsideTempArr.append(outsideTemp)
 		self.__AvgPowerPerSecArr.append(avgPwrPerSecond)
 
 	def GetHouseTempArray(self, isCelsius:bool = True):
+		if self.__samples is not None:
+			return self.__getColumn(0, isCelsius)
 		if isCelsius:
 			return self.__HouseTempArr
-		
+
 		# convert an array to farienheit
 		return self.__convertCArrayToF(self.__HouseTempArr)
-		
+
 	def GetOutsideTempArray(self, isCelsius:bool = True):
+		if self.__samples is not None:
+			return self.__getColumn(1, isCelsius)
 		if isCelsius:
 			return self.__OutsideTempArr
-		
+
 		# convert an array to farienheit
 		return self.__convertCArrayToF(self.__OutsideTempArr)
 
+	def GetAvgPowerPerSecArray(self):
+		if self.__samples is not None:
+			return self.__samples[:self.__count, 2]
+		return self.__AvgPowerPerSecArr
+
+	def __getColumn(self, column:int, isCelsius:bool):
+		# a view of the samples, the conversion to farienheit is a new array of the same dtype
+		values = self.__samples[:self.__count, column]
+		if isCelsius:
+			return values
+		return values * self.dtype.type(9 / 5) + self.dtype.type(32)
+
 	def __convertCArrayToF(self, C_Array):
 		f_array = []
 		for c in C_Array:
-			#convert 
+			#convert
 			f = (c * (9/5))+32
 			f_array.append(f)
 		return f_array
-
@@ -0,0 +1,180 @@
+import itertools
+import math
+import numpy as np
+
+# A single record of a recorded HVAC log
+# time {seconds}, command {0 off, 1 heating, 2 cooling}, outside and indoor temperature {C}
+REPLAY_LOG_DTYPE = np.dtype([
+	('time', '<f8'),
+	('command', '<i4'),
+	('outside_temperature', '<f8'),
+	('indoor_temperature', '<f8')])
+# The same record with float32 temperatures for large datasets, the time stays float64 since float32 only
+# counts whole seconds up to 194 days
+REPLAY_LOG_FLOAT32_DTYPE = np.dtype([
+	('time', '<f8'),
+	('command', '<i4'),
+	('outside_temperature', '<f4'),
+	('indoor_temperature', '<f4')])
+
+def ReadReplayLog(path:str, chunkRows:int = 65536, dtype = REPLAY_LOG_DTYPE):
+	"""Streams a recorded HVAC log in chunks of structured records (REPLAY_LOG_DTYPE or REPLAY_LOG_FLOAT32_DTYPE)
+
+	Supported formats are csv (time,command,outside_temperature,indoor_temperature with an optional header),
+	.npy files (memory mapped) and raw binary files of packed REPLAY_LOG_DTYPE records.
+	Only one chunk is held in memory at a time.
+
+	Arguments:
+		path {str} -- The path of the log file
+		chunkRows {int} -- The number of records in each chunk (default: {65536})
+		dtype {np.dtype} -- The record dtype of the chunks, and of the records in .npy and binary files (default: {REPLAY_LOG_DTYPE})
+	"""
+	if chunkRows <= 0:
+		raise ValueError("chunkRows must be positive.")
+	if dtype != REPLAY_LOG_DTYPE and dtype != REPLAY_LOG_FLOAT32_DTYPE:
+		raise ValueError("The log records must use REPLAY_LOG_DTYPE or REPLAY_LOG_FLOAT32_DTYPE.")
+
+	if path.endswith('.npy'):
+		records = np.load(path, mmap_mode='r')
+		if records.dtype != dtype:
+			raise ValueError("The log records must use " + ('REPLAY_LOG_DTYPE.' if dtype == REPLAY_LOG_DTYPE else 'REPLAY_LOG_FLOAT32_DTYPE.'))
+		for start in range(0, len(records), chunkRows):
+			yield np.array(records[start:start + chunkRows])
+		return
+
+	if path.endswith('.csv'):
+		with open(path, 'r') as logFile:
+			firstLine = logFile.readline()
+			pendingLines = [] if firstLine[:1].isalpha() else [firstLine]
+			while True:
+				lines = pendingLines + list(itertools.islice(logFile, chunkRows - len(pendingLines)))
+				pendingLines = []
+				lines = [line for line in lines if line.strip()]
+				if not lines:
+					return
+				yield np.loadtxt(lines, delimiter=',', dtype=dtype, ndmin=1)
+		return
+
+	with open(path, 'rb') as logFile:
+		while True:
+			records = np.fromfile(logFile, dtype=dtype, count=chunkRows)
+			if len(records) == 0:
+				return
+			yield records
+
+class ReplayResiduals():
+	"""Running statistics of the residuals (simulated - recorded indoor temperature) of a replay.
+
+	The statistics are merged chunk by chunk so they never keep the residuals themselves.
+	"""
+
+	def __init__(self):
+		self.Count = 0
+		self.Mean = 0.0
+		self.MaxAbs = 0.0
+		self.__sumSquaredDeviation = 0.0
+		self.__sumSquared = 0.0
+
+	def Update(self, residuals):
+		"""Merges a chunk of residuals into the running statistics
+
+		Arguments:
+			residuals {np.ndarray} -- The residuals of the chunk
+		"""
+		residuals = np.asarray(residuals, dtype=np.float64)
+		chunkCount = len(residuals)
+		if chunkCount == 0:
+			return
+		chunkMean = residuals.mean()
+		chunkDeviation = float(((residuals - chunkMean) ** 2).sum())
+		totalCount = self.Count + chunkCount
+		delta = chunkMean - self.Mean
+		self.__sumSquaredDeviation = self.__sumSquaredDeviation + chunkDeviation + delta * delta * self.Count * chunkCount / totalCount
+		self.Mean = self.Mean + delta * chunkCount / totalCount
+		self.__sumSquared = self.__sumSquared + float((residuals * residuals).sum())
+		self.MaxAbs = max(self.MaxAbs, float(np.abs(residuals).max()))
+		self.Count = totalCount
+
+	def GetStd(self):
+		"""Gets the standard deviation of the residuals
+		"""
+		if self.Count == 0:
+			return 0.0
+		return math.sqrt(self.__sumSquaredDeviation / self.Count)
+
+	def GetRmse(self):
+		"""Gets the root mean squared error of the residuals
+		"""
+		if self.Count == 0:
+			return 0.0
+		return math.sqrt(self.__sumSquared / self.Count)
+
+class HvacReplay():
+	"""Drives an HvacBuilding with recorded HVAC commands and outside temperatures and compares
+	the simulated indoor temperature with the recorded one.
+
+	Each record's command is applied the same way HvacEnv applies its actions (0 off, 1 heating, 2 cooling)
+	and held until the next record, the building is integrated in batches with HvacBuilding.StepSeconds.
+
+		Arguments:
+			hvacBuilding {HvacBuilding} -- The building to drive
+			initializeTemperature {bool} -- Start the building at the first recorded indoor temperature (default: {True})
+	"""
+
+	def __init__(self, hvacBuilding, initializeTemperature:bool = True):
+		self.hvacBuilding = hvacBuilding
+		self.Residuals = ReplayResiduals()
+		self.__initialize_temperature = initializeTemperature
+		self.__last_time = None
+		self.__last_outside_temperature = 0.0
+
+	def Run(self, chunks):
+		"""Replays chunks of log records, yielding after every chunk
+
+		Arguments:
+			chunks {iterable} -- chunks of REPLAY_LOG_DTYPE or REPLAY_LOG_FLOAT32_DTYPE records, for example from ReadReplayLog
+
+		Yields:
+			tuple -- (time, simulated indoor temperature, residual) arrays of the chunk and the running ReplayResiduals
+		"""
+		for records in chunks:
+			simulated = np.empty(len(records))
+			for i in range(len(records)):
+				time = float(records['time'][i])
+				if self.__last_time is None:
+					if self.__initialize_temperature:
+						self.hvacBuilding.current_temperature = float(records['indoor_temperature'][i])
+				else:
+					seconds = int(round(time - self.__last_time))
+					if seconds < 0:
+						raise ValueError("The log records must be ordered by time.")
+					self.hvacBuilding.StepSeconds(self.__last_outside_temperature, seconds)
+				simulated[i] = self.hvacBuilding.current_temperature
+				self.__apply_command(int(records['command'][i]))
+				self.__last_time = time
+				self.__last_outside_temperature = float(records['outside_temperature'][i])
+
+			residuals = simulated - records['indoor_temperature']
+			self.Residuals.Update(residuals)
+			yield records['time'], simulated, residuals, self.Residuals
+
+	def RunFile(self, path:str, chunkRows:int = 65536, dtype = REPLAY_LOG_DTYPE):
+		"""Replays a log file, see ReadReplayLog for the supported formats and record dtypes.
+
+		Returns:
+			ReplayResiduals -- The residual statistics of the whole log
+		"""
+		for _ in self.Run(ReadReplayLog(path, chunkRows, dtype)):
+			pass
+		return self.Residuals
+
+	def __apply_command(self, command:int):
+		hvac = self.hvacBuilding.building_hvac
+		if command == 0:
+			hvac.TurnHvacOff()
+		elif command == 1:
+			hvac.TurnHeatingOn()
+		elif command == 2:
+			hvac.TurnCoolingOn()
+		else:
+			raise ValueError("Unknown HVAC command: " + str(command))
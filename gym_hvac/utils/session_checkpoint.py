@@ -0,0 +1,260 @@
+"""Checkpoints a training session (env state, runner progress, RNG state and the collected metrics) so an interrupted
+run resumes exactly where its last checkpoint left it.
+
+A checkpoint directory holds one append only binary file per metric series and a manifest (MANIFEST, an .npz)
+with the session state and the length of every series. A save appends the series records added since the last
+save, syncs them, then writes the manifest next to the old one and renames it into place: the rename commits the
+save, so a crash leaves the previous checkpoint readable, and records appended past the manifest's lengths are cut
+off when the checkpoint is opened again. Saves are written by a background thread, training only copies the state
+and the new records.
+"""
+import json
+import os
+import random
+import tempfile
+import threading
+import numpy as np
+
+MANIFEST = 'session.npz'
+SERIES_SUFFIX = '.series'
+
+def GetRandomState():
+	"""Gets the state of the random and the global numpy.random generators as arrays a checkpoint can store
+	"""
+	version, internal, gauss = random.getstate()
+	name, keys, position, hasGauss, cachedGaussian = np.random.get_state()
+	return {
+		'python': np.array(internal, dtype=np.int64),
+		'pythonVersion': version,
+		'pythonGauss': np.nan if gauss is None else gauss,
+		'numpy': np.array(keys, dtype=np.uint32),
+		'numpyName': name,
+		'numpyPosition': position,
+		'numpyHasGauss': hasGauss,
+		'numpyCachedGaussian': cachedGaussian,
+	}
+
+def SetRandomState(state):
+	"""Sets the random and the global numpy.random generators to a GetRandomState
+	"""
+	gauss = float(state['pythonGauss'])
+	random.setstate((int(state['pythonVersion']), tuple(int(value) for value in state['python']), None if np.isnan(gauss) else gauss))
+	np.random.set_state((str(state['numpyName']), np.asarray(state['numpy'], dtype=np.uint32), int(state['numpyPosition']),
+		int(state['numpyHasGauss']), float(state['numpyCachedGaussian'])))
+
+def _Flatten(state, prefix:str, arrays):
+	# nested dicts become 'parent/child' keys
+	for key, value in state.items():
+		if '/' in key:
+			raise ValueError("A checkpoint state key can't contain '/': " + key)
+		if isinstance(value, dict):
+			_Flatten(value, prefix + key + '/', arrays)
+		else:
+			# copied, training goes on changing its arrays while the state is written
+			array = np.array(value)
+			if array.dtype.hasobject:
+				raise ValueError("A checkpoint state holds arrays, records, numbers and strings, not " + repr(value))
+			arrays[prefix + key] = array
+	return arrays
+
+def _Unflatten(arrays):
+	state = {}
+	for name, array in arrays.items():
+		parent = state
+		keys = name.split('/')
+		for key in keys[:-1]:
+			parent = parent.setdefault(key, {})
+		# scalars come back as python values, records as tuples
+		parent[keys[-1]] = array.item() if array.ndim == 0 else array
+	return state
+
+class SessionCheckpoint():
+	"""Saves the state and the growing metric series of a session in the background, see the module.
+
+		Arguments:
+			directory {str} -- The checkpoint directory, created when missing, an existing checkpoint is continued
+
+		Keyword Arguments:
+			dtypes {dict} -- The record dtype of series that are given as lists, e.g. of summary tuples (default: {None}, inferred)
+	"""
+
+	def __init__(self, directory:str, dtypes = None):
+		self.directory = directory
+		self.dtypes = {name: np.dtype(dtype) for name, dtype in (dtypes or {}).items()}
+		os.makedirs(directory, exist_ok=True)
+		self.Saves = 0
+		self.BytesWritten = 0
+		self.__sequence = 0
+		# the length of every series as of the last save handed to the writer, and as of the manifest on disk
+		self.__lengths = {}
+		self.__committed = {}
+		self.__condition = threading.Condition()
+		self.__pending = None
+		self.__writing = False
+		self.__error = None
+		self.__closed = False
+		manifest = self.__ReadManifest()
+		if manifest is not None:
+			self.__sequence = manifest['sequence']
+			for name, (length, descr) in manifest['series'].items():
+				dtype = np.lib.format.descr_to_dtype(descr)
+				self.dtypes[name] = dtype
+				self.__lengths[name] = length
+				self.__committed[name] = length
+				# records appended by a save that never committed are dropped
+				if os.path.exists(self.GetSeriesPath(name)):
+					with open(self.GetSeriesPath(name), 'r+b') as seriesFile:
+						seriesFile.truncate(length * dtype.itemsize)
+		self.__thread = threading.Thread(target=self.__Write, name='SessionCheckpoint', daemon=True)
+		self.__thread.start()
+
+	def GetSeriesPath(self, name:str):
+		return os.path.join(self.directory, name + SERIES_SUFFIX)
+
+	def GetSequence(self):
+		"""Gets the number of saves committed to the directory, 0 for a new checkpoint
+		"""
+		with self.__condition:
+			return self.__sequence
+
+	def Save(self, state, series = None):
+		"""Hands the session to the writer thread and returns, a save still waiting for the writer is merged into this one
+
+			Arguments:
+				state {dict} -- The session state, nested dicts of arrays, records, numbers and strings
+
+			Keyword Arguments:
+				series {dict} -- The metric series by name, lists or arrays that only grow, only the records added since
+					the last save are copied and written (default: {None})
+		"""
+		arrays = _Flatten(state, 'state/', {})
+		with self.__condition:
+			self.__RaiseError()
+			if self.__closed:
+				raise ValueError("The checkpoint is closed.")
+			appended = {}
+			for name, values in (series or {}).items():
+				if not name.replace('_', '').isalnum():
+					raise ValueError("A series name is letters, digits and underscores: " + name)
+				length = self.__lengths.get(name, 0)
+				if len(values) < length:
+					raise ValueError("The series " + name + " is shorter than in the checkpoint, series only grow.")
+				dtype = self.dtypes.get(name)
+				if dtype is None:
+					dtype = np.asarray(values).dtype if isinstance(values, np.ndarray) or len(values) else np.dtype(np.float64)
+					self.dtypes[name] = dtype
+				appended[name] = np.array(values[length:], dtype=dtype)
+			for name in appended:
+				self.__lengths[name] = len(series[name])
+			header = {name: (length, np.lib.format.dtype_to_descr(self.dtypes[name])) for name, length in self.__lengths.items()}
+			if self.__pending is not None:
+				# the writer is behind, the older state is superseded and the records are written together
+				for name, records in self.__pending[1].items():
+					if name in appended:
+						appended[name] = np.concatenate([records, appended[name]])
+					else:
+						appended[name] = records
+			self.__pending = (arrays, appended, header)
+			self.__condition.notify_all()
+
+	def Wait(self):
+		"""Waits until every save is committed, raising the error of a failed one
+		"""
+		with self.__condition:
+			while self.__pending is not None or self.__writing:
+				self.__condition.wait()
+			self.__RaiseError()
+
+	def Load(self):
+		"""Gets the last committed session
+
+			Returns:
+				tuple -- the state dict and the series by name as arrays, None for a new checkpoint
+		"""
+		self.Wait()
+		manifest = self.__ReadManifest()
+		if manifest is None:
+			return None
+		series = {}
+		for name, (length, descr) in manifest['series'].items():
+			series[name] = np.fromfile(self.GetSeriesPath(name), dtype=np.lib.format.descr_to_dtype(descr), count=length)
+		return manifest['state'], series
+
+	def Close(self):
+		"""Commits the pending save and stops the writer thread
+		"""
+		with self.__condition:
+			self.__closed = True
+			self.__condition.notify_all()
+		self.__thread.join()
+		self.__RaiseError()
+
+	def __RaiseError(self):
+		if self.__error is not None:
+			error = self.__error
+			self.__error = None
+			raise error
+
+	def __ReadManifest(self):
+		path = os.path.join(self.directory, MANIFEST)
+		if not os.path.exists(path):
+			return None
+		with np.load(path, allow_pickle=False) as manifest:
+			arrays = {name: manifest[name] for name in manifest.files}
+		header = json.loads(arrays.pop('header').item())
+		state = _Unflatten({name[len('state/'):]: array for name, array in arrays.items()})
+		return {'sequence': header['sequence'], 'series': header['series'], 'state': state}
+
+	def __Write(self):
+		while True:
+			with self.__condition:
+				while self.__pending is None and not self.__closed:
+					self.__condition.wait()
+				if self.__pending is None:
+					return
+				arrays, appended, header = self.__pending
+				self.__pending = None
+				self.__writing = True
+				sequence = self.__sequence + 1
+			try:
+				self.__Commit(sequence, arrays, appended, header)
+			except BaseException as error:
+				with self.__condition:
+					self.__error = error
+					# the records of the failed save and of a save merged behind it are sent again by the next save
+					self.__pending = None
+					self.__lengths = dict(self.__committed)
+			finally:
+				with self.__condition:
+					self.__writing = False
+					self.__condition.notify_all()
+
+	def __Commit(self, sequence:int, arrays, appended, series):
+		for name, records in appended.items():
+			if len(records) == 0 and os.path.exists(self.GetSeriesPath(name)):
+				continue
+			with open(self.GetSeriesPath(name), 'ab') as seriesFile:
+				# a failed save may have left records past the committed length
+				seriesFile.truncate(self.__committed.get(name, 0) * records.dtype.itemsize)
+				seriesFile.write(records.tobytes())
+				seriesFile.flush()
+				os.fsync(seriesFile.fileno())
+			self.BytesWritten = self.BytesWritten + records.nbytes
+		header = {'sequence': sequence, 'series': series}
+		arrays = dict(arrays, header=np.array(json.dumps(header)))
+		descriptor, temporaryPath = tempfile.mkstemp(dir=self.directory, prefix='.' + MANIFEST, suffix='.tmp')
+		try:
+			with os.fdopen(descriptor, 'wb') as temporaryFile:
+				np.savez(temporaryFile, **arrays)
+				temporaryFile.flush()
+				os.fsync(temporaryFile.fileno())
+			os.replace(temporaryPath, os.path.join(self.directory, MANIFEST))
+		except BaseException:
+			if os.path.exists(temporaryPath):
+				os.remove(temporaryPath)
+			raise
+		self.BytesWritten = self.BytesWritten + os.path.getsize(os.path.join(self.directory, MANIFEST))
+		with self.__condition:
+			self.__committed = {name: length for name, (length, descr) in series.items()}
+			self.__sequence = sequence
+			self.Saves = self.Saves + 1
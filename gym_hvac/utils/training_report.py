@@ -0,0 +1,267 @@
+"""Reports training progress from a background process so the training loop never waits on files or plots.
+
+Episode summaries go through a single producer, single consumer ring buffer in shared memory: the
+producer only writes a record and bumps its head counter, the consumer only reads records and bumps
+its tail counter, neither takes a lock. When the ring is full the summary is dropped and counted
+instead of blocking training.
+"""
+import csv
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+EPISODE_SUMMARY_DTYPE = np.dtype([
+	('episode', '<i8'),
+	('timesteps', '<i8'),
+	('reward', '<f8'),
+	('totalCost', '<f8'),
+	('temperature', '<f8'),
+	('heatingCycles', '<i8'),
+	('coolingCycles', '<i8'),
+	('heatingSeconds', '<f8'),
+	('coolingSeconds', '<f8')])
+
+METRICS_CSV = 'training_metrics.csv'
+METRICS_NPZ = 'training_metrics.npz'
+
+class EpisodeSummaryRing():
+	"""A lock free single producer, single consumer ring of EPISODE_SUMMARY_DTYPE records in shared memory
+
+		Keyword Arguments:
+			capacity {int} -- The number of records the ring holds (default: {4096})
+			name {str} -- Attach to an existing ring instead of creating one (default: {None})
+	"""
+
+	def __init__(self, capacity:int = 4096, name:str = None):
+		self.capacity = capacity
+		size = 16 + capacity * EPISODE_SUMMARY_DTYPE.itemsize
+		if name is None:
+			self.__memory = shared_memory.SharedMemory(create=True, size=size)
+			self.__owner = True
+		else:
+			self.__memory = shared_memory.SharedMemory(name=name)
+			self.__owner = False
+		# counters[0] is the head written by the producer, counters[1] the tail written by the consumer
+		self.__counters = np.ndarray((2,), dtype=np.int64, buffer=self.__memory.buf)
+		self.__records = np.ndarray((capacity,), dtype=EPISODE_SUMMARY_DTYPE, buffer=self.__memory.buf, offset=16)
+		if self.__owner:
+			self.__counters[:] = 0
+		self.Dropped = 0
+
+	def GetName(self):
+		return self.__memory.name
+
+	def Push(self, summary):
+		"""Adds a summary (a tuple in EPISODE_SUMMARY_DTYPE field order)
+
+		Returns:
+			bool -- False when the ring was full and the summary was dropped
+		"""
+		head = int(self.__counters[0])
+		if head - int(self.__counters[1]) >= self.capacity:
+			self.Dropped = self.Dropped + 1
+			return False
+		self.__records[head % self.capacity] = summary
+		self.__counters[0] = head + 1
+		return True
+
+	def PopAll(self):
+		"""Takes every summary pushed since the last call
+
+		Returns:
+			np.ndarray -- a copy of the records in push order
+		"""
+		head = int(self.__counters[0])
+		tail = int(self.__counters[1])
+		if head == tail:
+			return self.__records[:0].copy()
+		indexes = np.arange(tail, head) % self.capacity
+		records = self.__records[indexes]
+		self.__counters[1] = head
+		return records
+
+	def Close(self):
+		# drop the numpy views before closing the shared memory they point into
+		self.__counters = None
+		self.__records = None
+		self.__memory.close()
+		if self.__owner:
+			self.__memory.unlink()
+
+class TrainingReporter():
+	"""Collects episode summaries and comparison runs on the training side and hands them to a background
+	process that appends METRICS_CSV, snapshots METRICS_NPZ and regenerates the progress and comparison SVGs.
+
+		Keyword Arguments:
+			outputDirectory {str} -- where the metrics and SVGs are written (default: {'.'})
+			capacity {int} -- the number of summaries the ring holds before new ones are dropped (default: {4096})
+			plotEverySeconds {float} -- the least time between two regenerations of the progress SVGs (default: {30})
+			history {np.ndarray} -- the EPISODE_SUMMARY_DTYPE records of a resumed session, METRICS_CSV is rewritten
+				with them and the plots continue from them (default: {None})
+	"""
+
+	def __init__(self, outputDirectory:str = '.', capacity:int = 4096, plotEverySeconds:float = 30.0, history = None):
+		self.outputDirectory = outputDirectory
+		self.plotEverySeconds = plotEverySeconds
+		# every summary added, dropped or not, for a session checkpoint
+		self.__history = []
+		if history is not None:
+			history = np.asarray(history, dtype=EPISODE_SUMMARY_DTYPE)
+			self.__history = history.tolist()
+		self.__ring = EpisodeSummaryRing(capacity)
+		context = multiprocessing.get_context('spawn')
+		self.__comparisons = context.Queue()
+		self.__stop = context.Event()
+		self.__process = context.Process(target=_RunReportProcess, daemon=True,
+			args=(self.__ring.GetName(), capacity, outputDirectory, plotEverySeconds, self.__comparisons, self.__stop, history))
+		self.__process.start()
+
+	def GetDropped(self):
+		return self.__ring.Dropped
+
+	def AddEpisode(self, summary):
+		"""Adds an episode summary without blocking, see HvacEnv.GetEpisodeSummary
+
+		Returns:
+			bool -- False when the summary was dropped because the report process fell behind
+		"""
+		self.__history.append(tuple(summary))
+		return self.__ring.Push(summary)
+
+	def GetHistory(self):
+		"""Gets every summary added, after those of the resumed history, as a list that grows with the episodes
+		"""
+		return self.__history
+
+	def SubmitComparison(self, timeOfDayInSeconds, outdoorTemperature, rlIndoorTemperature, baselineIndoorTemperature,
+		rlCost, baselineCost, rlReward, baselineReward):
+		"""Hands a one day RL vs standard thermostat run to the report process to plot the comparison SVGs
+		"""
+		arrays = [timeOfDayInSeconds, outdoorTemperature, rlIndoorTemperature, baselineIndoorTemperature, rlCost, baselineCost, rlReward, baselineReward]
+		self.__comparisons.put([np.asarray(array, dtype=np.float64) for array in arrays])
+
+	def Close(self, timeout:float = 60.0):
+		"""Lets the report process write everything that was submitted, then stops it
+		"""
+		self.__stop.set()
+		self.__process.join(timeout)
+		if self.__process.is_alive():
+			self.__process.terminate()
+		self.__ring.Close()
+
+def _RunReportProcess(ringName:str, capacity:int, outputDirectory:str, plotEverySeconds:float, comparisons, stop, history = None):
+	ring = EpisodeSummaryRing(capacity, name=ringName)
+	os.makedirs(outputDirectory, exist_ok=True)
+	csvPath = os.path.join(outputDirectory, METRICS_CSV)
+	batches = []
+	if history is not None:
+		# the episodes after the resumed checkpoint are written again, the csv is cut back to the checkpoint's
+		temporaryPath = csvPath + '.tmp'
+		with open(temporaryPath, 'w', newline='') as csvFile:
+			writer = csv.writer(csvFile)
+			writer.writerow(EPISODE_SUMMARY_DTYPE.names)
+			writer.writerows(history.tolist())
+		os.replace(temporaryPath, csvPath)
+		batches.append(history)
+	writeHeader = not os.path.exists(csvPath)
+	lastPlot = 0.0
+	plottedCount = 0
+	with open(csvPath, 'a', newline='') as csvFile:
+		writer = csv.writer(csvFile)
+		if writeHeader:
+			writer.writerow(EPISODE_SUMMARY_DTYPE.names)
+		while True:
+			stopping = stop.is_set()
+			records = ring.PopAll()
+			if len(records):
+				writer.writerows(records.tolist())
+				csvFile.flush()
+				batches.append(records)
+
+			count = sum(len(batch) for batch in batches)
+			now = time.monotonic()
+			if count != plottedCount and (stopping or now - lastPlot >= plotEverySeconds):
+				metrics = np.concatenate(batches)
+				batches = [metrics]
+				_SaveMetrics(os.path.join(outputDirectory, METRICS_NPZ), metrics)
+				_PlotProgress(outputDirectory, metrics)
+				plottedCount = count
+				lastPlot = now
+
+			while True:
+				try:
+					_PlotComparison(outputDirectory, *comparisons.get_nowait())
+				except queue.Empty:
+					break
+
+			if stopping:
+				break
+			time.sleep(0.05)
+	ring.Close()
+
+def _SaveMetrics(path:str, metrics):
+	# write next to the target and rename so readers never see a half written file
+	temporaryPath = path + '.tmp.npz'
+	np.savez(temporaryPath, **{name: metrics[name] for name in metrics.dtype.names})
+	os.replace(temporaryPath, path)
+
+def _GetPyplot():
+	import matplotlib
+	matplotlib.use('Agg')
+	import matplotlib.pyplot as plt
+	for style in ['seaborn', 'seaborn-v0_8']:
+		if style in plt.style.available:
+			plt.style.use(style)
+			break
+	return plt
+
+def _AddAxisLabels(plt, yLabel:str, title:str, xLabel:str = 'Time of day', xAxisIsTime:bool = True):
+	import datetime
+	import matplotlib.ticker as ticker
+	fig, ax = plt.subplots()
+	if xAxisIsTime:
+		ax.xaxis.set_major_formatter(ticker.FuncFormatter(lambda x, pos: str(datetime.timedelta(seconds=x))))
+	plt.xlabel(xLabel, fontsize=18)
+	plt.ylabel(yLabel, fontsize=18)
+	plt.title(title, fontsize=20)
+	return fig, ax
+
+def _PlotProgress(outputDirectory:str, metrics):
+	plt = _GetPyplot()
+	for fileName, field, yLabel, label in [
+		('RL_Progress.svg', 'timesteps', 'Number of Steps per Episode', 'Step Count'),
+		('RL_Reward_Progress.svg', 'reward', 'Episode Reward', 'Reward'),
+		('RL_Cost_Progress.svg', 'totalCost', 'Episode Cost (US$)', 'Total Cost')]:
+		fig, ax = _AddAxisLabels(plt, yLabel, 'Reinforced Learning Progress', 'Number of Episodes', False)
+		ax.plot(metrics['episode'], metrics[field], 'C3', label=label)
+		ax.legend(loc='lower right')
+		fig.savefig(os.path.join(outputDirectory, fileName))
+		plt.close(fig)
+
+def _PlotComparison(outputDirectory:str, timeOfDay, outdoor, rlIndoor, baselineIndoor, rlCost, baselineCost, rlReward, baselineReward):
+	plt = _GetPyplot()
+	fig, ax = _AddAxisLabels(plt, 'Temperature (C°)', '24 Hour HVAC House Temperature')
+	ax.axhline(20, color='Yellow', lw=2, linestyle=':')
+	ax.plot(timeOfDay, outdoor, 'C2', label='Outdoor Temp')
+	ax.plot(timeOfDay, baselineIndoor, 'b--', label='Standard Thermostat Indoor Temp')
+	ax.plot(timeOfDay, rlIndoor, 'C1', label='RL Indoor Temp')
+	ax.legend(loc='lower right')
+	fig.savefig(os.path.join(outputDirectory, 'indoorAndOutdoor_RL_Baseline_Comparison.svg'))
+	plt.close(fig)
+
+	fig, ax = _AddAxisLabels(plt, 'Cost (US$)', '24 Hour HVAC Cost')
+	ax.plot(timeOfDay, rlCost, 'C3', label='RL Total Cost')
+	ax.plot(timeOfDay, baselineCost, 'b--', label='Standard Thermostat Total Cost')
+	ax.legend(loc='lower right')
+	fig.savefig(os.path.join(outputDirectory, 'Total_Cost_RL_Baseline_Comparison.svg'))
+	plt.close(fig)
+
+	fig, ax = _AddAxisLabels(plt, 'Reward (more is better)', '24 Hour HVAC Reward')
+	ax.plot(timeOfDay, rlReward, 'C3', label='RL Reward')
+	ax.plot(timeOfDay, baselineReward, 'b--', label='Standard Thermostat Reward')
+	ax.legend(loc='lower right')
+	fig.savefig(os.path.join(outputDirectory, 'Reward_RL_Baseline_Comparison.svg'))
+	plt.close(fig)
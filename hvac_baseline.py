@@ -10,22 +10,13 @@ import datetime
 
 env = gym.make('Hvac-v0')
 
-done = False
-observation = env.reset()
-action = 0
-indoorTempArr = []
-outdoorTempArr = []
-rewardTempArr = []
-costArr = []
-averageWattsPerSecArr = []
-timeOfDayInSecondsArr = []
 desiredTemperature = 20
 temperatureDelta = 2
 
-# siulate 30 second intervals
-
-for	i in range(2880):
-	timeOfDayInSecondsArr.append(i*30)
+def baselinePolicy(observation):
+	"""The standard thermostat, it reads the HVAC of the env and keeps its last action
+	"""
+	global action
 	if not env.hvacBuilding.building_hvac.HeatingIsShuttingDown and env.hvacBuilding.building_hvac.HeatingIsOn and env.hvacBuilding.current_temperature > (desiredTemperature):
 		print("Turning the Heater Off")
 		action = 0
@@ -41,12 +32,23 @@ for	i in range(2880):
 	if not env.hvacBuilding.building_hvac.HeatingIsOn and env.hvacBuilding.building_hvac.CoolingIsOn and env.hvacBuilding.current_temperature < desiredTemperature:
 		print("Turning the cooling off")
 		action = 0
-	
-	state, reward, done, info = env.step(action)
-	indoorTempArr.append(state[1])
-	outdoorTempArr.append(state[2])
-	averageWattsPerSecArr.append(state[0])
-	costArr.append(env.hvacBuilding.CalculateGasEneregyCost() + env.hvacBuilding.CalculateElectricEneregyCost())
+	return action
+
+# the run is streamed in chunks of 120 steps instead of growing a list per step
+action = 0
+timeOfDayInSecondsArr = []
+indoorTempArr = []
+outdoorTempArr = []
+costArr = []
+for chunk in env.unwrapped.iter_run(baselinePolicy, chunk_steps=120, steps=2880):
+	timeOfDayInSecondsArr.append(chunk['time'])
+	indoorTempArr.append(chunk['indoorTemperature'])
+	outdoorTempArr.append(chunk['outsideTemperature'])
+	costArr.append(chunk['cost'])
+timeOfDayInSecondsArr = np.concatenate(timeOfDayInSecondsArr)
+indoorTempArr = np.concatenate(indoorTempArr)
+outdoorTempArr = np.concatenate(outdoorTempArr)
+costArr = np.concatenate(costArr)
 
 def mjrFormatter(x, pos):
 	return str(datetime.timedelta(seconds=x))
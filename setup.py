@@ -2,5 +2,7 @@ from setuptools import setup
 
 setup(name='gym_hvac',
       version='0.0.1',
-      install_requires=['gym', 'timedelta', 'matplotlib', 'tensorflow', 'tensorforce']  # And any other dependencies foo needs
+      install_requires=['gym', 'timedelta', 'matplotlib', 'tensorflow', 'tensorforce'],  # And any other dependencies foo needs
+      # lets gym register Hvac-v0 itself, importing gym_hvac doesn't import gym
+      entry_points={'gym.envs': ['__root__ = gym_hvac:RegisterEnvironments']}
 )  
\ No newline at end of file
@@ -29,15 +29,14 @@ import os
 import time
 import sys
 import datetime
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
 import numpy as np
 
-from tensorforce import TensorForceError
-from tensorforce.agents import Agent
-from tensorforce.execution import Runner
-from tensorforce.contrib.openai_gym import OpenAIGym
 import gym_hvac
+from gym_hvac.evaluation import CreateScenarioSuite, ThermostatPolicy, EvaluatePolicy, SummarizeResults, FormatSummaryTable
+from gym_hvac.utils.training_report import TrainingReporter, EPISODE_SUMMARY_DTYPE
+from gym_hvac.utils.session_checkpoint import SessionCheckpoint, GetRandomState, SetRandomState
+from gym_hvac.results import ResultsStore
+from gym_hvac.envs import SHARED_ENV_POOL
 import gym
 
 # python examples/openai_gym.py Pong-ram-v0 -a examples/configs/vpg.json -n examples/configs/mlp2_network.json -e 50000 -m 2000
@@ -46,6 +45,13 @@ import gym
 
 
 def main():
+    # tensorforce pulls in TensorFlow, it is imported here so the evaluation worker processes, which
+    # import this module again, only load the simulator
+    from tensorforce import TensorForceError
+    from tensorforce.agents import Agent
+    from tensorforce.execution import Runner
+    from tensorforce.contrib.openai_gym import OpenAIGym
+
     parser = argparse.ArgumentParser()
 
     parser.add_argument('gym_id', help="Id of the Gym environment")
@@ -60,6 +66,8 @@ def main():
     parser.add_argument('-s', '--save', help="Save agent to this dir")
     parser.add_argument('-se', '--save-episodes', type=int, default=100, help="Save agent every x episodes")
     parser.add_argument('-l', '--load', help="Load agent from this dir")
+    parser.add_argument('-c', '--checkpoint', default=None, help="Checkpoint the session (agent, env, runner progress, metrics and RNG state) to this dir, and resume from it when it holds one")
+    parser.add_argument('-ce', '--checkpoint-episodes', type=int, default=100, help="Checkpoint the session every x episodes")
     parser.add_argument('--monitor', help="Save results to this directory")
     parser.add_argument('--monitor-safe', action='store_true', default=False, help="Do not overwrite previous results")
     parser.add_argument('--monitor-video', type=int, default=0, help="Save video every x steps (0 = disabled)")
@@ -67,6 +75,10 @@ def main():
     parser.add_argument('-D', '--debug', action='store_true', default=False, help="Show debug outputs")
     parser.add_argument('-te', '--test', action='store_true', default=False, help="Test agent without learning.")
     parser.add_argument('-sl', '--sleep', type=float, default=None, help="Slow down simulation by sleeping for x seconds (fractions allowed).")
+    parser.add_argument('-es', '--evaluate-scenarios', type=int, default=0, help="Evaluate the trained agent on the scenario suite with this many seeds per scenario (0 = disabled)")
+    parser.add_argument('-rd', '--report-dir', default='.', help="Write the training metrics and plots to this directory")
+    parser.add_argument('-rs', '--report-seconds', type=float, default=30.0, help="Regenerate the progress plots at most every x seconds")
+    parser.add_argument('--results-store', default=None, help="Record the configuration, episode metrics and evaluation of this run in this results SQLite file")
     parser.add_argument('--job', type=str, default=None, help="For distributed mode: The job type of this agent.")
     parser.add_argument('--task', type=int, default=0, help="For distributed mode: The task index of this agent.")
 
@@ -77,8 +89,19 @@ def main():
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
-    # run the baseline version of the hvace for comparison
-    baseIndoorTempArr, baseCostArr, baseRewardTempArr = baselineRun(args.max_episode_timesteps)
+    # a checkpointed session resumes with its metrics, and the baseline comparison it already ran
+    checkpoint = None
+    session = None
+    if args.checkpoint is not None:
+        checkpoint = SessionCheckpoint(args.checkpoint, dtypes={'episodes': EPISODE_SUMMARY_DTYPE})
+        session = checkpoint.Load()
+    if session is not None:
+        sessionState, sessionSeries = session
+        logger.info("Resuming the session of {} at episode {}".format(args.checkpoint, sessionState['runner']['episode']))
+        baseIndoorTempArr, baseCostArr, baseRewardTempArr = [sessionSeries[name].tolist() for name in ['baseIndoorTemperature', 'baseCost', 'baseReward']]
+    else:
+        # run the baseline version of the hvace for comparison
+        baseIndoorTempArr, baseCostArr, baseRewardTempArr = baselineRun(args.max_episode_timesteps)
 
     if args.import_modules is not None:
         for module in args.import_modules.split(','):
@@ -91,6 +114,10 @@ def main():
         monitor_video=args.monitor_video,
         visualize=args.visualize
     )
+    # the env hands every finished episode to the reporter, the metrics and plots are written by its own process
+    reporter = TrainingReporter(args.report_dir, plotEverySeconds=args.report_seconds,
+        history=sessionSeries['episodes'] if session is not None else None)
+    environment.gym.unwrapped.SetReporter(reporter)
 
     if args.agent is not None:
         with open(args.agent, 'r') as fp:
@@ -105,6 +132,11 @@ def main():
         network = None
         logger.info("No network configuration provided.")
 
+    if args.results_store is not None:
+        store = ResultsStore(args.results_store)
+        runId = store.CreateRun(args.gym_id, dict(agent=agent, network=network, args=vars(args)))
+        logger.info("Recording run {} in {}".format(runId, args.results_store))
+
     agent = Agent.from_spec(
         spec=agent,
         kwargs=dict(
@@ -119,6 +151,16 @@ def main():
         if not os.path.isdir(load_dir):
             raise OSError("Could not load agent from {}: No such directory.".format(load_dir))
         agent.restore_model(args.load)
+        # the reported episodes continue from the checkpoint's
+        environment.gym.unwrapped.episode = agent.episode
+
+    runnerHistory = None
+    if session is not None:
+        # the agent of the checkpoint, then the env and the random generators as they were when it was saved
+        agent.restore_model(file=sessionState['agentModel'])
+        environment.gym.unwrapped.SetSessionState(sessionState['env'])
+        SetRandomState(sessionState['random'])
+        runnerHistory = {name: sessionSeries[name].tolist() for name in ['episode_rewards', 'episode_timesteps', 'episode_times']}
 
     if args.save:
         save_dir = os.path.dirname(args.save)
@@ -136,7 +178,8 @@ def main():
     runner = Runner(
         agent=agent,
         environment=environment,
-        repeat_actions=1
+        repeat_actions=1,
+        history=runnerHistory
     )
 
     if args.debug:  # TODO: Timestep-based reporting
@@ -145,55 +188,36 @@ def main():
         report_episodes = 10
 
     logger.info("Starting {agent} for Environment '{env}'".format(agent=agent, env=environment))
-    totalCostArr = []
-    rewardArr = []
-    temperatureArr = []
-    episodeArr = []
-    stepCountArr = []
-    #fig, ax = plt.subplots()
-    #plt.scatter(episodeArr, rewardArr, c='b', label='reward')
-#    plt.scatter(episodeArr, totalCostArr, c='g', label='cost (cents)')
-#    plt.scatter(episodeArr, temperatureArr, c='r', label='Temp(C)')
-    #plt.scatter(episodeArr, stepCountArr, c='y', label='number of steps')
-    #plt.legend(loc='lower left')    
-    #ax.axhline((baseRewardTempArr[-1] - baseRewardTempArr[-2]), color='Yellow', lw=2, linestyle=':')
-    
-    plt.xlabel('number of episodes', fontsize=18)
     def episode_finished(r, id_):
         if r.episode % report_episodes == 0:
-            episodeArr.append(r.episode)
-            stepCountArr.append(r.episode_timestep)
             steps_per_second = r.timestep / (time.time() - r.start_time)
             logger.info("*****************************************************************")
             logger.info("Finished episode {:d} after {:d} timesteps. Steps Per Second {:0.2f}".format(
                 r.agent.episode, r.episode_timestep, steps_per_second
             ))
             logger.info("*****************************************************************")
-            electricalCost = r.environment.gym.hvacBuilding.CalculateElectricEneregyCost()
-            gasCost = r.environment.gym.hvacBuilding.CalculateGasEneregyCost()
-            rewardArr.append(r.episode_rewards[-1])
-            temperatureArr.append(r.environment.gym.hvacBuilding.current_temperature)
-            totalCostArr.append((electricalCost + gasCost)*100)
-
             logger.info("Episode reward: {}".format(r.episode_rewards[-1]))
             logger.info("Average of last 5 rewards: {:0.2f}".format(sum(r.episode_rewards[-5:]) / min(5, len(r.episode_rewards))))
-            logger.info("Current temperature: {}C".format(r.environment.gym.hvacBuilding.current_temperature))
-            logger.info("Number of times Heating turned on: {}".format(r.environment.gym.hvacBuilding.building_hvac.NumberOfTimesHeatingTurnedOn))
-            logger.info("Number of times Cooling turned on: {}".format(r.environment.gym.hvacBuilding.building_hvac.NumberOfTimesCoolingTurnedOn))
-            logger.info("Total Time heating : {}".format(r.environment.gym.hvacBuilding.building_hvac.TotalDurationHeatingOn))
-            logger.info("Total Time cooling : {}".format(r.environment.gym.hvacBuilding.building_hvac.TotalDurationCoolingOn))
+            logger.info("Dropped episode reports: {}".format(reporter.GetDropped()))
             logger.info("*****************************************************************")
         if args.save and args.save_episodes is not None and not r.episode % args.save_episodes:
             logger.info("Saving agent to {}".format(args.save))
             r.agent.save_model(args.save)
+        if checkpoint is not None and not r.agent.episode % args.checkpoint_episodes:
+            saveCheckpoint(r)
 
-        #plt.scatter(episodeArr, rewardArr, c='b', label='reward')
-#        plt.scatter(episodeArr, totalCostArr, c='g', label='cost (cents)')
-#        plt.scatter(episodeArr, temperatureArr, c='r', label='Temp(C)')
-        #plt.scatter(episodeArr, stepCountArr, c='y', label='number of steps')
-        #plt.pause(0.05)
         return True
 
+    def saveCheckpoint(r):
+        # the agent is saved by tensorforce in this thread, the session is written by the checkpoint's thread,
+        # the manifest points at the agent files so both are committed together
+        agentModel = r.agent.save_model(os.path.join(args.checkpoint, 'agent', 'model'))
+        state = {'agentModel': agentModel, 'env': environment.gym.unwrapped.GetSessionState(), 'random': GetRandomState(),
+            'runner': {'episode': r.agent.episode, 'timestep': r.agent.timestep}}
+        checkpoint.Save(state, series={'episodes': reporter.GetHistory(), 'episode_rewards': r.episode_rewards,
+            'episode_timesteps': r.episode_timesteps, 'episode_times': r.episode_times, 'baseIndoorTemperature': baseIndoorTempArr,
+            'baseCost': baseCostArr, 'baseReward': baseRewardTempArr})
+
     runner.run(
         num_timesteps=args.timesteps,
         num_episodes=args.episodes,
@@ -203,27 +227,13 @@ def main():
         testing=args.test,
         sleep=args.sleep
     )
+    if args.save:
+        logger.info("Saving agent to {}".format(args.save))
+        agent.save_model(args.save)
+    if checkpoint is not None:
+        saveCheckpoint(runner)
+        checkpoint.Close()
 	
-    plt.style.use('seaborn')
-    def mjrFormatter(x, pos):
-        return str(datetime.timedelta(seconds=x))
-
-    def addAxisLabels(plot: plt, yLabel:str, title:str, xlabel:str='Time of day', xAxisIsTime:bool = True):
-        fig, ax = plot.subplots()
-        if xAxisIsTime:
-            ax.xaxis.set_major_formatter(ticker.FuncFormatter(mjrFormatter))
-        plot.xlabel(xlabel, fontsize=18)
-        plot.ylabel(yLabel, fontsize=18)
-        plot.title(title, fontsize=20)
-        return plot, ax
-
-    # Print the graph for the Learning process
-    learningPlot, axis = addAxisLabels(plt, 'Number of Steps per Episode', 'Reinforced Learning Progress', 'Number of Episodes', False)
-    learningPlot.plot(episodeArr, stepCountArr, 'C3', label='Step Count')
-    learningPlot.legend(loc='lower right')
-    learningPlot.savefig('RL_Progress.svg')
-
-    #plt.show()
     logger.info("Learning finished. Total episodes: {ep}".format(ep=runner.agent.episode))
 	
     indoorTempArr = []
@@ -255,50 +265,40 @@ def main():
         costArr.append(env.hvacBuilding.CalculateGasEneregyCost() + env.hvacBuilding.CalculateElectricEneregyCost())
         agent.observe(reward=reward, terminal=terminal)
 
-    
-    tempPlot, axis = addAxisLabels(plt, 'Temperature (C°)', '24 Hour HVAC House Temperature')
-    axis.axhline(20, color='Yellow', lw=2, linestyle=':')
-    tempPlot.plot(timeOfDayInSecondsArr, outdoorTempArr, 'C2', label='Outdoor Temp')
-    tempPlot.plot(timeOfDayInSecondsArr, baseIndoorTempArr, 'b--', label='Standard Thermostat Indoor Temp')
-    tempPlot.plot(timeOfDayInSecondsArr, indoorTempArr, 'C1', label='RL Indoor Temp')
 
-    tempPlot.legend(loc='lower right')
-    
-	# save file
-    tempPlot.savefig('indoorAndOutdoor_RL_Baseline_Comparison.svg')
-	
-    costPlot, axis = addAxisLabels(plt, 'Cost (US$)', '24 Hour HVAC Cost')
-    costPlot.plot(timeOfDayInSecondsArr, costArr, 'C3', label='RL Total Cost')
-    costPlot.plot(timeOfDayInSecondsArr, baseCostArr, 'b--', label='Standard Thermostat Total Cost')
-    costPlot.legend(loc='lower right')
-    costPlot.savefig('Total_Cost_RL_Baseline_Comparison.svg')
-	
-    rewardPlot, axis = addAxisLabels(plt, 'Reward (more is better)', '24 Hour HVAC Reward')
-    rewardPlot.plot(timeOfDayInSecondsArr, rewardTempArr, 'C3', label='RL Reward')
-    rewardPlot.plot(timeOfDayInSecondsArr, baseRewardTempArr, 'b--', label='Standard Thermostat Reward')
-    rewardPlot.legend(loc='lower right')
-    rewardPlot.savefig('Reward_RL_Baseline_Comparison.svg')
+    # the comparison plots are drawn by the report process while the scenario suite runs
+    reporter.SubmitComparison(timeOfDayInSecondsArr, outdoorTempArr, indoorTempArr, baseIndoorTempArr,
+        costArr, baseCostArr, rewardTempArr, baseRewardTempArr)
+
+    if args.evaluate_scenarios > 0:
+        # the agent can't be pickled into worker processes, so the suite is evaluated in this process, the envs of a
+        # batch step in lock step and the agent acts on all of their observations in one batched call
+        def agentPolicy(observations):
+            return agent.act(observations, deterministic=True, independent=True)
+        scenarios = CreateScenarioSuite(seeds=range(args.evaluate_scenarios), steps=numberOfSteps)
+        agentRows = SummarizeResults(EvaluatePolicy(agentPolicy, scenarios, workers=0))
+        baselineRows = SummarizeResults(EvaluatePolicy(ThermostatPolicy(), scenarios))
+        logger.info("RL agent scenario summary:\n" + FormatSummaryTable(agentRows))
+        logger.info("Standard thermostat scenario summary:\n" + FormatSummaryTable(baselineRows))
+        if args.results_store is not None:
+            store.AddEvaluation(runId, 'agent', agentRows)
+            store.AddEvaluation(runId, 'thermostat', baselineRows)
     runner.close()
+    reporter.Close()
+    if args.results_store is not None:
+        # the report process has written every episode once it is closed
+        store.ImportEpisodes(runId, os.path.join(args.report_dir, 'training_metrics.csv'))
+        store.Close()
     print(datetime.datetime.now())
 
 def baselineRun(numberOfSteps):
-    env = gym.make('Hvac-v0')
-    done = False
-    observation = env.reset()
+    env = SHARED_ENV_POOL.Acquire()
     action = 0
-    indoorTempArr = []
-    outdoorTempArr = []
-    rewardTempArr = []
-    rewardSum = 0
-    costArr = []
-    averageWattsPerSecArr = []
-    timeOfDayInSecondsArr = []
     desiredTemperature = 20
     temperatureDelta = 2
-    
-    # siulate 30 second intervals 
-    for	i in range(numberOfSteps):
-        timeOfDayInSecondsArr.append(i*env.env_step_interval)
+
+    def baselinePolicy(observation):
+        nonlocal action
         if not env.hvacBuilding.building_hvac.HeatingIsShuttingDown and env.hvacBuilding.building_hvac.HeatingIsOn and env.hvacBuilding.current_temperature > (desiredTemperature):
             #print("Turning the Heater Off")
             action = 0
@@ -314,15 +314,19 @@ def baselineRun(numberOfSteps):
         if not env.hvacBuilding.building_hvac.HeatingIsOn and env.hvacBuilding.building_hvac.CoolingIsOn and env.hvacBuilding.current_temperature < desiredTemperature:
             #print("Turning the cooling off")
             action = 0
-    	
-        state, reward, done, info = env.step(action)
-        rewardSum = rewardSum + reward
-        rewardTempArr.append(rewardSum)
-        indoorTempArr.append(state[1])
-        outdoorTempArr.append(state[2])
-        averageWattsPerSecArr.append(state[0])
-        costArr.append(env.hvacBuilding.CalculateGasEneregyCost() + env.hvacBuilding.CalculateElectricEneregyCost())
-    return indoorTempArr, costArr, rewardTempArr
+        return action
+
+    # the run is streamed in chunks, only the indoor temperatures, costs and rewards are kept
+    indoorTempArr = []
+    costArr = []
+    rewardArr = []
+    for chunk in env.iter_run(baselinePolicy, steps=numberOfSteps):
+        indoorTempArr.append(chunk['indoorTemperature'])
+        costArr.append(chunk['cost'])
+        rewardArr.append(chunk['reward'])
+    SHARED_ENV_POOL.Release(env)
+    rewardTempArr = np.cumsum(np.concatenate(rewardArr))
+    return np.concatenate(indoorTempArr).tolist(), np.concatenate(costArr).tolist(), rewardTempArr.tolist()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
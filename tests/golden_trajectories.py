@@ -0,0 +1,124 @@
+"""Golden trajectories recorded from the per second simulator, used to check that faster engines keep the physics.
+
+Regenerate the corpus (only when the physics are meant to change) with:
+
+	PYTHONPATH=. python tests/golden_trajectories.py
+"""
+import os
+import numpy as np
+from gym_hvac.envs import HvacEnv
+from gym_hvac.models import HVAC
+from gym_hvac.models import HvacBuilding
+
+GOLDEN_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+# declared tolerances for an engine to count as equivalent
+TEMPERATURE_TOLERANCE = 1e-6 # [C]
+ENERGY_RELATIVE_TOLERANCE = 1e-9
+COST_TOLERANCE = 1e-9 # [$]
+REWARD_TOLERANCE = 1e-9
+
+PROFILES = ['cold', 'october', 'normal', 'hot']
+
+def CreateHvacBuilding():
+	conditioned_floor_area = 100
+	return HvacBuilding(HVAC(), heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200, initial_building_temperature=20, conditioned_floor_area=conditioned_floor_area)
+
+def ApplyCommand(hvac, command:int):
+	"""Applies a command the same way HvacEnv applies an action (0 off, 1 heating, 2 cooling)
+	"""
+	if command == 0:
+		hvac.TurnHvacOff()
+	elif command == 1:
+		hvac.TurnHeatingOn()
+	elif command == 2:
+		hvac.TurnCoolingOn()
+
+def BuildingCommandScenarios():
+	"""Gets the per second (command, seconds) schedules of the building level trajectories
+	"""
+	randomState = np.random.RandomState(26)
+	toggles = [(int(randomState.randint(3)), int(randomState.randint(1, 8))) for i in range(600)]
+	return {
+		'heating_interrupted_during_ignition': [(1, 10), (0, 200), (1, 400), (0, 300)],
+		'heating_interrupted_before_blower': [(1, 50), (0, 60), (1, 45), (0, 300)],
+		'heating_restart_during_shutdown': [(1, 600), (0, 40), (1, 200), (0, 300), (1, 100)],
+		'heating_to_cooling': [(1, 300), (2, 100), (0, 200), (2, 600), (1, 60), (0, 60)],
+		'cooling': [(2, 1800), (0, 600), (2, 1200)],
+		'rapid_toggling': toggles,
+	}
+
+def RunBuildingScenario(schedule, outsideTemperature:float, createHvacBuilding = CreateHvacBuilding, batched:bool = False):
+	"""Runs a per second command schedule and records the state after every command's duration
+
+	Arguments:
+		batched {bool} -- integrate each command's duration with HvacBuilding.StepSeconds instead of per second steps
+	"""
+	hvacBuilding = createHvacBuilding()
+	hvac = hvacBuilding.building_hvac
+	records = {'temperature': [], 'totalPowerUsed': [], 'totalGasEnergyUsed': [], 'heatingIsOn': [], 'coolingIsOn': []}
+	for command, seconds in schedule:
+		ApplyCommand(hvac, command)
+		if batched:
+			hvacBuilding.StepSeconds(outsideTemperature, seconds)
+		else:
+			for i in range(seconds):
+				hvacBuilding.step(outsideTemperature)
+		records['temperature'].append(hvacBuilding.current_temperature)
+		records['totalPowerUsed'].append(hvac.TotalPowerUsed)
+		records['totalGasEnergyUsed'].append(hvac.TotalGasEnergyUsed)
+		records['heatingIsOn'].append(hvac.HeatingIsOn)
+		records['coolingIsOn'].append(hvac.CoolingIsOn)
+	return {key: np.array(value) for key, value in records.items()}
+
+def EnvActionScenarios():
+	"""Gets the env level (profile, actions) trajectories: random toggling and held actions on every Logan profile
+	"""
+	scenarios = {}
+	for profileIndex, profile in enumerate(PROFILES):
+		randomState = np.random.RandomState(profileIndex)
+		scenarios[profile + '_random'] = (profile, randomState.randint(3, size=288).astype(np.int8))
+		held = np.repeat(randomState.randint(3, size=24), 12).astype(np.int8)
+		scenarios[profile + '_held'] = (profile, held)
+	return scenarios
+
+def RunEnvScenario(profile:str, actions, createEnv = HvacEnv):
+	"""Runs the actions through an env from reset, recording the observation, reward, total cost and energy after every step
+	"""
+	env = createEnv(outsideTemperatures=profile)
+	env.reset()
+	records = {'observation': [], 'reward': [], 'totalCost': [], 'totalPowerUsed': [], 'totalGasEnergyUsed': []}
+	for action in actions:
+		observation, reward, done, _ = env.step(int(action))
+		hvacBuilding = env.hvacBuilding
+		records['observation'].append(observation)
+		records['reward'].append(reward)
+		records['totalCost'].append(hvacBuilding.CalculateGasEneregyCost() + hvacBuilding.CalculateElectricEneregyCost())
+		records['totalPowerUsed'].append(hvacBuilding.building_hvac.TotalPowerUsed)
+		records['totalGasEnergyUsed'].append(hvacBuilding.building_hvac.TotalGasEnergyUsed)
+	return {key: np.array(value, dtype=np.float64) for key, value in records.items()}
+
+def LoadGolden(name:str):
+	with np.load(os.path.join(GOLDEN_DIRECTORY, name + '.npz')) as golden:
+		return {key: golden[key] for key in golden.files}
+
+def GenerateGoldenCorpus():
+	"""Records every scenario with the per second implementation into GOLDEN_DIRECTORY
+	"""
+	os.makedirs(GOLDEN_DIRECTORY, exist_ok=True)
+	buildingScenarios = BuildingCommandScenarios()
+	for name, schedule in buildingScenarios.items():
+		for outsideTemperature in [-5.0, 35.0]:
+			records = RunBuildingScenario(schedule, outsideTemperature)
+			np.savez_compressed(os.path.join(GOLDEN_DIRECTORY, 'building_{}_{:+.0f}C.npz'.format(name, outsideTemperature)),
+				commands=np.array([command for command, seconds in schedule], dtype=np.int8),
+				seconds=np.array([seconds for command, seconds in schedule], dtype=np.int32),
+				outsideTemperature=outsideTemperature, **records)
+	for name, (profile, actions) in EnvActionScenarios().items():
+		records = RunEnvScenario(profile, actions)
+		np.savez_compressed(os.path.join(GOLDEN_DIRECTORY, 'env_' + name + '.npz'),
+			profile=profile, actions=actions, **records)
+
+if __name__ == '__main__':
+	GenerateGoldenCorpus()
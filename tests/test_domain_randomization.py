@@ -0,0 +1,56 @@
+import pickle
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, ScenarioSampler, MaxEnergyCostForTime
+from gym_hvac.models import HVAC, HvacBuilding
+
+def runDay(env, actions):
+	observations = [env.reset()]
+	for action in actions:
+		observation, reward, done, info = env.step(action)
+		observations.append(np.append(observation, reward))
+	return np.array(observations[1:])
+
+def test_records_are_reproducible():
+	"""Tests a scenario only depends on the seed and its index, not on the batches drawn before
+	"""
+	sampler = ScenarioSampler(seed=7, batchSize=16, cachedBatches=1)
+	other = ScenarioSampler(seed=7, batchSize=16)
+	record = sampler.GetRecord(37)
+	sampler.GetRecord(3)
+	assert other.GetRecord(37) == record
+	assert record[0] == 37
+	assert pickle.loads(pickle.dumps(sampler)).GetRecord(37) == record
+	assert ScenarioSampler(seed=8, batchSize=16).GetRecord(37) != record
+	batch = sampler.GetBatch(2)
+	assert batch['index'][5] == 37
+	assert batch['heatTransmission'][5] == record[4]
+
+def test_derived_constants_match_the_building():
+	"""Tests the precomputed max cost is the one HvacBuilding calculates for the same HVAC
+	"""
+	batch = ScenarioSampler(seed=1, batchSize=32).GetBatch(0)
+	for record in batch[:8]:
+		hvac = HVAC(gasRateEnergy=float(record['gasRateEnergy']), airConditioningEnergy=float(record['airConditioningEnergy']))
+		building = HvacBuilding(hvac, float(record['heatMassCapacity']), float(record['heatTransmission']), 20, float(record['conditionedFloorArea']))
+		assert building.CalculateMaxEneregyCostForTime(300) == record['maxEnergyCost']
+	assert MaxEnergyCostForTime(np.array([29307.0]), np.array([3740.0]), 300)[0] == HvacBuilding(HVAC(), 1650000, 200, 20, 100).CalculateMaxEneregyCostForTime(300)
+	np.testing.assert_array_equal(batch['decay'], 1 - batch['heatTransmission'] / batch['heatMassCapacity'])
+
+def test_env_runs_the_scenario_of_each_episode():
+	"""Tests a randomized env steps like an env built with the parameters of its scenario
+	"""
+	actions = [2] * 20 + [0] * 20 + [1] * 10
+	sampler = ScenarioSampler(seed=3, batchSize=8, gasRateEnergyRange=(29307, 29307), airConditioningEnergyRange=(3740, 3740))
+	env = HvacEnv(scenarioSampler=sampler, scenarioStart=1, scenarioStride=2)
+	for episode in range(3):
+		observations = runDay(env, actions)
+		scenario = sampler.GetRecord(1 + episode * 2)
+		assert env.scenario == scenario
+		expected = HvacEnv(conditionedFloorArea=scenario[2], heatMassCapacity=scenario[3], heatTransmission=scenario[4],
+			initialTemperature=scenario[7], outsideTemperatures=scenario[12])
+		np.testing.assert_allclose(observations, runDay(expected, actions), rtol=1e-12)
+
+def test_sampler_rejects_an_envelope():
+	with pytest.raises(ValueError):
+		HvacEnv(scenarioSampler=ScenarioSampler(), envelope='2r2c')
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+from gym_hvac.evaluation import CreateScenarioSuite, ThermostatPolicy, EvaluatePolicy
+from gym_hvac.models import HVAC, HvacBuilding, ExogenousForcing, CreateResidentialForcing
+from gym_hvac.utils import GetStorageDtype, HvacBuildingTracker, HvacReplay, ReadReplayLog, REPLAY_LOG_DTYPE, REPLAY_LOG_FLOAT32_DTYPE
+
+# the rounding of a float32 value: relative 6e-8, about 2e-6 C at 30 C and 5e-4 W at 8000 W
+TEMPERATURE_TOLERANCE = 5e-6
+RELATIVE_TOLERANCE = 1.2e-7
+
+def runDay(env, actions):
+	observations = [env.reset()]
+	rewards = []
+	for action in actions:
+		observation, reward, done, info = env.step(action)
+		observations.append(observation)
+		rewards.append(reward)
+	return np.array(observations), np.array(rewards)
+
+def createHvacBuilding(tracker = None):
+	return HvacBuilding(HVAC(), 16500 * 100, 200, 20, 100, hvacBuildingTracker=tracker)
+
+def test_storage_dtypes():
+	assert GetStorageDtype('float32') == np.float32
+	assert GetStorageDtype(np.float64) == np.float64
+	for dtype in ['float16', 'int32', 'bogus']:
+		with pytest.raises(ValueError):
+			GetStorageDtype(dtype)
+
+def test_float32_env_follows_the_float64_trajectory():
+	"""Tests float32 observations are the float64 ones rounded, the simulation itself doesn't change
+	"""
+	actions = ([1] * 12 + [0] * 12) * 6 + ([2] * 6 + [0] * 18) * 6
+	env32 = HvacEnv(outsideTemperatures='october', dtype='float32')
+	observations32, rewards32 = runDay(env32, actions)
+	observations64, rewards64 = runDay(HvacEnv(outsideTemperatures='october'), actions)
+	assert observations32.dtype == np.float32 and observations64.dtype == np.float64
+	assert env32.observation_space.dtype == np.float32
+	assert env32.observation_space.contains(observations32[0])
+	# the rewards and totals are computed by the float64 simulation in both modes
+	np.testing.assert_array_equal(rewards32, rewards64)
+	np.testing.assert_allclose(observations32[:, 1:4], observations64[:, 1:4], rtol=0, atol=TEMPERATURE_TOLERANCE)
+	np.testing.assert_allclose(observations32[:, 0], observations64[:, 0], rtol=RELATIVE_TOLERANCE)
+
+def test_float32_tracker_keeps_rounded_samples():
+	tracked64 = createHvacBuilding(HvacBuildingTracker())
+	tracker32 = HvacBuildingTracker(dtype='float32')
+	tracked32 = createHvacBuilding(tracker32)
+	for building in [tracked64, tracked32]:
+		building.building_hvac.TurnHeatingOn()
+		for second in range(3000):
+			building.step(-5.0)
+	temperatures = tracker32.GetHouseTempArray()
+	assert temperatures.dtype == np.float32 and len(temperatures) == 3000
+	np.testing.assert_allclose(temperatures, tracked64.GetHvacBuildingTracker().GetHouseTempArray(), rtol=0, atol=TEMPERATURE_TOLERANCE)
+	np.testing.assert_allclose(tracker32.GetHouseTempArray(False), tracked64.GetHvacBuildingTracker().GetHouseTempArray(False), rtol=2 * RELATIVE_TOLERANCE)
+	np.testing.assert_allclose(tracker32.GetAvgPowerPerSecArray(), tracked64.GetHvacBuildingTracker().GetAvgPowerPerSecArray(), rtol=RELATIVE_TOLERANCE)
+	assert tracked32.current_temperature == tracked64.current_temperature
+
+def test_float32_forcing_stays_within_a_microkelvin_over_a_day():
+	"""Tests float32 gains only round the per second temperature changes
+	"""
+	forcing32 = CreateResidentialForcing()
+	forcing32.dtype = GetStorageDtype('float32')
+	buildings = []
+	for forcing in [CreateResidentialForcing(), forcing32]:
+		building = createHvacBuilding()
+		building.SetForcing(forcing.Compile(86400))
+		for hour in range(24):
+			building.StepSeconds(5.0, 3600)
+		buildings.append(building)
+	assert forcing32.Compile(10).netGain.dtype == np.float32
+	assert buildings[1].current_temperature == pytest.approx(buildings[0].current_temperature, abs=1e-6)
+
+def test_float32_replay_log(tmp_path):
+	"""Tests a float32 log replays with the residuals of the float64 log rounded
+	"""
+	records = np.zeros(50, dtype=REPLAY_LOG_DTYPE)
+	records['time'] = np.arange(50) * 600.0 + 1e9
+	records['command'] = ([1] * 5 + [0] * 5) * 5
+	records['outside_temperature'] = np.linspace(-3.0, 4.0, 50)
+	records['indoor_temperature'] = 20.0 + np.sin(np.arange(50) / 7.0)
+	path = str(tmp_path / 'log32.npy')
+	np.save(path, records.astype(REPLAY_LOG_FLOAT32_DTYPE))
+	with pytest.raises(ValueError):
+		list(ReadReplayLog(path))
+	chunks = list(ReadReplayLog(path, chunkRows=16, dtype=REPLAY_LOG_FLOAT32_DTYPE))
+	# the time keeps its float64 precision
+	np.testing.assert_array_equal(np.concatenate(chunks)['time'], records['time'])
+	residuals64 = HvacReplay(createHvacBuilding()).Run([records])
+	statistics32 = HvacReplay(createHvacBuilding()).RunFile(path, dtype=REPLAY_LOG_FLOAT32_DTYPE)
+	statistics64 = list(residuals64)[-1][3]
+	assert statistics32.GetRmse() == pytest.approx(statistics64.GetRmse(), abs=1e-5)
+
+def test_float32_evaluation_matches_float64():
+	scenarios = CreateScenarioSuite(profiles=('cold', 'hot'), seeds=range(2), steps=96)
+	results64 = EvaluatePolicy(ThermostatPolicy(), scenarios, workers=0)
+	results32 = EvaluatePolicy(ThermostatPolicy(), scenarios, workers=0, dtype='float32')
+	for result32, result64 in zip(results32, results64):
+		assert result32['heatingCycles'] == result64['heatingCycles']
+		assert result32['totalCost'] == pytest.approx(result64['totalCost'], rel=1e-9)
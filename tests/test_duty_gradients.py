@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from gym_hvac.models import HVAC, HvacBuilding, TwoNodeEnvelope, CreateResidentialForcing, SimulateDutySchedule
+
+def createHvacBuilding(envelope = None):
+	conditioned_floor_area = 100
+	return HvacBuilding(
+		HVAC(),
+		heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200,
+		initial_building_temperature=24,
+		conditioned_floor_area=conditioned_floor_area,
+		envelope=envelope)
+
+def test_full_duty_is_the_simulated_building():
+	"""Tests running the A/C all the time gives the stepped building's temperatures and cost
+	"""
+	outside = [30.0, 32.0, 31.0]
+	building = createHvacBuilding()
+	trajectory = building.SimulateDutySchedule(outside, [0, 0, 0], [1, 1, 1], intervalSeconds=600)
+	assert building.current_temperature == 24
+	building.building_hvac.TurnCoolingOn()
+	for k, temperature in enumerate(outside):
+		building.StepSeconds(temperature, 600)
+		assert trajectory.temperatures[k + 1] == pytest.approx(building.current_temperature, abs=1e-9)
+	assert trajectory.cost == pytest.approx(building.CalculateElectricEneregyCost(), rel=1e-9)
+
+def test_gains_follow_the_building_forcing():
+	building = createHvacBuilding()
+	building.SetForcing(CreateResidentialForcing().Compile(86400))
+	trajectory = building.SimulateDutySchedule([10.0, 12.0], [0, 0], [0, 0], intervalSeconds=3600)
+	for k, temperature in enumerate([10.0, 12.0]):
+		building.StepSeconds(temperature, 3600)
+		assert trajectory.temperatures[k + 1] == pytest.approx(building.current_temperature, abs=1e-9)
+
+def simulate(inputs, intervals, gains):
+	# inputs: the heating duties, the cooling duties, then the heat mass capacity, heat transmission and initial temperature
+	return SimulateDutySchedule(inputs[-3], inputs[-2], inputs[-1], np.linspace(-5, 8, intervals),
+		inputs[:intervals], inputs[intervals:2 * intervals], 29307.0, 3740.0, 8e-5, 1.5e-4,
+		intervalSeconds=600, comfortLow=20.0, comfortHigh=21.0, comfortWeights=np.linspace(0.5, 1.5, intervals), gains=gains)
+
+def test_adjoint_gradients_match_finite_differences():
+	intervals = 6
+	gains = np.random.default_rng(1).uniform(0, 2000, intervals * 600)
+	inputs = np.concatenate([[0.4, 0.1, 0.05, 0.0, 0.2, 0.0], [0.0, 0.1, 0.0, 0.4, 0.0, 0.2], [1.65e6, 200.0, 19.0]])
+	trajectory = simulate(inputs, intervals, gains)
+	# the penalty is active below and above the band
+	assert trajectory.temperatures[1:].min() < 20 and trajectory.temperatures[1:].max() > 21
+	jacobian = np.concatenate([trajectory.heatingJacobian, trajectory.coolingJacobian, trajectory.parameterJacobian], axis=1)
+	for column, value in enumerate(inputs):
+		step = 1e-6 * max(abs(value), 1.0)
+		up = inputs.copy()
+		up[column] = value + step
+		down = inputs.copy()
+		down[column] = value - step
+		upper = simulate(up, intervals, gains)
+		lower = simulate(down, intervals, gains)
+		for row, output in enumerate(['finalTemperature', 'cost', 'comfortPenalty']):
+			difference = (getattr(upper, output) - getattr(lower, output)) / (2 * step)
+			assert jacobian[row, column] == pytest.approx(difference, rel=1e-5, abs=1e-9), (output, column)
+	heating, cooling, parameters = trajectory.GetGradient('comfortPenalty')
+	np.testing.assert_array_equal(heating, trajectory.heatingJacobian[2])
+
+def test_gradient_descent_finds_a_comfortable_schedule():
+	"""Tests a projected gradient descent on cost plus comfort warms a cold building into the band
+	"""
+	building = createHvacBuilding()
+	building.current_temperature = 15
+	outside = np.full(12, -5.0)
+	heating = np.zeros(12)
+	cooling = np.zeros(12)
+	start = building.SimulateDutySchedule(outside, heating, cooling, intervalSeconds=1800)
+	for _ in range(100):
+		trajectory = building.SimulateDutySchedule(outside, heating, cooling, intervalSeconds=1800)
+		heating = np.clip(heating - 2e-5 * (trajectory.heatingJacobian[1] + trajectory.heatingJacobian[2]), 0, 1)
+	assert trajectory.comfortPenalty < 0.1 * start.comfortPenalty
+	assert 18.5 < trajectory.finalTemperature < 23
+	assert 0 < trajectory.cost
+
+def test_envelope_is_rejected():
+	with pytest.raises(ValueError):
+		createHvacBuilding(TwoNodeEnvelope.FromSingleNode(16500 * 100, 200)).SimulateDutySchedule([0.0], [1], [0])
+	with pytest.raises(ValueError):
+		SimulateDutySchedule(1.65e6, 200, 20, [0.0, 1.0], [1], [0, 0], 1, 1, 1, 1)
@@ -0,0 +1,92 @@
+import json
+import os
+import pickle
+import gym
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, HvacEnvPool, HvacSetpointEnv, CompileEnvSpec, CompiledEnvSpec
+
+SPEC_PATH = os.path.join(os.path.dirname(__file__), '..', 'examples', 'configs', 'hvac_env_spec.json')
+
+def runDay(env, actions):
+	observations = [env.reset()]
+	for action in actions:
+		observation, reward, done, info = env.step(action)
+		observations.append(np.append(observation, reward))
+	return np.array(observations[1:])
+
+def test_default_spec_is_the_default_env():
+	compiled = CompileEnvSpec()
+	assert CompileEnvSpec({}) is compiled
+	assert CompileEnvSpec({'conditionedFloorArea': 100, 'outsideTemperatures': 'cold'}) is compiled
+	env = HvacEnv()
+	assert env.envSpec is compiled
+	assert (env.env_step_interval, env.step_max, env.building_min, env.building_max, env.building_target) == (300, 3600, 10, 30, 20)
+	assert compiled.maxEnergyCost == env.hvacBuilding.CalculateMaxEneregyCostForTime(300)
+	assert compiled.dtByCm == 1 / (16500 * 100) and compiled.decay == 1 - 200 / (16500 * 100)
+	actions = [1] * 60 + [0] * 40 + [2] * 10
+	np.testing.assert_array_equal(runDay(HvacEnv(spec={}), actions), runDay(HvacEnv(), actions))
+
+def test_spec_sets_the_env():
+	weather = [5.0] + [6.0] * 24
+	spec = {'outsideTemperatures': weather, 'conditionedFloorArea': 150, 'temperatureBounds': [12, 28], 'targetTemperature': 21,
+		'stepSeconds': 600, 'maxSteps': 10, 'hvac': {'gasRateEnergy': 20000}, 'dtype': 'float32'}
+	env = HvacEnv(spec=spec)
+	assert env.hvacBuilding.GetParameters() == (16500 * 150, 200, 150)
+	assert env.hvacBuilding.building_hvac.GetMaxHeatingPower() == 20000
+	assert env.GetOutsideTemperatureForTime(3600) == 6.0
+	assert (env.env_step_interval, env.building_min, env.building_max, env.building_target) == (600, 12, 28, 21)
+	assert env.observation_space.dtype == np.float32 and env.observation_space.low[1] == 12
+	for step in range(9):
+		assert not env.step(0)[2]
+	assert env.step(0)[2]
+	# the same env as the keyword arguments give
+	keywords = HvacEnv(outsideTemperatures=weather, conditionedFloorArea=150, dtype='float32')
+	np.testing.assert_array_equal(runDay(HvacEnv(spec=dict(spec, temperatureBounds=[10, 30], targetTemperature=20, stepSeconds=300,
+		maxSteps=3600, hvac={})), [1] * 30), runDay(keywords, [1] * 30))
+
+def test_compiled_spec_is_immutable_hashable_and_pickled_with_its_constants():
+	compiled = CompileEnvSpec(SPEC_PATH)
+	with open(SPEC_PATH) as fp:
+		assert CompileEnvSpec(json.dumps(json.load(fp))) is compiled
+	with pytest.raises(AttributeError):
+		compiled.heatTransmission = 1
+	assert {compiled: 1}[CompileEnvSpec(SPEC_PATH)] == 1
+	assert compiled != CompileEnvSpec()
+	restored = pickle.loads(pickle.dumps(compiled))
+	assert restored is compiled
+	assert compiled.spec['conditionedFloorArea'] == 150 and compiled.spec['heatMassCapacity'] == 16500 * 150
+	# another process gets the constants as they were compiled
+	state = compiled.__reduce__()[1][0]
+	assert dict(zip(CompiledEnvSpec.__slots__, state))['maxEnergyCost'] == compiled.maxEnergyCost
+
+def test_invalid_specs_are_rejected():
+	for spec in [{'floorArea': 100}, {'hvac': {'gasRate': 1}}, {'outsideTemperatures': 'arctic'}, {'targetTemperature': 40},
+		{'stepSeconds': 0}, {'conditionedFloorArea': 'big'}, {'envelope': '3r3c'}, {'dtype': 'float16'}, 'missing.json']:
+		with pytest.raises(ValueError):
+			CompileEnvSpec(spec)
+	with pytest.raises(ValueError):
+		HvacEnv(spec={}, conditionedFloorArea=120)
+
+def test_short_weather_keeps_its_last_hour():
+	"""Tests a spec with fewer than 25 hours compiles the weather the env runs past the day with
+	"""
+	compiled = CompileEnvSpec({'outsideTemperatures': [3.0, 4.0]})
+	assert compiled.outsideTemperatures == (3.0,) + (4.0,) * 24
+	assert compiled is CompileEnvSpec({'outsideTemperatures': compiled.outsideTemperatures})
+	assert len(CompileEnvSpec({'outsideTemperatures': 'normal'}).outsideTemperatures) == 25
+	env = HvacEnv(spec={'outsideTemperatures': [3.0, 4.0]})
+	for step in range(300):
+		env.step(0)
+	assert env.OutsideTemperature == 4.0
+
+def test_gym_make_and_pool_take_a_spec():
+	env = gym.make('Hvac-v0', spec=SPEC_PATH, disable_env_checker=True).unwrapped
+	assert env.envSpec is CompileEnvSpec(SPEC_PATH)
+	assert HvacSetpointEnv(spec={'outsideTemperatures': 'hot'}).GetOutsideTemperatureForTime(0) == 37
+	pool = HvacEnvPool()
+	first = pool.Acquire(spec={'conditionedFloorArea': 120})
+	assert first.initialTemperature == 18
+	pool.Release(first)
+	assert pool.Acquire(spec=CompileEnvSpec({'conditionedFloorArea': 120}), initialTemperature=21) is first
+	assert first.hvacBuilding.current_temperature == 21
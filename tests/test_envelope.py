@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+from gym_hvac.models import HvacBuilding
+from gym_hvac.models import HVAC
+from gym_hvac.models import TwoNodeEnvelope
+
+def createHvacBuilding(envelope: TwoNodeEnvelope):
+	conditioned_floor_area = 100
+	return HvacBuilding(
+		HVAC(),
+		heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200,
+		initial_building_temperature=20,
+		conditioned_floor_area=conditioned_floor_area,
+		envelope=envelope)
+
+@pytest.fixture
+def envelope():
+	return TwoNodeEnvelope.FromSingleNode(16500 * 100, 200)
+
+def test_transition_is_cached_and_composes(envelope: TwoNodeEnvelope):
+	"""Tests a 300 second transition equals 300 one second transitions
+	"""
+	assert envelope.GetTransition(300) is TwoNodeEnvelope.FromSingleNode(16500 * 100, 200).GetTransition(300)
+	a00, a01, a10, a11, bOut0, bOut1, bPower0, bPower1 = envelope.GetTransition(1)
+	state = np.array([20.0, 15.0])
+	for i in range(300):
+		state = np.array([[a00, a01], [a10, a11]]) @ state + np.array([bOut0, bOut1]) * -5.0 + np.array([bPower0, bPower1]) * 3000.0
+	a00, a01, a10, a11, bOut0, bOut1, bPower0, bPower1 = envelope.GetTransition(300)
+	batched = np.array([[a00, a01], [a10, a11]]) @ np.array([20.0, 15.0]) + np.array([bOut0, bOut1]) * -5.0 + np.array([bPower0, bPower1]) * 3000.0
+	assert batched == pytest.approx(state, abs=1e-9)
+
+def test_transition_settles_to_steady_state(envelope: TwoNodeEnvelope):
+	a00, a01, a10, a11, bOut0, bOut1, bPower0, bPower1 = envelope.GetTransition(10 ** 7)
+	# with 2000 W into the air the building settles 2000 W / 200 W/K above the outside
+	assert a00 * 20 + a01 * 15 + bOut0 * 5 + bPower0 * 2000 == pytest.approx(15.0)
+	assert a10 * 20 + a11 * 15 + bOut1 * 5 + bPower1 * 2000 == pytest.approx(15.0)
+
+def test_air_swings_faster_than_mass(envelope: TwoNodeEnvelope):
+	hvacBuilding = createHvacBuilding(envelope)
+	hvacBuilding.building_hvac.TurnHeatingOn()
+	hvacBuilding.StepSeconds(0.0, 600)
+	assert hvacBuilding.current_temperature > hvacBuilding.mass_temperature > 20.0
+
+def test_batched_matches_per_second(envelope: TwoNodeEnvelope):
+	stepped = createHvacBuilding(envelope)
+	batched = createHvacBuilding(envelope)
+	for command, seconds in [(1, 700), (0, 300), (2, 900), (0, 100)]:
+		for hvacBuilding in [stepped, batched]:
+			[hvacBuilding.building_hvac.TurnHvacOff, hvacBuilding.building_hvac.TurnHeatingOn, hvacBuilding.building_hvac.TurnCoolingOn][command]()
+		for i in range(seconds):
+			stepped.step(10.0)
+		batched.StepSeconds(10.0, seconds)
+		assert batched.current_temperature == pytest.approx(stepped.current_temperature, abs=1e-9)
+		assert batched.mass_temperature == pytest.approx(stepped.mass_temperature, abs=1e-9)
+
+def test_env_with_two_node_envelope():
+	env = HvacEnv(envelope='2r2c')
+	env.reset()
+	assert env.hvacBuilding.GetEnvelope() is not None
+	for i in range(12):
+		observation, reward, done, info = env.step(1)
+	assert observation[1] > 18.0
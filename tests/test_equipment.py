@@ -0,0 +1,68 @@
+import pytest
+from gym_hvac.models import HvacBuilding
+from gym_hvac.models import HVAC
+from gym_hvac.models import PerformanceTable, TableEquipment
+
+def createHvacBuilding(equipment = None):
+	conditioned_floor_area = 100
+	return HvacBuilding(
+		HVAC(),
+		heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200,
+		initial_building_temperature=20,
+		conditioned_floor_area=conditioned_floor_area,
+		equipment=equipment)
+
+def runSchedule(hvacBuilding: HvacBuilding, outsideTemperature: float):
+	hvac = hvacBuilding.building_hvac
+	for command, seconds in [(1, 900), (0, 300), (2, 600), (0, 200), (1, 40), (0, 300)]:
+		if command == 0:
+			hvac.TurnHvacOff()
+		elif command == 1:
+			hvac.TurnHeatingOn()
+		else:
+			hvac.TurnCoolingOn()
+		hvacBuilding.StepSeconds(outsideTemperature, seconds)
+
+def test_performance_table_lookup():
+	"""Tests the compiled grid matches the table at its points, interpolates between them and clamps outside
+	"""
+	table = PerformanceTable([-10, 0, 10], [15, 25], capacity=[[1000, 2000], [3000, 4000], [5000, 6000]], power=[[10, 10], [20, 20], [30, 30]])
+	assert table.Lookup(0, 15) == (3000, 20)
+	assert table.Lookup(-5, 20)[0] == pytest.approx(2500)
+	assert table.Lookup(-50, 0) == (1000, 10)
+	assert table.Lookup(50, 50) == (6000, 30)
+	capacity, power = table.LookupArray([-5, 10], [20, 25])
+	assert list(capacity) == pytest.approx([2500, 6000])
+
+def test_performance_table_validation():
+	with pytest.raises(ValueError):
+		PerformanceTable([10, 0], [20], capacity=[[1], [1]], power=[[1], [1]])
+	with pytest.raises(ValueError):
+		PerformanceTable([0, 10], [20], capacity=[[-1], [1]], power=[[1], [1]])
+
+def test_constant_tables_match_fixed_hvac():
+	"""Tests tables holding the HVAC's fixed furnace and A/C power reproduce the plain building
+	"""
+	furnace = PerformanceTable([-30, 50], [0, 40], capacity=[[29307, 29307], [29307, 29307]], power=[[29307, 29307], [29307, 29307]])
+	airConditioner = PerformanceTable([-30, 50], [0, 40], capacity=[[3740, 3740], [3740, 3740]], power=[[3740, 3740], [3740, 3740]])
+	plain = createHvacBuilding()
+	tabled = createHvacBuilding(TableEquipment(furnace, airConditioner))
+	runSchedule(plain, 5.0)
+	runSchedule(tabled, 5.0)
+	assert tabled.current_temperature == pytest.approx(plain.current_temperature, abs=1e-9)
+	assert tabled.CalculateGasEneregyCost() == pytest.approx(plain.CalculateGasEneregyCost())
+	assert tabled.CalculateElectricEneregyCost() == pytest.approx(plain.CalculateElectricEneregyCost())
+
+def test_heat_pump_capacity_follows_outside_temperature():
+	"""Tests a heat pump delivers less heat when it is colder outside and is charged as electricity
+	"""
+	heating = PerformanceTable([-20, 10], [20], capacity=[[4000], [10000]], power=[[3000], [3000]])
+	heatPumps = [createHvacBuilding(TableEquipment(heating, heatingIsElectric=True)) for i in range(2)]
+	for hvacBuilding, outsideTemperature in zip(heatPumps, [-20.0, 10.0]):
+		hvacBuilding.reset(20)
+		hvacBuilding.building_hvac.TurnHeatingOn()
+		hvacBuilding.StepSeconds(outsideTemperature, 600)
+		assert hvacBuilding.CalculateGasEneregyCost() == 0.0
+		assert hvacBuilding.GetEquipment().ElectricEnergyUsed == 3000 * (600 - 30)
+	assert heatPumps[0].current_temperature < heatPumps[1].current_temperature
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+from gym_hvac.models import HvacBuilding
+from gym_hvac.models import HVAC
+from gym_hvac.models import HourlySchedule, ExogenousForcing, CreateResidentialForcing
+
+def createHvacBuilding():
+	conditioned_floor_area = 100
+	return HvacBuilding(
+		HVAC(),
+		heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200,
+		initial_building_temperature=20,
+		conditioned_floor_area=conditioned_floor_area)
+
+def test_hourly_schedule():
+	"""Tests held and interpolated schedules per second, repeating every day
+	"""
+	held = HourlySchedule(list(range(24))).ToSeconds(2 * 86400)
+	assert held[3599] == 0 and held[3600] == 1 and held[86400 + 7200] == 2
+	interpolated = HourlySchedule(list(range(24)), interpolate=True).ToSeconds(86400)
+	assert interpolated[1800] == pytest.approx(0.5)
+	# wraps from 23 back to 0 over the last hour
+	assert interpolated[86400 - 1800] == pytest.approx(11.5)
+	# other counts are spread over the day in both modes, a half hourly schedule uses all of its values
+	halfHourly = HourlySchedule(list(range(48))).ToSeconds(86400)
+	assert halfHourly[1799] == 0 and halfHourly[1800] == 1 and halfHourly[86399] == 47
+	assert HourlySchedule([0, 10]).ToSeconds(86400)[[0, 12 * 3600 - 1, 12 * 3600]].tolist() == [0, 0, 10]
+	assert HourlySchedule([0, 10], interpolate=True).ToSeconds(86400)[6 * 3600] == pytest.approx(5)
+
+def test_forcing_is_compiled_once():
+	forcing = CreateResidentialForcing()
+	compiled = forcing.Compile(86400)
+	assert forcing.Compile(86400) is compiled
+	assert compiled.netGain.shape == (86400,)
+	assert compiled.GetOccupancy(0) == 1.0 and compiled.GetOccupancy(12 * 3600) == 0.0
+	assert compiled.GetOccupancy(10 ** 6) == compiled.occupancy[-1]
+
+def test_gains_warm_the_building_in_batches_and_per_second():
+	"""Tests the gains heat a building and the batched integration keeps them exactly
+	"""
+	compiled = ExogenousForcing(internalGains=HourlySchedule([2000, 0], interpolate=True)).Compile(7200)
+	plain = createHvacBuilding()
+	stepped = createHvacBuilding()
+	batched = createHvacBuilding()
+	stepped.SetForcing(compiled)
+	batched.SetForcing(compiled)
+	for i in range(5000):
+		plain.step(20.0)
+		stepped.step(20.0)
+	batched.StepSeconds(20.0, 5000)
+	assert plain.current_temperature == pytest.approx(20.0)
+	assert stepped.current_temperature > 20.5
+	assert batched.current_temperature == pytest.approx(stepped.current_temperature, abs=1e-9)
+
+def test_env_observes_occupancy_and_only_asks_comfort_when_occupied():
+	env = HvacEnv(outsideTemperatures='october', forcing=CreateResidentialForcing())
+	observation = env.reset()
+	assert observation.shape == env.observation_space.shape == (6,)
+	assert observation[5] == 1.0
+	# occupied at 18C, outside the 20 +- 2 comfort band
+	observation, reward, done, info = env.step(0)
+	assert reward < 0
+	for i in range(12 * 8):
+		observation, reward, done, info = env.step(0)
+	# empty during the day, cold but not penalized
+	assert observation[5] == 0.0
+	assert observation[1] < 18.0
+	assert reward >= 0
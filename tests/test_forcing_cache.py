@@ -0,0 +1,79 @@
+import os
+import pickle
+import time
+import numpy as np
+import pytest
+from gym_hvac.envs import ScenarioSampler
+from gym_hvac.models import ForcingCache, CreateResidentialForcing, HourlySchedule, ExogenousForcing
+
+def test_entries_are_created_once_and_mapped_read_only(tmp_path):
+	cache = ForcingCache(str(tmp_path))
+	calls = []
+	def create():
+		calls.append(1)
+		return np.arange(10.0)
+	key = cache.MakeKey('test', 10)
+	first = cache.GetOrCreate(key, create)
+	second = ForcingCache(str(tmp_path)).GetOrCreate(key, create)
+	assert len(calls) == 1
+	assert isinstance(second, np.memmap)
+	np.testing.assert_array_equal(first, second)
+	with pytest.raises(ValueError):
+		second[0] = 1.0
+	assert cache.GetStats()['misses'] == 1 and cache.GetStats()['hits'] == 0
+	assert cache.GetOrCreate(key, create) is not None and cache.GetStats()['hitRate'] == 0.5
+	# no temporary files are left behind
+	assert [name for name in os.listdir(tmp_path)] == [key + '.npy']
+
+def test_keys_follow_the_content():
+	assert ForcingCache.MakeKey('a', 1, (2.0, 3.0)) == ForcingCache.MakeKey('a', 1, (2.0, 3.0))
+	assert ForcingCache.MakeKey('a', 1, (2.0, 3.0)) != ForcingCache.MakeKey('a', 1, (2.0, 3.5))
+	assert ForcingCache.MakeKey(np.zeros(3)) != ForcingCache.MakeKey(np.zeros(3, dtype=np.float32))
+	assert ForcingCache.MakeKey(1) != ForcingCache.MakeKey(1.0)
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+	entryBytes = os.path.getsize(ForcingCache(str(tmp_path / 'probe')).Store('probe', np.zeros(1000)).filename)
+	cache = ForcingCache(str(tmp_path / 'cache'), maxBytes=2 * entryBytes)
+	cache.Store('a', np.zeros(1000))
+	cache.Store('b', np.ones(1000))
+	# reading a marks it as used, so b is the least recently used
+	past = time.time() - 100
+	os.utime(cache.GetPath('a'), (past, past))
+	os.utime(cache.GetPath('b'), (past + 1, past + 1))
+	assert cache.Load('a') is not None
+	cache.Store('c', np.full(1000, 2.0))
+	assert cache.Load('b') is None
+	assert cache.Load('a') is not None and cache.Load('c') is not None
+	assert cache.GetStats()['evictions'] == 1
+	assert cache.GetSize() <= cache.maxBytes
+
+def test_compiled_forcing_from_the_cache_is_the_compiled_forcing(tmp_path):
+	cache = ForcingCache(str(tmp_path))
+	expected = CreateResidentialForcing().Compile(86400)
+	for dtype in ['float64', 'float32']:
+		forcing = CreateResidentialForcing()
+		cached = ExogenousForcing(forcing.occupancy, forcing.occupantGains, forcing.internalGains, forcing.solarGains, dtype=dtype, cache=cache)
+		compiled = cached.Compile(86400)
+		assert compiled.netGain.dtype == dtype
+		np.testing.assert_allclose(compiled.netGain, expected.netGain, rtol=1e-6)
+		np.testing.assert_array_equal(compiled.occupancy, expected.occupancy.astype(dtype))
+	assert cache.GetStats()['misses'] == 2
+	# a worker gets the cache, not the arrays, and maps the same entry
+	worker = pickle.loads(pickle.dumps(cached))
+	assert len(pickle.dumps(cached)) < 10000
+	np.testing.assert_array_equal(worker.Compile(86400).netGain, compiled.netGain)
+	assert worker.cache.GetStats()['hits'] == 1
+	# another schedule is another entry
+	ExogenousForcing(internalGains=HourlySchedule([100]), cache=cache).Compile(86400)
+	assert len(cache.GetEntries()) == 3
+
+def test_scenario_batches_from_the_cache_are_the_drawn_batches(tmp_path):
+	cache = ForcingCache(str(tmp_path))
+	expected = ScenarioSampler(seed=3, batchSize=8)
+	sampler = ScenarioSampler(seed=3, batchSize=8, cache=cache)
+	assert sampler.GetRecord(13) == expected.GetRecord(13)
+	np.testing.assert_array_equal(sampler.GetBatch(1), expected.GetBatch(1))
+	worker = pickle.loads(pickle.dumps(sampler))
+	assert worker.GetRecord(13) == expected.GetRecord(13)
+	assert worker.cache.GetStats()['hits'] == 1
+	assert ScenarioSampler(seed=4, batchSize=8, cache=cache).GetRecord(13) != expected.GetRecord(13)
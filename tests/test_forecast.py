@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, HvacSetpointEnv, CompileEnvSpec
+
+WEATHER = [float(hour) for hour in range(25)]
+
+def test_forecast_is_the_coming_weather():
+	env = HvacEnv(outsideTemperatures=WEATHER, forecastHorizon=3, forecastStride=2)
+	observation = env.reset()
+	assert observation.shape == env.observation_space.shape == (8,)
+	np.testing.assert_array_equal(observation[5:], [2, 4, 6])
+	for step in range(12):
+		observation = env.step(0)[0]
+	# an hour on, the first 5 values are those of the env without a forecast
+	np.testing.assert_array_equal(observation[5:], [3, 5, 7])
+	plain = HvacEnv(outsideTemperatures=WEATHER)
+	for step in range(12):
+		plainObservation = plain.step(0)[0]
+	np.testing.assert_array_equal(observation[:5], plainObservation)
+	assert env.observation_space.contains(observation)
+	# the last hour is kept after the day
+	env.hvacBuilding.building_hvac.TotalTimeInSeconds = 23 * 3600
+	np.testing.assert_array_equal(env.GetForecast(), [24, 24, 24])
+
+def test_forecast_rows_are_views_into_the_episode_forecasts():
+	env = HvacEnv(outsideTemperatures=WEATHER, forecastHorizon=4)
+	first = env.GetForecast()
+	env.step(0)
+	assert not first.flags.writeable
+	assert np.shares_memory(first, env.GetForecast())
+	with pytest.raises(ValueError):
+		HvacEnv().GetForecast()
+
+def test_forecast_noise_is_seeded_per_episode():
+	def forecasts(seed):
+		env = HvacEnv(forecastHorizon=6, forecastNoise=0.5, forecastSeed=seed)
+		episodes = [env.GetForecast().copy()]
+		env.step(0)
+		env.reset()
+		episodes.append(env.GetForecast().copy())
+		return episodes
+	first, second = forecasts(1)
+	assert not np.array_equal(first, second)
+	np.testing.assert_array_equal(forecasts(1)[1], second)
+	assert not np.array_equal(forecasts(2)[0], first)
+	# the error is a random walk over the lead hours
+	env = HvacEnv(outsideTemperatures=[0.0] * 25, forecastHorizon=24, forecastNoise=1.0)
+	errors = []
+	for episode in range(400):
+		errors.append(env.GetForecast().copy())
+		env.step(0)
+		env.reset()
+	variance = np.var(errors, axis=0)
+	assert variance[0] == pytest.approx(1.0, rel=0.25) and variance[-1] == pytest.approx(24.0, rel=0.25)
+	assert np.all(env.observation_space.low[5:] == -10 - 5 * np.sqrt(24))
+
+def test_forecast_is_part_of_the_spec():
+	env = HvacEnv(spec={'forecastHorizon': 2, 'outsideTemperatures': 'hot'})
+	assert env.envSpec is CompileEnvSpec({'forecastHorizon': 2, 'outsideTemperatures': 'hot'})
+	np.testing.assert_array_equal(env.reset()[5:], [38, 38])
+	with pytest.raises(ValueError):
+		HvacEnv(spec={}, forecastHorizon=2)
+	for spec in [{'forecastHorizon': -1}, {'forecastStride': 0}, {'forecastNoise': -1.0}, {'forecastHorizon': 1.5}]:
+		with pytest.raises(ValueError):
+			CompileEnvSpec(spec)
+
+def test_setpoint_env_observes_the_forecast():
+	env = HvacSetpointEnv(outsideTemperatures=WEATHER, forecastHorizon=2, dtype='float32')
+	observation = env.step(np.array([20.0, 24.0, 1.0]))[0]
+	assert observation.dtype == np.float32
+	np.testing.assert_array_equal(observation[5:], [2, 3])
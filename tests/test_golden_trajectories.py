@@ -0,0 +1,56 @@
+import functools
+import os
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+import golden_trajectories as golden
+
+# engines replaying the golden actions, add new implementations here to check them against the corpus
+BUILDING_ENGINES = {
+	'per_second': functools.partial(golden.RunBuildingScenario, batched=False),
+	'batched': functools.partial(golden.RunBuildingScenario, batched=True),
+}
+ENV_ENGINES = {
+	'per_second': HvacEnv,
+}
+
+def goldenNames(prefix:str):
+	return sorted(name[:-len('.npz')] for name in os.listdir(golden.GOLDEN_DIRECTORY) if name.startswith(prefix))
+
+def assertEnergyEqual(actual, expected):
+	np.testing.assert_allclose(actual, expected, rtol=golden.ENERGY_RELATIVE_TOLERANCE, atol=1e-6)
+
+def test_corpus_covers_every_scenario():
+	"""Tests the stored corpus has every scenario the generator defines
+	"""
+	assert len(goldenNames('building_')) == 2 * len(golden.BuildingCommandScenarios())
+	assert len(goldenNames('env_')) == len(golden.EnvActionScenarios())
+
+@pytest.mark.parametrize("engine", sorted(BUILDING_ENGINES))
+@pytest.mark.parametrize("name", goldenNames('building_'))
+def test_building_engine_matches_golden(engine, name):
+	expected = golden.LoadGolden(name)
+	schedule = list(zip(expected['commands'].tolist(), expected['seconds'].tolist()))
+	actual = BUILDING_ENGINES[engine](schedule, float(expected['outsideTemperature']))
+
+	np.testing.assert_allclose(actual['temperature'], expected['temperature'], rtol=0, atol=golden.TEMPERATURE_TOLERANCE)
+	assertEnergyEqual(actual['totalPowerUsed'], expected['totalPowerUsed'])
+	assertEnergyEqual(actual['totalGasEnergyUsed'], expected['totalGasEnergyUsed'])
+	np.testing.assert_array_equal(actual['heatingIsOn'], expected['heatingIsOn'])
+	np.testing.assert_array_equal(actual['coolingIsOn'], expected['coolingIsOn'])
+
+@pytest.mark.parametrize("engine", sorted(ENV_ENGINES))
+@pytest.mark.parametrize("name", goldenNames('env_'))
+def test_env_engine_matches_golden(engine, name):
+	expected = golden.LoadGolden(name)
+	actual = golden.RunEnvScenario(str(expected['profile']), expected['actions'], ENV_ENGINES[engine])
+
+	# observation: average watts, temperature, outside temperature, temperature delta, target
+	np.testing.assert_allclose(actual['observation'][:, 1], expected['observation'][:, 1], rtol=0, atol=golden.TEMPERATURE_TOLERANCE)
+	np.testing.assert_allclose(actual['observation'][:, 3], expected['observation'][:, 3], rtol=0, atol=golden.TEMPERATURE_TOLERANCE)
+	np.testing.assert_array_equal(actual['observation'][:, 2], expected['observation'][:, 2])
+	assertEnergyEqual(actual['observation'][:, 0], expected['observation'][:, 0])
+	assertEnergyEqual(actual['totalPowerUsed'], expected['totalPowerUsed'])
+	assertEnergyEqual(actual['totalGasEnergyUsed'], expected['totalGasEnergyUsed'])
+	np.testing.assert_allclose(actual['totalCost'], expected['totalCost'], rtol=0, atol=golden.COST_TOLERANCE)
+	np.testing.assert_allclose(actual['reward'], expected['reward'], rtol=0, atol=golden.REWARD_TOLERANCE)
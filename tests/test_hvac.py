@@ -77,6 +77,21 @@ def test_HVAC_cooling_on_off(typicalHvac: HVAC):
 	assert typicalHvac.TotalPowerUsed == (3740 + 587)
 	assert typicalHvac.LastCoolingDuration == 1
 	
+def test_HVAC_cooling_on_again(typicalHvac: HVAC):
+	"""Tests every cooling on command is counted and restarts the cooling duration, unlike the heating
+	
+	Arguments:
+		typicalHvac {HVAC} -- the hvac test fixture object
+	"""
+	typicalHvac.TurnCoolingOn()
+	typicalHvac.SimulateOneSecond()
+	typicalHvac.SimulateOneSecond()
+	typicalHvac.TurnCoolingOn()
+	typicalHvac.SimulateOneSecond()
+	assert typicalHvac.NumberOfTimesCoolingTurnedOn == 2
+	assert typicalHvac.LastCoolingDuration == 1
+	assert typicalHvac.TotalPowerUsed == (3740 + 587) * 3
+
 def test_HVAC_Average_watts(typicalHvac: HVAC):
 	"""Tests the The average watts per second calculation
 	
@@ -125,3 +140,18 @@ def test_HVAC_Average_watts_for_small_time_frame(typicalHvac: HVAC):
 
 	assert typicalHvac.TotalPowerUsed == (3740 + 587) * 3
 	
+
+def test_HVAC_custom_timing():
+	"""Tests timedelta timing parameters are honored after being converted to seconds, on an HVAC built with a
+	10 second flame ignitor and a 20 second house blower delay instead of the fixture
+	"""
+	hvac = HVAC(flameIgnitorDuration=timedelta(seconds = 10), houseBlowerOnDelay=timedelta(seconds = 20))
+	assert not hasattr(hvac, '__dict__')
+	hvac.TurnHeatingOn()
+	for i in range(11):
+		hvac.SimulateOneSecond()
+	assert hvac.TotalPowerUsed == (184 + 460) * 10 + 12 + 29307 + 184
+	assert not hvac.IsInSteadyPhase()
+	for i in range(9):
+		hvac.SimulateOneSecond()
+	assert hvac.IsInSteadyPhase()
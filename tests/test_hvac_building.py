@@ -48,6 +48,20 @@ def test_HVAC_on(hvacBuilding: HvacBuilding):
 	
 	assert hvacBuilding.building_hvac.TotalPowerUsed > 0
 
+def test_SetParameters_max_energy_cost(hvacBuilding: HvacBuilding):
+	"""Tests the max energy cost of a step follows a new HVAC capacity unless it is given
+	
+	Arguments:
+		hvacBuilding {HvacBuilding} -- the hvac Building test fixture object
+	"""
+	hvacBuilding.building_hvac.SetCapacity(50000, 9000)
+	hvacBuilding.SetParameters(2e6, 300, 120)
+	assert hvacBuilding.GetMaxEnergyCost() == pytest.approx(0.0948, abs=1e-4)
+	hvacBuilding.SetParameters(2e6, 300, 120, step_seconds=600)
+	assert hvacBuilding.GetMaxEnergyCost() == hvacBuilding.CalculateMaxEneregyCostForTime(600)
+	hvacBuilding.SetParameters(2e6, 300, 120, max_energy_cost=1.5)
+	assert hvacBuilding.GetMaxEnergyCost() == 1.5
+
 def test_WattsToDTH(hvacBuilding: HvacBuilding):
 	"""Tests the conversion of watts to DTH
 	
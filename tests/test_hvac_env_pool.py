@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, HvacEnvPool
+
+def runDay(env, actions):
+	observations = [env.reset()]
+	for action in actions:
+		observation, reward, done, info = env.step(action)
+		observations.append(observation)
+	return np.array(observations)
+
+def test_pool_reuses_envs_by_arguments():
+	"""Tests a released env is handed out again only for the same keyword arguments
+	"""
+	pool = HvacEnvPool()
+	env = pool.Acquire(outsideTemperatures='hot')
+	pool.Release(env)
+	assert pool.Acquire(outsideTemperatures='hot', initialTemperature=22) is env
+	assert env.hvacBuilding.current_temperature == 22
+	assert pool.Acquire(outsideTemperatures='cold') is not env
+	assert (pool.Created, pool.Reused) == (2, 1)
+	with pytest.raises(ValueError):
+		pool.Release(HvacEnv())
+
+def test_reused_env_matches_a_new_env():
+	"""Tests an env used for a day and reused behaves like a newly built one
+	"""
+	actions = [1] * 20 + [0] * 20 + [2] * 20 + [0] * 10
+	pool = HvacEnvPool()
+	with pool.Borrow(outsideTemperatures='october') as env:
+		runDay(env, actions)
+		env.render('rgb_array')
+	with pool.Borrow(outsideTemperatures='october') as reused:
+		assert reused is env
+		assert reused.render_history is None
+		np.testing.assert_array_equal(runDay(reused, actions), runDay(HvacEnv(outsideTemperatures='october'), actions))
+
+def test_envs_share_the_immutable_data():
+	"""Tests envs built alike share spaces and weather, and reset hands out a fresh observation each time
+	"""
+	first = HvacEnv()
+	second = HvacEnv()
+	assert first.observation_space is second.observation_space
+	assert first.GetOutsideTemperatureProfile('hot') is second.GetOutsideTemperatureProfile('hot')
+
+	observation = first.reset()
+	observation[1] = 99.0
+	assert first.reset()[1] == 18
+	first.initialTemperature = 21
+	assert first.reset()[1] == 21
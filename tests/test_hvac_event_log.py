@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from gym_hvac.models import HVAC, HvacEventLog, PHASE_NAMES
+
+# (seconds, command) pieces: 0 off, 1 heating, 2 cooling
+SCHEDULE = [(900, 1), (1200, 0), (100, 1), (600, 0), (1800, 2), (60, 0), (30, 2), (400, 0), (2000, 1)]
+
+def command(hvac, action):
+	if action == 0:
+		hvac.TurnHvacOff()
+	elif action == 1:
+		hvac.TurnHeatingOn()
+	else:
+		hvac.TurnCoolingOn()
+
+def runPerSecond(hvac):
+	powers = []
+	for seconds, action in SCHEDULE:
+		command(hvac, action)
+		for second in range(seconds):
+			before = hvac.TotalPowerUsed
+			hvac.SimulateOneSecond()
+			powers.append(hvac.TotalPowerUsed - before)
+	return np.array(powers)
+
+def test_power_is_reconstructed_from_the_transitions():
+	"""Tests the per second power and interval energy of the log against the per second simulation
+	"""
+	hvac = HVAC()
+	log = hvac.EnableEventLog(capacity=4)
+	powers = runPerSecond(hvac)
+	end = hvac.TotalTimeInSeconds
+	assert len(log) < 25
+	np.testing.assert_array_equal(log.GetPowerPerSecond(end), powers)
+	np.testing.assert_array_equal(log.GetPowerPerSecond(700, 300), powers[300:700])
+	boundaries = np.arange(0, end + 1, 600)
+	np.testing.assert_allclose(log.GetEnergy(boundaries), powers[:boundaries[-1]].reshape(-1, 600).sum(axis=1))
+	assert log.GetCumulativeEnergy([end])[0] == pytest.approx(hvac.TotalPowerUsed)
+	assert [PHASE_NAMES[phase] for phase in log.GetEvents()['phase'][:6]] == ['ignition', 'gasOn', 'running', 'shutdown', 'shutdownBlower', 'off']
+
+def test_batched_seconds_record_the_same_transitions():
+	stepped = HVAC()
+	stepped.EnableEventLog()
+	runPerSecond(stepped)
+	batched = HVAC()
+	batched.EnableEventLog()
+	for seconds, action in SCHEDULE:
+		command(batched, action)
+		batched.SimulateSeconds(seconds)
+	np.testing.assert_array_equal(batched.GetEventLog().GetEvents(), stepped.GetEventLog().GetEvents())
+
+def test_cycles_match_the_counters():
+	"""Tests the cycle summaries: one per time the heating and cooling went on, with their energy and short cycles
+	"""
+	hvac = HVAC()
+	log = hvac.EnableEventLog()
+	runPerSecond(hvac)
+	cycles = log.GetCycles(hvac.TotalTimeInSeconds)
+	assert cycles['heating'].sum() == hvac.NumberOfTimesHeatingTurnedOn == 3
+	assert (~cycles['heating']).sum() == hvac.NumberOfTimesCoolingTurnedOn == 2
+	# the heating runs until its shutdown finished, the short heating ran 100 seconds and shut down for 150 more
+	assert cycles['duration'].tolist() == [900 + 150, 100 + 150, 1800, 30, 2000]
+	assert cycles['shortCycle'].tolist() == [False, True, False, True, False]
+	assert cycles['energy'].sum() == pytest.approx(hvac.TotalPowerUsed)
+	assert cycles['energy'][~cycles['heating']].sum() == pytest.approx(hvac.TotalPowerCoolingUsed)
+	hvac.reset()
+	assert len(log) == 0 and len(log.GetCycles(0)) == 0
+
+def test_log_is_only_recorded_when_enabled():
+	hvac = HVAC()
+	hvac.TurnHeatingOn()
+	hvac.SimulateSeconds(100)
+	assert hvac.GetEventLog() is None
+	assert hvac.EnableEventLog() is hvac.EnableEventLog()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+from gym_hvac.envs.hvac_renderer import RenderHistory
+
+def test_history_keeps_the_last_steps_in_order():
+	"""Tests the history ring wraps around and keeps the newest capacity steps, oldest first
+	"""
+	history = RenderHistory(4)
+	for i in range(6):
+		history.Append(i, i + 0.5, 2.0 * i)
+	assert history.GetCount() == 6
+	np.testing.assert_array_equal(history.GetRows()[:, 0], [2, 3, 4, 5])
+	np.testing.assert_array_equal(history.GetRows()[-1], [5, 5.5, 10])
+
+	version = history.GetVersion()
+	history.Clear()
+	assert history.GetVersion() != version
+	assert len(history.GetRows()) == 0
+	history.Append(7, 7, 7)
+	np.testing.assert_array_equal(history.GetRows(), [[7, 7, 7]])
+	history.Close()
+
+def test_shared_history_is_read_by_name():
+	"""Tests a history attached by name sees the rows of the owner
+	"""
+	history = RenderHistory(8, shared=True)
+	attached = RenderHistory(8, name=history.GetName())
+	try:
+		history.Append(21.0, -3.0, 500.0)
+		np.testing.assert_array_equal(attached.GetRows(), [[21.0, -3.0, 500.0]])
+	finally:
+		attached.Close()
+		history.Close()
+
+def test_rgb_array_reuses_the_frame():
+	"""Tests rgb_array returns the same preallocated frame, redrawn only after a step
+	"""
+	env = HvacEnv()
+	assert env.render_history is None
+	frame = env.render('rgb_array')
+	assert frame.shape == (480, 640, 3)
+	assert frame.dtype == np.uint8
+	first = frame.copy()
+
+	for action in [1, 1, 1, 0]:
+		env.step(action)
+	assert env.render('rgb_array') is frame
+	assert not np.array_equal(frame, first)
+	assert env.render_history.GetCount() == 5
+
+	env.close()
+	assert env.renderer is None and env.render_history is None
+
+def test_unknown_render_mode():
+	with pytest.raises(ValueError):
+		HvacEnv().render('ansi')
+
+def test_human_dashboard_process(monkeypatch):
+	"""Tests the live dashboard runs in its own process and stops on close
+	"""
+	monkeypatch.setenv('MPLBACKEND', 'Agg')
+	env = HvacEnv()
+	env.render('rgb_array')
+	env.step(1)
+	env.render('human')
+	# the steps recorded before the dashboard are moved into the shared history
+	assert env.render_history.GetName() is not None
+	assert env.render_history.GetCount() == 2
+	env.step(1)
+	env.render('human')
+	env.close()
+	assert env.renderer is None
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from gym_hvac.models import HvacBuilding
+from gym_hvac.models import HVAC
+from gym_hvac.utils import HvacReplay, ReadReplayLog, REPLAY_LOG_DTYPE
+
+def createHvacBuilding():
+	conditioned_floor_area = 100
+	return HvacBuilding(
+		HVAC(),
+		heat_mass_capacity=16500 * conditioned_floor_area,
+		heat_transmission=200,
+		initial_building_temperature=20,
+		conditioned_floor_area=conditioned_floor_area)
+
+def createLog(rows:int):
+	records = np.zeros(rows, dtype=REPLAY_LOG_DTYPE)
+	records['time'] = np.arange(rows) * 60.0
+	records['command'] = (np.arange(rows) // 10) % 3
+	records['outside_temperature'] = np.linspace(-5.0, 35.0, rows)
+	records['indoor_temperature'] = 20.0
+	return records
+
+def test_step_seconds_matches_per_second_steps():
+	"""Tests the batched integration gives the same result as stepping every second
+	"""
+	stepped = createHvacBuilding()
+	batched = createHvacBuilding()
+	for command, seconds in [(1, 400), (0, 100), (1, 50), (0, 300), (2, 200), (0, 30)]:
+		for hvacBuilding in [stepped, batched]:
+			if command == 0:
+				hvacBuilding.building_hvac.TurnHvacOff()
+			elif command == 1:
+				hvacBuilding.building_hvac.TurnHeatingOn()
+			else:
+				hvacBuilding.building_hvac.TurnCoolingOn()
+		for i in range(seconds):
+			stepped.step(5.0)
+		batched.StepSeconds(5.0, seconds)
+
+		assert batched.current_temperature == pytest.approx(stepped.current_temperature, abs=1e-9)
+		assert batched.building_hvac.TotalPowerUsed == stepped.building_hvac.TotalPowerUsed
+		assert batched.building_hvac.TotalGasEnergyUsed == stepped.building_hvac.TotalGasEnergyUsed
+		assert batched.building_hvac.TotalTimeInSeconds == stepped.building_hvac.TotalTimeInSeconds
+		assert batched.building_hvac.HeatingIsOn == stepped.building_hvac.HeatingIsOn
+
+@pytest.mark.parametrize("extension", [".csv", ".bin", ".npy"])
+def test_replay_streams_log_in_chunks(tmp_path, extension):
+	"""Tests every log format gives the same residuals regardless of the chunk size
+	"""
+	records = createLog(95)
+	path = str(tmp_path / ("log" + extension))
+	if extension == ".csv":
+		with open(path, 'w') as logFile:
+			logFile.write("time,command,outside_temperature,indoor_temperature\n")
+			for record in records:
+				logFile.write("{},{},{},{}\n".format(*record))
+	elif extension == ".bin":
+		records.tofile(path)
+	else:
+		np.save(path, records)
+
+	chunks = list(ReadReplayLog(path, chunkRows=20))
+	assert [len(chunk) for chunk in chunks] == [20, 20, 20, 20, 15]
+
+	chunkedReplay = HvacReplay(createHvacBuilding())
+	simulated = np.concatenate([chunk[1] for chunk in chunkedReplay.Run(ReadReplayLog(path, chunkRows=20))])
+	wholeReplay = HvacReplay(createHvacBuilding())
+	statistics = wholeReplay.RunFile(path, chunkRows=1000)
+
+	assert len(simulated) == 95
+	assert simulated[0] == 20.0
+	assert statistics.Count == 95
+	assert chunkedReplay.Residuals.Mean == pytest.approx(statistics.Mean)
+	assert chunkedReplay.Residuals.GetStd() == pytest.approx(statistics.GetStd())
+	assert statistics.GetRmse() == pytest.approx(np.sqrt(np.mean((simulated - 20.0) ** 2)))
+	assert statistics.MaxAbs == pytest.approx(np.abs(simulated - 20.0).max())
+	assert wholeReplay.hvacBuilding.building_hvac.TotalTimeInSeconds == 94 * 60
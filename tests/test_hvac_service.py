@@ -0,0 +1,141 @@
+import asyncio
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+from gym_hvac.models import CreateResidentialForcing
+from gym_hvac.service import HvacServiceServer, HvacServiceClient, HvacServiceError
+
+async def runSessions(server:HvacServiceServer, address, clientCount:int, sessionsPerClient:int, actions):
+	async def runClient():
+		client = HvacServiceClient()
+		if isinstance(address, str):
+			await client.Connect(path=address)
+		else:
+			await client.Connect(*address)
+		sessionIds = [(await client.Open())[0] for i in range(sessionsPerClient)]
+		observations = []
+		for sessionId in sessionIds:
+			await client.Reset(sessionId)
+			for action in actions:
+				observation, reward, done = await client.Step(sessionId, action)
+			observations.append(observation)
+		snapshot = await client.Snapshot(sessionIds[0])
+		for sessionId in sessionIds:
+			await client.CloseSession(sessionId)
+		await client.Close()
+		return observations, snapshot
+
+	return await asyncio.gather(*[runClient() for i in range(clientCount)])
+
+def test_service_matches_local_env():
+	"""Tests concurrent sessions over TCP step exactly like a local HvacEnv
+	"""
+	actions = [1, 1, 1, 0, 0, 2, 0]
+	env = HvacEnv()
+	env.reset()
+	for action in actions:
+		expected, reward, done, _ = env.step(action)
+
+	async def run():
+		server = HvacServiceServer()
+		address = await server.Start()
+		results = await runSessions(server, address, clientCount=20, sessionsPerClient=3, actions=actions)
+		sessionCount = server.GetSessionCount()
+		await server.Close()
+		return server, results, sessionCount
+
+	server, results, sessionCount = asyncio.run(run())
+	assert sessionCount == 0
+	# concurrent requests were executed in batches
+	assert server.BatchCount < server.RequestCount
+	for observations, snapshot in results:
+		for observation in observations:
+			assert observation == pytest.approx(tuple(expected))
+		assert snapshot['temperature'] == pytest.approx(expected[1])
+		assert snapshot['totalTimeInSeconds'] == len(actions) * env.env_step_interval
+
+def test_service_unix_socket_and_errors(tmp_path):
+	"""Tests the Unix socket transport and the error statuses
+	"""
+	async def run():
+		server = HvacServiceServer(realTimeFactor=1e6)
+		path = await server.Start(path=str(tmp_path / "hvac.sock"))
+		results = await runSessions(server, path, clientCount=2, sessionsPerClient=2, actions=[0, 1])
+		client = HvacServiceClient()
+		await client.Connect(path=path)
+		with pytest.raises(HvacServiceError):
+			await client.Step(12345, 0)
+		with pytest.raises(HvacServiceError):
+			await client.Snapshot(12345)
+		sessionId, observation = await client.Open()
+		with pytest.raises(HvacServiceError):
+			await client.Step(sessionId, 7)
+		await client.Close()
+		await server.Close()
+		return results
+
+	results = asyncio.run(run())
+	assert len(results) == 2
+
+def test_service_sizes_observations_by_env():
+	"""Tests sessions of envs with longer observations (occupancy and a forecast window) and that a failing
+	session doesn't stop the server
+	"""
+	actions = [1, 1, 0, 2]
+	createEnv = lambda: HvacEnv(forcing=CreateResidentialForcing(), forecastHorizon=2)
+	env = createEnv()
+	env.reset()
+	for action in actions:
+		expected, reward, done, _ = env.step(action)
+	factories = iter([createEnv, lambda: HvacEnv(spec={'maxSteps': 'forever'}), createEnv])
+
+	async def run():
+		server = HvacServiceServer(envFactory=lambda: next(factories)())
+		address = await server.Start()
+		client = HvacServiceClient()
+		await client.Connect(*address)
+		sessionId, observation = await client.Open()
+		assert len(observation) == len(expected) == 8
+		with pytest.raises(HvacServiceError):
+			await client.Open()
+		otherSessionId, otherObservation = await client.Open()
+		await client.Reset(sessionId)
+		for action in actions:
+			observation, reward, done = await client.Step(sessionId, action)
+		snapshot = await client.Snapshot(sessionId)
+		await asyncio.wait_for(client.Step(otherSessionId, 0), timeout=10)
+		await client.Close()
+		await server.Close()
+		return observation, snapshot
+
+	observation, snapshot = asyncio.run(run())
+	assert observation == pytest.approx(tuple(expected))
+	assert snapshot['observation'] == pytest.approx(tuple(expected))
+
+def test_sessions_of_a_disconnected_client_are_closed():
+	"""Tests the sessions a client leaves open are closed when its connection goes away
+	"""
+	async def run():
+		server = HvacServiceServer()
+		address = await server.Start()
+		staying = HvacServiceClient()
+		await staying.Connect(*address)
+		stayingSessionId, observation = await staying.Open()
+		leaving = HvacServiceClient()
+		await leaving.Connect(*address)
+		sessionIds = [(await leaving.Open())[0] for i in range(3)]
+		await leaving.Step(sessionIds[0], 1)
+		await leaving.CloseSession(sessionIds[1])
+		assert server.GetSessionCount() == 3
+		await leaving.Close()
+		for i in range(100):
+			if server.GetSessionCount() == 1:
+				break
+			await asyncio.sleep(0.01)
+		sessionCount = server.GetSessionCount()
+		await staying.Step(stayingSessionId, 0)
+		await staying.Close()
+		await server.Close()
+		return sessionCount
+
+	assert asyncio.run(run()) == 1
@@ -0,0 +1,48 @@
+import warnings
+import gym
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacSetpointEnv, ScenarioSampler
+from gym_hvac.models import HvacBuilding, HVAC, HysteresisThermostat
+
+def test_a_day_is_one_action_per_hour():
+	"""Tests an episode is 24 hourly steps running the thermostat on the hourly weather
+	"""
+	env = HvacSetpointEnv(outsideTemperatures='normal', initialTemperature=19)
+	observation = env.reset()
+	assert env.action_space.shape == (3,)
+	steps = 0
+	done = False
+	while not done:
+		observation, reward, done, info = env.step(np.array([20.0, 22.0, 1.0]))
+		steps = steps + 1
+		assert env.observation_space.contains(observation.astype(np.float32)) or env.building_min <= observation[1] <= env.building_max
+	assert steps == 24
+	assert env.hvacBuilding.building_hvac.TotalTimeInSeconds == 24 * 3600
+
+def test_block_matches_the_thermostat_on_the_weather():
+	"""Tests a block runs the thermostat with the outside temperature of each hour
+	"""
+	weather = [-5.0, 0.0, 5.0, 10.0] + [10.0] * 21
+	env = HvacSetpointEnv(outsideTemperatures=weather, initialTemperature=18, blockSeconds=7200)
+	env.reset()
+	env.step([21.0, 24.0, 1.0])
+	env.step([21.0, 24.0, 1.0])
+	building = HvacBuilding(HVAC(), 16500 * 100, 200, 18, 100)
+	thermostat = HysteresisThermostat(21.0, 24.0, 1.0)
+	for hour in range(4):
+		thermostat.Run(building, weather[hour], 3600)
+	assert env.hvacBuilding.current_temperature == pytest.approx(building.current_temperature, abs=1e-9)
+	assert env.hvacBuilding.building_hvac.NumberOfTimesHeatingTurnedOn == building.building_hvac.NumberOfTimesHeatingTurnedOn
+	assert env.OutsideTemperature == 10.0
+
+def test_actions_are_clipped_and_the_env_is_registered():
+	with warnings.catch_warnings():
+		warnings.simplefilter('ignore')
+		env = gym.make('HvacSetpoint-v0').unwrapped
+	env.reset()
+	env.step([40.0, 0.0, 10.0])
+	assert (env.thermostat.heatingSetpoint, env.thermostat.coolingSetpoint, env.thermostat.deadband) == (28.0, 28.0, 4.0)
+	with pytest.raises(ValueError):
+		HvacSetpointEnv(scenarioSampler=ScenarioSampler())
+	HvacSetpointEnv(scenarioSampler=ScenarioSampler(stepSeconds=3600)).step([20.0, 20.0, 2.0])
@@ -0,0 +1,107 @@
+import json
+import os
+import pytest
+from gym_hvac.results import ResultsStore
+from gym_hvac.sweep import HyperparameterSweep, ExpandGrid, SetConfigValue, RecordSweep, FormatSweepTable, ReadScore
+
+BASE_CONFIG = {'agent': {'type': 'ppo_agent', 'step_optimizer': {'type': 'adam', 'learning_rate': 1}}, 'network': [{'type': 'dense', 'size': 32}]}
+GRID = {'agent.step_optimizer.learning_rate': [0.001, 0.01, 0.1], 'network.0.size': [16, 32, 64]}
+
+def scoreTrial(directory, config, episodes, resume, failOn = None, failWith = RuntimeError):
+	"""A stand in for the training: the score peaks at a learning rate of 0.01 and 32 units and grows with the episodes
+	"""
+	with open(os.path.join(directory, 'calls.log'), 'a') as log:
+		log.write(json.dumps({'episodes': episodes, 'resume': resume}) + '\n')
+	learningRate = config['agent']['step_optimizer']['learning_rate']
+	size = config['network'][0]['size']
+	if failOn is not None and (learningRate, size) == failOn and resume:
+		raise failWith("The trial crashed")
+	return -abs(learningRate - 0.01) * 100 - abs(size - 32) / 16.0 + episodes / 1000.0
+
+def readCalls(directory):
+	with open(os.path.join(directory, 'calls.log')) as log:
+		return [json.loads(line) for line in log]
+
+def test_expand_grid():
+	trials = ExpandGrid(BASE_CONFIG, GRID)
+	assert len(trials) == 9
+	parameters, config = trials[0]
+	assert parameters == {'agent.step_optimizer.learning_rate': 0.001, 'network.0.size': 16}
+	assert config['network'][0]['size'] == 16
+	assert BASE_CONFIG['network'][0]['size'] == 32
+
+	config = {}
+	SetConfigValue(config, 'agent.update_mode.batch_size', 8)
+	assert config == {'agent': {'update_mode': {'batch_size': 8}}}
+
+def test_successive_halving(tmp_path):
+	"""Tests every rung keeps the best 1/eta trials, which resume for the rest of the rung's episodes
+	"""
+	sweep = HyperparameterSweep(str(tmp_path), BASE_CONFIG, GRID, trialFunction=scoreTrial, minEpisodes=10, eta=3, workers=0)
+	assert sweep.rungs == 3
+	results = sweep.Run()
+
+	assert [len(trial['scores']) for trial in results] == [3, 2, 2] + [1] * 6
+	assert results[0]['parameters'] == {'agent.step_optimizer.learning_rate': 0.01, 'network.0.size': 32}
+	assert readCalls(results[0]['directory']) == [{'episodes': 10, 'resume': False}, {'episodes': 20, 'resume': True}, {'episodes': 60, 'resume': True}]
+	assert 'rung 2' in FormatSweepTable(results)
+
+def test_sweep_resumes_after_a_crash(tmp_path):
+	"""Tests a sweep started again in its directory after an interrupt only runs the trials that didn't finish
+	"""
+	interrupted = HyperparameterSweep(str(tmp_path), BASE_CONFIG, GRID, trialFunction=scoreTrial,
+		trialArguments={'failOn': (0.01, 32), 'failWith': KeyboardInterrupt}, minEpisodes=10, workers=0)
+	with pytest.raises(KeyboardInterrupt):
+		interrupted.Run()
+
+	results = HyperparameterSweep(str(tmp_path), BASE_CONFIG, GRID, trialFunction=scoreTrial, minEpisodes=10, workers=0).Run()
+	best = results[0]
+	assert best['parameters'] == {'agent.step_optimizer.learning_rate': 0.01, 'network.0.size': 32}
+	# the first rung isn't run again, the crashed second rung is
+	assert [call['episodes'] for call in readCalls(best['directory'])] == [10, 20, 20, 60]
+	for trial in results[3:]:
+		assert len(readCalls(trial['directory'])) == 1
+
+	with pytest.raises(ValueError):
+		HyperparameterSweep(str(tmp_path), BASE_CONFIG, {'network.0.size': [8]}, trialFunction=scoreTrial, workers=0)
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_failed_trial_is_eliminated(tmp_path, workers):
+	"""Tests a trial that raises gets the worst score and its error and the sweep finishes without it
+	"""
+	sweep = HyperparameterSweep(str(tmp_path), BASE_CONFIG, GRID, trialFunction=scoreTrial, trialArguments={'failOn': (0.01, 32)},
+		minEpisodes=10, workers=workers)
+	results = sweep.Run()
+	failed = [trial for trial in results if 'error' in trial]
+	assert len(failed) == 1 and failed[0]['parameters'] == {'agent.step_optimizer.learning_rate': 0.01, 'network.0.size': 32}
+	assert failed[0]['scores'][-1] == float('-inf') and failed[0]['error'] == 'RuntimeError: The trial crashed'
+	# the failed trial drops out at the next halving, the next best one finishes the sweep
+	assert len(failed[0]['scores']) == 2 and len(results[0]['scores']) == 3 and 'error' not in results[0]
+	assert sweep.GetRungTrials(2) == [trial for trial in sweep.state['trials'] if trial['trial'] == results[0]['trial']]
+	# the state was saved with the failure, a resumed sweep has nothing left to run
+	resumed = HyperparameterSweep(str(tmp_path), BASE_CONFIG, GRID, trialFunction=scoreTrial, minEpisodes=10, workers=0)
+	assert resumed.Run() == results
+
+def test_process_pool_with_pinned_workers(tmp_path):
+	"""Tests the trials run in pinned, memory limited worker processes and give the same result as in process
+	"""
+	pooled = HyperparameterSweep(str(tmp_path / 'pooled'), BASE_CONFIG, GRID, trialFunction=scoreTrial, minEpisodes=10, workers=2,
+		memoryLimitBytes=8 * 1024 ** 3).Run()
+	inProcess = HyperparameterSweep(str(tmp_path / 'in_process'), BASE_CONFIG, GRID, trialFunction=scoreTrial, minEpisodes=10, workers=0).Run()
+	assert [(trial['trial'], trial['scores']) for trial in pooled] == [(trial['trial'], trial['scores']) for trial in inProcess]
+
+def test_record_sweep(tmp_path):
+	"""Tests the trials are recorded as runs found by their sweep parameters, and the score of a metrics file
+	"""
+	results = HyperparameterSweep(str(tmp_path / 'sweep'), BASE_CONFIG, GRID, trialFunction=scoreTrial, minEpisodes=10, workers=0).Run()
+	with ResultsStore(str(tmp_path / 'results.sqlite')) as store:
+		runIds = RecordSweep(store, 'lr-size', results)
+		assert len(runIds) == 9
+		runs = store.FindRuns({'sweep.rungs': 3})
+		assert [run['run_id'] for run in runs] == [runIds[0]]
+		assert store.GetConfig(runIds[0])['sweep']['parameters']['network.0.size'] == 32
+
+	csvPath = str(tmp_path / 'training_metrics.csv')
+	with open(csvPath, 'w') as csvFile:
+		csvFile.write('episode,reward\n0,1.0\n1,2.0\n2,4.0\n')
+	assert ReadScore(csvPath, 'reward', 2) == 3.0
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+def runProbe(code:str):
+	return subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout.split()
+
+def test_models_import_without_frameworks():
+	"""Tests the simulator imports without gym, plotting or the training report
+	"""
+	loaded = runProbe("import sys, gym_hvac.models, gym_hvac.utils\n"
+		"print(' '.join(name for name in ['gym', 'matplotlib', 'tensorforce', 'tensorflow', 'multiprocessing'] if name in sys.modules))")
+	assert loaded == []
+
+def test_envs_import_registers_environment():
+	"""Tests Hvac-v0 can be made after importing gym_hvac.envs, or gym before gym_hvac
+	"""
+	assert runProbe("import gym_hvac.envs, gym\nprint('Hvac-v0' in gym.envs.registry)") == ['True']
+	assert runProbe("import gym, gym_hvac\nprint(type(gym.make('Hvac-v0').unwrapped).__name__)") == ['HvacEnv']
+
+def test_lazy_utils_attributes():
+	"""Tests the training report names load on first use
+	"""
+	import gym_hvac.utils
+	from gym_hvac.utils.training_report import TrainingReporter
+	assert gym_hvac.utils.TrainingReporter is TrainingReporter
+	assert 'EPISODE_SUMMARY_DTYPE' in dir(gym_hvac.utils)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, HvacSetpointEnv
+from gym_hvac.evaluation import ThermostatPolicy
+from gym_hvac.models import HVAC, HvacBuilding, HysteresisThermostat, RUN_CHUNK_DTYPE
+
+def createHvacBuilding(initialTemperature:float = 18):
+	return HvacBuilding(HVAC(), 16500 * 100, 200, initialTemperature, 100)
+
+def test_chunks_are_the_simulated_seconds():
+	"""Tests the streamed run is the run a thermostat steps second by second
+	"""
+	weather = [-5.0, -4.0, -6.0]
+	building = createHvacBuilding()
+	chunks = list(building.iter_run(HysteresisThermostat(), weather, chunk_seconds=5000))
+	assert [len(chunk) for chunk in chunks] == [5000, 5000, 800]
+	assert chunks[0].dtype == RUN_CHUNK_DTYPE
+	run = np.concatenate(chunks)
+
+	stepped = createHvacBuilding()
+	thermostat = HysteresisThermostat()
+	temperatures = []
+	for second in range(3 * 3600):
+		thermostat.Step(stepped, weather[second // 3600])
+		temperatures.append(stepped.current_temperature)
+	np.testing.assert_array_equal(run['indoorTemperature'], temperatures)
+	np.testing.assert_array_equal(run['time'], np.arange(3 * 3600))
+	assert run['outsideTemperature'][3600] == -4.0
+	assert run['power'].sum() == pytest.approx(stepped.building_hvac.TotalPowerUsed)
+	assert run['cost'][-1] == pytest.approx(stepped.CalculateGasEneregyCost() + stepped.CalculateElectricEneregyCost(), rel=1e-12)
+	# heating starts with the ignition, runs and shuts down
+	assert set(np.unique(run['mode'])) >= {0, 1, 2, 3, 4, 5}
+
+def test_cost_and_time_continue_from_the_building():
+	building = createHvacBuilding(25)
+	building.building_hvac.TurnCoolingOn()
+	building.StepSeconds(30, 100)
+	before = building.CalculateElectricEneregyCost()
+	chunk = next(building.iter_run(None, lambda seconds: np.full(len(seconds), 30.0), chunk_seconds=50, seconds=50))
+	assert chunk['time'][0] == 100 and (chunk['mode'] == 6).all()
+	assert chunk['cost'][-1] == pytest.approx(building.CalculateElectricEneregyCost() - before, rel=1e-9)
+	with pytest.raises(ValueError):
+		next(building.iter_run(None, lambda seconds: seconds * 0.0))
+
+def test_controller_is_called_every_control_seconds():
+	calls = []
+	run = createHvacBuilding().iter_run(lambda building, outside: calls.append(building.building_hvac.TotalTimeInSeconds), [0.0],
+		chunk_seconds=100, seconds=300, control_seconds=60, dtype='float32')
+	chunks = list(run)
+	assert calls == [0, 60, 120, 180, 240]
+	assert chunks[0]['indoorTemperature'].dtype == np.float32
+
+def test_env_chunks_are_the_stepped_episode():
+	env = HvacEnv(outsideTemperatures='normal')
+	policy = ThermostatPolicy()
+	policy.Reset(1)
+	chunks = list(env.iter_run(lambda observation: int(policy(observation.reshape(1, -1))[0]), chunk_steps=100, steps=288))
+	assert [len(chunk) for chunk in chunks] == [100, 100, 88]
+	run = np.concatenate(chunks)
+
+	stepped = HvacEnv(outsideTemperatures='normal')
+	policy.Reset(1)
+	observation = stepped.reset()
+	for step in range(288):
+		action = int(policy(observation.reshape(1, -1))[0])
+		observation, reward, done, info = stepped.step(action)
+		assert run['action'][step] == action
+		assert run['reward'][step] == reward
+		assert run['indoorTemperature'][step] == observation[1]
+	np.testing.assert_array_equal(run['step'], np.arange(288))
+	np.testing.assert_array_equal(run['time'], np.arange(288) * 300)
+	assert run['cost'][-1] == pytest.approx(stepped.hvacBuilding.CalculateGasEneregyCost() + stepped.hvacBuilding.CalculateElectricEneregyCost())
+
+def test_env_run_stops_when_done_and_keeps_box_actions():
+	env = HvacEnv(outsideTemperatures='normal')
+	# cooling on a day this cold ends the episode
+	run = np.concatenate(list(env.iter_run(lambda observation: 2)))
+	assert len(run) < 288
+	setpointEnv = HvacSetpointEnv()
+	action = np.array([20.0, 20.0, 2.0], dtype=np.float32)
+	run = np.concatenate(list(setpointEnv.iter_run(lambda observation: action, chunk_steps=10)))
+	assert len(run) == 24
+	np.testing.assert_array_equal(run['action'][3], action)
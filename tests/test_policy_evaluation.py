@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv
+from gym_hvac.evaluation import CreateScenarioSuite, ThermostatPolicy, EvaluatePolicy, SummarizeResults, FormatSummaryTable
+
+def offPolicy(observations):
+	return np.zeros(len(observations), dtype=np.int64)
+
+def test_thermostat_policy_suite():
+	"""Tests the thermostat keeps the building comfortable on cold days and the summary groups the seeds
+	"""
+	scenarios = CreateScenarioSuite(profiles=('cold', 'hot'), seeds=range(3), steps=48)
+	results = EvaluatePolicy(ThermostatPolicy(), scenarios, workers=0, batchSize=4)
+	assert [result['seed'] for result in results] == [0, 1, 2, 0, 1, 2]
+	assert [(result['heatingCycles'], result['coolingCycles']) for result in results[:3]] == [(8, 0)] * 3
+	assert all(result['coolingCycles'] > 0 for result in results[3:5])
+	assert all(result['totalCost'] > 0 for result in results)
+	# the last hot scenario starts cold enough to heat, heating on a hot day ends the episode
+	assert [result['steps'] for result in results] == [48] * 5 + [1]
+
+	rows = SummarizeResults(results)
+	assert [row['name'] for row in rows] == ['cold/standard', 'hot/standard']
+	assert rows[0]['count'] == 3
+	assert rows[0]['totalCost_ci95'] >= 0
+	assert 'cold/standard' in FormatSummaryTable(rows)
+
+def test_cycles_are_the_transitions_of_the_event_log():
+	"""Tests a cooling command that keeps the A/C on isn't counted as a cycle
+	"""
+	scenarios = CreateScenarioSuite(profiles=('hot',), seeds=range(1), steps=288, initialTemperatureJitter=0.0)
+	result = EvaluatePolicy(ThermostatPolicy(), scenarios, workers=0)[0]
+	env = HvacEnv(outsideTemperatures='hot')
+	hvac = env.hvacBuilding.building_hvac
+	eventLog = hvac.EnableEventLog()
+	policy = ThermostatPolicy()
+	policy.Reset(1)
+	observation = env.reset()
+	for step in range(288):
+		observation = env.step(int(policy(observation[np.newaxis])[0]))[0]
+	cycles = eventLog.GetCycles(hvac.TotalTimeInSeconds)
+	assert result['coolingCycles'] == np.count_nonzero(~cycles['heating']) == 14
+	assert hvac.NumberOfTimesCoolingTurnedOn > 14
+	assert result['steps'] == 288
+
+def test_process_pool_matches_in_process():
+	"""Tests fanning out over worker processes gives the same results as evaluating in process
+	"""
+	scenarios = CreateScenarioSuite(profiles=('october',), buildingVariants={'small': {'conditionedFloorArea': 50}}, seeds=range(4), steps=24)
+	inProcess = EvaluatePolicy(offPolicy, scenarios, workers=0, batchSize=3)
+	pooled = EvaluatePolicy(offPolicy, scenarios, workers=2, batchSize=3)
+	assert [result['finalTemperature'] for result in pooled] == pytest.approx([result['finalTemperature'] for result in inProcess])
+	# nothing turned on, so every step is spent outside the comfort band until the building leaves the bounds
+	assert all(result['totalCost'] == 0 for result in pooled)
+	assert [result['comfortViolationMinutes'] for result in pooled] == [result['comfortViolationMinutes'] for result in inProcess]
+	assert all(result['comfortViolationMinutes'] == result['steps'] * 5 and 0 < result['steps'] < 24 for result in pooled)
+
+def test_evaluation_leaves_the_global_random_state_alone():
+	"""Tests the initial temperature jitter is drawn without reseeding numpy.random
+	"""
+	scenarios = CreateScenarioSuite(profiles=('october',), seeds=range(3), steps=4)
+	np.random.seed(7)
+	expected = np.random.get_state()[1].copy()
+	results = EvaluatePolicy(offPolicy, scenarios, workers=0)
+	np.testing.assert_array_equal(np.random.get_state()[1], expected)
+	# the jitter still depends on the seed only
+	assert [result['finalTemperature'] for result in EvaluatePolicy(offPolicy, scenarios, workers=0)] == [result['finalTemperature'] for result in results]
+	assert len(set(result['finalTemperature'] for result in results)) == 3
+
+def test_profiles_hold_their_last_hour_after_the_day():
+	"""Tests a 24 hour profile runs past the end of the day with the last hour's temperature
+	"""
+	env = HvacEnv(outsideTemperatures='normal')
+	for step in range(300):
+		env.step(0)
+	assert env.OutsideTemperature == 4.44
+	scenarios = CreateScenarioSuite(profiles=('normal',), seeds=range(2), steps=400)
+	assert len(EvaluatePolicy(ThermostatPolicy(), scenarios, workers=0)) == 2
@@ -0,0 +1,83 @@
+import json
+import os
+import pytest
+from gym_hvac.results import ResultsStore, FlattenConfig, LoadConfigFile
+from gym_hvac.results.__main__ import main
+
+CONFIG_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'examples', 'configs')
+
+def createEpisodes(count:int, rewardOffset:float = 0.0):
+	return [(episode, 100 + episode, rewardOffset + episode, 0.5 * episode, 20.0, 1, 0, 300.0, 0.0) for episode in range(count)]
+
+def test_flatten_config():
+	assert FlattenConfig({'a': {'b': [1, {'c': 'x'}]}, 'd': True}) == {'a.b.0': 1, 'a.b.1.c': 'x', 'd': True}
+
+def test_find_runs_by_configuration(tmp_path):
+	"""Tests runs are found by flattened configuration values, ranges and name
+	"""
+	with ResultsStore(str(tmp_path / 'results.sqlite')) as store:
+		ppo = store.CreateRun('ppo', {'agent': LoadConfigFile(os.path.join(CONFIG_DIRECTORY, 'hvac_ppo.json')), 'env': {'heatTransmission': 200}})
+		dqn = store.CreateRun('dqn', {'agent': LoadConfigFile(os.path.join(CONFIG_DIRECTORY, 'dqn.json')), 'env': {'heatTransmission': 300}})
+
+		assert [run['run_id'] for run in store.FindRuns({'agent.type': 'ppo_agent'})] == [ppo]
+		assert [run['run_id'] for run in store.FindRuns({'env.heatTransmission': 300})] == [dqn]
+		assert [run['run_id'] for run in store.FindRuns({'env.heatTransmission': (150, 350)})] == [ppo, dqn]
+		assert [run['run_id'] for run in store.FindRuns({'env.heatTransmission': (150, 350)}, name='dq%')] == [dqn]
+		assert store.FindRuns({'agent.type': 'ppo_agent', 'env.heatTransmission': 300}) == []
+		assert store.GetConfig(ppo)['agent']['update_mode']['batch_size'] == 32
+		with pytest.raises(KeyError):
+			store.GetConfig(99)
+
+def test_episode_aggregation(tmp_path):
+	"""Tests the per run aggregation, over all and over the last episodes, and the episode stream
+	"""
+	with ResultsStore(str(tmp_path / 'results.sqlite')) as store:
+		first = store.CreateRun('first')
+		second = store.CreateRun('second')
+		store.AddEpisodes(first, createEpisodes(10))
+		store.AddEpisodes(second, createEpisodes(4, rewardOffset=100))
+
+		rows = store.SummarizeRuns(metric='reward')
+		assert [(row['run_id'], row['episodes'], row['mean'], row['minimum'], row['maximum'], row['last']) for row in rows] == [
+			(first, 10, 4.5, 0, 9, 9), (second, 4, 101.5, 100, 103, 103)]
+		rows = store.SummarizeRuns([first], metric='totalCost', lastEpisodes=2)
+		assert [(row['episodes'], row['mean']) for row in rows] == [(2, 4.25)]
+
+		assert list(store.IterEpisodes(second, ['episode', 'reward'])) == [(0, 100.0), (1, 101.0), (2, 102.0), (3, 103.0)]
+		with pytest.raises(ValueError):
+			store.SummarizeRuns(metric='reward; DROP TABLE runs')
+
+def test_import_and_evaluations(tmp_path):
+	"""Tests importing a training_metrics.csv keeps the last row of repeated episodes, and the evaluation rows
+	"""
+	csvPath = str(tmp_path / 'training_metrics.csv')
+	with open(csvPath, 'w') as csvFile:
+		csvFile.write('episode,timesteps,reward,totalCost,temperature,heatingCycles,coolingCycles,heatingSeconds,coolingSeconds\n')
+		for episode, reward in [(0, 1.0), (1, 2.0), (1, 3.0)]:
+			csvFile.write('{},10,{},0.1,20.0,1,0,300.0,0.0\n'.format(episode, reward))
+
+	with ResultsStore(str(tmp_path / 'results.sqlite')) as store:
+		runId = store.CreateRun('imported')
+		assert store.ImportEpisodes(runId, csvPath) == 2
+		assert list(store.IterEpisodes(runId, ['reward'])) == [(1.0,), (3.0,)]
+		store.AddEvaluation(runId, 'agent', [{'name': 'cold', 'count': 3, 'totalCost_mean': 1.5, 'totalCost_std': 0.1, 'totalCost_ci95': 0.25}])
+		rows = store.GetEvaluations([runId], 'totalCost')
+		assert [(row['policy'], row['scenario'], row['count'], row['mean'], row['ci95']) for row in rows] == [('agent', 'cold', 3, 1.5, 0.25)]
+
+def test_command_line(tmp_path, capsys):
+	"""Tests the command line imports, lists and compares runs
+	"""
+	store = str(tmp_path / 'results.sqlite')
+	csvPath = str(tmp_path / 'training_metrics.csv')
+	with open(csvPath, 'w') as csvFile:
+		csvFile.write('episode,timesteps,reward,totalCost,temperature,heatingCycles,coolingCycles,heatingSeconds,coolingSeconds\n')
+		csvFile.write('0,10,-5.0,0.1,20.0,1,0,300.0,0.0\n')
+
+	main([store, 'import', 'cli-run', '--agent', os.path.join(CONFIG_DIRECTORY, 'hvac_ppo.json'), '--env', json.dumps({'heatTransmission': 250}), '--metrics', csvPath])
+	assert 'Added run 1 with 1 episodes' in capsys.readouterr().out
+	main([store, 'list', '--filter', 'env.heatTransmission=200..300', '--filter', 'agent.type=ppo_agent'])
+	assert 'cli-run' in capsys.readouterr().out
+	main([store, 'list', '--filter', 'env.heatTransmission=100'])
+	assert 'cli-run' not in capsys.readouterr().out
+	main([store, 'compare', '1', '--metric', 'reward'])
+	assert '-5.000' in capsys.readouterr().out
@@ -0,0 +1,86 @@
+import pickle
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, CompileEnvSpec
+from gym_hvac.models import CreateResidentialForcing, RewardFunction, RegisterRewardTerm, REWARD_STEP_DTYPE, REWARD_TERMS
+
+ACTIONS = [1] * 20 + [0] * 10 + [2] * 5 + [0] * 5
+
+def test_default_rewards_are_the_building_rewards():
+	"""Tests the default reward functions give the rewards HvacBuilding.DetermineReward* gave
+	"""
+	for forcing in [None, CreateResidentialForcing()]:
+		env = HvacEnv(outsideTemperatures='october', forcing=forcing)
+		building = env.hvacBuilding
+		for action in ACTIONS:
+			previousTemp = building.current_temperature
+			previousCost = building.CalculateGasEneregyCost() + building.CalculateElectricEneregyCost()
+			reward = env.step(action)[1]
+			actionCost = building.CalculateGasEneregyCost() + building.CalculateElectricEneregyCost() - previousCost
+			if forcing is None:
+				expected = building.DetermineReward(previousTemp, actionCost)
+			else:
+				expected = building.DetermineRewardOccupiedComfort(previousTemp, actionCost, building.GetOccupancy() > 0, 18, 22)
+			assert reward == pytest.approx(expected, abs=1e-12)
+
+def test_step_deltas():
+	env = HvacEnv(outsideTemperatures='october')
+	assert env.GetRewardStep() is None
+	env.step(1)
+	step = np.array([env.GetRewardStep()], dtype=REWARD_STEP_DTYPE)[0]
+	building = env.hvacBuilding
+	assert step['cycles'] == 1 and step['previousTemperature'] == 18 and step['temperature'] == building.current_temperature
+	assert step['cost'] == pytest.approx(building.CalculateGasEneregyCost() + building.CalculateElectricEneregyCost(), rel=1e-12)
+	hvac = building.building_hvac
+	assert step['power'] == pytest.approx((hvac.TotalPowerUsed - hvac.TotalGasEnergyUsed) / 300)
+	env.step(1)
+	assert env.GetRewardStep()[4] == 0
+	env.reset()
+	assert env.GetRewardStep() is None
+	# keeping the A/C on isn't a new cycle to the reward, though HVAC counts every command
+	env = HvacEnv(outsideTemperatures='hot')
+	assert [env.step(2) and env.GetRewardStep()[4] for i in range(3)] == [1, 0, 0]
+	assert env.hvacBuilding.building_hvac.NumberOfTimesCoolingTurnedOn == 3
+
+def test_recorded_steps_are_rescored_in_one_batch():
+	reward = RewardFunction({'savings': 1.0, 'comfort': (0.5, {'occupiedOnly': True}), 'cycling': 0.01, 'peak': (0.1, {'limit': 500.0})})
+	env = HvacEnv(outsideTemperatures='october', forcing=CreateResidentialForcing(), reward=reward)
+	rewards = []
+	steps = []
+	for action in ACTIONS:
+		rewards.append(env.step(action)[1])
+		steps.append(env.GetRewardStep())
+	steps = np.array(steps, dtype=REWARD_STEP_DTYPE)
+	np.testing.assert_allclose(reward(steps), rewards, rtol=1e-12)
+	terms = reward.GetTermRewards(steps)
+	assert sorted(terms) == ['comfort', 'cycling', 'peak', 'savings']
+	np.testing.assert_allclose(sum(terms.values()), rewards, rtol=1e-12)
+	assert terms['cycling'].sum() == pytest.approx(-0.01 * steps['cycles'].sum()) and steps['cycles'].sum() == 2
+	# another reward of the same episode
+	np.testing.assert_allclose(RewardFunction('maxCost')(steps), steps['maxCost'] - steps['cost'])
+
+def test_reward_is_part_of_the_spec():
+	env = HvacEnv(reward={'cost': 1, 'comfort': 2})
+	assert env.envSpec is CompileEnvSpec({'reward': {'comfort': 2.0, 'cost': 1.0}})
+	assert env.envSpec.reward == RewardFunction({'comfort': 2, 'cost': 1})
+	assert env.envSpec.spec['reward'] == {'comfort': 2.0, 'cost': 1.0}
+	assert pickle.loads(pickle.dumps(env.envSpec)) is env.envSpec
+	assert HvacEnv(spec={'reward': 'occupiedComfort'}).rewardFunction == RewardFunction({'occupiedComfort': 1})
+	for reward in ['fastest', {'speed': 1.0}, {'cost': 'high'}, {}]:
+		with pytest.raises(ValueError):
+			RewardFunction(reward)
+	with pytest.raises(ValueError):
+		HvacEnv(spec={}, reward='maxCost')
+
+def test_registered_terms():
+	def warmth(steps, scale = 1.0):
+		return scale * steps['temperature']
+	RegisterRewardTerm('warmth', warmth)
+	try:
+		reward = RewardFunction({'warmth': (2.0, {'scale': 0.5})})
+		assert reward({'temperature': 20.0}) == 20.0
+		assert pickle.loads(pickle.dumps(reward)) == reward
+		with pytest.raises(ValueError):
+			RegisterRewardTerm('warmth', lambda steps: steps['temperature'])
+	finally:
+		del REWARD_TERMS['warmth']
@@ -0,0 +1,132 @@
+import os
+import random
+import numpy as np
+import pytest
+from gym_hvac.envs import HvacEnv, HvacSetpointEnv, ScenarioSampler
+from gym_hvac.models import CreateResidentialForcing, HVAC, HVAC_STATE_DTYPE
+from gym_hvac.utils import SessionCheckpoint, GetRandomState, SetRandomState, TrainingReporter, EPISODE_SUMMARY_DTYPE
+from gym_hvac.utils.training_report import METRICS_CSV
+
+ACTIONS = [1] * 40 + [0] * 20 + [2] * 10 + [0] * 30
+
+def runSteps(env, actions):
+	results = []
+	for action in actions:
+		observation, reward, done, info = env.step(action)
+		results.append(np.append(observation, [reward, done]))
+		if done:
+			env.reset()
+	return np.array(results)
+
+@pytest.mark.parametrize('createEnv', [
+	lambda: HvacEnv(outsideTemperatures='october', forcing=CreateResidentialForcing(), forecastHorizon=3, forecastNoise=0.3),
+	lambda: HvacEnv(scenarioSampler=ScenarioSampler(seed=3, batchSize=16), scenarioStart=5),
+])
+def test_env_resumes_exactly(createEnv, tmp_path):
+	"""Tests an env restored from a checkpoint in a later episode steps like the env it was saved from
+	"""
+	env = createEnv()
+	runSteps(env, ACTIONS[:50])
+	env.reset()
+	runSteps(env, ACTIONS[:37])
+	checkpoint = SessionCheckpoint(str(tmp_path))
+	checkpoint.Save({'env': env.GetSessionState()})
+	checkpoint.Close()
+	expected = runSteps(env, ACTIONS)
+
+	resumed = createEnv()
+	state, series = SessionCheckpoint(str(tmp_path)).Load()
+	resumed.SetSessionState(state['env'])
+	assert resumed.episode == state['env']['env'][0] > 0
+	np.testing.assert_array_equal(runSteps(resumed, ACTIONS), expected)
+	assert resumed.GetEpisodeSummary() == env.GetEpisodeSummary()
+
+def test_setpoint_env_resumes_with_its_thermostat():
+	env = HvacSetpointEnv(outsideTemperatures='normal')
+	action = np.array([21.0, 23.0, 1.0], dtype=np.float32)
+	for step in range(5):
+		env.step(action)
+	resumed = HvacSetpointEnv(outsideTemperatures='normal')
+	resumed.SetSessionState(env.GetSessionState())
+	for step in range(5):
+		np.testing.assert_array_equal(resumed.step(action)[0], env.step(action)[0])
+	assert resumed.thermostat.Decisions == env.thermostat.Decisions
+
+def test_hvac_state_round_trip():
+	hvac = HVAC()
+	hvac.TurnHeatingOn()
+	hvac.SimulateSeconds(45)
+	state = np.array(hvac.GetState(), dtype=HVAC_STATE_DTYPE)
+	restored = HVAC()
+	restored.SetState(state)
+	assert restored.GetState() == hvac.GetState()
+	assert type(restored.TotalTimeInSeconds) is int
+
+def test_series_are_appended_incrementally(tmp_path):
+	checkpoint = SessionCheckpoint(str(tmp_path), dtypes={'episodes': EPISODE_SUMMARY_DTYPE})
+	episodes = []
+	rewards = []
+	for episode in range(10):
+		episodes.append((episode, 288, -1.5 * episode, 0.25, 20.0, 3, 0, 900.0, 0.0))
+		rewards.append(-1.5 * episode)
+		checkpoint.Save({'runner': {'episode': episode}}, series={'episodes': episodes, 'rewards': rewards})
+		checkpoint.Wait()
+		# only the new records are written, the files are never rewritten
+		assert os.path.getsize(checkpoint.GetSeriesPath('episodes')) == (episode + 1) * EPISODE_SUMMARY_DTYPE.itemsize
+	assert checkpoint.GetSequence() == 10
+	with pytest.raises(ValueError):
+		checkpoint.Save({}, series={'rewards': rewards[:5]})
+	with pytest.raises(ValueError):
+		checkpoint.Save({'agent': None})
+	checkpoint.Close()
+
+	# a save that appended records but died before its manifest is cut off on resume
+	with open(os.path.join(str(tmp_path), 'rewards.series'), 'ab') as seriesFile:
+		seriesFile.write(np.arange(3, dtype=np.float64).tobytes())
+	resumed = SessionCheckpoint(str(tmp_path))
+	state, series = resumed.Load()
+	assert state == {'runner': {'episode': 9}}
+	np.testing.assert_array_equal(series['episodes'], np.array(episodes, dtype=EPISODE_SUMMARY_DTYPE))
+	np.testing.assert_array_equal(series['rewards'], rewards)
+	rewards.append(7.0)
+	resumed.Save({'runner': {'episode': 10}}, series={'rewards': rewards})
+	resumed.Close()
+	np.testing.assert_array_equal(SessionCheckpoint(str(tmp_path)).Load()[1]['rewards'], rewards)
+
+def test_saves_behind_the_writer_are_merged(tmp_path):
+	checkpoint = SessionCheckpoint(str(tmp_path))
+	values = []
+	for value in range(500):
+		values.append(value)
+		checkpoint.Save({'last': value}, series={'values': values})
+	checkpoint.Close()
+	assert checkpoint.GetSequence() <= 500
+	state, series = SessionCheckpoint(str(tmp_path)).Load()
+	assert state['last'] == 499
+	np.testing.assert_array_equal(series['values'], np.arange(500))
+
+def test_random_state_round_trip(tmp_path):
+	random.seed(4)
+	np.random.seed(4)
+	random.gauss(0, 1)
+	np.random.normal()
+	checkpoint = SessionCheckpoint(str(tmp_path))
+	checkpoint.Save({'random': GetRandomState()})
+	checkpoint.Close()
+	expected = (random.random(), random.gauss(0, 1), np.random.normal(size=3))
+	SetRandomState(SessionCheckpoint(str(tmp_path)).Load()[0]['random'])
+	actual = (random.random(), random.gauss(0, 1), np.random.normal(size=3))
+	assert actual[:2] == expected[:2]
+	np.testing.assert_array_equal(actual[2], expected[2])
+
+def test_reporter_continues_from_the_history(tmp_path):
+	history = np.array([(episode, 288, -1.0, 0.5, 20.0, 2, 0, 600.0, 0.0) for episode in range(3)], dtype=EPISODE_SUMMARY_DTYPE)
+	with open(os.path.join(str(tmp_path), METRICS_CSV), 'w') as csvFile:
+		csvFile.write('episode\n0\n1\n2\n3\n4\n')
+	reporter = TrainingReporter(str(tmp_path), plotEverySeconds=3600, history=history)
+	reporter.AddEpisode((3, 288, -2.0, 0.5, 20.0, 2, 0, 600.0, 0.0))
+	assert [summary[0] for summary in reporter.GetHistory()] == [0, 1, 2, 3]
+	reporter.Close()
+	with open(os.path.join(str(tmp_path), METRICS_CSV)) as csvFile:
+		lines = csvFile.read().splitlines()
+	assert lines[0].startswith('episode,timesteps') and [line.split(',')[0] for line in lines[1:]] == ['0', '1', '2', '3']
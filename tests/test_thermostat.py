@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from gym_hvac.models import HVAC, HvacBuilding, HysteresisThermostat
+
+def createBuilding(temperature:float, heatTransmission:float = 200):
+	return HvacBuilding(HVAC(), 16500 * 100, heatTransmission, temperature, 100)
+
+def runPerSecond(building, thermostat, outsideTemperature, seconds):
+	for second in range(seconds):
+		thermostat.Step(building, outsideTemperature)
+	return building
+
+def summarize(building):
+	hvac = building.building_hvac
+	return (hvac.TotalTimeInSeconds, hvac.NumberOfTimesHeatingTurnedOn, hvac.NumberOfTimesCoolingTurnedOn,
+		hvac.TotalDurationHeatingOn, hvac.TotalDurationCoolingOn, hvac.HeatingIsOn, hvac.CoolingIsOn)
+
+@pytest.mark.parametrize('outsideTemperature, initialTemperature, setpoints', [
+	(-8, 18, (20, 20, 2)),
+	(-8, 21, (19, 24, 0.5)),
+	(34, 20, (20, 20, 2)),
+	(34, 26, (18, 23, 1)),
+	(12, 16, (20, 22, 1.5)),
+])
+def test_event_run_matches_the_per_second_thermostat(outsideTemperature, initialTemperature, setpoints):
+	"""Tests solving the threshold crossings gives the cycles and temperatures of deciding every second
+	"""
+	reference = createBuilding(initialTemperature)
+	events = createBuilding(initialTemperature)
+	referenceThermostat = HysteresisThermostat(*setpoints)
+	eventThermostat = HysteresisThermostat(*setpoints)
+	for hour in range(6):
+		runPerSecond(reference, referenceThermostat, outsideTemperature, 3600)
+		eventThermostat.Run(events, outsideTemperature, 3600)
+		assert summarize(events) == summarize(reference)
+		assert events.current_temperature == pytest.approx(reference.current_temperature, abs=1e-9)
+		assert events.building_hvac.TotalPowerUsed == pytest.approx(reference.building_hvac.TotalPowerUsed, rel=1e-12)
+	# only start up and shutdown are decided every second
+	assert eventThermostat.Decisions < 6 * 3600 / 2
+
+def test_seconds_in_band_finds_the_first_second_outside():
+	"""Tests the solved crossing second against stepping the closed form
+	"""
+	building = createBuilding(18)
+	power = building.building_hvac.GetMaxHeatingPower()
+	seconds = building.GetSecondsInBand(-8, power, float('-inf'), 20, 100000)
+	temperatures = [building._next_temperature_after(-8, power, n) for n in (seconds - 1, seconds)]
+	assert temperatures[0] <= 20 < temperatures[1]
+	# settling inside the band runs to the limit
+	assert building.GetSecondsInBand(-8, 0.0, -100, 30, 5000) == 5000
+	assert building.GetSecondsInBand(18, 0.0, 10, 30, 5000) == 5000
+
+def test_cooling_setpoint_is_at_least_the_heating_setpoint():
+	thermostat = HysteresisThermostat(22, 18, -1)
+	assert (thermostat.coolingSetpoint, thermostat.deadband) == (22, 0.0)
@@ -0,0 +1,106 @@
+import csv
+import os
+import numpy as np
+from gym_hvac.envs import HvacEnv
+from gym_hvac.utils import TrainingReporter, EpisodeSummaryRing, EPISODE_SUMMARY_DTYPE
+
+def createSummary(episode:int):
+	return (episode, 10 + episode, -1.5 * episode, 0.25 * episode, 20.0, 1, 0, 300.0, 0.0)
+
+class ListReporter():
+	def __init__(self):
+		self.summaries = []
+
+	def AddEpisode(self, summary):
+		self.summaries.append(summary)
+		return True
+
+def test_ring_keeps_push_order_across_the_wrap():
+	"""Tests the ring hands the summaries back in push order after the indexes wrap around
+	"""
+	ring = EpisodeSummaryRing(4)
+	try:
+		for episode in range(3):
+			assert ring.Push(createSummary(episode))
+		assert ring.PopAll()['episode'].tolist() == [0, 1, 2]
+		for episode in range(3, 7):
+			assert ring.Push(createSummary(episode))
+		records = ring.PopAll()
+		assert records.dtype == EPISODE_SUMMARY_DTYPE
+		assert records['episode'].tolist() == [3, 4, 5, 6]
+		assert len(ring.PopAll()) == 0
+	finally:
+		ring.Close()
+
+def test_ring_drops_when_full():
+	"""Tests a full ring drops and counts new summaries instead of blocking
+	"""
+	ring = EpisodeSummaryRing(2)
+	try:
+		assert ring.Push(createSummary(0))
+		assert ring.Push(createSummary(1))
+		assert not ring.Push(createSummary(2))
+		assert ring.Dropped == 1
+		assert ring.PopAll()['episode'].tolist() == [0, 1]
+		assert ring.Push(createSummary(3))
+	finally:
+		ring.Close()
+
+def test_ring_is_shared_by_name():
+	"""Tests a ring attached by name sees what the owner pushed
+	"""
+	ring = EpisodeSummaryRing(8)
+	attached = EpisodeSummaryRing(8, name=ring.GetName())
+	try:
+		ring.Push(createSummary(5))
+		assert attached.PopAll()['reward'].tolist() == [-7.5]
+		assert len(ring.PopAll()) == 0
+	finally:
+		attached.Close()
+		ring.Close()
+
+def test_env_reports_finished_episodes():
+	"""Tests the env reports an episode on reset, only when it took a step
+	"""
+	env = HvacEnv()
+	reporter = ListReporter()
+	env.SetReporter(reporter)
+	env.reset()
+	assert reporter.summaries == []
+
+	rewards = 0.0
+	for action in [1, 1, 0]:
+		observation, reward, done, info = env.step(action)
+		rewards = rewards + reward
+	expected = env.GetEpisodeSummary()
+	env.reset()
+	assert reporter.summaries == [expected]
+	episode, timesteps, reward, totalCost, temperature, heatingCycles, coolingCycles, heatingSeconds, coolingSeconds = expected
+	assert (episode, timesteps, heatingCycles, coolingCycles) == (0, 3, 1, 0)
+	assert reward == rewards
+	assert totalCost > 0
+	assert heatingSeconds >= 600
+
+	env.step(0)
+	env.reset()
+	assert reporter.summaries[-1][0] == 1
+
+def test_reporter_writes_metrics_and_plots(tmp_path):
+	"""Tests the report process writes the metrics and every SVG before it stops
+	"""
+	reporter = TrainingReporter(str(tmp_path), capacity=16, plotEverySeconds=0)
+	for episode in range(5):
+		assert reporter.AddEpisode(createSummary(episode))
+	timeOfDay = np.arange(4) * 300.0
+	reporter.SubmitComparison(timeOfDay, [0, 1, 2, 3], [18, 19, 20, 21], [18, 18, 19, 19], [0, 1, 2, 3], [0, 2, 3, 4], [0, -1, -2, -3], [0, -2, -4, -6])
+	reporter.Close()
+
+	with open(os.path.join(str(tmp_path), 'training_metrics.csv')) as csvFile:
+		rows = list(csv.reader(csvFile))
+	assert rows[0] == list(EPISODE_SUMMARY_DTYPE.names)
+	assert [int(row[0]) for row in rows[1:]] == [0, 1, 2, 3, 4]
+	with np.load(os.path.join(str(tmp_path), 'training_metrics.npz')) as metrics:
+		np.testing.assert_array_equal(metrics['totalCost'], [0.25 * episode for episode in range(5)])
+	for name in ['RL_Progress.svg', 'RL_Reward_Progress.svg', 'RL_Cost_Progress.svg', 'indoorAndOutdoor_RL_Baseline_Comparison.svg',
+		'Total_Cost_RL_Baseline_Comparison.svg', 'Reward_RL_Baseline_Comparison.svg']:
+		assert os.path.getsize(os.path.join(str(tmp_path), name)) > 0